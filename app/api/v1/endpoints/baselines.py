@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Query
+from typing import Optional
+from app.schemas.baseline import BaselineCreate, BaselineResponse, BaselineHistoryResponse
+from app.services.baseline_service import BaselineService
+
+router = APIRouter()
+
+@router.post("/", response_model=BaselineResponse, summary="Pin a named performance baseline")
+async def pin_baseline(baseline: BaselineCreate):
+    service = BaselineService()
+    return await service.pin_baseline(baseline)
+
+@router.get("/", response_model=list[BaselineResponse], summary="List baselines")
+async def list_baselines():
+    service = BaselineService()
+    return await service.list_baselines()
+
+@router.get("/{name}/history", response_model=BaselineHistoryResponse, summary="Baseline run history and verdicts")
+async def get_baseline_history(
+    name: str,
+    limit: int = Query(100, ge=1, le=1000),
+    verdict: Optional[str] = None
+):
+    service = BaselineService()
+    return await service.get_history(name, limit=limit, verdict=verdict)
@@ -1,7 +1,15 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from app.schemas.experiment import ExperimentCreate, ExperimentResponse
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Response
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from app.schemas.experiment import (
+    ExperimentCreate,
+    ExperimentResponse,
+    ExperimentSummary,
+    ExperimentComparisonRequest
+)
 from app.services.experiment_service import ExperimentService
 from app.core.exceptions import ExperimentNotFoundError
+import json
 
 router = APIRouter()
 
@@ -10,10 +18,48 @@ async def create_experiment(experiment: ExperimentCreate):
     service = ExperimentService()
     return await service.create_experiment(experiment)
 
-@router.get("/", response_model=list[ExperimentResponse], summary="List all experiments")
-async def list_experiments():
+@router.get("/", response_model=list[ExperimentSummary], summary="List experiments (paginated)")
+async def list_experiments(
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    database_type: Optional[str] = None,
+    status: Optional[str] = None
+):
     service = ExperimentService()
-    return await service.list_experiments()
+    items, next_cursor = await service.list_experiments(
+        limit=limit,
+        cursor=cursor,
+        database_type=database_type,
+        status=status
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
+
+@router.get("/export", summary="Stream all experiments as NDJSON")
+async def export_experiments(
+    database_type: Optional[str] = None,
+    status: Optional[str] = None,
+    include_results: bool = False
+):
+    service = ExperimentService()
+    rows = await service.stream_experiments(
+        database_type=database_type,
+        status=status,
+        include_results=include_results
+    )
+    
+    async def ndjson():
+        async for row in rows:
+            yield json.dumps(row, default=str) + "\n"
+    
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+@router.post("/compare", summary="Statistically compare two or more experiment runs")
+async def compare_experiments(request: ExperimentComparisonRequest):
+    service = ExperimentService()
+    return await service.compare_experiments(request)
 
 @router.get("/{experiment_id}", response_model=ExperimentResponse, summary="Get experiment by ID")
 async def get_experiment(experiment_id: str):
@@ -28,3 +74,62 @@ async def run_experiment(experiment_id: str, background_tasks: BackgroundTasks):
     service = ExperimentService()
     return await service.execute_experiment(experiment_id)
 
+@router.get("/{experiment_id}/sweep", summary="Consolidated result table of a sweep experiment")
+async def get_sweep_table(experiment_id: str, format: str = Query("json", pattern="^(json|csv)$")):
+    service = ExperimentService()
+    table = await service.get_sweep_table(experiment_id, format=format)
+    if format == "csv":
+        return Response(content=table, media_type="text/csv")
+    return table
+
+@router.get("/{experiment_id}/samples", summary="Raw latency samples in a time range")
+async def get_samples(
+    experiment_id: str,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    operation: Optional[str] = None,
+    limit: int = Query(10000, ge=1, le=100000)
+):
+    service = ExperimentService()
+    return await service.get_samples(experiment_id, start=start, end=end, operation=operation, limit=limit)
+
+@router.get("/{experiment_id}/samples/downsampled", summary="Per-bucket latency aggregates")
+async def get_downsampled_samples(
+    experiment_id: str,
+    bucket_seconds: float = Query(1.0, gt=0),
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    operation: Optional[str] = None,
+    percentiles: str = "50,95,99"
+):
+    service = ExperimentService()
+    return await service.get_downsampled_samples(
+        experiment_id,
+        bucket_seconds=bucket_seconds,
+        start=start,
+        end=end,
+        operation=operation,
+        percentiles=tuple(float(p) for p in percentiles.split(",") if p)
+    )
+
+@router.get("/{experiment_id}/live", summary="Stream live metrics of a running experiment (SSE)")
+async def stream_live_metrics(experiment_id: str):
+    service = ExperimentService()
+    queue = service.subscribe_live_metrics(experiment_id)
+    
+    async def events():
+        try:
+            while True:
+                snapshot = await queue.get()
+                if snapshot is None:
+                    yield "event: end\ndata: {}\n\n"
+                    break
+                yield f"event: metrics\ndata: {json.dumps(snapshot)}\n\n"
+        finally:
+            service.unsubscribe_live_metrics(experiment_id, queue)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,8 +1,9 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import experiments, health
+from app.api.v1.endpoints import experiments, health, baselines
 
 api_router = APIRouter()
 
 api_router.include_router(experiments.router, prefix="/experiments", tags=["experiments"])
+api_router.include_router(baselines.router, prefix="/baselines", tags=["baselines"])
 api_router.include_router(health.router, prefix="/health", tags=["health"])
 
@@ -1,5 +1,8 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Dict, Any
+import os
+import yaml
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "OptiStack"
@@ -45,8 +48,28 @@ class Settings(BaseSettings):
     ELASTICSEARCH_USER: Optional[str] = None
     ELASTICSEARCH_PASSWORD: Optional[str] = None
     
+    SQLITE_PATH: str = "data/sqlite/benchmark.db"
+    
+    METRICS_ENABLED: bool = True
+    
     OPENTELEMETRY_ENABLED: bool = False
     OPENTELEMETRY_ENDPOINT: Optional[str] = None
+    OPENTELEMETRY_EXPORTER: str = "file"
+    OPENTELEMETRY_FILE_PATH: str = "data/traces/spans.jsonl"
+    OPENTELEMETRY_SAMPLE_RATIO: float = 1.0
+    OPENTELEMETRY_OPERATION_SAMPLE_RATIO: float = 0.01
+    OPENTELEMETRY_BATCH_SIZE: int = 512
+    OPENTELEMETRY_MAX_QUEUE_SIZE: int = 2048
+    OPENTELEMETRY_EXPORT_INTERVAL_MS: int = 5000
+    
+    SAMPLE_ARCHIVE_DIR: str = "data/samples"
+    DATASET_CACHE_DIR: str = "data/datasets"
+    DATASET_CACHE_MAX_MB: int = 1024
+    
+    LOOP_LAG_PROBE_INTERVAL_MS: float = 10.0
+    CLIENT_BOUND_LAG_SHARE: float = 0.1
+    CLIENT_BOUND_CPU_PERCENT: float = 90.0
+    TRACE_DIR: str = "data/replay"
     
     LOG_LEVEL: str = "INFO"
     
@@ -56,3 +79,21 @@ class Settings(BaseSettings):
 
 settings = Settings()
 
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "conf", "config.yaml")
+
+@lru_cache(maxsize=1)
+def load_config_file() -> Dict[str, Any]:
+    """conf/config.yaml, parsed once per process; empty if the file is missing or invalid"""
+    try:
+        with open(CONFIG_FILE, 'r') as f:
+            return yaml.safe_load(f) or {}
+    except Exception:
+        return {}
+
+def config_section(*path: str) -> Dict[str, Any]:
+    """A nested section of conf/config.yaml, e.g. config_section("databases", "postgres")"""
+    section: Any = load_config_file()
+    for key in path:
+        section = section.get(key) if isinstance(section, dict) else None
+    return section if isinstance(section, dict) else {}
@@ -19,3 +19,11 @@ class BenchmarkError(OptiStackException):
 class ConfigurationError(OptiStackException):
     pass
 
+class InvalidCursorError(OptiStackException):
+    pass
+
+class BaselineNotFoundError(OptiStackException):
+    pass
+
+class ExperimentTimeoutError(OptiStackException):
+    pass
@@ -1,4 +1,5 @@
 from app.models.experiment import Base
+from app.models.baseline import Baseline, BaselineRun
 from app.db.postgres import get_postgres_async_engine
 from sqlalchemy.ext.asyncio import AsyncSession
 
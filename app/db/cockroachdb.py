@@ -1,59 +1,64 @@
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine
 from contextlib import asynccontextmanager
 from app.core.config import settings
-import yaml
-import os
+from app.db.registry import engine_registry, sqlalchemy_sessions, prewarm_sqlalchemy_pool
+from typing import Dict, Any, Optional
+from telemetry.breakdown import instrument_breakdown
+from telemetry.metrics import instrument_engine
 
-_async_engine = None
-_AsyncSessionLocal = None
-
-def _load_pool_config():
-    config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "conf", "config.yaml")
-    try:
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
-            return config.get("databases", {}).get("cockroachdb", {})
-    except Exception:
-        return {}
-
-def get_cockroachdb_async_engine():
-    global _async_engine
-    if _async_engine is not None:
-        return _async_engine
-        
-    if not settings.COCKROACHDB_HOST:
-        return None
-    
-    pool_config = _load_pool_config()
-    pool_size = pool_config.get("pool_size", 10)
-    
+def create_cockroachdb_async_engine(
+    pool_size: int = 10,
+    max_overflow: int = 0,
+    pool_timeout: float = 30.0,
+    pool_recycle: int = -1,
+    pool_pre_ping: bool = True,
+    query_cache_size: int = 500,
+    statement_cache_size: int = 100,
+    driver_options: Optional[Dict[str, Any]] = None
+):
+    """
+    A new engine with its own pool, not yet instrumented. query_cache_size is
+    SQLAlchemy's compiled statement cache and statement_cache_size the prepared
+    statement cache of each connection; driver_options go to asyncpg.connect().
+    """
     user = settings.COCKROACHDB_USER or "root"
     password = settings.COCKROACHDB_PASSWORD or ""
     auth = f"{user}:{password}@" if password else f"{user}@"
     database_url = f"postgresql+asyncpg://{auth}{settings.COCKROACHDB_HOST}:{settings.COCKROACHDB_PORT}/{settings.COCKROACHDB_DB}?sslmode=disable"
-    
-    _async_engine = create_async_engine(
+    return create_async_engine(
         database_url,
         pool_size=pool_size,
-        max_overflow=0,
-        pool_pre_ping=True,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=pool_recycle,
+        pool_pre_ping=pool_pre_ping,
+        query_cache_size=query_cache_size,
+        connect_args={**(driver_options or {}), "prepared_statement_cache_size": statement_cache_size},
         echo=False
     )
-    return _async_engine
+
+def _instrument(engine):
+    instrument_engine(engine, "cockroachdb")
+    instrument_breakdown(engine)
+
+engine_registry.register(
+    "cockroachdb",
+    create_cockroachdb_async_engine,
+    instrument=_instrument,
+    sessions=sqlalchemy_sessions,
+    prewarm=prewarm_sqlalchemy_pool
+)
+
+def get_cockroachdb_async_engine():
+    if not settings.COCKROACHDB_HOST:
+        return None
+    return engine_registry.get("cockroachdb")
 
 def get_cockroachdb_async_session():
-    global _AsyncSessionLocal
-    if _AsyncSessionLocal is None:
-        engine = get_cockroachdb_async_engine()
-        if not engine:
-            return None
-        _AsyncSessionLocal = async_sessionmaker(
-            engine,
-            class_=AsyncSession,
-            expire_on_commit=False
-        )
-    return _AsyncSessionLocal()
+    if not settings.COCKROACHDB_HOST:
+        return None
+    return engine_registry.entry("cockroachdb").sessions()
 
 @asynccontextmanager
 async def get_cockroachdb_connection():
@@ -1,37 +1,36 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 from contextlib import asynccontextmanager
 from app.core.config import settings
-import yaml
-import os
+from app.db.registry import engine_registry
+from typing import Dict, Any, Optional
 
-_client = None
+def create_mongodb_client(
+    max_pool_size: int = 50,
+    min_pool_size: int = 0,
+    server_selection_timeout_ms: int = 5000,
+    driver_options: Optional[Dict[str, Any]] = None
+):
+    """A new client with its own pool; driver_options are passed to the client as keyword options"""
+    return AsyncIOMotorClient(
+        settings.MONGODB_URL,
+        maxPoolSize=max_pool_size,
+        minPoolSize=min_pool_size,
+        serverSelectionTimeoutMS=server_selection_timeout_ms,
+        **(driver_options or {})
+    )
 
-def _load_pool_config():
-    config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "conf", "config.yaml")
-    try:
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
-            return config.get("databases", {}).get("mongodb", {})
-    except Exception:
-        return {}
+# Motor opens connections on demand; min_pool_size keeps a floor of them open instead of a pre-warm
+engine_registry.register(
+    "mongodb",
+    create_mongodb_client,
+    pool_size_option="max_pool_size",
+    dispose=lambda client: client.close()
+)
 
 def get_mongodb_client():
-    global _client
-    if _client is not None:
-        return _client
-        
     if not settings.MONGODB_URL:
         return None
-    
-    pool_config = _load_pool_config()
-    max_pool_size = pool_config.get("max_pool_size", 50)
-    
-    _client = AsyncIOMotorClient(
-        settings.MONGODB_URL,
-        maxPoolSize=max_pool_size,
-        serverSelectionTimeoutMS=5000
-    )
-    return _client
+    return engine_registry.get("mongodb")
 
 def get_mongodb_database(db_name: str = "optistack"):
     client = get_mongodb_client()
@@ -1,55 +1,59 @@
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine
 from contextlib import asynccontextmanager
 from app.core.config import settings
-import yaml
-import os
+from app.db.registry import engine_registry, sqlalchemy_sessions, prewarm_sqlalchemy_pool
+from typing import Dict, Any, Optional
+from telemetry.breakdown import instrument_breakdown
+from telemetry.metrics import instrument_engine
 
-_async_engine = None
-_AsyncSessionLocal = None
-
-def _load_pool_config():
-    config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "conf", "config.yaml")
-    try:
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
-            return config.get("databases", {}).get("mysql", {})
-    except Exception:
-        return {}
-
-def get_mysql_async_engine():
-    global _async_engine
-    if _async_engine is not None:
-        return _async_engine
-        
-    if not settings.MYSQL_HOST:
-        return None
-    
-    pool_config = _load_pool_config()
-    pool_size = pool_config.get("pool_size", 10)
-    
+def create_mysql_async_engine(
+    pool_size: int = 10,
+    max_overflow: int = 0,
+    pool_timeout: float = 30.0,
+    pool_recycle: int = -1,
+    pool_pre_ping: bool = True,
+    query_cache_size: int = 500,
+    driver_options: Optional[Dict[str, Any]] = None
+):
+    """
+    A new engine with its own pool, not yet instrumented. query_cache_size is
+    SQLAlchemy's compiled statement cache; driver_options go to aiomysql.connect().
+    """
     database_url = f"mysql+aiomysql://{settings.MYSQL_USER}:{settings.MYSQL_PASSWORD}@{settings.MYSQL_HOST}:{settings.MYSQL_PORT}/{settings.MYSQL_DB}"
-    _async_engine = create_async_engine(
+    return create_async_engine(
         database_url,
         pool_size=pool_size,
-        max_overflow=0,
-        pool_pre_ping=True,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=pool_recycle,
+        pool_pre_ping=pool_pre_ping,
+        query_cache_size=query_cache_size,
+        connect_args=dict(driver_options or {}),
         echo=False
     )
-    return _async_engine
+
+def _instrument(engine):
+    instrument_engine(engine, "mysql")
+    instrument_breakdown(engine)
+
+engine_registry.register(
+    "mysql",
+    create_mysql_async_engine,
+    instrument=_instrument,
+    sessions=sqlalchemy_sessions,
+    prewarm=prewarm_sqlalchemy_pool
+)
+
+def get_mysql_async_engine():
+    if not settings.MYSQL_HOST:
+        return None
+    return engine_registry.get("mysql")
 
 def get_mysql_async_session():
-    global _AsyncSessionLocal
-    if _AsyncSessionLocal is None:
-        engine = get_mysql_async_engine()
-        if not engine:
-            return None
-        _AsyncSessionLocal = async_sessionmaker(
-            engine,
-            class_=AsyncSession,
-            expire_on_commit=False
-        )
-    return _AsyncSessionLocal()
+    if not settings.MYSQL_HOST:
+        return None
+    return engine_registry.entry("mysql").sessions()
 
 @asynccontextmanager
 async def get_mysql_connection():
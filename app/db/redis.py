@@ -1,39 +1,56 @@
-from redis.asyncio import Redis
+from redis.asyncio import Redis, BlockingConnectionPool
 from contextlib import asynccontextmanager
 from app.core.config import settings
-import yaml
-import os
+from app.db.registry import engine_registry
+from typing import Dict, Any, Optional
 
-_client = None
+def create_redis_client(
+    max_connections: int = 50,
+    socket_timeout: float = 5.0,
+    socket_connect_timeout: float = 5.0,
+    health_check_interval: int = 0,
+    blocking: bool = False,
+    driver_options: Optional[Dict[str, Any]] = None
+):
+    """
+    A new client with its own pool of up to max_connections connections. A
+    blocking pool makes callers wait for a free connection instead of failing;
+    driver_options go to the connection class.
+    """
+    options = {
+        **(driver_options or {}),
+        "max_connections": max_connections,
+        "socket_timeout": socket_timeout,
+        "socket_connect_timeout": socket_connect_timeout,
+        "health_check_interval": health_check_interval,
+        "decode_responses": False
+    }
+    if blocking:
+        return Redis(connection_pool=BlockingConnectionPool.from_url(settings.REDIS_URL, **options))
+    return Redis.from_url(settings.REDIS_URL, **options)
 
-def _load_pool_config():
-    config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "conf", "config.yaml")
-    try:
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
-            return config.get("databases", {}).get("redis", {})
-    except Exception:
-        return {}
+async def prewarm_redis_pool(client, size: int) -> None:
+    pool = client.connection_pool
+    connections = [await pool.get_connection("PING") for _ in range(size)]
+    for connection in connections:
+        await pool.release(connection)
+
+async def close_redis_client(client) -> None:
+    await client.aclose()
+    await client.connection_pool.aclose()
+
+engine_registry.register(
+    "redis",
+    create_redis_client,
+    pool_size_option="max_connections",
+    prewarm=prewarm_redis_pool,
+    dispose=close_redis_client
+)
 
 async def get_redis_client():
-    global _client
-    if _client is not None:
-        return _client
-        
     if not settings.REDIS_URL:
         return None
-    
-    pool_config = _load_pool_config()
-    max_connections = pool_config.get("max_connections", 50)
-    
-    _client = Redis.from_url(
-        settings.REDIS_URL,
-        max_connections=max_connections,
-        socket_connect_timeout=5,
-        socket_timeout=5,
-        decode_responses=False
-    )
-    return _client
+    return engine_registry.get("redis")
 
 @asynccontextmanager
 async def get_redis_connection():
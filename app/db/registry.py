@@ -0,0 +1,213 @@
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Callable, Tuple
+from app.core.config import config_section
+from app.core.exceptions import ConfigurationError
+from app.core.logging import logger
+import inspect
+import json
+import threading
+import time
+
+# Engines and clients of the pooled backends, keyed by backend and effective
+# connection options: the factory's defaults, then the backend's section of
+# conf/config.yaml, then the overrides active in the current context (an
+# experiment's "engine" object, set by EngineRegistry.lease). Lookups with the
+# same options share one engine. Engines built for overrides are disposed,
+# least recently used first, once more than max_idle of them are unleased.
+
+_overrides: ContextVar[Optional[Dict[str, Dict[str, Any]]]] = ContextVar("optistack_engine_overrides", default=None)
+
+@dataclass
+class EngineBackend:
+    # Keyword arguments of the factory are the backend's options
+    factory: Callable[..., Any]
+    defaults: Dict[str, Any]
+    pool_size_option: str
+    instrument: Optional[Callable[[Any], Any]] = None
+    sessions: Optional[Callable[[Any], Any]] = None
+    prewarm: Optional[Callable[[Any, int], Any]] = None
+    dispose: Optional[Callable[[Any], Any]] = None
+
+@dataclass
+class EngineEntry:
+    backend: str
+    options: Dict[str, Any]
+    engine: Any
+    sessions: Any = None
+    leases: int = 0
+    # Engines for the configured defaults are never evicted
+    pinned: bool = False
+    last_used: float = field(default_factory=time.monotonic)
+
+class EngineRegistry:
+    def __init__(self, max_idle: Optional[int] = None):
+        self.max_idle = max_idle if max_idle is not None else int(config_section("engines").get("max_idle", 4))
+        self._backends: Dict[str, EngineBackend] = {}
+        self._entries: "OrderedDict[Tuple[str, str], EngineEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        backend: str,
+        factory: Callable[..., Any],
+        pool_size_option: str = "pool_size",
+        instrument: Optional[Callable[[Any], Any]] = None,
+        sessions: Optional[Callable[[Any], Any]] = None,
+        prewarm: Optional[Callable[[Any, int], Any]] = None,
+        dispose: Optional[Callable[[Any], Any]] = None
+    ) -> None:
+        defaults = {
+            name: parameter.default
+            for name, parameter in inspect.signature(factory).parameters.items()
+            if parameter.default is not inspect.Parameter.empty
+        }
+        self._backends[backend] = EngineBackend(
+            factory, defaults, pool_size_option, instrument, sessions, prewarm, dispose
+        )
+
+    def supports(self, backend: str) -> bool:
+        return backend in self._backends
+
+    def validate(self, backend: str, overrides: Any) -> Dict[str, Any]:
+        """Check an experiment's engine overrides against the backend's options"""
+        if not isinstance(overrides, dict):
+            raise ConfigurationError("engine must be an object of connection options")
+        if not overrides:
+            return {}
+        if backend not in self._backends:
+            raise ConfigurationError(f"engine options are not available for {backend}")
+        spec = self._backends[backend]
+        unknown = set(overrides) - set(spec.defaults)
+        if unknown:
+            raise ConfigurationError(
+                f"Unknown engine options for {backend}: {', '.join(sorted(unknown))}; "
+                f"choose from {', '.join(sorted(spec.defaults))}"
+            )
+        for name, value in overrides.items():
+            default = spec.defaults[name]
+            if default is None or isinstance(default, dict):
+                valid = isinstance(value, dict)
+            elif isinstance(default, bool):
+                valid = isinstance(value, bool)
+            else:
+                types = (int, float) if isinstance(default, float) else (int,)
+                minimum = 1 if name == spec.pool_size_option else min(default, 0)
+                valid = isinstance(value, types) and not isinstance(value, bool) and value >= minimum
+            if not valid:
+                raise ConfigurationError(f"Invalid value for engine option {name}: {value!r}")
+        return dict(overrides)
+
+    def options(self, backend: str) -> Dict[str, Any]:
+        """Effective options for the backend in the current context"""
+        spec = self._backends[backend]
+        configured = {k: v for k, v in config_section("databases", backend).items() if k in spec.defaults}
+        return {**spec.defaults, **configured, **(_overrides.get() or {}).get(backend, {})}
+
+    def entry(self, backend: str) -> EngineEntry:
+        options = self.options(backend)
+        key = (backend, json.dumps(options, sort_keys=True, default=str))
+        overridden = backend in (_overrides.get() or {})
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                spec = self._backends[backend]
+                engine = spec.factory(**options)
+                if spec.instrument:
+                    spec.instrument(engine)
+                entry = EngineEntry(backend, options, engine, sessions=spec.sessions(engine) if spec.sessions else None)
+                self._entries[key] = entry
+                logger.info(f"Created {backend} engine with options {key[1]}")
+            entry.pinned = entry.pinned or not overridden
+            entry.last_used = time.monotonic()
+            self._entries.move_to_end(key)
+        return entry
+
+    def get(self, backend: str) -> Any:
+        return self.entry(backend).engine
+
+    @asynccontextmanager
+    async def lease(self, backend: str, overrides: Optional[Dict[str, Any]] = None):
+        """
+        Route this context's lookups for backend to the engine for overrides
+        and keep that engine from eviction until the block exits. Yields the
+        entry, or None for backends the registry does not manage.
+        """
+        if backend not in self._backends:
+            yield None
+            return
+        token = None
+        if overrides:
+            token = _overrides.set({**(_overrides.get() or {}), backend: overrides})
+        try:
+            entry = self.entry(backend)
+            with self._lock:
+                entry.leases += 1
+            try:
+                yield entry
+            finally:
+                with self._lock:
+                    entry.leases -= 1
+                    entry.last_used = time.monotonic()
+        finally:
+            if token is not None:
+                _overrides.reset(token)
+            await self.evict_idle()
+
+    async def prewarm(self, backend: str) -> Optional[Dict[str, Any]]:
+        """Open the current engine's pool to its target size; None if the backend has no prewarm hook"""
+        spec = self._backends.get(backend)
+        if spec is None or spec.prewarm is None:
+            return None
+        entry = self.entry(backend)
+        size = entry.options[spec.pool_size_option]
+        started = time.perf_counter()
+        await spec.prewarm(entry.engine, size)
+        return {"connections": size, "seconds": round(time.perf_counter() - started, 3)}
+
+    async def evict_idle(self) -> None:
+        """Dispose the least recently used unleased override engines beyond max_idle"""
+        with self._lock:
+            idle = [key for key, entry in self._entries.items() if not entry.leases and not entry.pinned]
+            evicted = [self._entries.pop(key) for key in idle[:max(0, len(idle) - self.max_idle)]]
+        for entry in evicted:
+            logger.info(f"Disposing idle {entry.backend} engine")
+            await self._dispose(entry)
+
+    async def dispose_all(self) -> None:
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            await self._dispose(entry)
+
+    async def _dispose(self, entry: EngineEntry) -> None:
+        dispose = self._backends[entry.backend].dispose or (lambda engine: engine.dispose())
+        try:
+            result = dispose(entry.engine)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.warning(f"Failed to dispose {entry.backend} engine: {e}")
+
+def engine_settings(config: Dict[str, Any], database_type: str) -> Tuple[Dict[str, Any], bool]:
+    """An experiment's validated "engine" overrides and whether to pre-warm the pool (default: true)"""
+    overrides = engine_registry.validate(database_type, config.get("engine", {}))
+    prewarm = config.get("prewarm", True)
+    if not isinstance(prewarm, bool):
+        raise ConfigurationError("prewarm must be true or false")
+    return overrides, prewarm
+
+def sqlalchemy_sessions(engine):
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+async def prewarm_sqlalchemy_pool(engine, size: int) -> None:
+    """Hold size connections at once so the pool opens them, then return them all"""
+    connections = [await engine.connect() for _ in range(size)]
+    for connection in connections:
+        await connection.close()
+
+engine_registry = EngineRegistry()
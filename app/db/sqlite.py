@@ -0,0 +1,78 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+from app.core.config import settings
+from app.core.exceptions import ConfigurationError
+
+JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+SYNCHRONOUS_LEVELS = ("OFF", "NORMAL", "FULL", "EXTRA")
+DEFAULT_PRAGMAS = {"journal_mode": "WAL", "synchronous": "NORMAL", "page_size": 4096, "mmap_size": 0}
+
+def sqlite_pragmas(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validated storage settings from an experiment config's top-level
+    journal_mode, synchronous, page_size and mmap_size keys. They end up in
+    PRAGMA statements, which take no bind parameters, so only known values pass.
+    """
+    pragmas = {key: config.get(key, default) for key, default in DEFAULT_PRAGMAS.items()}
+    pragmas["journal_mode"] = str(pragmas["journal_mode"]).upper()
+    pragmas["synchronous"] = str(pragmas["synchronous"]).upper()
+    if pragmas["journal_mode"] not in JOURNAL_MODES:
+        raise ConfigurationError(f"journal_mode must be one of {', '.join(JOURNAL_MODES)}")
+    if pragmas["synchronous"] not in SYNCHRONOUS_LEVELS:
+        raise ConfigurationError(f"synchronous must be one of {', '.join(SYNCHRONOUS_LEVELS)}")
+    page_size = pragmas["page_size"]
+    if not isinstance(page_size, int) or not 512 <= page_size <= 65536 or page_size & (page_size - 1):
+        raise ConfigurationError("page_size must be a power of two between 512 and 65536")
+    if not isinstance(pragmas["mmap_size"], int) or pragmas["mmap_size"] < 0:
+        raise ConfigurationError("mmap_size must be a non-negative integer")
+    return pragmas
+
+def durability_label(pragmas: Dict[str, Any]) -> str:
+    """What a commit survives under these settings, per the SQLite documentation"""
+    journal_mode, synchronous = pragmas["journal_mode"], pragmas["synchronous"]
+    if journal_mode in ("OFF", "MEMORY"):
+        return "an application crash mid-transaction may corrupt the database"
+    if synchronous == "OFF":
+        return "an OS crash or power loss may corrupt the database"
+    if journal_mode == "WAL" and synchronous == "NORMAL":
+        return "power loss may roll back the last commits; no corruption"
+    if synchronous == "NORMAL":
+        return "power loss may corrupt the database on some filesystems"
+    return "durable on commit"
+
+def open_sqlite(path: Optional[str] = None, pragmas: Optional[Dict[str, Any]] = None) -> sqlite3.Connection:
+    path = path or settings.SQLITE_PATH
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Threads each open their own connection; the timeout covers waiting on another writer's lock
+    connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    pragmas = pragmas or DEFAULT_PRAGMAS
+    # page_size only takes effect before the first table is created, so it goes first
+    connection.execute(f"PRAGMA page_size = {int(pragmas['page_size'])}")
+    connection.execute(f"PRAGMA journal_mode = {pragmas['journal_mode']}")
+    connection.execute(f"PRAGMA synchronous = {pragmas['synchronous']}")
+    connection.execute(f"PRAGMA mmap_size = {int(pragmas['mmap_size'])}")
+    return connection
+
+@contextmanager
+def get_sqlite_connection(path: Optional[str] = None, pragmas: Optional[Dict[str, Any]] = None):
+    from app.core.exceptions import DatabaseConnectionError
+    try:
+        connection = open_sqlite(path, pragmas)
+    except sqlite3.Error as e:
+        raise DatabaseConnectionError(f"SQLite connection not available: {e}") from e
+    try:
+        yield connection
+    except sqlite3.Error as e:
+        raise DatabaseConnectionError(f"SQLite operation failed: {e}") from e
+    finally:
+        connection.close()
+
+def check_sqlite_health() -> bool:
+    try:
+        with get_sqlite_connection() as connection:
+            connection.execute("SELECT 1")
+        return True
+    except Exception:
+        return False
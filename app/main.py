@@ -1,5 +1,5 @@
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
@@ -7,6 +7,7 @@ from app.core.exceptions import (
     OptiStackException,
     DatabaseConnectionError,
     ExperimentNotFoundError,
+    BaselineNotFoundError,
     ExperimentExecutionError,
     InvalidDatabaseTypeError,
     BenchmarkError
@@ -14,6 +15,11 @@ from app.core.exceptions import (
 from app.core.logging import setup_logging
 from app.api.v1.router import api_router
 from app.db.base import init_db
+from app.db.registry import engine_registry
+from app.services.health_supervisor import health_supervisor
+from telemetry.metrics import HTTP_REQUEST_LATENCY, render_metrics
+from telemetry.tracing import setup_tracing, shutdown_tracing, start_span
+import time
 
 logger = setup_logging()
 
@@ -37,6 +43,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    with start_span(f"{request.method} {request.url.path}", {"http.method": request.method}) as span:
+        start = time.perf_counter()
+        response = await call_next(request)
+        elapsed = time.perf_counter() - start
+        # Label by route template, not raw path, so experiment ids don't explode cardinality
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        if span is not None:
+            span.update_name(f"{request.method} {path}")
+            span.set_attribute("http.route", path)
+            span.set_attribute("http.status_code", response.status_code)
+    if settings.METRICS_ENABLED:
+        HTTP_REQUEST_LATENCY.labels(request.method, path, str(response.status_code)).observe(elapsed)
+    return response
+
 @app.on_event("startup")
 async def startup_event():
     try:
@@ -44,13 +67,21 @@ async def startup_event():
         logger.info("Database initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
+    setup_tracing()
+    await health_supervisor.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await health_supervisor.stop()
+    await engine_registry.dispose_all()
+    shutdown_tracing()
 
 @app.exception_handler(OptiStackException)
 async def optistack_exception_handler(request: Request, exc: OptiStackException):
     logger.error(f"OptiStack exception: {exc}", exc_info=True)
     status_code = status.HTTP_400_BAD_REQUEST
     
-    if isinstance(exc, ExperimentNotFoundError):
+    if isinstance(exc, (ExperimentNotFoundError, BaselineNotFoundError)):
         status_code = status.HTTP_404_NOT_FOUND
     elif isinstance(exc, DatabaseConnectionError):
         status_code = status.HTTP_503_SERVICE_UNAVAILABLE
@@ -96,5 +127,10 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    snapshot = health_supervisor.snapshot()
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE if snapshot["status"] == "unhealthy" else status.HTTP_200_OK
+    return JSONResponse(status_code=status_code, content=snapshot)
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, String, Integer, DateTime, JSON, Index
+from datetime import datetime
+from app.models.experiment import Base
+
+class Baseline(Base):
+    __tablename__ = "baselines"
+    
+    name = Column(String, primary_key=True)
+    fingerprint = Column(String, nullable=False, unique=True, index=True)
+    database_type = Column(String, nullable=False)
+    config = Column(JSON)
+    history_size = Column(Integer, default=20)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class BaselineRun(Base):
+    __tablename__ = "baseline_runs"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    fingerprint = Column(String, nullable=False)
+    experiment_id = Column(String, nullable=False)
+    metrics = Column(JSON)
+    verdict = Column(JSON)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index("ix_baseline_runs_fingerprint_created_at", "fingerprint", "created_at"),
+    )
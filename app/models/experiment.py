@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, JSON
+from sqlalchemy import Column, String, Integer, Float, DateTime, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
@@ -14,4 +14,8 @@ class Experiment(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     config = Column(JSON)
     results = Column(JSON)
+    
+    __table_args__ = (
+        Index("ix_experiments_created_at_id", "created_at", "id"),
+    )
 
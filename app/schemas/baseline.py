@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+from typing import Optional, Dict, Any, List
+from datetime import datetime
+
+class BaselineCreate(BaseModel):
+    name: str
+    database_type: Optional[str] = None
+    config: Optional[Dict[str, Any]] = None
+    experiment_id: Optional[str] = None
+    history_size: int = 20
+
+class BaselineResponse(BaseModel):
+    name: str
+    fingerprint: str
+    database_type: str
+    config: Dict[str, Any]
+    history_size: int
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class BaselineRunResponse(BaseModel):
+    experiment_id: str
+    metrics: Dict[str, float]
+    verdict: Optional[Dict[str, Any]] = None
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class BaselineHistoryResponse(BaseModel):
+    baseline: BaselineResponse
+    runs: List[BaselineRunResponse]
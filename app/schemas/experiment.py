@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 class ExperimentCreate(BaseModel):
@@ -19,3 +19,21 @@ class ExperimentResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class ExperimentSummary(BaseModel):
+    id: str
+    name: str
+    database_type: str
+    status: str
+    created_at: datetime
+    config: Dict[str, Any]
+    
+    class Config:
+        from_attributes = True
+
+class ExperimentComparisonRequest(BaseModel):
+    experiment_ids: List[str] = Field(..., min_length=2)
+    bootstrap_iterations: int = Field(1000, ge=100, le=20000)
+    confidence: float = Field(0.95, gt=0.5, lt=1.0)
+    max_samples: int = Field(20000, ge=100)
+    min_effect: float = Field(0.02, ge=0.0)
+    seed: Optional[int] = None
@@ -0,0 +1,213 @@
+from typing import Optional, List, Dict, Any
+from sqlalchemy import select, delete
+from app.schemas.baseline import (
+    BaselineCreate,
+    BaselineResponse,
+    BaselineRunResponse,
+    BaselineHistoryResponse
+)
+from app.models.baseline import Baseline, BaselineRun
+from app.models.experiment import Experiment
+from app.db.postgres import get_postgres_async_session
+from app.core.exceptions import (
+    DatabaseConnectionError,
+    BaselineNotFoundError,
+    ExperimentNotFoundError,
+    ConfigurationError
+)
+from app.core.logging import logger
+from app.services.health_supervisor import health_supervisor
+from app.utils.statistics import detect_shift
+from app.services.trials import TRIAL_KEYS
+from datetime import datetime
+import hashlib
+import json
+
+# Config keys that change how a run is observed, not what workload it runs
+NON_WORKLOAD_KEYS = {"archive_samples", "resource_sampling", "calibrate", *TRIAL_KEYS}
+
+WORKLOAD_DEFAULTS = {
+    "rows": 1000,
+    "concurrent_users": 1,
+    "data_size": "small"
+}
+
+# metric name -> (path into performance_metrics, higher_is_better)
+TRACKED_METRICS = {
+    "ops_per_second": (("ops_per_second",), True),
+    "latency_p50_ms": (("latency_ms", "p50"), False),
+    "latency_p95_ms": (("latency_ms", "p95"), False),
+    "latency_p99_ms": (("latency_ms", "p99"), False)
+}
+
+def normalize_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    normalized = dict(WORKLOAD_DEFAULTS)
+    for key, value in (config or {}).items():
+        if key in NON_WORKLOAD_KEYS:
+            continue
+        if key == "operations" and isinstance(value, list):
+            value = sorted(value)
+        normalized[key] = value
+    return normalized
+
+def workload_fingerprint(database_type: str, config: Dict[str, Any]) -> str:
+    payload = json.dumps(
+        {"database_type": database_type.lower(), "config": normalize_config(config)},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+def extract_metrics(results: Dict[str, Any]) -> Dict[str, float]:
+    performance = (results or {}).get("performance_metrics", {})
+    metrics = {}
+    for name, (path, _) in TRACKED_METRICS.items():
+        value = performance
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        if isinstance(value, (int, float)):
+            metrics[name] = float(value)
+    return metrics
+
+class BaselineService:
+    async def _session(self):
+        await health_supervisor.ensure_available("postgres")
+        session = get_postgres_async_session()
+        if not session:
+            raise DatabaseConnectionError("Failed to create database session")
+        return session
+
+    async def pin_baseline(self, request: BaselineCreate) -> BaselineResponse:
+        session = await self._session()
+        try:
+            seed_experiment = None
+            if request.experiment_id:
+                result = await session.execute(select(Experiment).filter(Experiment.id == request.experiment_id))
+                seed_experiment = result.scalar_one_or_none()
+                if not seed_experiment:
+                    raise ExperimentNotFoundError(f"Experiment with id {request.experiment_id} not found")
+
+            database_type = (request.database_type or (seed_experiment.database_type if seed_experiment else "")).lower()
+            config = request.config if request.config is not None else (seed_experiment.config if seed_experiment else None)
+            if not database_type or config is None:
+                raise ConfigurationError("A baseline needs database_type and config, or an experiment_id")
+
+            fingerprint = workload_fingerprint(database_type, config)
+            existing = await session.execute(
+                select(Baseline).filter((Baseline.name == request.name) | (Baseline.fingerprint == fingerprint))
+            )
+            if existing.scalars().first():
+                raise ConfigurationError(f"A baseline named {request.name} or with the same workload already exists")
+
+            baseline = Baseline(
+                name=request.name,
+                fingerprint=fingerprint,
+                database_type=database_type,
+                config=normalize_config(config),
+                history_size=request.history_size,
+                created_at=datetime.utcnow()
+            )
+            session.add(baseline)
+            if seed_experiment and seed_experiment.status == "completed":
+                session.add(BaselineRun(
+                    fingerprint=fingerprint,
+                    experiment_id=seed_experiment.id,
+                    metrics=extract_metrics(seed_experiment.results),
+                    verdict=None,
+                    created_at=seed_experiment.created_at
+                ))
+            await session.commit()
+            logger.info(f"Pinned baseline {request.name} ({fingerprint}) for {database_type}")
+            return BaselineResponse.model_validate(baseline)
+        except (ExperimentNotFoundError, ConfigurationError):
+            await session.rollback()
+            raise
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Failed to pin baseline: {e}", exc_info=True)
+            raise DatabaseConnectionError(f"Failed to pin baseline: {e}")
+        finally:
+            await session.close()
+
+    async def list_baselines(self) -> List[BaselineResponse]:
+        session = await self._session()
+        try:
+            result = await session.execute(select(Baseline).order_by(Baseline.name))
+            return [BaselineResponse.model_validate(b) for b in result.scalars().all()]
+        finally:
+            await session.close()
+
+    async def get_history(self, name: str, limit: int = 100, verdict: Optional[str] = None) -> BaselineHistoryResponse:
+        session = await self._session()
+        try:
+            result = await session.execute(select(Baseline).filter(Baseline.name == name))
+            baseline = result.scalar_one_or_none()
+            if not baseline:
+                raise BaselineNotFoundError(f"Baseline {name} not found")
+            result = await session.execute(
+                select(BaselineRun)
+                .filter(BaselineRun.fingerprint == baseline.fingerprint)
+                .order_by(BaselineRun.created_at.desc())
+                .limit(limit)
+            )
+            runs = [BaselineRunResponse.model_validate(r) for r in result.scalars().all()]
+            if verdict:
+                runs = [r for r in runs if r.verdict and r.verdict.get("verdict") == verdict]
+            return BaselineHistoryResponse(baseline=BaselineResponse.model_validate(baseline), runs=runs)
+        finally:
+            await session.close()
+
+    async def check_run(self, session, experiment: Experiment) -> Optional[Dict[str, Any]]:
+        """
+        Compare a completed run with its pinned baseline's history, then append it.
+
+        Uses the caller's session so the verdict and the experiment results are
+        committed together. Returns None when no baseline matches the workload.
+        """
+        fingerprint = workload_fingerprint(experiment.database_type, experiment.config)
+        result = await session.execute(select(Baseline).filter(Baseline.fingerprint == fingerprint))
+        baseline = result.scalar_one_or_none()
+        if not baseline:
+            return None
+
+        result = await session.execute(
+            select(BaselineRun)
+            .filter(BaselineRun.fingerprint == fingerprint)
+            .order_by(BaselineRun.created_at.desc())
+            .limit(baseline.history_size)
+        )
+        history = list(reversed(result.scalars().all()))
+        metrics = extract_metrics(experiment.results)
+
+        checks = {}
+        for name, value in metrics.items():
+            _, higher_is_better = TRACKED_METRICS[name]
+            values = [run.metrics[name] for run in history if name in (run.metrics or {})]
+            checks[name] = detect_shift(values, value, higher_is_better)
+
+        verdicts = {check["verdict"] for check in checks.values()}
+        if "regression" in verdicts:
+            overall = "regression"
+        elif "improvement" in verdicts:
+            overall = "improvement"
+        elif verdicts == {"insufficient_history"}:
+            overall = "insufficient_history"
+        else:
+            overall = "ok"
+        verdict = {"baseline": baseline.name, "verdict": overall, "metrics": checks}
+
+        session.add(BaselineRun(
+            fingerprint=fingerprint,
+            experiment_id=experiment.id,
+            metrics=metrics,
+            verdict=verdict,
+            created_at=datetime.utcnow()
+        ))
+        # Keep only the rolling window (plus the run just added)
+        if len(history) >= baseline.history_size:
+            stale_ids = [run.id for run in history[:len(history) - baseline.history_size + 1]]
+            await session.execute(delete(BaselineRun).where(BaselineRun.id.in_(stale_ids)))
+
+        if overall == "regression":
+            logger.warning(f"Experiment {experiment.id} regressed against baseline {baseline.name}")
+        return verdict
@@ -0,0 +1,51 @@
+from typing import Dict, Any
+from app.core.exceptions import ConfigurationError
+from app.utils.performance_monitor import PerformanceMonitor
+from benchmarks.noop_benchmark import NoopBenchmark
+import time
+
+DEFAULT_CALIBRATION_OPERATIONS = 10000
+
+def calibration_settings(config: Dict[str, Any]) -> Dict[str, Any]:
+    """"calibrate": true, or {"operations": N} to size the pass"""
+    raw = config.get("calibrate")
+    options = raw if isinstance(raw, dict) else {}
+    if not isinstance(raw, (bool, dict)):
+        raise ConfigurationError("calibrate must be true or an object")
+    operations = options.get("operations", DEFAULT_CALIBRATION_OPERATIONS)
+    if not isinstance(operations, int) or operations < 1:
+        raise ConfigurationError("calibrate.operations must be a positive integer")
+    return {"operations": operations, "concurrent_users": config.get("concurrent_users", 1)}
+
+async def run_calibration(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Harness overhead floor for an experiment's settings.
+
+    Runs the noop backend through the full benchmark/monitor path at the
+    experiment's concurrency, on its own monitor so the experiment's
+    numbers are untouched.
+    """
+    options = calibration_settings(config)
+    monitor = PerformanceMonitor()
+    benchmark = NoopBenchmark()
+    benchmark.set_monitor(monitor)
+    started = time.perf_counter()
+    await benchmark.run({"rows": options["operations"], "concurrent_users": options["concurrent_users"], "operations": ["select"]})
+    duration = time.perf_counter() - started
+    window = monitor.get_window_results(0, monitor.query_count(), duration)
+    return {
+        "operations": window["total_queries"],
+        "concurrent_users": options["concurrent_users"],
+        "harness_ops_per_second": window["ops_per_second"],
+        "harness_latency_ms": window["latency_ms"]
+    }
+
+def calibration_report(calibration: Dict[str, Any], performance_metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """The calibration pass plus the share of each measured latency statistic that is harness overhead"""
+    measured = performance_metrics.get("latency_ms", {})
+    harness = calibration["harness_latency_ms"]
+    share = {
+        key: round(harness[key] / measured[key], 4) if measured.get(key) else None
+        for key in ("avg", "p50", "p99")
+    }
+    return {**calibration, "share_of_measured_latency": share}
@@ -0,0 +1,131 @@
+from typing import Dict, Any, Optional, Tuple
+import numpy as np
+from app.utils.statistics import (
+    mann_whitney_u,
+    bootstrap_differences,
+    classify_change,
+    sorted_quantile,
+    subsample
+)
+
+# Statistics over rows of sorted resamples (seconds in, milliseconds out)
+LATENCY_STATISTICS = {
+    "latency_avg_ms": lambda x: np.mean(x, axis=1) * 1000,
+    "latency_p50_ms": lambda x: sorted_quantile(x, 0.50) * 1000,
+    "latency_p95_ms": lambda x: sorted_quantile(x, 0.95) * 1000,
+    "latency_p99_ms": lambda x: sorted_quantile(x, 0.99) * 1000
+}
+
+def _inter_arrival_gaps(timestamps: np.ndarray) -> np.ndarray:
+    if len(timestamps) < 2:
+        return np.zeros(1)
+    return np.diff(np.sort(timestamps))
+
+def _ops_per_second(gaps: np.ndarray) -> np.ndarray:
+    # Completions over the span they cover; unlike whole-second bins this holds for sub-second runs
+    mean_gap = np.mean(gaps, axis=1)
+    return np.divide(1.0, mean_gap, out=np.zeros_like(mean_gap), where=mean_gap > 0)
+
+def _metric_entry(
+    interval: Dict[str, float],
+    higher_is_better: bool,
+    p_value: Optional[float],
+    alpha: float,
+    min_effect: float
+) -> Dict[str, Any]:
+    baseline_value = interval["baseline"]
+    return {
+        "baseline": round(baseline_value, 4),
+        "candidate": round(interval["candidate"], 4),
+        "difference": round(interval["difference"], 4),
+        "ci_low": round(interval["ci_low"], 4),
+        "ci_high": round(interval["ci_high"], 4),
+        "relative_change": round(interval["difference"] / baseline_value, 4) if baseline_value else None,
+        "verdict": classify_change(
+            baseline_value,
+            interval["difference"],
+            interval["ci_low"],
+            interval["ci_high"],
+            higher_is_better=higher_is_better,
+            p_value=p_value,
+            alpha=alpha,
+            min_effect=min_effect
+        )
+    }
+
+def compare_operation_samples(
+    baseline: Tuple[np.ndarray, np.ndarray],
+    candidate: Tuple[np.ndarray, np.ndarray],
+    iterations: int = 1000,
+    confidence: float = 0.95,
+    max_samples: int = 20000,
+    min_effect: float = 0.02,
+    seed: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Compare one operation's raw samples between two runs.
+
+    Latency statistics get bootstrap CIs on the difference and share one
+    Mann-Whitney p-value for the distribution shift; throughput is compared
+    as the completion rate, bootstrapped over gaps between completions. Samples beyond max_samples are
+    uniformly subsampled so millions of samples stay interactive.
+    """
+    rng = np.random.default_rng(seed)
+    alpha = 1 - confidence
+    base_latency = subsample(baseline[1], max_samples, rng)
+    cand_latency = subsample(candidate[1], max_samples, rng)
+    _, p_value = mann_whitney_u(base_latency, cand_latency)
+
+    intervals = bootstrap_differences(
+        base_latency, cand_latency, LATENCY_STATISTICS,
+        iterations=iterations, confidence=confidence, rng=rng
+    )
+    metrics = {
+        name: _metric_entry(interval, higher_is_better=False, p_value=p_value, alpha=alpha, min_effect=min_effect)
+        for name, interval in intervals.items()
+    }
+
+    throughput = bootstrap_differences(
+        subsample(_inter_arrival_gaps(baseline[0]), max_samples, rng),
+        subsample(_inter_arrival_gaps(candidate[0]), max_samples, rng),
+        {"ops_per_second": _ops_per_second},
+        iterations=iterations, confidence=confidence, rng=rng
+    )
+    metrics["ops_per_second"] = _metric_entry(
+        throughput["ops_per_second"], higher_is_better=True, p_value=None, alpha=alpha, min_effect=min_effect
+    )
+
+    return {
+        "samples": {"baseline": int(len(baseline[1])), "candidate": int(len(candidate[1]))},
+        "mann_whitney_p": round(p_value, 6),
+        "metrics": metrics
+    }
+
+def compare_summary_results(baseline: Dict[str, Any], candidate: Dict[str, Any]) -> Dict[str, Any]:
+    """Fallback for runs without a sample archive: point differences of per-operation averages only"""
+    operations = {}
+    for operation, base_result in baseline.items():
+        cand_result = candidate.get(operation)
+        if not isinstance(base_result, dict) or not isinstance(cand_result, dict):
+            continue
+        metrics = {}
+        for key, value in base_result.items():
+            other = cand_result.get(key)
+            if isinstance(value, (int, float)) and isinstance(other, (int, float)) and not isinstance(value, bool):
+                metrics[key] = {
+                    "baseline": value,
+                    "candidate": other,
+                    "difference": round(other - value, 6),
+                    "relative_change": round((other - value) / value, 4) if value else None,
+                    "verdict": "inconclusive"
+                }
+        if metrics:
+            operations[operation] = {"metrics": metrics}
+    return operations
+
+def summarize_verdicts(operations: Dict[str, Any]) -> Dict[str, int]:
+    summary: Dict[str, int] = {"improvement": 0, "regression": 0, "noise": 0, "inconclusive": 0}
+    for result in operations.values():
+        for metric in result["metrics"].values():
+            summary[metric["verdict"]] += 1
+    return summary
@@ -0,0 +1,35 @@
+from typing import Dict, Any, Awaitable, Optional, TypeVar
+from app.core.config import config_section
+from app.core.exceptions import ConfigurationError, ExperimentTimeoutError
+import asyncio
+
+T = TypeVar("T")
+
+def experiment_timeout(config: Dict[str, Any]) -> Optional[float]:
+    """An experiment's own timeout_seconds, else experiments.timeout_seconds from conf/config.yaml"""
+    timeout = config.get("timeout_seconds", config_section("experiments").get("timeout_seconds"))
+    if timeout is None:
+        return None
+    if not isinstance(timeout, (int, float)) or isinstance(timeout, bool) or timeout <= 0:
+        raise ConfigurationError("timeout_seconds must be a positive number")
+    return float(timeout)
+
+async def run_with_timeout(benchmark, work: Awaitable[T], timeout: Optional[float]) -> T:
+    """
+    Await the benchmark's work, cancelling it cleanly once timeout elapses.
+
+    Cancellation first tells the benchmark's sample loops to stop (loops in
+    worker threads do not see asyncio cancellation), then cancels the task
+    and waits for it to unwind, so its teardown runs before this raises
+    ExperimentTimeoutError.
+    """
+    task = asyncio.ensure_future(work)
+    try:
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+    except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+        benchmark.cancel()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        if isinstance(e, asyncio.CancelledError):
+            raise
+        raise ExperimentTimeoutError(f"Experiment exceeded its {timeout:g}s timeout") from e
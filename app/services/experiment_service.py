@@ -1,16 +1,51 @@
-from typing import Optional, List
-from app.schemas.experiment import ExperimentCreate, ExperimentResponse
+from typing import Optional, List, Tuple, Dict, Any, AsyncIterator
+from sqlalchemy import and_, or_
+from sqlalchemy.orm.attributes import flag_modified
+from app.schemas.experiment import (
+    ExperimentCreate,
+    ExperimentResponse,
+    ExperimentSummary,
+    ExperimentComparisonRequest
+)
 from app.models.experiment import Experiment
-from app.db.postgres import get_postgres_async_session, check_postgres_health
+from app.db.postgres import get_postgres_async_session
+from app.db.registry import engine_registry, engine_settings
 from app.core.exceptions import (
     DatabaseConnectionError,
     ExperimentNotFoundError,
     ExperimentExecutionError,
     InvalidDatabaseTypeError,
-    BenchmarkError
+    BenchmarkError,
+    ConfigurationError,
+    ExperimentTimeoutError
 )
 from app.core.logging import logger
 from app.utils.performance_monitor import PerformanceMonitor
+from app.utils.system_sampler import resource_sampling_settings
+from telemetry.metrics import ACTIVE_EXPERIMENTS
+from telemetry.breakdown import breakdown_enabled, measure_round_trip
+from telemetry.tracing import start_span
+from app.utils.helpers import encode_cursor, decode_cursor
+from app.utils.sample_archive import (
+    write_sample_archive,
+    read_samples,
+    downsample_samples,
+    load_operation_samples,
+    load_archive_meta
+)
+from app.services.comparison import (
+    compare_operation_samples,
+    compare_summary_results,
+    summarize_verdicts
+)
+from app.services.health_supervisor import health_supervisor
+from app.services.baseline_service import BaselineService
+from app.services.live_metrics import live_metrics_hub
+from app.services.trials import run_trials, uses_trials
+from app.services.calibration import calibration_settings, run_calibration, calibration_report
+from app.services.execution_timeout import experiment_timeout, run_with_timeout
+from app.services.sweep import init_sweep_progress, run_sweep, expand_sweep, sweep_table, table_to_csv
+from app.services.pool_tuning import pool_tuning_settings, run_pool_tuning
 from benchmarks.postgres_benchmark import PostgresBenchmark
 from benchmarks.mysql_benchmark import MySQLBenchmark
 from benchmarks.cockroachdb_benchmark import CockroachDBBenchmark
@@ -19,6 +54,18 @@ from benchmarks.redis_benchmark import RedisBenchmark
 from benchmarks.cassandra_benchmark import CassandraBenchmark
 from benchmarks.influxdb_benchmark import InfluxDBBenchmark
 from benchmarks.elasticsearch_benchmark import ElasticsearchBenchmark
+from benchmarks.noop_benchmark import NoopBenchmark
+from benchmarks.memory_benchmark import MemoryBenchmark
+from benchmarks.sqlite_benchmark import SQLiteBenchmark
+from benchmarks.workload import WorkloadBenchmark, WorkloadSpec
+from benchmarks.replay import ReplayBenchmark, replay_settings
+from benchmarks.encoding import payload_encoding
+from benchmarks.sampling import sampling_settings
+from benchmarks.warmup import warmup_settings
+from app.utils.dataset_cache import data_seed
+from contextlib import AsyncExitStack
+import asyncio
+import time
 import uuid
 from datetime import datetime
 
@@ -32,18 +79,57 @@ class ExperimentService:
             "redis": RedisBenchmark,
             "cassandra": CassandraBenchmark,
             "influxdb": InfluxDBBenchmark,
-            "elasticsearch": ElasticsearchBenchmark
+            "elasticsearch": ElasticsearchBenchmark,
+            "noop": NoopBenchmark,
+            "memory": MemoryBenchmark,
+            "sqlite": SQLiteBenchmark
         }
     
     async def create_experiment(self, experiment: ExperimentCreate) -> ExperimentResponse:
-        if not await check_postgres_health():
-            raise DatabaseConnectionError("PostgreSQL connection not available")
+        await health_supervisor.ensure_available("postgres")
         
         if experiment.database_type.lower() not in self.benchmark_classes:
             raise InvalidDatabaseTypeError(
                 f"Unsupported database type: {experiment.database_type}. "
                 f"Supported types: {', '.join(self.benchmark_classes.keys())}"
             )
+        health_supervisor.check_circuit(experiment.database_type.lower())
+        if experiment.config.get("sweep"):
+            expand_sweep(experiment.config, self.benchmark_classes[experiment.database_type.lower()].dataset_parameters)
+        if "workload" in experiment.config:
+            WorkloadSpec.from_config(experiment.config)
+        resource_sampling_settings(experiment.config, experiment.database_type.lower())
+        if experiment.config.get("calibrate"):
+            calibration_settings(experiment.config)
+        sampling_settings(experiment.config)
+        if "workload" in experiment.config:
+            warmup_settings(experiment.config, WorkloadBenchmark.load_operations)
+        elif "replay" in experiment.config:
+            warmup_settings(experiment.config, ReplayBenchmark.load_operations)
+        else:
+            warmup_settings(experiment.config, self.benchmark_classes[experiment.database_type.lower()].load_operations)
+        experiment_timeout(experiment.config)
+        data_seed(experiment.config)
+        breakdown_enabled(
+            experiment.config,
+            self.benchmark_classes[experiment.database_type.lower()].latency_breakdown_supported,
+            experiment.database_type.lower()
+        )
+        payload_encoding(
+            experiment.config,
+            self.benchmark_classes[experiment.database_type.lower()].payload_encodings,
+            experiment.database_type.lower()
+        )
+        pool_tuning_settings(
+            experiment.config,
+            self.benchmark_classes[experiment.database_type.lower()].pool_tuning_supported,
+            experiment.database_type.lower()
+        )
+        engine_settings(experiment.config, experiment.database_type.lower())
+        if "replay" in experiment.config:
+            if not self.benchmark_classes[experiment.database_type.lower()].replay_command:
+                raise ConfigurationError(f"{experiment.database_type} does not support trace replay")
+            replay_settings(experiment.config)
         
         experiment_id = str(uuid.uuid4())
         session = get_postgres_async_session()
@@ -83,8 +169,7 @@ class ExperimentService:
             await session.close()
     
     async def get_experiment(self, experiment_id: str) -> Optional[ExperimentResponse]:
-        if not await check_postgres_health():
-            raise DatabaseConnectionError("PostgreSQL connection not available")
+        await health_supervisor.ensure_available("postgres")
         
         session = get_postgres_async_session()
         if not session:
@@ -112,39 +197,107 @@ class ExperimentService:
         finally:
             await session.close()
     
-    async def list_experiments(self) -> List[ExperimentResponse]:
-        if not await check_postgres_health():
-            raise DatabaseConnectionError("PostgreSQL connection not available")
+    def _summary_query(self, database_type: Optional[str] = None, status: Optional[str] = None):
+        from sqlalchemy import select
+        query = select(
+            Experiment.id,
+            Experiment.name,
+            Experiment.database_type,
+            Experiment.status,
+            Experiment.created_at,
+            Experiment.config
+        )
+        if database_type:
+            query = query.where(Experiment.database_type == database_type.lower())
+        if status:
+            query = query.where(Experiment.status == status)
+        return query.order_by(Experiment.created_at.desc(), Experiment.id.desc())
+    
+    async def list_experiments(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        database_type: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> Tuple[List[ExperimentSummary], Optional[str]]:
+        """
+        Return one page of experiment summaries, newest first, and the cursor for the next page.
+        
+        Keyset pagination on (created_at, id) keeps every page an index range scan,
+        and the summary projection never reads the results column.
+        """
+        await health_supervisor.ensure_available("postgres")
+        
+        query = self._summary_query(database_type, status)
+        if cursor:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+            query = query.where(
+                or_(
+                    Experiment.created_at < cursor_created_at,
+                    and_(Experiment.created_at == cursor_created_at, Experiment.id < cursor_id)
+                )
+            )
         
         session = get_postgres_async_session()
         if not session:
             raise DatabaseConnectionError("Failed to create database session")
         
         try:
-            from sqlalchemy import select
-            result = await session.execute(select(Experiment))
-            experiments = result.scalars().all()
-            return [
-                ExperimentResponse(
-                    id=exp.id,
-                    name=exp.name,
-                    database_type=exp.database_type,
-                    status=exp.status,
-                    created_at=exp.created_at,
-                    config=exp.config,
-                    results=exp.results
-                )
-                for exp in experiments
-            ]
+            result = await session.execute(query.limit(limit + 1))
+            rows = result.all()
+            items = [ExperimentSummary.model_validate(row) for row in rows[:limit]]
+            next_cursor = None
+            if len(rows) > limit:
+                last = items[-1]
+                next_cursor = encode_cursor(last.created_at, last.id)
+            return items, next_cursor
         except Exception as e:
             logger.error(f"Failed to list experiments: {e}", exc_info=True)
             raise DatabaseConnectionError(f"Failed to list experiments: {e}")
         finally:
             await session.close()
     
+    async def stream_experiments(
+        self,
+        database_type: Optional[str] = None,
+        status: Optional[str] = None,
+        include_results: bool = False,
+        batch_size: int = 500
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Open a server-side cursor over experiments and return an iterator of row dicts.
+        
+        Rows are fetched batch_size at a time, so exporting the full history never
+        buffers it in memory. Connection errors surface here, before streaming starts.
+        """
+        await health_supervisor.ensure_available("postgres")
+        
+        query = self._summary_query(database_type, status)
+        if include_results:
+            query = query.add_columns(Experiment.results)
+        
+        session = get_postgres_async_session()
+        if not session:
+            raise DatabaseConnectionError("Failed to create database session")
+        
+        try:
+            result = await session.stream(query.execution_options(yield_per=batch_size))
+        except Exception as e:
+            await session.close()
+            logger.error(f"Failed to export experiments: {e}", exc_info=True)
+            raise DatabaseConnectionError(f"Failed to export experiments: {e}")
+        
+        async def rows():
+            try:
+                async for row in result:
+                    yield dict(row._mapping)
+            finally:
+                await session.close()
+        
+        return rows()
+    
     async def execute_experiment(self, experiment_id: str) -> ExperimentResponse:
-        if not await check_postgres_health():
-            raise DatabaseConnectionError("PostgreSQL connection not available")
+        await health_supervisor.ensure_available("postgres")
         
         session = get_postgres_async_session()
         if not session:
@@ -165,6 +318,7 @@ class ExperimentService:
                 raise InvalidDatabaseTypeError(
                     f"Unsupported database type: {experiment.database_type}"
                 )
+            await health_supervisor.ensure_available(experiment.database_type.lower())
             
             experiment.status = "running"
             await session.commit()
@@ -172,14 +326,99 @@ class ExperimentService:
             logger.info(f"Starting experiment {experiment_id} for database {experiment.database_type}")
             
             monitor = PerformanceMonitor()
+            if experiment.config.get("archive_samples"):
+                monitor.enable_sample_capture()
+            monitor.configure_resource_sampling(
+                **resource_sampling_settings(experiment.config, experiment.database_type.lower())
+            )
             benchmark = benchmark_class()
+            benchmark.configure_sampling(sampling_settings(experiment.config))
+            benchmark.data_seed = data_seed(experiment.config)
+            benchmark.configure_breakdown(breakdown_enabled(
+                experiment.config, benchmark.latency_breakdown_supported, experiment.database_type.lower()
+            ))
+            benchmark.payload_encoding = payload_encoding(
+                experiment.config, benchmark.payload_encodings, experiment.database_type.lower()
+            )
+            pool_tuning = pool_tuning_settings(
+                experiment.config, benchmark.pool_tuning_supported, experiment.database_type.lower()
+            )
+            engine_overrides, prewarm = engine_settings(experiment.config, experiment.database_type.lower())
+            if "workload" in experiment.config:
+                benchmark = WorkloadBenchmark(benchmark)
+            elif "replay" in experiment.config:
+                benchmark = ReplayBenchmark(benchmark)
+            benchmark.configure_warmup(warmup_settings(experiment.config, benchmark.load_operations))
             benchmark.set_monitor(monitor)
             
+            sweep_progress = None
+            experiment_resources = AsyncExitStack()
+            ACTIVE_EXPERIMENTS.inc()
             try:
+                # Routes this experiment's connections to the engine for its own options
+                engine_entry = await experiment_resources.enter_async_context(
+                    engine_registry.lease(experiment.database_type.lower(), engine_overrides)
+                )
+                span_attributes = {"experiment.id": experiment_id, "db.system": experiment.database_type.lower()}
+                calibration = None
+                if experiment.config.get("calibrate"):
+                    # Before the experiment's monitor starts, so the pass adds nothing to its duration
+                    with start_span("experiment.calibrate", span_attributes):
+                        calibration = await run_calibration(experiment.config)
+                engine_report = None
+                if engine_entry is not None:
+                    engine_report = {"options": engine_entry.options}
+                    if prewarm and not pool_tuning:
+                        # Before timing starts, so no timed operation pays for opening a connection
+                        engine_report["prewarm"] = await engine_registry.prewarm(experiment.database_type.lower())
+                if benchmark.breakdown is not None:
+                    # Before timing starts; splits each statement's execution into network and server time
+                    benchmark.breakdown.round_trip = await measure_round_trip(benchmark.wl_connect)
                 monitor.start_experiment()
-                await benchmark.setup(experiment.config)
-                benchmark_results = await benchmark.run(experiment.config)
-                await benchmark.teardown()
+                live_metrics_hub.register(experiment_id, monitor)
+                extra_results: Dict[str, Any] = {}
+                
+                async def run_benchmark() -> Tuple[Dict[str, Any], float]:
+                    nonlocal sweep_progress
+                    with start_span("experiment.execute", span_attributes):
+                        if experiment.config.get("sweep"):
+                            sweep_progress = init_sweep_progress(
+                                experiment.config, (experiment.results or {}).get("sweep"), benchmark.dataset_parameters
+                            )
+                            
+                            async def checkpoint():
+                                experiment.results = {"sweep": sweep_progress}
+                                flag_modified(experiment, "results")
+                                await session.commit()
+                            
+                            run_started = time.perf_counter()
+                            sweep_results = await run_sweep(benchmark, experiment.config, monitor, sweep_progress, checkpoint)
+                            extra_results["sweep"] = {**sweep_progress, "table": sweep_results["table"]}
+                            return sweep_results["benchmark_results"], time.perf_counter() - run_started
+                        if pool_tuning:
+                            run_started = time.perf_counter()
+                            tuning_results = await run_pool_tuning(benchmark, pool_tuning)
+                            extra_results["pool_tuning"] = tuning_results["pool_tuning"]
+                            return tuning_results["benchmark_results"], time.perf_counter() - run_started
+                        if uses_trials(experiment.config):
+                            run_started = time.perf_counter()
+                            trial_results = await run_trials(benchmark, experiment.config, monitor)
+                            extra_results["trials"] = trial_results["trials"]
+                            return trial_results["benchmark_results"], time.perf_counter() - run_started
+                        with start_span("experiment.setup", span_attributes):
+                            await benchmark.setup(experiment.config)
+                        try:
+                            run_started = time.perf_counter()
+                            with start_span("experiment.run", span_attributes):
+                                results = await benchmark.run_phases(experiment.config)
+                            return results, time.perf_counter() - run_started
+                        finally:
+                            with start_span("experiment.teardown", span_attributes):
+                                await benchmark.teardown()
+                
+                benchmark_results, run_seconds = await run_with_timeout(
+                    benchmark, run_benchmark(), experiment_timeout(experiment.config)
+                )
                 monitor.stop_experiment()
                 
                 performance_metrics = monitor.get_results()
@@ -189,18 +428,66 @@ class ExperimentService:
                     "benchmark_results": benchmark_results,
                     "performance_metrics": performance_metrics
                 }
+                experiment.results.update(extra_results)
+                if benchmark.phase_samples and "sweep" not in extra_results:
+                    experiment.results["sampling"] = benchmark.phase_samples
+                if benchmark.warmup_report:
+                    experiment.results["warmup"] = benchmark.warmup_report
+                if benchmark.breakdown is not None:
+                    experiment.results["latency_breakdown"] = benchmark.breakdown.report()
+                if engine_report:
+                    experiment.results["engine"] = engine_report
+                if benchmark.dataset_lookups["hits"] or benchmark.dataset_lookups["misses"]:
+                    experiment.results["dataset_cache"] = dict(benchmark.dataset_lookups)
+                if calibration:
+                    experiment.results["calibration"] = calibration_report(calibration, performance_metrics)
+                experiment.results["resource_samples"] = list(monitor.system_sampler.samples)
+                experiment.results["client_bound"] = performance_metrics["client"]["client_bound"]
+                if experiment.results["client_bound"]:
+                    logger.warning(
+                        f"Experiment {experiment_id} is client-bound: {'; '.join(performance_metrics['client']['reasons'])}"
+                    )
+                if benchmark.tracer:
+                    experiment.results["tracing"] = benchmark.tracer.report(run_seconds)
+                if monitor.capture_samples:
+                    experiment.results["sample_archive"] = await asyncio.to_thread(
+                        write_sample_archive, experiment_id, monitor.get_samples()
+                    )
+                try:
+                    regression_check = await BaselineService().check_run(session, experiment)
+                    if regression_check:
+                        experiment.results["regression_check"] = regression_check
+                except Exception as e:
+                    logger.warning(f"Baseline check failed for experiment {experiment_id}: {e}")
                 await session.commit()
                 await session.refresh(experiment)
                 logger.info(f"Experiment {experiment_id} completed successfully")
             except Exception as e:
+                if isinstance(e, DatabaseConnectionError):
+                    health_supervisor.record_failure(experiment.database_type.lower(), str(e))
                 experiment.status = "failed"
                 experiment.results = {
                     "error": str(e),
                     "error_type": type(e).__name__
                 }
+                if sweep_progress:
+                    # Keep completed points so re-running the experiment resumes the sweep
+                    experiment.results["sweep"] = sweep_progress
+                if isinstance(e, ExperimentTimeoutError):
+                    # Report what ran before the timeout
+                    if monitor.sampling_active:
+                        monitor.stop_experiment()
+                    experiment.results["performance_metrics"] = monitor.get_results()
+                    experiment.results["sampling"] = benchmark.phase_samples
                 await session.commit()
                 logger.error(f"Experiment {experiment_id} failed: {e}", exc_info=True)
                 raise BenchmarkError(f"Benchmark execution failed: {e}") from e
+            finally:
+                ACTIVE_EXPERIMENTS.dec()
+                if monitor.sampling_active:
+                    monitor.stop_experiment()
+                await live_metrics_hub.unregister(experiment_id)
+                await experiment_resources.aclose()
             
             return ExperimentResponse(
                 id=experiment.id,
@@ -211,11 +498,118 @@ class ExperimentService:
                 config=experiment.config,
                 results=experiment.results
             )
-        except (ExperimentNotFoundError, ExperimentExecutionError, InvalidDatabaseTypeError, BenchmarkError):
+        except (ExperimentNotFoundError, ExperimentExecutionError, InvalidDatabaseTypeError, BenchmarkError, DatabaseConnectionError):
             raise
         except Exception as e:
             logger.error(f"Unexpected error executing experiment {experiment_id}: {e}", exc_info=True)
             raise ExperimentExecutionError(f"Failed to execute experiment: {e}")
         finally:
             await session.close()
-
+    
+    async def get_sweep_table(self, experiment_id: str, format: str = "json") -> Any:
+        experiment = await self.get_experiment(experiment_id)
+        if not experiment:
+            raise ExperimentNotFoundError(f"Experiment with id {experiment_id} not found")
+        progress = (experiment.results or {}).get("sweep")
+        if not progress:
+            raise ExperimentNotFoundError(f"Experiment {experiment_id} has no sweep results")
+        table = sweep_table(progress)
+        if format == "csv":
+            return table_to_csv(table)
+        return {"total": progress["total"], "completed": progress["completed"], **table}
+    
+    async def get_samples(
+        self,
+        experiment_id: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        operation: Optional[str] = None,
+        limit: int = 10000
+    ) -> Dict[str, Any]:
+        return await asyncio.to_thread(read_samples, experiment_id, start, end, operation, limit)
+    
+    async def get_downsampled_samples(
+        self,
+        experiment_id: str,
+        bucket_seconds: float = 1.0,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        operation: Optional[str] = None,
+        percentiles: Tuple[float, ...] = (50, 95, 99)
+    ) -> Dict[str, Any]:
+        return await asyncio.to_thread(
+            downsample_samples, experiment_id, bucket_seconds, start, end, operation, percentiles
+        )
+    
+    async def compare_experiments(self, request: ExperimentComparisonRequest) -> Dict[str, Any]:
+        """
+        Compare each experiment against the first one, operation by operation.
+        
+        Runs with a sample archive get bootstrap CIs and a Mann-Whitney test;
+        otherwise only point differences of the stored summaries are reported.
+        """
+        experiments = []
+        for experiment_id in request.experiment_ids:
+            experiment = await self.get_experiment(experiment_id)
+            if not experiment:
+                raise ExperimentNotFoundError(f"Experiment with id {experiment_id} not found")
+            if experiment.status != "completed":
+                raise ExperimentExecutionError(f"Experiment {experiment_id} has not completed")
+            experiments.append(experiment)
+        
+        def _load(experiment: ExperimentResponse):
+            if "sample_archive" not in (experiment.results or {}):
+                return None
+            try:
+                load_archive_meta(experiment.id)
+            except ExperimentNotFoundError:
+                return None
+            return load_operation_samples(experiment.id)
+        
+        def _compare():
+            baseline = experiments[0]
+            baseline_samples = _load(baseline)
+            comparisons = []
+            for candidate in experiments[1:]:
+                candidate_samples = _load(candidate)
+                if baseline_samples is not None and candidate_samples is not None:
+                    operations = {
+                        operation: compare_operation_samples(
+                            baseline_samples[operation],
+                            candidate_samples[operation],
+                            iterations=request.bootstrap_iterations,
+                            confidence=request.confidence,
+                            max_samples=request.max_samples,
+                            min_effect=request.min_effect,
+                            seed=request.seed
+                        )
+                        for operation in baseline_samples
+                        if operation in candidate_samples
+                    }
+                    method = "bootstrap"
+                else:
+                    operations = compare_summary_results(
+                        baseline.results.get("benchmark_results", {}),
+                        candidate.results.get("benchmark_results", {})
+                    )
+                    method = "summary"
+                comparisons.append({
+                    "experiment_id": candidate.id,
+                    "name": candidate.name,
+                    "method": method,
+                    "operations": operations,
+                    "summary": summarize_verdicts(operations)
+                })
+            return {
+                "baseline_id": baseline.id,
+                "confidence": request.confidence,
+                "comparisons": comparisons
+            }
+        
+        return await asyncio.to_thread(_compare)
+    
+    def subscribe_live_metrics(self, experiment_id: str):
+        return live_metrics_hub.subscribe(experiment_id)
+    
+    def unsubscribe_live_metrics(self, experiment_id: str, queue):
+        live_metrics_hub.unsubscribe(experiment_id, queue)
@@ -0,0 +1,213 @@
+from typing import Dict, Any, Optional, Callable, Tuple
+from app.core.config import settings, config_section
+from app.core.exceptions import DatabaseConnectionError
+from app.core.logging import logger
+from app.db.postgres import check_postgres_health
+from app.db.mysql import check_mysql_health
+from app.db.cockroachdb import check_cockroachdb_health
+from app.db.mongodb import check_mongodb_health
+from app.db.redis import check_redis_health
+from app.db.cassandra import check_cassandra_health
+from app.db.influxdb import check_influxdb_health
+from app.db.elasticsearch import check_elasticsearch_health
+import asyncio
+import inspect
+import time
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+def _backend_probes() -> Dict[str, Tuple[Callable[[], bool], Callable]]:
+    return {
+        "postgres": (lambda: bool(settings.POSTGRES_HOST), check_postgres_health),
+        "mysql": (lambda: bool(settings.MYSQL_HOST), check_mysql_health),
+        "cockroachdb": (lambda: bool(settings.COCKROACHDB_HOST), check_cockroachdb_health),
+        "mongodb": (lambda: bool(settings.MONGODB_URL), check_mongodb_health),
+        "redis": (lambda: bool(settings.REDIS_URL), check_redis_health),
+        "cassandra": (lambda: bool(settings.CASSANDRA_HOST), check_cassandra_health),
+        "influxdb": (lambda: bool(settings.INFLUXDB_URL), check_influxdb_health),
+        "elasticsearch": (lambda: bool(settings.ELASTICSEARCH_URL), check_elasticsearch_health)
+    }
+
+class BackendStatus:
+    def __init__(self, name: str):
+        self.name = name
+        self.healthy: Optional[bool] = None
+        self.checked_at: Optional[float] = None
+        self.latency_ms: Optional[float] = None
+        self.error: Optional[str] = None
+        self.consecutive_failures = 0
+        self.circuit = CIRCUIT_CLOSED
+        self.opened_at: Optional[float] = None
+
+    def to_dict(self, now: float, ttl: float) -> Dict[str, Any]:
+        return {
+            "healthy": self.healthy,
+            "circuit": self.circuit,
+            "consecutive_failures": self.consecutive_failures,
+            "latency_ms": self.latency_ms,
+            "age_seconds": round(now - self.checked_at, 3) if self.checked_at else None,
+            "stale": self.checked_at is None or now - self.checked_at > ttl,
+            "error": self.error
+        }
+
+class HealthSupervisor:
+    """
+    Probes every configured backend in the background and caches the result.
+
+    Request paths read the cache instead of issuing their own health queries.
+    A backend that fails failure_threshold probes (or operations) in a row has
+    its circuit opened, so callers fail fast until a probe succeeds again;
+    after reset_timeout_seconds the circuit goes half-open and lets one
+    request through as a trial.
+    """
+
+    def __init__(self):
+        config = config_section("health")
+        self.interval = config.get("probe_interval_seconds", 10)
+        self.ttl = config.get("ttl_seconds", 30)
+        self.probe_timeout = config.get("probe_timeout_seconds", 5)
+        self.failure_threshold = config.get("failure_threshold", 3)
+        self.reset_timeout = config.get("reset_timeout_seconds", 30)
+        self.probes = _backend_probes()
+        self.statuses: Dict[str, BackendStatus] = {name: BackendStatus(name) for name in self.probes}
+        self._task: Optional[asyncio.Task] = None
+
+    def is_configured(self, backend: str) -> bool:
+        probe = self.probes.get(backend)
+        return probe is not None and probe[0]()
+
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._supervise())
+            logger.info(f"Health supervisor started (interval={self.interval}s, ttl={self.ttl}s)")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _supervise(self):
+        while True:
+            await self.probe_all()
+            await asyncio.sleep(self.interval)
+
+    async def probe_all(self):
+        backends = [name for name in self.probes if self.is_configured(name)]
+        await asyncio.gather(*[self.probe(name) for name in backends])
+
+    async def probe(self, backend: str) -> bool:
+        _, check = self.probes[backend]
+        start = time.perf_counter()
+        error = None
+        try:
+            if inspect.iscoroutinefunction(check):
+                healthy = await asyncio.wait_for(check(), timeout=self.probe_timeout)
+            else:
+                healthy = await asyncio.wait_for(asyncio.to_thread(check), timeout=self.probe_timeout)
+        except asyncio.TimeoutError:
+            healthy = False
+            error = f"probe timed out after {self.probe_timeout}s"
+        except Exception as e:
+            healthy = False
+            error = str(e)
+
+        status = self.statuses[backend]
+        status.checked_at = time.monotonic()
+        status.latency_ms = round((time.perf_counter() - start) * 1000, 2)
+        status.error = error if not healthy else None
+        if healthy:
+            self.record_success(backend)
+        else:
+            self.record_failure(backend, error or "health check failed")
+        return healthy
+
+    def record_success(self, backend: str):
+        status = self.statuses.get(backend)
+        if not status:
+            return
+        if status.circuit != CIRCUIT_CLOSED:
+            logger.info(f"Circuit closed for {backend}")
+        status.healthy = True
+        status.consecutive_failures = 0
+        status.circuit = CIRCUIT_CLOSED
+        status.opened_at = None
+
+    def record_failure(self, backend: str, error: Optional[str] = None):
+        status = self.statuses.get(backend)
+        if not status:
+            return
+        status.healthy = False
+        status.error = error
+        status.consecutive_failures += 1
+        if status.circuit == CIRCUIT_HALF_OPEN or (
+            status.circuit == CIRCUIT_CLOSED and status.consecutive_failures >= self.failure_threshold
+        ):
+            status.circuit = CIRCUIT_OPEN
+            status.opened_at = time.monotonic()
+            logger.warning(f"Circuit opened for {backend} after {status.consecutive_failures} failures: {error}")
+
+    def _refresh_circuit(self, status: BackendStatus):
+        if status.circuit == CIRCUIT_OPEN and time.monotonic() - status.opened_at >= self.reset_timeout:
+            status.circuit = CIRCUIT_HALF_OPEN
+
+    def check_circuit(self, backend: str):
+        """Raise immediately if the backend's circuit is open. Never does I/O."""
+        status = self.statuses.get(backend)
+        if not status:
+            return
+        self._refresh_circuit(status)
+        if status.circuit == CIRCUIT_OPEN:
+            raise DatabaseConnectionError(
+                f"{backend} is unavailable (circuit open after {status.consecutive_failures} failures: {status.error})"
+            )
+
+    async def ensure_available(self, backend: str):
+        """
+        Raise DatabaseConnectionError unless the backend is usable.
+
+        Served from the cache while it is fresh; only probes inline when no
+        result newer than the TTL exists (e.g. the supervisor is not running).
+        Backends without a health probe are always considered available.
+        """
+        status = self.statuses.get(backend)
+        if not status:
+            return
+        if not self.is_configured(backend):
+            raise DatabaseConnectionError(f"{backend} connection not available")
+        self.check_circuit(backend)
+        if status.checked_at is None or time.monotonic() - status.checked_at > self.ttl:
+            await self.probe(backend)
+            self.check_circuit(backend)
+        if not status.healthy and status.circuit == CIRCUIT_CLOSED:
+            raise DatabaseConnectionError(f"{backend} connection not available")
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        backends = {}
+        for name, status in self.statuses.items():
+            if not self.is_configured(name):
+                backends[name] = {"configured": False}
+                continue
+            self._refresh_circuit(status)
+            backends[name] = {"configured": True, **status.to_dict(now, self.ttl)}
+
+        configured = [b for b in backends.values() if b["configured"]]
+        if not backends["postgres"].get("healthy"):
+            overall = "unhealthy"
+        elif any(not b["healthy"] for b in configured):
+            overall = "degraded"
+        else:
+            overall = "healthy"
+        return {
+            "status": overall,
+            "supervisor_running": self._task is not None and not self._task.done(),
+            "backends": backends
+        }
+
+health_supervisor = HealthSupervisor()
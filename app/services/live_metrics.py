@@ -0,0 +1,87 @@
+from typing import Dict, Any, Optional, Set
+from app.core.exceptions import ExperimentNotFoundError
+from app.core.logging import logger
+import asyncio
+
+_END = None
+
+class _Channel:
+    def __init__(self, monitor):
+        self.monitor = monitor
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.task: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+class LiveMetricsHub:
+    """
+    Fans PerformanceMonitor snapshots of in-flight experiments out to subscribers.
+
+    One publisher task per experiment takes a snapshot every interval (in a
+    worker thread, off the benchmark's event loop) and offers it to every
+    subscriber's bounded queue. A full queue drops its oldest entry instead of
+    blocking, so a slow client only loses updates and never slows the run.
+    """
+
+    def __init__(self, interval: float = 1.0, buffer_size: int = 10):
+        self.interval = interval
+        self.buffer_size = buffer_size
+        self._channels: Dict[str, _Channel] = {}
+
+    def register(self, experiment_id: str, monitor):
+        channel = self._channels.get(experiment_id)
+        if channel:
+            channel.monitor = monitor
+            return
+        channel = _Channel(monitor)
+        channel.task = asyncio.create_task(self._publish_loop(experiment_id, channel))
+        self._channels[experiment_id] = channel
+
+    async def unregister(self, experiment_id: str):
+        channel = self._channels.pop(experiment_id, None)
+        if not channel:
+            return
+        if channel.task:
+            channel.task.cancel()
+            try:
+                await channel.task
+            except asyncio.CancelledError:
+                pass
+        for queue in channel.subscribers:
+            self._offer(channel, queue, _END)
+        if channel.dropped:
+            logger.info(f"Live metrics for {experiment_id}: dropped {channel.dropped} updates for slow subscribers")
+
+    def subscribe(self, experiment_id: str) -> asyncio.Queue:
+        channel = self._channels.get(experiment_id)
+        if not channel:
+            raise ExperimentNotFoundError(f"Experiment {experiment_id} is not running")
+        queue = asyncio.Queue(maxsize=self.buffer_size)
+        channel.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, experiment_id: str, queue: asyncio.Queue):
+        channel = self._channels.get(experiment_id)
+        if channel:
+            channel.subscribers.discard(queue)
+
+    def _offer(self, channel: _Channel, queue: asyncio.Queue, item: Optional[Dict[str, Any]]):
+        if queue.full():
+            queue.get_nowait()
+            channel.dropped += 1
+        queue.put_nowait(item)
+
+    async def _publish_loop(self, experiment_id: str, channel: _Channel):
+        while True:
+            await asyncio.sleep(self.interval)
+            if not channel.subscribers:
+                continue
+            try:
+                snapshot = await asyncio.to_thread(channel.monitor.get_live_snapshot)
+            except Exception as e:
+                logger.warning(f"Live snapshot failed for {experiment_id}: {e}")
+                continue
+            snapshot["experiment_id"] = experiment_id
+            for queue in list(channel.subscribers):
+                self._offer(channel, queue, snapshot)
+
+live_metrics_hub = LiveMetricsHub()
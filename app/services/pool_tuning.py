@@ -0,0 +1,181 @@
+from dataclasses import replace
+from typing import Dict, Any, List, Optional
+from app.core.exceptions import ConfigurationError
+from app.core.logging import logger
+from app.services.trials import uses_trials
+from benchmarks.workload import WorkloadSpec, WorkloadRunner
+import threading
+import time
+import numpy as np
+
+# Connection-pool sizing: for each candidate size the backend opens a dedicated
+# pool (wl_pool), which is then driven at increasing concurrency with every
+# operation checking a connection out and returning it. The recommendation is
+# the smallest size whose best throughput is within `tolerance` of the peak.
+
+DEFAULT_POOL_TUNING = {
+    "pool_sizes": [1, 2, 4, 8, 16, 32],
+    "concurrency": [1, 2, 4, 8, 16, 32, 64],
+    "operations": 2000,
+    "tolerance": 0.05,
+    "workload": {"preset": "c", "record_count": 10000}
+}
+MAX_POOL_SIZE = 1000
+# Keys that run something other than the tuning passes
+EXCLUSIVE_KEYS = ("sweep", "workload", "replay", "latency_breakdown")
+
+def _positive_ints(value: Any, key: str) -> List[int]:
+    if (
+        not isinstance(value, list) or not value
+        or not all(isinstance(v, int) and not isinstance(v, bool) and v > 0 for v in value)
+    ):
+        raise ConfigurationError(f"pool_tuning.{key} must be a non-empty list of positive integers")
+    return sorted(set(value))
+
+def pool_tuning_settings(config: Dict[str, Any], supported: bool, database_type: str) -> Optional[Dict[str, Any]]:
+    """
+    Tuning settings for an experiment's "pool_tuning" option (true for the
+    defaults, or an object overriding them), or None when it is not set.
+    """
+    tuning = config.get("pool_tuning")
+    if tuning is None or tuning is False:
+        return None
+    if tuning is True:
+        tuning = {}
+    if not isinstance(tuning, dict):
+        raise ConfigurationError("pool_tuning must be true or an object")
+    if not supported:
+        raise ConfigurationError(f"pool_tuning is not available for {database_type}")
+    unknown = set(tuning) - set(DEFAULT_POOL_TUNING)
+    if unknown:
+        raise ConfigurationError(f"Unknown pool_tuning settings: {', '.join(sorted(unknown))}")
+    combined = [key for key in EXCLUSIVE_KEYS if config.get(key)]
+    if combined or uses_trials(config):
+        raise ConfigurationError(f"pool_tuning cannot be combined with {', '.join(combined) or 'trials'}")
+
+    settings = {**DEFAULT_POOL_TUNING, **tuning}
+    settings["pool_sizes"] = _positive_ints(settings["pool_sizes"], "pool_sizes")
+    settings["concurrency"] = _positive_ints(settings["concurrency"], "concurrency")
+    if settings["pool_sizes"][-1] > MAX_POOL_SIZE:
+        raise ConfigurationError(f"pool_tuning.pool_sizes cannot exceed {MAX_POOL_SIZE}")
+    operations = settings["operations"]
+    if not isinstance(operations, int) or isinstance(operations, bool) or operations < 1:
+        raise ConfigurationError("pool_tuning.operations must be a positive integer")
+    tolerance = settings["tolerance"]
+    if not isinstance(tolerance, (int, float)) or isinstance(tolerance, bool) or not 0 <= tolerance < 1:
+        raise ConfigurationError("pool_tuning.tolerance must be a number in [0, 1)")
+    spec = WorkloadSpec.from_config({"workload": settings["workload"]})
+    if spec.mix.get("insert", 0) > 0:
+        # Every level replays the same operation stream, so inserted keys would collide
+        raise ConfigurationError("pool_tuning workloads cannot include inserts")
+    return settings
+
+class PoolStats:
+    """Checkout waits and connection setup times reported by a dedicated pool"""
+
+    def __init__(self):
+        self.waits: List[float] = []
+        self.connects: List[float] = []
+        self._lock = threading.Lock()
+
+    def add_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.waits.append(seconds)
+
+    def add_connect(self, seconds: float) -> None:
+        with self._lock:
+            self.connects.append(seconds)
+
+    def take_waits(self) -> List[float]:
+        with self._lock:
+            waits, self.waits = self.waits, []
+        return waits
+
+def _ms_summary(values: List[float]) -> Dict[str, Any]:
+    if not values:
+        return {"count": 0}
+    array = np.asarray(values, dtype=np.float64) * 1000
+    p50, p99 = np.percentile(array, [50, 99])
+    return {
+        "count": len(values),
+        "avg": round(float(array.mean()), 3),
+        "p50": round(float(p50), 3),
+        "p99": round(float(p99), 3),
+        "max": round(float(array.max()), 3)
+    }
+
+async def _tune_pool_size(benchmark, runner: WorkloadRunner, pool_size: int, concurrency: List[int]) -> Dict[str, Any]:
+    stats = PoolStats()
+    benchmark._begin_operation(f"pool_{pool_size}")
+    started = time.perf_counter()
+    levels = []
+    async with benchmark.wl_pool(pool_size, stats) as connect:
+        setup_seconds = time.perf_counter() - started
+        opened = len(stats.connects)
+        for workers in concurrency:
+            if benchmark.cancelled.is_set():
+                break
+            stats.take_waits()
+            level = await runner.run_checkouts(connect, workers)
+            level["pool_wait_ms"] = _ms_summary(stats.take_waits())
+            levels.append(level)
+    # Throughput only counts levels without errors (pool timeouts, dropped connections)
+    clean = [level for level in levels if level["errors"] == 0]
+    peak = max(clean, key=lambda level: level["ops_per_second"], default=None)
+    return {
+        "pool_size": pool_size,
+        "setup_seconds": round(setup_seconds, 3),
+        "connect_ms": _ms_summary(stats.connects[:opened]),
+        # New connections while running: the pool replaced dropped or stale ones
+        "reconnects": len(stats.connects) - opened,
+        "peak_ops_per_second": peak["ops_per_second"] if peak else 0.0,
+        "peak_concurrency": peak["concurrency"] if peak else None,
+        "levels": levels
+    }
+
+def recommend_pool_size(sizes: List[Dict[str, Any]], tolerance: float) -> Dict[str, Any]:
+    """The smallest pool whose peak throughput is within tolerance of the best pool's"""
+    best = max(sizes, key=lambda size: size["peak_ops_per_second"])
+    threshold = best["peak_ops_per_second"] * (1 - tolerance)
+    chosen = next(size for size in sizes if size["peak_ops_per_second"] >= threshold)
+    return {
+        "pool_size": chosen["pool_size"],
+        "ops_per_second": chosen["peak_ops_per_second"],
+        "concurrency": chosen["peak_concurrency"],
+        "peak_pool_size": best["pool_size"],
+        "peak_ops_per_second": best["peak_ops_per_second"],
+        "tolerance": tolerance
+    }
+
+async def run_pool_tuning(benchmark, settings: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Load the tuning workload once through the backend's default connection,
+    then measure every pool size in ascending order on its own pool.
+    """
+    spec = replace(WorkloadSpec.from_config({"workload": settings["workload"]}), operation_count=settings["operations"])
+    runner = WorkloadRunner(benchmark, spec)
+    sizes = []
+    await benchmark.wl_setup(spec)
+    try:
+        benchmark._begin_operation("pool_tuning_load")
+        load = await runner.load()
+        for pool_size in settings["pool_sizes"]:
+            if benchmark.cancelled.is_set():
+                break
+            size = await _tune_pool_size(benchmark, runner, pool_size, settings["concurrency"])
+            logger.info(
+                f"Pool size {pool_size}: peak {size['peak_ops_per_second']} ops/s "
+                f"at concurrency {size['peak_concurrency']}"
+            )
+            sizes.append(size)
+    finally:
+        await benchmark.wl_teardown(spec)
+    return {
+        "benchmark_results": {"load": load, "pool_sizes": {str(size["pool_size"]): size for size in sizes}},
+        "pool_tuning": {
+            "workload": spec.describe(),
+            "pool_sizes": settings["pool_sizes"],
+            "concurrency": settings["concurrency"],
+            "recommendation": recommend_pool_size(sizes, settings["tolerance"]) if sizes else None
+        }
+    }
@@ -0,0 +1,199 @@
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable
+from itertools import product
+from app.core.exceptions import ConfigurationError
+from app.core.logging import logger
+from app.services.trials import TRIAL_KEYS
+from telemetry.tracing import start_span
+import csv
+import io
+import json
+import time
+
+# Parameters that change the loaded dataset; points differing only elsewhere share one load
+DEFAULT_LOAD_PARAMETERS = ("rows", "data_size", "batch_size")
+MAX_SWEEP_POINTS = 1000
+
+def _sweep_spec(config: Dict[str, Any]) -> Dict[str, Any]:
+    sweep = config.get("sweep")
+    if not isinstance(sweep, dict) or not ("grid" in sweep or "points" in sweep):
+        raise ConfigurationError("sweep must be an object with a 'grid' or a 'points' list")
+    if any(key in config for key in TRIAL_KEYS):
+        raise ConfigurationError("sweep cannot be combined with trials")
+    return sweep
+
+def load_parameters(config: Dict[str, Any], dataset_parameters: Tuple[str, ...] = ()) -> Tuple[str, ...]:
+    """An explicit sweep.load_parameters list wins; otherwise the defaults plus the backend's own dataset parameters"""
+    return tuple(_sweep_spec(config).get("load_parameters", DEFAULT_LOAD_PARAMETERS + tuple(dataset_parameters)))
+
+def expand_sweep(config: Dict[str, Any], dataset_parameters: Tuple[str, ...] = ()) -> List[Dict[str, Any]]:
+    """
+    Config overrides for every sweep point, grouped so points sharing a dataset are adjacent.
+
+    Grids vary load parameters in the outer loops; explicit point lists keep
+    their order within each dataset group, groups in order of first appearance.
+    """
+    sweep = _sweep_spec(config)
+    loads = load_parameters(config, dataset_parameters)
+    if "grid" in sweep:
+        grid = sweep["grid"]
+        if not isinstance(grid, dict) or not grid or not all(isinstance(v, list) and v for v in grid.values()):
+            raise ConfigurationError("sweep.grid must map parameter names to non-empty lists")
+        keys = sorted(grid, key=lambda k: (k not in loads, list(grid).index(k)))
+        points = [dict(zip(keys, values)) for values in product(*(grid[k] for k in keys))]
+    else:
+        points = sweep["points"]
+        if not isinstance(points, list) or not points or not all(isinstance(p, dict) for p in points):
+            raise ConfigurationError("sweep.points must be a non-empty list of config overrides")
+        group_order: Dict[str, int] = {}
+        for point in points:
+            group_order.setdefault(dataset_key({**config, **point}, loads), len(group_order))
+        points = sorted(points, key=lambda p: group_order[dataset_key({**config, **p}, loads)])
+    if len(points) > MAX_SWEEP_POINTS:
+        raise ConfigurationError(f"sweep expands to {len(points)} points; the limit is {MAX_SWEEP_POINTS}")
+    return points
+
+def point_id(overrides: Dict[str, Any]) -> str:
+    return json.dumps(overrides, sort_keys=True, default=str)
+
+def point_label(overrides: Dict[str, Any]) -> str:
+    return ",".join(f"{key}={value}" for key, value in overrides.items())
+
+def dataset_key(point_config: Dict[str, Any], loads: Tuple[str, ...]) -> str:
+    return json.dumps({key: point_config.get(key) for key in loads}, sort_keys=True, default=str)
+
+def init_sweep_progress(
+    config: Dict[str, Any],
+    previous: Optional[Dict[str, Any]] = None,
+    dataset_parameters: Tuple[str, ...] = ()
+) -> Dict[str, Any]:
+    """Fresh progress for the sweep, carrying over completed points from an interrupted run"""
+    completed = {}
+    for point in (previous or {}).get("points", []):
+        if point.get("status") == "completed":
+            completed[point["id"]] = point
+    points = []
+    for overrides in expand_sweep(config, dataset_parameters):
+        pid = point_id(overrides)
+        points.append(completed.get(pid) or {
+            "id": pid,
+            "label": point_label(overrides),
+            "overrides": overrides,
+            "status": "pending"
+        })
+    return {
+        "total": len(points),
+        "completed": sum(1 for p in points if p["status"] == "completed"),
+        "resumed": bool(completed),
+        "points": points
+    }
+
+async def run_sweep(
+    benchmark,
+    config: Dict[str, Any],
+    monitor,
+    progress: Dict[str, Any],
+    checkpoint: Optional[Callable[[], Awaitable[None]]] = None
+) -> Dict[str, Any]:
+    """
+    Run every pending sweep point, calling checkpoint() after each one.
+
+    Each dataset group (points that agree on the load parameters) gets one
+    setup and one run of the benchmark's load operations; every point in the
+    group then runs only the read-side operations against that data.
+    """
+    base_config = {key: value for key, value in config.items() if key != "sweep"}
+    loads = load_parameters(config, benchmark.dataset_parameters)
+    operations = list(base_config.get("operations", benchmark.default_operations))
+    load_ops = [op for op in operations if op in benchmark.load_operations]
+    read_ops = [op for op in operations if op not in benchmark.load_operations]
+
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for point in progress["points"]:
+        groups.setdefault(dataset_key({**base_config, **point["overrides"]}, loads), []).append(point)
+
+    for points in groups.values():
+        pending = [p for p in points if p["status"] != "completed"]
+        if not pending:
+            continue
+        group_config = {**base_config, **pending[0]["overrides"]}
+        with start_span("experiment.sweep_group", {"sweep.points": len(pending)}):
+            await benchmark.setup(group_config)
+            try:
+                load_results: Dict[str, Any] = {}
+                if load_ops:
+                    load_results = await benchmark.run({**group_config, "operations": load_ops})
+                warmup = await benchmark.warm_up({**group_config, "operations": read_ops}) if read_ops else None
+                for index, point in enumerate(pending):
+                    point_config = {**base_config, **point["overrides"]}
+                    start_mark = monitor.query_count()
+                    benchmark.clear_phase_samples()
+                    started = time.perf_counter()
+                    results = await benchmark.run({**point_config, "operations": read_ops}) if read_ops else {}
+                    duration = time.perf_counter() - started
+                    if benchmark.phase_samples:
+                        point["sampling"] = benchmark.phase_samples
+                    if warmup and index == 0:
+                        point["warmup"] = warmup
+                    point.update({
+                        "status": "completed",
+                        "load_reused": index > 0,
+                        "benchmark_results": {**load_results, **results} if index == 0 else results,
+                        "performance_metrics": monitor.get_window_results(start_mark, monitor.query_count(), duration)
+                    })
+                    progress["completed"] += 1
+                    logger.info(f"Sweep point {progress['completed']}/{progress['total']} ({point['label']}) completed")
+                    if checkpoint:
+                        await checkpoint()
+            finally:
+                await benchmark.teardown()
+
+    return {
+        "benchmark_results": {p["label"]: p.get("benchmark_results", {}) for p in progress["points"]},
+        "table": sweep_table(progress)
+    }
+
+def sweep_table(progress: Dict[str, Any]) -> Dict[str, Any]:
+    """One row per (point, operation) with the point's parameters and the operation's numeric metrics"""
+    parameters: List[str] = []
+    metrics: List[str] = []
+    records = []
+    for point in progress["points"]:
+        if point["status"] != "completed":
+            continue
+        for key in point["overrides"]:
+            if key not in parameters:
+                parameters.append(key)
+        performance = point["performance_metrics"]
+        point_metrics = {
+            "point_ops_per_second": performance["ops_per_second"],
+            "point_p50_ms": performance["latency_ms"]["p50"],
+            "point_p99_ms": performance["latency_ms"]["p99"]
+        }
+        for operation, result in point["benchmark_results"].items():
+            if not isinstance(result, dict):
+                continue
+            values = {
+                key: value for key, value in result.items()
+                if isinstance(value, (int, float)) and not isinstance(value, bool)
+            }
+            values.update(point_metrics)
+            for key in values:
+                if key not in metrics:
+                    metrics.append(key)
+            records.append((point, operation, values))
+
+    columns = parameters + ["operation", "load_reused"] + metrics
+    rows = [
+        [point["overrides"].get(key) for key in parameters]
+        + [operation, point["load_reused"]]
+        + [values.get(key) for key in metrics]
+        for point, operation, values in records
+    ]
+    return {"columns": columns, "rows": rows}
+
+def table_to_csv(table: Dict[str, Any]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(table["columns"])
+    writer.writerows(table["rows"])
+    return buffer.getvalue()
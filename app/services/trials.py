@@ -0,0 +1,132 @@
+from typing import Dict, Any, List, Tuple
+from app.core.exceptions import ConfigurationError
+from app.core.logging import logger
+from app.utils.statistics import summarize_trials
+from telemetry.tracing import start_span
+import time
+
+TRIAL_KEYS = ("trials", "warmup_trials", "reuse_setup")
+
+def trial_settings(config: Dict[str, Any]) -> Tuple[int, int, bool]:
+    trials = config.get("trials", 1)
+    warmup_trials = config.get("warmup_trials", 0)
+    reuse_setup = config.get("reuse_setup", False)
+    if not isinstance(trials, int) or trials < 1:
+        raise ConfigurationError("trials must be a positive integer")
+    if not isinstance(warmup_trials, int) or warmup_trials < 0:
+        raise ConfigurationError("warmup_trials must be a non-negative integer")
+    return trials, warmup_trials, bool(reuse_setup)
+
+def uses_trials(config: Dict[str, Any]) -> bool:
+    return config.get("trials", 1) != 1 or config.get("warmup_trials", 0) != 0
+
+def trial_schedule(operations: List[str], load_operations: Tuple[str, ...], total_trials: int) -> List[List[str]]:
+    """
+    Operation order for each trial.
+
+    Load operations always come first (later operations read their data);
+    the rest are rotated one position per trial, so over a full cycle each
+    operation runs in every slot and slow environmental drift is spread
+    evenly instead of always landing on the same operation.
+    """
+    loads = [op for op in operations if op in load_operations]
+    others = [op for op in operations if op not in load_operations]
+    schedule = []
+    for trial in range(total_trials):
+        shift = trial % len(others) if others else 0
+        schedule.append(loads + others[shift:] + others[:shift])
+    return schedule
+
+def _numeric_leaves(value: Any, prefix: Tuple[str, ...] = ()) -> List[Tuple[Tuple[str, ...], float]]:
+    if isinstance(value, dict):
+        leaves = []
+        for key, child in value.items():
+            leaves.extend(_numeric_leaves(child, prefix + (str(key),)))
+        return leaves
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return [(prefix, float(value))]
+    return []
+
+def _nest(flat: Dict[Tuple[str, ...], Any]) -> Dict[str, Any]:
+    nested: Dict[str, Any] = {}
+    for path, value in flat.items():
+        node = nested
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = value
+    return nested
+
+def aggregate_trials(per_trial: List[Dict[str, Any]], section: str) -> Dict[str, Any]:
+    """Per-metric trial statistics for one section of the measured trials, keeping the section's shape"""
+    series: Dict[Tuple[str, ...], List[float]] = {}
+    for trial in per_trial:
+        for path, value in _numeric_leaves(trial[section]):
+            series.setdefault(path, []).append(value)
+    return _nest({path: summarize_trials(values) for path, values in series.items()})
+
+def _means(summary: Dict[str, Any]) -> Dict[str, Any]:
+    if "mean" in summary and "ci95_low" in summary:
+        return summary["mean"]
+    return {key: _means(child) for key, child in summary.items()}
+
+async def run_trials(benchmark, config: Dict[str, Any], monitor) -> Dict[str, Any]:
+    """
+    Run the benchmark's operations over warm-up plus measured trials.
+
+    Each operation runs as its own benchmark.run() call in the trial's
+    scheduled order. Without reuse_setup every trial gets a fresh
+    setup/teardown; with it, setup happens once and load operations run in
+    the first trial only, so later trials measure reads against the same data.
+    """
+    trials, warmup_trials, reuse_setup = trial_settings(config)
+    operations = list(config.get("operations", benchmark.default_operations))
+    load_operations = benchmark.load_operations
+    schedule = trial_schedule(operations, load_operations, warmup_trials + trials)
+
+    per_trial = []
+    if reuse_setup:
+        await benchmark.setup(config)
+    try:
+        for index, order in enumerate(schedule):
+            warmup = index < warmup_trials
+            if reuse_setup and index > 0:
+                order = [op for op in order if op not in load_operations]
+            with start_span("experiment.trial", {"trial.index": index, "trial.warmup": warmup}):
+                if not reuse_setup:
+                    await benchmark.setup(config)
+                benchmark_results: Dict[str, Any] = {}
+                start_mark = monitor.query_count()
+                started = time.perf_counter()
+                for operation in order:
+                    benchmark_results.update(await benchmark.run({**config, "operations": [operation]}))
+                duration = time.perf_counter() - started
+                performance = monitor.get_window_results(start_mark, monitor.query_count(), duration)
+                if not reuse_setup:
+                    await benchmark.teardown()
+            per_trial.append({
+                "trial": index + 1,
+                "warmup": warmup,
+                "order": order,
+                "benchmark_results": benchmark_results,
+                "performance_metrics": performance
+            })
+            logger.info(f"Trial {index + 1}/{len(schedule)}{' (warm-up)' if warmup else ''} finished in {duration:.2f}s")
+    finally:
+        if reuse_setup:
+            await benchmark.teardown()
+
+    measured = [trial for trial in per_trial if not trial["warmup"]]
+    summary = {
+        "benchmark_results": aggregate_trials(measured, "benchmark_results"),
+        "performance_metrics": aggregate_trials(measured, "performance_metrics")
+    }
+    return {
+        "benchmark_results": _means(summary["benchmark_results"]),
+        "trials": {
+            "count": trials,
+            "warmup_trials": warmup_trials,
+            "reuse_setup": reuse_setup,
+            "summary": summary,
+            "per_trial": per_trial
+        }
+    }
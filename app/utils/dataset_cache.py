@@ -0,0 +1,198 @@
+import hashlib
+import json
+import os
+import shutil
+import string
+import threading
+import uuid
+from collections.abc import Sequence
+from typing import Dict, Any, List, Optional
+import numpy as np
+from app.core.config import settings
+from app.core.exceptions import ConfigurationError
+from telemetry.metrics import DATASET_CACHE_LOOKUPS, metrics_enabled
+
+# Generated benchmark datasets are cached as one directory per generator
+# key: a raw .npy file per column (memory-mapped on load, so every run and
+# worker process shares the page cache) plus meta.json. Bump SCHEMA whenever
+# the generated columns or their distributions change.
+SCHEMA = "base-v1"
+META_FILE = "meta.json"
+FIELD_SIZES = {"small": 10, "medium": 50, "large": 200}
+NAME_LENGTH = 20
+_LETTERS = np.frombuffer(string.ascii_letters.encode(), dtype="S1")
+_ALPHANUMERIC = np.frombuffer((string.ascii_letters + string.digits).encode(), dtype="S1")
+
+def dataset_key(num_rows: int, num_fields: int, data_size: str, seed: int) -> str:
+    parameters = {"rows": num_rows, "fields": num_fields, "data_size": data_size, "seed": seed, "schema": SCHEMA}
+    return hashlib.sha1(json.dumps(parameters, sort_keys=True).encode()).hexdigest()[:20]
+
+def data_seed(config: Dict[str, Any]) -> int:
+    """An experiment config's data_seed (default 0), which selects the generated dataset"""
+    seed = config.get("data_seed", 0)
+    if not isinstance(seed, int) or isinstance(seed, bool) or seed < 0:
+        raise ConfigurationError("data_seed must be a non-negative integer")
+    return seed
+
+def _random_strings(rng: np.random.Generator, alphabet: np.ndarray, count: int, length: int) -> np.ndarray:
+    return alphabet[rng.integers(0, len(alphabet), size=(count, length))].view(f"S{length}").reshape(count)
+
+def generate_columns(num_rows: int, num_fields: int, data_size: str, seed: int) -> Dict[str, np.ndarray]:
+    """The base benchmark row set as columns; same key, same data"""
+    rng = np.random.default_rng(seed)
+    field_size = FIELD_SIZES.get(data_size, FIELD_SIZES["small"])
+    ids = np.arange(num_rows, dtype=np.int64)
+    emails = np.char.add(np.char.add(b"user", ids.astype("S20")), b"@example.com")
+    columns = {
+        "id": ids,
+        "name": _random_strings(rng, _LETTERS, num_rows, NAME_LENGTH),
+        "email": emails,
+        "age": rng.integers(18, 81, size=num_rows, dtype=np.int64),
+        "score": rng.integers(0, 101, size=num_rows, dtype=np.int64)
+    }
+    for j in range(num_fields - 5):
+        columns[f"field_{j}"] = _random_strings(rng, _ALPHANUMERIC, num_rows, field_size)
+    return columns
+
+class Dataset(Sequence):
+    """
+    Read-only rows over column arrays (memory-mapped when cached).
+
+    Indexing builds one row dict with plain Python values; slicing builds the
+    dicts for just that range, so batching a large dataset never materialises
+    all of it. Decoding is not free, so timed loops take their rows from
+    batches() (or a list) built before the clock starts. `columns` exposes the
+    arrays for vectorised consumers.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], cache_hit: bool = False):
+        self.columns = columns
+        self.cache_hit = cache_hit
+        self._length = len(next(iter(columns.values()))) if columns else 0
+        self._text = {name for name, values in columns.items() if values.dtype.kind == "S"}
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _rows(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        names = list(self.columns)
+        values = [
+            [value.decode() for value in self.columns[name][start:stop].tolist()] if name in self._text
+            else self.columns[name][start:stop].tolist()
+            for name in names
+        ]
+        return [dict(zip(names, row)) for row in zip(*values)]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            rows = self._rows(start, stop)
+            return rows if step == 1 else rows[::step]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("dataset index out of range")
+        return self._rows(index, index + 1)[0]
+
+    def __iter__(self):
+        for offset in range(0, self._length, 4096):
+            yield from self._rows(offset, min(offset + 4096, self._length))
+
+    def batches(self, size: int) -> List[List[Dict[str, Any]]]:
+        """Every row, decoded now, in consecutive lists of `size`"""
+        return [self._rows(offset, min(offset + size, self._length)) for offset in range(0, self._length, size)]
+
+class DatasetCache:
+    """
+    Size-capped on-disk cache of generated datasets, evicting least recently used.
+
+    A hit memory-maps the cached columns; a miss generates them, writes them
+    to a temporary directory and renames it into place, so concurrent
+    processes never see a partial entry. Use refreshes the entry's mtime,
+    which eviction orders by.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.directory = directory or settings.DATASET_CACHE_DIR
+        self.max_bytes = settings.DATASET_CACHE_MAX_MB * 1024 * 1024 if max_bytes is None else max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def _count(self, result: str) -> None:
+        with self._lock:
+            if result == "hit":
+                self.hits += 1
+            else:
+                self.misses += 1
+        if metrics_enabled():
+            DATASET_CACHE_LOOKUPS.labels(result).inc()
+
+    def _load(self, path: str, cache_hit: bool) -> Optional[Dataset]:
+        try:
+            with open(os.path.join(path, META_FILE)) as f:
+                meta = json.load(f)
+            columns = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in meta["columns"]}
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            return None
+        return Dataset(columns, cache_hit)
+
+    def _store(self, path: str, columns: Dict[str, np.ndarray], parameters: Dict[str, Any]) -> None:
+        temporary = os.path.join(self.directory, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(temporary)
+        try:
+            for name, values in columns.items():
+                np.save(os.path.join(temporary, f"{name}.npy"), values)
+            with open(os.path.join(temporary, META_FILE), "w") as f:
+                json.dump({**parameters, "columns": list(columns)}, f)
+            os.rename(temporary, path)
+        except OSError:
+            # Another process stored the same key first; theirs is identical
+            shutil.rmtree(temporary, ignore_errors=True)
+
+    @staticmethod
+    def _size(path: str) -> int:
+        return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+    def _evict(self, keep: str) -> None:
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_dir() and not entry.name.startswith("."):
+                entries.append((entry.stat().st_mtime, entry.path, self._size(entry.path)))
+        total = sum(size for _, _, size in entries)
+        for _, path, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            # Processes that already mapped the files keep reading them after removal
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+    def get(self, num_rows: int, num_fields: int = 5, data_size: str = "small", seed: int = 0) -> Dataset:
+        if self.max_bytes <= 0:
+            self._count("miss")
+            return Dataset(generate_columns(num_rows, num_fields, data_size, seed))
+        path = os.path.join(self.directory, dataset_key(num_rows, num_fields, data_size, seed))
+        dataset = self._load(path, cache_hit=True)
+        if dataset is not None:
+            self._count("hit")
+            return dataset
+        self._count("miss")
+        columns = generate_columns(num_rows, num_fields, data_size, seed)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self._store(path, columns, {"rows": num_rows, "fields": num_fields, "data_size": data_size, "seed": seed, "schema": SCHEMA})
+            self._evict(keep=path)
+        except OSError:
+            return Dataset(columns)
+        return self._load(path, cache_hit=False) or Dataset(columns)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+dataset_cache = DatasetCache()
@@ -1,4 +1,6 @@
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
+from datetime import datetime
+import base64
 
 def format_experiment_results(results: Dict[str, Any]) -> Dict[str, Any]:
     return results
@@ -6,3 +8,15 @@ def format_experiment_results(results: Dict[str, Any]) -> Dict[str, Any]:
 def validate_experiment_config(config: Dict[str, Any]) -> bool:
     return True
 
+def encode_cursor(created_at: datetime, experiment_id: str) -> str:
+    raw = f"{created_at.isoformat()}|{experiment_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    from app.core.exceptions import InvalidCursorError
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, experiment_id = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), experiment_id
+    except Exception as e:
+        raise InvalidCursorError(f"Invalid pagination cursor: {cursor}") from e
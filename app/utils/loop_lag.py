@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+import psutil
+from array import array
+from typing import Dict, Any, List, Optional
+
+class LoopLagProbe:
+    """
+    Measures event-loop scheduling delay while an experiment runs.
+
+    A task asks to wake every `interval` seconds and records how late it
+    actually woke. Every coroutine on the loop (benchmark workers, the API,
+    the live-metrics stream) waits behind the same backlog, so this lag is
+    time the client adds on top of what the database spent. The loop
+    thread's own CPU time is read at start and stop to tell a saturated
+    client (the loop thread near one full core) from an idle one.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.lags = array('d')
+        self._task: Optional[asyncio.Task] = None
+        self._thread_id: Optional[int] = None
+        self._cpu_start = 0.0
+        self._wall_start = 0.0
+        self.loop_thread_cpu_percent: Optional[float] = None
+
+    def _thread_cpu_seconds(self) -> Optional[float]:
+        try:
+            for thread in psutil.Process().threads():
+                if thread.id == self._thread_id:
+                    return thread.user_time + thread.system_time
+        except (psutil.Error, OSError):
+            pass
+        return None
+
+    def start(self) -> bool:
+        """Start probing on the running loop; returns False when called outside one"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        self.lags = array('d')
+        self._thread_id = threading.get_native_id()
+        self._cpu_start = self._thread_cpu_seconds() or 0.0
+        self._wall_start = time.perf_counter()
+        self._task = loop.create_task(self._run())
+        return True
+
+    async def _run(self):
+        interval = self.interval
+        expected = time.perf_counter() + interval
+        while True:
+            await asyncio.sleep(interval)
+            now = time.perf_counter()
+            self.lags.append(max(0.0, now - expected))
+            expected = now + interval
+
+    def stop(self) -> None:
+        if not self._task:
+            return
+        self._task.cancel()
+        self._task = None
+        wall = time.perf_counter() - self._wall_start
+        cpu_end = self._thread_cpu_seconds()
+        if cpu_end is not None and wall > 0:
+            self.loop_thread_cpu_percent = round((cpu_end - self._cpu_start) / wall * 100, 2)
+
+    def summary(self) -> Dict[str, Any]:
+        lags: List[float] = sorted(self.lags)
+
+        def percentile(p):
+            return round(lags[min(int(len(lags) * p / 100), len(lags) - 1)] * 1000, 3) if lags else 0.0
+
+        return {
+            "probe_interval_ms": round(self.interval * 1000, 3),
+            "probe_samples": len(lags),
+            "loop_lag_ms": {
+                "mean": round(sum(lags) / len(lags) * 1000, 3) if lags else 0.0,
+                "p50": percentile(50),
+                "p95": percentile(95),
+                "p99": percentile(99),
+                "max": round(lags[-1] * 1000, 3) if lags else 0.0
+            },
+            "loop_thread_cpu_percent": self.loop_thread_cpu_percent
+        }
+
+def client_bound_report(
+    probe_summary: Dict[str, Any],
+    avg_latency_ms: float,
+    process_cpu_percent: float,
+    lag_share_threshold: float,
+    cpu_threshold: float
+) -> Dict[str, Any]:
+    """
+    Flag a run as client-bound when loop lag is a significant share of the
+    measured latency, or when the loop thread (or the whole API process,
+    if the thread could not be read) is running close to a full core.
+    """
+    mean_lag = probe_summary["loop_lag_ms"]["mean"]
+    share = round(mean_lag / avg_latency_ms, 4) if avg_latency_ms > 0 else 0.0
+    loop_cpu = probe_summary["loop_thread_cpu_percent"]
+    reasons = []
+    if probe_summary["probe_samples"] and share >= lag_share_threshold:
+        reasons.append(
+            f"mean event-loop lag {mean_lag}ms is {share:.0%} of the {avg_latency_ms}ms mean latency"
+        )
+    if loop_cpu is not None and loop_cpu >= cpu_threshold:
+        reasons.append(f"event-loop thread at {loop_cpu}% CPU")
+    elif loop_cpu is None and process_cpu_percent >= cpu_threshold:
+        reasons.append(f"API process at {process_cpu_percent}% CPU")
+    return {
+        **probe_summary,
+        "process_cpu_percent": process_cpu_percent,
+        "lag_share_of_latency": share,
+        "client_bound": bool(reasons),
+        "reasons": reasons
+    }
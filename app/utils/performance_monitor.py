@@ -1,56 +1,183 @@
 import time
 import psutil
 import threading
+from array import array
 from typing import List, Dict, Any, Optional
 from collections import deque
+from app.utils.system_sampler import SystemSampler, DEFAULT_INTERVAL
+from app.utils.loop_lag import LoopLagProbe, client_bound_report
+from app.core.config import settings
 
 class PerformanceMonitor:
     def __init__(self):
         self.start_time: Optional[float] = None
         self.end_time: Optional[float] = None
+        # Unmeasured time inside the experiment (warm-up), left out of its duration
+        self.excluded_seconds = 0.0
         self.query_times: List[float] = []
         self.cpu_samples: deque = deque(maxlen=1000)
         self.memory_samples: deque = deque(maxlen=1000)
         self.sampling_active = False
         self.sampling_thread: Optional[threading.Thread] = None
+        self._sampling_stop = threading.Event()
+        self.sample_interval = DEFAULT_INTERVAL
+        self.system_sampler = SystemSampler()
+        self.loop_probe = LoopLagProbe(settings.LOOP_LAG_PROBE_INTERVAL_MS / 1000)
         self.process = psutil.Process()
         self._lock = threading.Lock()  # Thread-safe operations
+        self.current_operation: Optional[str] = None
+        self.operation_codes: Dict[str, int] = {}
+        self.capture_samples = False
+        self.error_count = 0
+        self._live_cursor = 0
+        self._live_time: Optional[float] = None
+        self._reset_samples()
+        
+    def _reset_samples(self):
+        # Columnar per-op samples, only filled when capture_samples is enabled
+        self.sample_timestamps = array('d')
+        self.sample_operations = array('B')
+        self.sample_latencies = array('d')
+        self.sample_errors = array('B')
+        
+    def enable_sample_capture(self):
+        self.capture_samples = True
+    
+    def configure_resource_sampling(self, interval: float, pids: List[int], process_names: List[str]):
+        """Sampling period and the database server processes to watch alongside host-wide counters"""
+        self.sample_interval = interval
+        self.system_sampler = SystemSampler(pids, process_names)
+        
+    def set_operation(self, operation: str):
+        with self._lock:
+            self.current_operation = operation
+            if operation not in self.operation_codes:
+                self.operation_codes[operation] = len(self.operation_codes)
         
     def start_experiment(self):
         self.start_time = time.perf_counter()
+        self.excluded_seconds = 0.0
         with self._lock:
             self.query_times.clear()
             self.cpu_samples.clear()
             self.memory_samples.clear()
+            self._reset_samples()
+            self.error_count = 0
+            self._live_cursor = 0
+        self._live_time = self.start_time
         self._start_sampling()
+        # Only probes when started from the event loop the benchmark runs on
+        self.loop_probe.start()
         
     def stop_experiment(self):
         self.end_time = time.perf_counter()
+        self.loop_probe.stop()
         self._stop_sampling()
         
-    def record_query_time(self, query_time: float):
+    def exclude_time(self, seconds: float):
+        self.excluded_seconds += seconds
+        
+    def record_query_time(self, query_time: float, error: bool = False):
         """Thread-safe method to record query times"""
         with self._lock:
             self.query_times.append(query_time)
+            if error:
+                self.error_count += 1
+            if self.capture_samples:
+                self.sample_timestamps.append(time.perf_counter() - (self.start_time or 0.0))
+                self.sample_operations.append(self.operation_codes.get(self.current_operation, 255))
+                self.sample_latencies.append(query_time)
+                self.sample_errors.append(1 if error else 0)
+    
+    def get_samples(self) -> Dict[str, Any]:
+        """Return captured samples as columns: seconds since start, op code, latency seconds, error flag"""
+        with self._lock:
+            return {
+                "timestamp": self.sample_timestamps,
+                "operation": self.sample_operations,
+                "latency": self.sample_latencies,
+                "error": self.sample_errors,
+                "operations": {code: name for name, code in self.operation_codes.items()}
+            }
         
     def _start_sampling(self):
         self.sampling_active = True
+        self._sampling_stop.clear()
         self.sampling_thread = threading.Thread(target=self._sample_resources, daemon=True)
         self.sampling_thread.start()
         
     def _stop_sampling(self):
         self.sampling_active = False
+        self._sampling_stop.set()
         if self.sampling_thread:
             self.sampling_thread.join(timeout=1.0)
             
     def _sample_resources(self):
-        while self.sampling_active:
+        # Counter-delta sampling: nothing here blocks, so each tick lands on the interval and stop is immediate
+        self.process.cpu_percent(None)
+        self.system_sampler.start()
+        mark = 0
+        while not self._sampling_stop.wait(self.sample_interval):
             try:
-                self.cpu_samples.append(self.process.cpu_percent(interval=0.1))
+                self.cpu_samples.append(self.process.cpu_percent(None))
                 self.memory_samples.append(self.process.memory_info().rss / 1024 / 1024)
+                end = self.query_count()
+                load = self._window_load(mark, end)
+                mark = end
+                self.system_sampler.tick(time.perf_counter() - (self.start_time or 0.0), load)
             except Exception:
                 pass
-            time.sleep(0.5)
+    
+    def _window_load(self, start_index: int, end_index: int) -> Dict[str, Any]:
+        with self._lock:
+            window = self.query_times[start_index:end_index]
+        window.sort()
+        
+        def percentile(p):
+            return round(window[min(int(len(window) * p / 100), len(window) - 1)] * 1000, 3) if window else 0.0
+        
+        return {"queries": len(window), "p50_ms": percentile(50), "p99_ms": percentile(99)}
+            
+    def get_live_snapshot(self) -> Dict[str, Any]:
+        """
+        Metrics for the window since the previous snapshot.
+        
+        Only the new query times are copied under the lock; sorting happens
+        outside it, so callers should run this off the benchmark's event loop.
+        """
+        now = time.perf_counter()
+        with self._lock:
+            window = self.query_times[self._live_cursor:]
+            self._live_cursor = len(self.query_times)
+            total_queries = self._live_cursor
+            errors = self.error_count
+            operation = self.current_operation
+            cpu = self.cpu_samples[-1] if self.cpu_samples else 0.0
+            memory = self.memory_samples[-1] if self.memory_samples else 0.0
+        
+        interval = now - self._live_time if self._live_time else 0.0
+        self._live_time = now
+        window.sort()
+        
+        def percentile(p):
+            return window[min(int(len(window) * p / 100), len(window) - 1)] if window else 0.0
+        
+        return {
+            "elapsed_seconds": round(now - self.start_time, 3) if self.start_time else 0.0,
+            "operation": operation,
+            "total_queries": total_queries,
+            "errors": errors,
+            "window_seconds": round(interval, 3),
+            "ops_per_second": round(len(window) / interval, 2) if interval > 0 else 0.0,
+            "latency_ms": {
+                "p50": round(percentile(50) * 1000, 2),
+                "p95": round(percentile(95) * 1000, 2),
+                "p99": round(percentile(99) * 1000, 2),
+                "max": round(window[-1] * 1000, 2) if window else 0.0
+            },
+            "cpu_percent": round(cpu, 2),
+            "memory_mb": round(memory, 2)
+        }
             
     def _calculate_percentile(self, values: List[float], percentile: float) -> float:
         if not values:
@@ -59,8 +186,29 @@ class PerformanceMonitor:
         index = int(len(sorted_values) * percentile / 100)
         return sorted_values[min(index, len(sorted_values) - 1)]
     
+    def query_count(self) -> int:
+        with self._lock:
+            return len(self.query_times)
+    
+    def get_window_results(self, start_index: int, end_index: int, duration: float) -> Dict[str, Any]:
+        """Throughput and latency for the query times recorded between two query_count() marks"""
+        with self._lock:
+            window = self.query_times[start_index:end_index]
+        total_queries = len(window)
+        return {
+            "duration_seconds": round(duration, 3),
+            "total_queries": total_queries,
+            "ops_per_second": round(total_queries / duration, 2) if duration > 0 else 0.0,
+            "latency_ms": {
+                "avg": round(sum(window) / total_queries * 1000, 2) if window else 0.0,
+                "p50": round(self._calculate_percentile(window, 50) * 1000, 2),
+                "p95": round(self._calculate_percentile(window, 95) * 1000, 2),
+                "p99": round(self._calculate_percentile(window, 99) * 1000, 2)
+            }
+        }
+    
     def get_results(self) -> Dict[str, Any]:
-        duration = (self.end_time - self.start_time) if self.end_time and self.start_time else 0.0
+        duration = (self.end_time - self.start_time - self.excluded_seconds) if self.end_time and self.start_time else 0.0
         
         with self._lock:
             query_times_copy = self.query_times.copy()
@@ -104,6 +252,14 @@ class PerformanceMonitor:
             "memory_mb": {
                 "avg": round(avg_memory, 2),
                 "max": round(max_memory, 2)
-            }
+            },
+            "system": self.system_sampler.summary(),
+            "client": client_bound_report(
+                self.loop_probe.summary(),
+                round(avg_latency * 1000, 3),
+                round(avg_cpu, 2),
+                settings.CLIENT_BOUND_LAG_SHARE,
+                settings.CLIENT_BOUND_CPU_PERCENT
+            )
         }
 
@@ -0,0 +1,239 @@
+import codecs
+import csv
+import json
+import os
+import re
+import struct
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterator, Iterable, Optional, Tuple
+from bson import json_util
+from app.core.config import settings
+from app.core.exceptions import ConfigurationError
+
+# Query logs are normalised into a compact binary trace: a magic header, then
+# a stream of records. A "F" record defines a fingerprint (id + normalised
+# text) the first time it is seen; an "E" record is one event: microsecond
+# offset from the first event, fingerprint id and the backend command as JSON.
+# Reader and writer both stream, so trace size is bounded by disk, not memory.
+MAGIC = b"OSTRACE1"
+_FINGERPRINT = struct.Struct("<II")
+_EVENT = struct.Struct("<QII")
+
+def resolve_trace_path(path: str) -> str:
+    """Trace and log paths are relative to TRACE_DIR; anything resolving outside it is rejected"""
+    root = os.path.realpath(settings.TRACE_DIR)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise ConfigurationError(f"Trace path {path} must be inside {settings.TRACE_DIR}")
+    return resolved
+
+# Fingerprinting: literals become "?" so queries differing only in values share a fingerprint
+
+_SQL_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_SQL_STRING = re.compile(r"'(?:[^']|'')*'")
+_SQL_NUMBER = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?\b", re.I)
+_SQL_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_DIGITS = re.compile(r"\d+")
+
+def fingerprint_query(query: str) -> str:
+    query = _SQL_COMMENT.sub(" ", query)
+    query = _SQL_STRING.sub("?", query)
+    query = _SQL_NUMBER.sub("?", query)
+    query = _SQL_LIST.sub("(?+)", query)
+    return _WHITESPACE.sub(" ", query).strip().lower()
+
+def _shape(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _shape(child) for key, child in value.items()}
+    if isinstance(value, list):
+        return [_shape(value[0])] if value else []
+    return "?"
+
+def fingerprint_command(command: Dict[str, Any]) -> str:
+    """Fingerprint of a normalised command, whichever backend it targets"""
+    if "sql" in command:
+        return fingerprint_query(command["sql"])
+    if "cql" in command:
+        return fingerprint_query(command["cql"])
+    if "flux" in command:
+        return fingerprint_query(command["flux"])
+    if "args" in command:
+        args = command["args"]
+        name = str(args[0]).upper()
+        return f"{name} {_DIGITS.sub('?', str(args[1]))}" if len(args) > 1 else name
+    if "db_command" in command:
+        # The first key names the command and its value the collection; keep both
+        (name, target), *rest = command["db_command"].items()
+        return json.dumps({name: target, **_shape(dict(rest))}, sort_keys=True)
+    if "http" in command:
+        http = command["http"]
+        body = json.dumps(_shape(http.get("body")), sort_keys=True) if http.get("body") is not None else ""
+        return f"{http['method'].upper()} {_DIGITS.sub('?', http['path'])} {body}".strip()
+    raise ConfigurationError(f"Unrecognised trace command {sorted(command)}")
+
+# Log parsers: each yields (epoch seconds, command) in log order
+
+_PG_PARAMETER = re.compile(r"\$(\d+) = ('(?:[^']|'')*'|NULL)")
+_PG_STATEMENT = re.compile(r"^(?:duration: [\d.]+ ms\s+)?(?:statement|execute [^:]*): (.*)$", re.S)
+
+def _parse_pg_time(value: str) -> float:
+    # "2024-05-01 12:00:00.123 UTC": offsets are relative, so the zone name is ignored
+    return datetime.strptime(value[:23], "%Y-%m-%d %H:%M:%S.%f").replace(tzinfo=timezone.utc).timestamp()
+
+def parse_postgres_csv(lines: Iterable[str]) -> Iterator[Tuple[float, Dict[str, Any]]]:
+    """
+    PostgreSQL csvlog (log_destination = 'csvlog') with log_statement = 'all'
+    or log_min_duration_statement = 0. Bind parameters logged in the detail
+    column are substituted back into extended-protocol statements.
+    """
+    for row in csv.reader(lines):
+        if len(row) < 15:
+            continue
+        match = _PG_STATEMENT.match(row[13])
+        if not match:
+            continue
+        sql = match.group(1)
+        if row[14].startswith("parameters:"):
+            parameters = dict(_PG_PARAMETER.findall(row[14]))
+            for number in sorted(parameters, key=int, reverse=True):
+                sql = sql.replace(f"${number}", parameters[number])
+        yield _parse_pg_time(row[0]), {"sql": sql}
+
+_MONGO_SKIPPED_COMMANDS = {"getMore", "killCursors", "endSessions"}
+_MONGO_SESSION_FIELDS = {"lsid", "txnNumber", "autocommit", "startTransaction", "readConcern"}
+
+def _mongo_time(value: Any) -> float:
+    if isinstance(value, datetime):
+        return (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).timestamp()
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+
+def parse_mongodb_profile(lines: Iterable[str]) -> Iterator[Tuple[float, Dict[str, Any]]]:
+    """
+    system.profile documents as Extended JSON lines (mongoexport -c system.profile).
+    Session and cluster fields are dropped; cursor continuations are skipped
+    because the replayed find/aggregate already fetches its first batch.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        document = json_util.loads(line)
+        command = document.get("command")
+        if not isinstance(command, dict) or not command or next(iter(command)) in _MONGO_SKIPPED_COMMANDS:
+            continue
+        command = {
+            key: value for key, value in command.items()
+            if not key.startswith("$") and key not in _MONGO_SESSION_FIELDS
+        }
+        yield _mongo_time(document["ts"]), {"db_command": command}
+
+_REDIS_LINE = re.compile(r'^(\d+\.\d+) \[[^\]]*\] (.*)$')
+_REDIS_ARGUMENT = re.compile(r'"((?:[^"\\]|\\.)*)"')
+
+def parse_redis_monitor(lines: Iterable[str]) -> Iterator[Tuple[float, Dict[str, Any]]]:
+    """redis-cli MONITOR output: 1700000000.123456 [0 127.0.0.1:6379] "SET" "key" "value\""""
+    for line in lines:
+        match = _REDIS_LINE.match(line.rstrip("\n"))
+        if not match:
+            continue
+        # MONITOR escapes non-printable bytes as \xHH; restore the bytes, then decode as UTF-8
+        args = [
+            codecs.escape_decode(argument.encode())[0].decode("utf-8", "backslashreplace")
+            for argument in _REDIS_ARGUMENT.findall(match.group(2))
+        ]
+        if args:
+            yield float(match.group(1)), {"args": args}
+
+def parse_ndjson(lines: Iterable[str]) -> Iterator[Tuple[float, Dict[str, Any]]]:
+    """
+    Generic format, one JSON object per line: {"ts": <epoch seconds or ISO time>, "command": {...}}
+    where command holds one of "sql", "cql", "flux", "args", "db_command" or "http".
+    """
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        event = json_util.loads(line)
+        ts = event["ts"]
+        yield (float(ts) if isinstance(ts, (int, float)) else _mongo_time(ts)), event["command"]
+
+LOG_PARSERS = {
+    "postgres_csv": parse_postgres_csv,
+    "mongodb_profile": parse_mongodb_profile,
+    "redis_monitor": parse_redis_monitor,
+    "ndjson": parse_ndjson
+}
+
+class TraceWriter:
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+        self._fingerprints: Dict[str, int] = {}
+        self._origin: Optional[float] = None
+        self.events = 0
+
+    def write(self, timestamp: float, command: Dict[str, Any], fingerprint: Optional[str] = None) -> None:
+        fingerprint = fingerprint or fingerprint_command(command)
+        fingerprint_id = self._fingerprints.get(fingerprint)
+        if fingerprint_id is None:
+            fingerprint_id = self._fingerprints[fingerprint] = len(self._fingerprints)
+            text = fingerprint.encode()
+            self._file.write(b"F" + _FINGERPRINT.pack(fingerprint_id, len(text)) + text)
+        if self._origin is None:
+            self._origin = timestamp
+        # Logs interleave slightly out of order across sessions; never schedule before the origin
+        offset_us = max(0, round((timestamp - self._origin) * 1e6))
+        payload = json_util.dumps(command).encode()
+        self._file.write(b"E" + _EVENT.pack(offset_us, fingerprint_id, len(payload)) + payload)
+        self.events += 1
+
+    @property
+    def fingerprint_count(self) -> int:
+        return len(self._fingerprints)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class TraceReader:
+    """Streams (offset seconds, fingerprint id, command) from a binary trace; fingerprints fills as it reads"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fingerprints: Dict[int, str] = {}
+
+    def __iter__(self) -> Iterator[Tuple[float, int, Dict[str, Any]]]:
+        with open(self.path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ConfigurationError(f"{self.path} is not a trace file")
+            while True:
+                kind = file.read(1)
+                if not kind:
+                    return
+                if kind == b"F":
+                    fingerprint_id, length = _FINGERPRINT.unpack(file.read(_FINGERPRINT.size))
+                    self.fingerprints[fingerprint_id] = file.read(length).decode()
+                elif kind == b"E":
+                    offset_us, fingerprint_id, length = _EVENT.unpack(file.read(_EVENT.size))
+                    yield offset_us / 1e6, fingerprint_id, json_util.loads(file.read(length))
+                else:
+                    raise ConfigurationError(f"Corrupt trace record in {self.path}")
+
+def ingest_log(log_path: str, log_format: str, trace_path: str, limit: Optional[int] = None) -> Dict[str, Any]:
+    """Convert a query log into a binary trace, reading and writing one event at a time"""
+    parser = LOG_PARSERS.get(log_format)
+    if not parser:
+        raise ConfigurationError(f"Unknown log format {log_format}; choose one of {', '.join(LOG_PARSERS)}")
+    with open(log_path, newline="", encoding="utf-8", errors="replace") as log, TraceWriter(trace_path) as writer:
+        for timestamp, command in parser(log):
+            writer.write(timestamp, command)
+            if limit and writer.events >= limit:
+                break
+        return {"events": writer.events, "fingerprints": writer.fingerprint_count}
@@ -0,0 +1,231 @@
+import json
+import os
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+import numpy as np
+from app.core.config import settings
+from app.core.exceptions import ExperimentNotFoundError
+
+# Raw per-operation samples are stored outside Postgres as a directory of
+# compressed columnar chunks (one .npz per CHUNK_ROWS samples) plus a meta.json
+# index holding each chunk's time range. Range reads and downsampling only
+# decompress the chunks that overlap the requested window.
+CHUNK_ROWS = 65536
+META_FILE = "meta.json"
+
+def _archive_dir(experiment_id: str) -> str:
+    return os.path.join(settings.SAMPLE_ARCHIVE_DIR, experiment_id)
+
+def write_sample_archive(experiment_id: str, samples: Dict[str, Any], chunk_rows: int = CHUNK_ROWS) -> Dict[str, Any]:
+    """
+    Persist samples captured by PerformanceMonitor.get_samples()
+
+    Args:
+        experiment_id: Archive key
+        samples: Columns "timestamp", "operation", "latency", "error" and the "operations" code map
+        chunk_rows: Samples per compressed chunk
+    """
+    timestamps = np.frombuffer(samples["timestamp"], dtype=np.float64)
+    operations = np.frombuffer(samples["operation"], dtype=np.uint8)
+    latencies = np.frombuffer(samples["latency"], dtype=np.float64).astype(np.float32)
+    errors = np.frombuffer(samples["error"], dtype=np.uint8).astype(bool)
+
+    directory = _archive_dir(experiment_id)
+    os.makedirs(directory, exist_ok=True)
+
+    chunks = []
+    total_bytes = 0
+    for index, offset in enumerate(range(0, len(timestamps), chunk_rows)):
+        end = offset + chunk_rows
+        file_name = f"chunk_{index:05d}.npz"
+        path = os.path.join(directory, file_name)
+        np.savez_compressed(
+            path,
+            timestamp=timestamps[offset:end],
+            operation=operations[offset:end],
+            latency=latencies[offset:end],
+            error=errors[offset:end]
+        )
+        total_bytes += os.path.getsize(path)
+        chunks.append({
+            "file": file_name,
+            "rows": int(min(end, len(timestamps)) - offset),
+            "t_min": float(timestamps[offset]),
+            "t_max": float(timestamps[min(end, len(timestamps)) - 1])
+        })
+
+    meta = {
+        "experiment_id": experiment_id,
+        "samples": int(len(timestamps)),
+        "operations": {str(code): name for code, name in samples["operations"].items()},
+        "chunks": chunks
+    }
+    with open(os.path.join(directory, META_FILE), "w") as f:
+        json.dump(meta, f)
+
+    return {
+        "samples": meta["samples"],
+        "chunks": len(chunks),
+        "compressed_bytes": total_bytes
+    }
+
+def load_archive_meta(experiment_id: str) -> Dict[str, Any]:
+    path = os.path.join(_archive_dir(experiment_id), META_FILE)
+    if not os.path.exists(path):
+        raise ExperimentNotFoundError(f"No sample archive for experiment {experiment_id}")
+    with open(path, "r") as f:
+        return json.load(f)
+
+def _operation_code(meta: Dict[str, Any], operation: Optional[str]) -> Optional[int]:
+    if operation is None:
+        return None
+    for code, name in meta["operations"].items():
+        if name == operation:
+            return int(code)
+    return -1
+
+def _iter_chunks(
+    experiment_id: str,
+    meta: Dict[str, Any],
+    start: Optional[float],
+    end: Optional[float],
+    operation: Optional[str]
+) -> Iterator[Dict[str, np.ndarray]]:
+    """Yield only the chunks overlapping [start, end), trimmed and filtered"""
+    code = _operation_code(meta, operation)
+    directory = _archive_dir(experiment_id)
+    for chunk in meta["chunks"]:
+        if start is not None and chunk["t_max"] < start:
+            continue
+        if end is not None and chunk["t_min"] >= end:
+            break
+        with np.load(os.path.join(directory, chunk["file"])) as data:
+            columns = {name: data[name] for name in ("timestamp", "operation", "latency", "error")}
+        timestamps = columns["timestamp"]
+        lo = np.searchsorted(timestamps, start, side="left") if start is not None else 0
+        hi = np.searchsorted(timestamps, end, side="left") if end is not None else len(timestamps)
+        columns = {name: values[lo:hi] for name, values in columns.items()}
+        if code is not None:
+            mask = columns["operation"] == code
+            columns = {name: values[mask] for name, values in columns.items()}
+        if len(columns["timestamp"]):
+            yield columns
+
+def read_samples(
+    experiment_id: str,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    operation: Optional[str] = None,
+    limit: int = 10000
+) -> Dict[str, Any]:
+    """Return raw samples in a time range (seconds since experiment start), at most limit rows"""
+    meta = load_archive_meta(experiment_id)
+    names = meta["operations"]
+    rows: List[Dict[str, Any]] = []
+    truncated = False
+    for columns in _iter_chunks(experiment_id, meta, start, end, operation):
+        take = min(limit - len(rows), len(columns["timestamp"]))
+        for i in range(take):
+            rows.append({
+                "timestamp": round(float(columns["timestamp"][i]), 6),
+                "operation": names.get(str(int(columns["operation"][i]))),
+                "latency_ms": round(float(columns["latency"][i]) * 1000, 4),
+                "error": bool(columns["error"][i])
+            })
+        if take < len(columns["timestamp"]):
+            truncated = True
+            break
+    return {
+        "experiment_id": experiment_id,
+        "samples": rows,
+        "truncated": truncated
+    }
+
+def _bucket_stats(
+    bucket_ids: np.ndarray,
+    latencies: np.ndarray,
+    errors: np.ndarray,
+    bucket_seconds: float,
+    percentiles: List[float]
+) -> List[Dict[str, Any]]:
+    boundaries = np.flatnonzero(np.diff(bucket_ids)) + 1
+    starts = np.concatenate(([0], boundaries))
+    counts = np.diff(np.concatenate((starts, [len(latencies)])))
+    mins = np.minimum.reduceat(latencies, starts)
+    maxs = np.maximum.reduceat(latencies, starts)
+    sums = np.add.reduceat(latencies.astype(np.float64), starts)
+    error_counts = np.add.reduceat(errors.astype(np.int64), starts)
+
+    buckets = []
+    for i, offset in enumerate(starts):
+        segment = latencies[offset:offset + counts[i]]
+        values = np.percentile(segment, percentiles) if percentiles else []
+        buckets.append({
+            "start": round(float(bucket_ids[offset] * bucket_seconds), 6),
+            "count": int(counts[i]),
+            "errors": int(error_counts[i]),
+            "ops_per_second": round(float(counts[i] / bucket_seconds), 2),
+            "latency_ms": {
+                "min": round(float(mins[i]) * 1000, 4),
+                "max": round(float(maxs[i]) * 1000, 4),
+                "avg": round(float(sums[i] / counts[i]) * 1000, 4),
+                **{f"p{p:g}": round(float(v) * 1000, 4) for p, v in zip(percentiles, values)}
+            }
+        })
+    return buckets
+
+def downsample_samples(
+    experiment_id: str,
+    bucket_seconds: float = 1.0,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    operation: Optional[str] = None,
+    percentiles: Tuple[float, ...] = (50, 95, 99)
+) -> Dict[str, Any]:
+    """
+    Aggregate samples into fixed time buckets server-side.
+
+    Chunks are processed in time order; the trailing, possibly incomplete
+    bucket of each chunk is carried into the next one, so memory is bounded
+    by one chunk plus one bucket rather than the whole archive.
+    """
+    meta = load_archive_meta(experiment_id)
+    percentiles = list(percentiles)
+    buckets: List[Dict[str, Any]] = []
+    carry_ids = np.empty(0, dtype=np.int64)
+    carry_latencies = np.empty(0, dtype=np.float32)
+    carry_errors = np.empty(0, dtype=bool)
+
+    for columns in _iter_chunks(experiment_id, meta, start, end, operation):
+        ids = np.concatenate((carry_ids, np.floor(columns["timestamp"] / bucket_seconds).astype(np.int64)))
+        latencies = np.concatenate((carry_latencies, columns["latency"]))
+        errors = np.concatenate((carry_errors, columns["error"]))
+        complete = ids < ids[-1]
+        if complete.any():
+            buckets.extend(_bucket_stats(ids[complete], latencies[complete], errors[complete], bucket_seconds, percentiles))
+        carry_ids, carry_latencies, carry_errors = ids[~complete], latencies[~complete], errors[~complete]
+
+    if len(carry_ids):
+        buckets.extend(_bucket_stats(carry_ids, carry_latencies, carry_errors, bucket_seconds, percentiles))
+
+    return {
+        "experiment_id": experiment_id,
+        "bucket_seconds": bucket_seconds,
+        "operation": operation,
+        "buckets": buckets
+    }
+
+def load_operation_samples(experiment_id: str) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Load (timestamps, latencies) per operation name for whole-run analysis"""
+    meta = load_archive_meta(experiment_id)
+    timestamps: Dict[str, List[np.ndarray]] = {}
+    latencies: Dict[str, List[np.ndarray]] = {}
+    for columns in _iter_chunks(experiment_id, meta, None, None, None):
+        for code in np.unique(columns["operation"]):
+            name = meta["operations"].get(str(int(code)), "unknown")
+            mask = columns["operation"] == code
+            timestamps.setdefault(name, []).append(columns["timestamp"][mask])
+            latencies.setdefault(name, []).append(columns["latency"][mask])
+    return {
+        name: (np.concatenate(timestamps[name]), np.concatenate(latencies[name]).astype(np.float64))
+        for name in timestamps
+    }
@@ -0,0 +1,192 @@
+import math
+from typing import Callable, Dict, Any, List, Optional, Tuple
+import numpy as np
+
+def mann_whitney_u(a: np.ndarray, b: np.ndarray) -> Tuple[float, float]:
+    """
+    Two-sided Mann-Whitney U test using the normal approximation with tie correction.
+
+    Returns (u_statistic, p_value). Ranks come from a single argsort over the
+    pooled samples, so the cost is O((n + m) log(n + m)).
+    """
+    n1, n2 = len(a), len(b)
+    if n1 == 0 or n2 == 0:
+        return 0.0, 1.0
+    pooled = np.concatenate((a, b))
+    order = np.argsort(pooled, kind="mergesort")
+    sorted_values = pooled[order]
+
+    # Average ranks for ties: every member of a tie group gets the mean of its positions
+    _, group_starts, group_counts = np.unique(sorted_values, return_index=True, return_counts=True)
+    average_ranks = group_starts + (group_counts + 1) / 2.0
+    ranks = np.empty(len(pooled), dtype=np.float64)
+    ranks[order] = np.repeat(average_ranks, group_counts)
+
+    u1 = ranks[:n1].sum() - n1 * (n1 + 1) / 2.0
+    n = n1 + n2
+    tie_term = (group_counts ** 3 - group_counts).sum() / (n * (n - 1)) if n > 1 else 0.0
+    sigma = math.sqrt(n1 * n2 / 12.0 * ((n + 1) - tie_term))
+    if sigma == 0:
+        return float(u1), 1.0
+    z = (u1 - n1 * n2 / 2.0) / sigma
+    return float(u1), float(math.erfc(abs(z) / math.sqrt(2)))
+
+def sorted_quantile(sorted_values: np.ndarray, q: float) -> np.ndarray:
+    """Linear-interpolated quantile along the last axis of an already sorted array"""
+    position = q * (sorted_values.shape[-1] - 1)
+    lower = int(math.floor(position))
+    upper = min(lower + 1, sorted_values.shape[-1] - 1)
+    fraction = position - lower
+    return sorted_values[..., lower] * (1 - fraction) + sorted_values[..., upper] * fraction
+
+def bootstrap_differences(
+    a: np.ndarray,
+    b: np.ndarray,
+    statistics: Dict[str, Callable[[np.ndarray], np.ndarray]],
+    iterations: int = 1000,
+    confidence: float = 0.95,
+    rng: Optional[np.random.Generator] = None,
+    batch_size: int = 50
+) -> Dict[str, Dict[str, float]]:
+    """
+    Percentile bootstrap CIs for statistic(b) - statistic(a), for several statistics at once.
+
+    Each statistic receives a 2-D array whose rows are sorted resamples and must
+    reduce along axis=1, so every resample is drawn and sorted once no matter
+    how many statistics are computed. Resamples are generated in batches to
+    keep memory at batch_size * len(sample).
+    """
+    rng = rng or np.random.default_rng()
+    sorted_a = np.sort(a)[np.newaxis, :]
+    sorted_b = np.sort(b)[np.newaxis, :]
+    differences = {name: np.empty(iterations, dtype=np.float64) for name in statistics}
+    for offset in range(0, iterations, batch_size):
+        size = min(batch_size, iterations - offset)
+        resampled_a = np.sort(a[rng.integers(0, len(a), size=(size, len(a)))], axis=1)
+        resampled_b = np.sort(b[rng.integers(0, len(b), size=(size, len(b)))], axis=1)
+        for name, statistic in statistics.items():
+            differences[name][offset:offset + size] = statistic(resampled_b) - statistic(resampled_a)
+
+    alpha = (1 - confidence) / 2
+    intervals = {}
+    for name, statistic in statistics.items():
+        low, high = np.quantile(differences[name], [alpha, 1 - alpha])
+        intervals[name] = {
+            "baseline": float(statistic(sorted_a)[0]),
+            "candidate": float(statistic(sorted_b)[0]),
+            "difference": float(statistic(sorted_b)[0] - statistic(sorted_a)[0]),
+            "ci_low": float(low),
+            "ci_high": float(high)
+        }
+    return intervals
+
+def classify_change(
+    baseline_value: float,
+    difference: float,
+    ci_low: float,
+    ci_high: float,
+    higher_is_better: bool,
+    p_value: Optional[float] = None,
+    alpha: float = 0.05,
+    min_effect: float = 0.02
+) -> str:
+    """Label a change as improvement, regression or noise"""
+    relative = abs(difference) / abs(baseline_value) if baseline_value else 0.0
+    excludes_zero = ci_low > 0 or ci_high < 0
+    significant = p_value is None or p_value < alpha
+    if not (excludes_zero and significant and relative >= min_effect):
+        return "noise"
+    increased = ci_low > 0
+    return "improvement" if increased == higher_is_better else "regression"
+
+def subsample(values: np.ndarray, max_samples: int, rng: np.random.Generator) -> np.ndarray:
+    if len(values) <= max_samples:
+        return values
+    return values[rng.choice(len(values), size=max_samples, replace=False)]
+
+def detect_shift(
+    history: List[float],
+    value: float,
+    higher_is_better: bool,
+    z_threshold: float = 3.0,
+    min_effect: float = 0.05,
+    min_history: int = 5,
+    cusum_slack: float = 0.5,
+    cusum_threshold: float = 4.0
+) -> Dict[str, Any]:
+    """
+    Check a new metric value against its rolling history.
+
+    Two tests run on values standardised by the history's median and MAD:
+    a robust z-score threshold for a single outlying run, and a one-sided
+    CUSUM over the history plus the new value for a sustained drift that no
+    single run would trip. Either must also exceed min_effect relative change.
+    """
+    if len(history) < min_history:
+        return {"value": value, "verdict": "insufficient_history", "history_size": len(history)}
+
+    values = np.asarray(history, dtype=np.float64)
+    median = float(np.median(values))
+    mad = float(np.median(np.abs(values - median))) * 1.4826
+    scale = mad if mad > 0 else max(abs(median) * 0.01, 1e-12)
+    z = (value - median) / scale
+    relative = (value - median) / median if median else 0.0
+
+    # Orient so positive means "worse" for both CUSUM directions
+    sign = -1.0 if higher_is_better else 1.0
+    standardized = sign * (np.append(values, value) - median) / scale
+    worse = better = 0.0
+    for point in standardized:
+        worse = max(0.0, worse + point - cusum_slack)
+        better = max(0.0, better - point - cusum_slack)
+
+    worse_run = sign * z > z_threshold or worse > cusum_threshold
+    better_run = -sign * z > z_threshold or better > cusum_threshold
+    if worse_run and abs(relative) >= min_effect and sign * relative > 0:
+        verdict = "regression"
+    elif better_run and abs(relative) >= min_effect and sign * relative < 0:
+        verdict = "improvement"
+    else:
+        verdict = "ok"
+
+    return {
+        "value": value,
+        "median": round(median, 4),
+        "mad": round(mad, 4),
+        "z_score": round(z, 3),
+        "relative_change": round(relative, 4),
+        "cusum": round(max(worse, better), 3),
+        "verdict": verdict,
+        "history_size": len(history)
+    }
+
+# Two-sided 95% Student t critical values for 1..30 degrees of freedom
+_T_CRITICAL_95 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042
+)
+
+def t_critical_95(degrees_of_freedom: int) -> float:
+    if degrees_of_freedom < 1:
+        return float("nan")
+    if degrees_of_freedom <= len(_T_CRITICAL_95):
+        return _T_CRITICAL_95[degrees_of_freedom - 1]
+    # Within 0.002 of the exact quantile for df > 30
+    return 1.96 + 2.5 / degrees_of_freedom
+
+def summarize_trials(values: List[float]) -> Dict[str, Any]:
+    """Mean, median, sample stdev and a t-based 95% CI of the mean over per-trial values"""
+    data = np.asarray(values, dtype=np.float64)
+    n = len(data)
+    mean = float(data.mean()) if n else 0.0
+    stdev = float(data.std(ddof=1)) if n > 1 else 0.0
+    half_width = t_critical_95(n - 1) * stdev / math.sqrt(n) if n > 1 else 0.0
+    return {
+        "n": n,
+        "mean": round(mean, 4),
+        "median": round(float(np.median(data)), 4) if n else 0.0,
+        "stdev": round(stdev, 4),
+        "ci95_low": round(mean - half_width, 4),
+        "ci95_high": round(mean + half_width, 4)
+    }
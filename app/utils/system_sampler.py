@@ -0,0 +1,180 @@
+import time
+import psutil
+from collections import deque
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+from app.core.exceptions import ConfigurationError
+
+# Process names watched by default when the server runs on the same host as the API
+DEFAULT_SERVER_PROCESSES = {
+    "postgres": ["postgres"],
+    "mysql": ["mysqld"],
+    "cockroachdb": ["cockroach"],
+    "mongodb": ["mongod"],
+    "redis": ["redis-server"],
+    "influxdb": ["influxd"]
+}
+DEFAULT_INTERVAL = 0.5
+MAX_SAMPLES = 20000
+# Matching processes by name is a full process-table scan, so new processes
+# (e.g. a Postgres backend per connection) are picked up on this period only
+PROCESS_RESCAN_SECONDS = 5.0
+
+def resource_sampling_settings(config: Dict[str, Any], database_type: str) -> Dict[str, Any]:
+    """Sampler options from an experiment config's optional "resource_sampling" object"""
+    raw = config.get("resource_sampling", {})
+    if not isinstance(raw, dict):
+        raise ConfigurationError("resource_sampling must be an object")
+    interval = raw.get("interval_seconds", DEFAULT_INTERVAL)
+    if not isinstance(interval, (int, float)) or not 0.05 <= interval <= 60:
+        raise ConfigurationError("resource_sampling.interval_seconds must be between 0.05 and 60")
+    pids = raw.get("pids", [])
+    names = raw.get("process_names", DEFAULT_SERVER_PROCESSES.get(database_type, []))
+    if not all(isinstance(pid, int) for pid in pids) or not all(isinstance(name, str) for name in names):
+        raise ConfigurationError("resource_sampling.pids must be integers and process_names strings")
+    return {"interval": float(interval), "pids": pids, "process_names": names}
+
+class SystemSampler:
+    """
+    Host-wide resource sampling for the database server's side of the load.
+
+    Every tick() reads cumulative kernel counters and records the rates since
+    the previous tick, so no call blocks: per-core CPU, disk read/write bytes
+    and IOPS, network bytes, context switches, and CPU/RSS aggregated per
+    watched process (by pid, or every process sharing a name). Each sample
+    also carries the throughput and latency of the queries recorded in the
+    same interval, so load and resources line up window by window.
+    """
+
+    def __init__(self, pids: Iterable[int] = (), process_names: Iterable[str] = (), max_samples: int = MAX_SAMPLES):
+        self.pids = list(pids)
+        self.process_names = set(process_names)
+        self.samples: deque = deque(maxlen=max_samples)
+        self._processes: Dict[int, Tuple[psutil.Process, str]] = {}
+        self._last_scan = 0.0
+        self._last: Optional[Dict[str, Any]] = None
+
+    def _counters(self) -> Dict[str, Any]:
+        disk = psutil.disk_io_counters()
+        net = psutil.net_io_counters()
+        return {
+            "time": time.perf_counter(),
+            "disk": (disk.read_bytes, disk.write_bytes, disk.read_count, disk.write_count) if disk else None,
+            "net": (net.bytes_recv, net.bytes_sent) if net else None,
+            "ctx_switches": psutil.cpu_stats().ctx_switches
+        }
+
+    def _refresh_processes(self, now: float) -> None:
+        if self._last_scan and now - self._last_scan < PROCESS_RESCAN_SECONDS:
+            return
+        self._last_scan = now
+        wanted = {}
+        for pid in self.pids:
+            wanted[pid] = str(pid)
+        if self.process_names:
+            for process in psutil.process_iter(["name"]):
+                if process.info["name"] in self.process_names:
+                    wanted[process.pid] = process.info["name"]
+        for pid, label in wanted.items():
+            if pid not in self._processes:
+                try:
+                    process = psutil.Process(pid)
+                    process.cpu_percent(None)  # First call only primes the counter
+                    self._processes[pid] = (process, label)
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+
+    def _process_usage(self) -> Dict[str, Dict[str, float]]:
+        usage: Dict[str, Dict[str, float]] = {}
+        for pid, (process, label) in list(self._processes.items()):
+            try:
+                with process.oneshot():
+                    cpu = process.cpu_percent(None)
+                    rss = process.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                del self._processes[pid]
+                continue
+            entry = usage.setdefault(label, {"processes": 0, "cpu_percent": 0.0, "rss_mb": 0.0})
+            entry["processes"] += 1
+            entry["cpu_percent"] += cpu
+            entry["rss_mb"] += rss / 1024 / 1024
+        return {
+            label: {"processes": entry["processes"], "cpu_percent": round(entry["cpu_percent"], 2), "rss_mb": round(entry["rss_mb"], 2)}
+            for label, entry in usage.items()
+        }
+
+    def start(self) -> None:
+        self.samples.clear()
+        psutil.cpu_percent(percpu=True)  # Prime the per-core counters
+        self._last_scan = 0.0
+        self._refresh_processes(time.perf_counter())
+        self._last = self._counters()
+
+    def tick(self, elapsed: float, load: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Record one sample covering the time since the previous tick; elapsed is seconds since experiment start"""
+        if self._last is None:
+            return None
+        current = self._counters()
+        interval = current["time"] - self._last["time"]
+        if interval <= 0:
+            return None
+
+        def rate(now_value: float, last_value: float) -> float:
+            return round((now_value - last_value) / interval, 2)
+
+        per_core = psutil.cpu_percent(percpu=True)
+        sample: Dict[str, Any] = {
+            "t": round(elapsed, 3),
+            "interval_seconds": round(interval, 3),
+            "cpu_percent": round(sum(per_core) / len(per_core), 2) if per_core else 0.0,
+            "cpu_percent_per_core": per_core,
+            "ctx_switches_per_second": rate(current["ctx_switches"], self._last["ctx_switches"])
+        }
+        if current["disk"] and self._last["disk"]:
+            read_bytes, write_bytes, reads, writes = (rate(now, last) for now, last in zip(current["disk"], self._last["disk"]))
+            sample["disk"] = {
+                "read_bytes_per_second": read_bytes,
+                "write_bytes_per_second": write_bytes,
+                "read_iops": reads,
+                "write_iops": writes
+            }
+        if current["net"] and self._last["net"]:
+            received, sent = (rate(now, last) for now, last in zip(current["net"], self._last["net"]))
+            sample["net"] = {"recv_bytes_per_second": received, "sent_bytes_per_second": sent}
+        self._refresh_processes(current["time"])
+        if self._processes:
+            sample["processes"] = self._process_usage()
+        if load is not None:
+            sample["load"] = {**load, "ops_per_second": round(load["queries"] / interval, 2)}
+        self._last = current
+        self.samples.append(sample)
+        return sample
+
+    def summary(self) -> Dict[str, Any]:
+        samples = list(self.samples)
+        if not samples:
+            return {"samples": 0}
+
+        def stats(values: List[float]) -> Dict[str, float]:
+            return {"avg": round(sum(values) / len(values), 2), "max": round(max(values), 2)} if values else {"avg": 0.0, "max": 0.0}
+
+        cores = len(samples[0]["cpu_percent_per_core"])
+        summary: Dict[str, Any] = {
+            "samples": len(samples),
+            "cpu_percent": stats([s["cpu_percent"] for s in samples]),
+            "cpu_percent_per_core": [stats([s["cpu_percent_per_core"][core] for s in samples]) for core in range(cores)],
+            "ctx_switches_per_second": stats([s["ctx_switches_per_second"] for s in samples])
+        }
+        for section in ("disk", "net"):
+            rows = [s[section] for s in samples if section in s]
+            if rows:
+                summary[section] = {key: stats([row[key] for row in rows]) for key in rows[0]}
+        labels = {label for s in samples for label in s.get("processes", {})}
+        if labels:
+            summary["processes"] = {
+                label: {
+                    "cpu_percent": stats([s["processes"][label]["cpu_percent"] for s in samples if label in s.get("processes", {})]),
+                    "rss_mb": stats([s["processes"][label]["rss_mb"] for s in samples if label in s.get("processes", {})])
+                }
+                for label in sorted(labels)
+            }
+        return summary
@@ -1,15 +1,49 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Tuple, Iterable, Iterator
 import time
-import random
-import string
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import math
+import threading
+from benchmarks.encoding import EncodedPayloads, encode_payloads
+from benchmarks.sampling import PhaseSampler
+from benchmarks.warmup import SteadyStateDetector
+from app.utils.dataset_cache import Dataset, dataset_cache
+from telemetry.metrics import metrics_enabled, operation_recorders
+from telemetry.breakdown import LatencyBreakdown, activate as activate_breakdown
+from telemetry.tracing import operation_tracer, start_span
 
 class BaseBenchmark(ABC):
+    default_operations: List[str] = []
+    # Operations that populate the data later operations read; trials always run these first
+    load_operations: Tuple[str, ...] = ()
+    # Config keys besides rows/data_size/batch_size that shape the loaded data (see app/services/sweep.py)
+    dataset_parameters: Tuple[str, ...] = ()
+    # Payload encodings the backend can store (benchmarks/encoding.py); the first is the default
+    payload_encodings: Tuple[str, ...] = ()
+    # Whether operations run on instrumented SQLAlchemy engines (telemetry/breakdown.py)
+    latency_breakdown_supported = False
+    # Whether wl_pool can open dedicated pools of a given size (app/services/pool_tuning.py)
+    pool_tuning_supported = False
+    
     def __init__(self):
         self.monitor = None
+        self.backend = type(self).__name__.replace("Benchmark", "").lower()
+        self._op_metrics = None
+        self.current_operation = None
+        self.tracer = operation_tracer(self.backend)
+        self.sampling: Optional[Dict[str, Any]] = None
+        self._phase_samplers: Dict[str, PhaseSampler] = {}
+        self.cancelled = threading.Event()
+        self._phase_latencies: Optional[List[float]] = None
+        # Seed for generate_test_data; equal seeds give identical (and shared, cached) datasets
+        self.data_seed = 0
+        self.dataset_lookups = {"hits": 0, "misses": 0}
+        self.payload_encoding = self.payload_encodings[0] if self.payload_encodings else ""
+        self.warmup: Optional[Dict[str, Any]] = None
+        self.warmup_report: Optional[Dict[str, Any]] = None
+        self._warmup_detector: Optional[SteadyStateDetector] = None
+        self.breakdown: Optional[LatencyBreakdown] = None
         
     def set_monitor(self, monitor):
         self.monitor = monitor
@@ -26,9 +60,220 @@ class BaseBenchmark(ABC):
     async def teardown(self) -> None:
         pass
     
-    def _record_query_time(self, query_time: float):
+    # Workload adapter (see benchmarks/workload.py). Blocking adapters implement the
+    # per-operation methods as plain functions and are driven from worker threads.
+    wl_blocking = False
+    
+    def wl_connect(self):
+        """Context manager yielding a per-worker handle passed to the wl_* operations"""
+        raise NotImplementedError(f"{type(self).__name__} does not support declarative workloads")
+    
+    async def wl_setup(self, spec) -> None:
+        raise NotImplementedError(f"{type(self).__name__} does not support declarative workloads")
+    
+    async def wl_teardown(self, spec) -> None:
+        raise NotImplementedError(f"{type(self).__name__} does not support declarative workloads")
+    
+    def wl_pool(self, pool_size: int, stats):
+        """
+        Async context manager yielding a wl_connect replacement backed by a new pool
+        of pool_size connections, opened in full before it is yielded and closed on
+        exit. Checkout waits are reported to stats.add_wait and new connection setup
+        to stats.add_connect.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support pool tuning")
+    
+    # Trace replay adapter (see benchmarks/replay.py): replay_command names the command
+    # kind this backend accepts ("sql", "db_command", "args", ...); handles come from
+    # replay_connect, which defaults to the workload connection.
+    replay_command: Optional[str] = None
+    
+    def replay_connect(self):
+        return self.wl_connect()
+    
+    def replay_execute(self, handle, command: Dict[str, Any]):
+        raise NotImplementedError(f"{type(self).__name__} does not support trace replay")
+    
+    def configure_sampling(self, settings: Optional[Dict[str, Any]]):
+        """Adaptive sampling options from benchmarks.sampling.sampling_settings; None keeps fixed counts"""
+        self.sampling = settings
+    
+    def configure_warmup(self, settings: Optional[Dict[str, Any]]):
+        """Warm-up options from benchmarks.warmup.warmup_settings; None starts measuring cold"""
+        self.warmup = settings
+    
+    def configure_breakdown(self, enabled: bool):
+        """Decompose each operation's query time into pool acquire, execution and client time"""
+        self.breakdown = LatencyBreakdown() if enabled else None
+    
+    def cancel(self):
+        """Ask running sample loops, including ones in worker threads, to stop at their next iteration"""
+        self.cancelled.set()
+    
+    def _samples(self, default: int, phase: Optional[str] = None) -> Iterator[int]:
+        """
+        Indices for a timed loop that records one query time per iteration.
+        
+        Yields `default` indices, or under adaptive sampling as many as the
+        target percentile needs to converge. The count taken and why it
+        stopped are reported in phase_samples under `phase` (default: the
+        current operation).
+        """
+        sampler = PhaseSampler(self.sampling, default, self.cancelled)
+        self._phase_samplers[phase or self.current_operation] = sampler
+        # Stays attached after the indices run out so queries still in flight on
+        # other workers count; the next phase or operation detaches it
+        self._phase_latencies = sampler.latencies
+        yield from sampler
+    
+    @property
+    def phase_samples(self) -> Dict[str, Dict[str, Any]]:
+        return {name: sampler.report() for name, sampler in self._phase_samplers.items()}
+    
+    def clear_phase_samples(self):
+        self._phase_samplers = {}
+    
+    def _begin_operation(self, operation: str):
+        """Tag subsequently recorded query times with the operation being benchmarked"""
+        self.current_operation = operation
+        self._phase_latencies = None
+        if self.breakdown is not None:
+            self.breakdown.begin(operation)
+            activate_breakdown(self.breakdown)
+        if self.monitor:
+            self.monitor.set_operation(operation)
+        # Resolve the labelled metric children once so recording stays a thread-local lookup and an add
+        self._op_metrics = operation_recorders(self.backend, operation) if metrics_enabled() else None
+    
+    def _record_query_time(self, query_time: float, error: bool = False):
+        if self._warmup_detector is not None:
+            # Warm-up queries only feed steady-state detection, never the reported metrics
+            self._warmup_detector.record()
+            return
+        if self.breakdown is not None:
+            self.breakdown.add_query(query_time)
+        if self._phase_latencies is not None:
+            self._phase_latencies.append(query_time)
         if self.monitor:
-            self.monitor.record_query_time(query_time)
+            self.monitor.record_query_time(query_time, error=error)
+        if self._op_metrics:
+            latency, errors = self._op_metrics
+            latency.observe(query_time)
+            if error:
+                errors.inc()
+        if self.tracer:
+            self.tracer.record(self.current_operation, query_time, error)
+    
+    async def warm_up(self, config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Run the read-side operations unmeasured until throughput is steady.
+        
+        Repeats run() with warmup.operations (default: the config's operations
+        minus load operations) until SteadyStateDetector reports steady
+        windowed throughput, max_seconds passes or the experiment is
+        cancelled; steadiness is checked between passes. Nothing recorded
+        meanwhile reaches the monitor, metrics, traces or phase_samples, and
+        the monitor excludes the warm-up from the experiment's duration.
+        """
+        if not self.warmup:
+            return None
+        operations = self.warmup["operations"] or [
+            op for op in config.get("operations", self.default_operations) if op not in self.load_operations
+        ]
+        if not operations:
+            return None
+        detector = SteadyStateDetector(self.warmup["window_seconds"], self.warmup["stable_windows"], self.warmup["tolerance"])
+        sampling, samplers = self.sampling, self._phase_samplers
+        # Fixed counts: adaptive sampling would never see these latencies converge
+        self.sampling, self._phase_samplers = None, {}
+        self._warmup_detector = detector
+        started = time.perf_counter()
+        passes = 0
+        stopped_by = "steady"
+        try:
+            with self._phase("warmup"):
+                while not detector.steady:
+                    if self.cancelled.is_set():
+                        stopped_by = "cancelled"
+                        break
+                    if time.perf_counter() - started >= self.warmup["max_seconds"]:
+                        stopped_by = "max_seconds"
+                        break
+                    queries = detector.queries
+                    await self.run({**config, "operations": operations})
+                    passes += 1
+                    if detector.queries == queries:
+                        stopped_by = "no_queries"
+                        break
+        finally:
+            self._warmup_detector = None
+            self.sampling, self._phase_samplers = sampling, samplers
+            elapsed = time.perf_counter() - started
+            if self.monitor:
+                self.monitor.exclude_time(elapsed)
+        variation = detector.variation()
+        return {
+            "operations": operations,
+            "passes": passes,
+            "queries": detector.queries,
+            "seconds": round(elapsed, 3),
+            "stopped_by": stopped_by,
+            "throughput_variation": round(variation, 4) if variation is not None else None,
+            "window_ops_per_second": [round(value, 2) for value in detector.windows[-self.warmup["stable_windows"]:]]
+        }
+    
+    async def run_phases(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        run(), with the optional phases every backend shares.
+        
+        With warm-up configured, load operations run first, then warm_up(),
+        then the remaining operations, so the load is measured once and
+        reads are measured warm. A positive steady_state_duration then
+        repeats the read-side operations for that many seconds as a measured
+        sustained-load phase, reported under "steady_state".
+        """
+        operations = list(config.get("operations", self.default_operations))
+        reads = [op for op in operations if op not in self.load_operations]
+        self.warmup_report = None
+        if self.warmup and reads:
+            loads = [op for op in operations if op in self.load_operations]
+            results = await self.run({**config, "operations": loads}) if loads else {}
+            self.warmup_report = await self.warm_up(config)
+            results.update(await self.run({**config, "operations": reads}))
+        else:
+            results = await self.run(config)
+        duration = config.get("steady_state_duration", 0)
+        if duration > 0 and reads:
+            results["steady_state"] = await self._run_steady_state(config, reads, duration)
+        return results
+    
+    async def _run_steady_state(self, config: Dict[str, Any], operations: List[str], duration: float) -> Dict[str, Any]:
+        queries = self.monitor.query_count() if self.monitor else 0
+        # Passes run fixed counts and keep the measured run's phase_samples
+        sampling, samplers = self.sampling, self._phase_samplers
+        self.sampling, self._phase_samplers = None, {}
+        started = time.perf_counter()
+        passes = 0
+        try:
+            with self._phase("steady_state"):
+                while time.perf_counter() - started < duration and not self.cancelled.is_set():
+                    await self.run({**config, "operations": operations})
+                    passes += 1
+        finally:
+            self.sampling, self._phase_samplers = sampling, samplers
+        elapsed = time.perf_counter() - started
+        query_count = (self.monitor.query_count() - queries) if self.monitor else 0
+        return {
+            "duration_seconds": round(elapsed, 3),
+            "passes": passes,
+            "queries_executed": query_count,
+            "queries_per_second": round(query_count / elapsed, 2) if elapsed > 0 else 0,
+            "concurrent_users": config.get("concurrent_users", 1)
+        }
+    
+    def _phase(self, name: str):
+        """Trace span around a benchmark-internal phase such as warm-up"""
+        return start_span(f"benchmark.{name}", {"db.system": self.backend})
     
     def _time_operation(self, func, *args, **kwargs):
         start = time.perf_counter()
@@ -37,35 +282,26 @@ class BaseBenchmark(ABC):
         self._record_query_time(elapsed)
         return result, elapsed
     
-    def generate_test_data(self, num_rows: int, num_fields: int = 5, data_size: str = "small") -> List[Dict[str, Any]]:
+    def generate_test_data(self, num_rows: int, num_fields: int = 5, data_size: str = "small") -> Dataset:
         """
         Generate test data with configurable complexity
         
+        Rows come from the on-disk dataset cache (app/utils/dataset_cache.py),
+        so a dataset is generated once per (rows, fields, data_size, data_seed)
+        and memory-mapped by every later run.
+        
         Args:
             num_rows: Number of rows to generate
             num_fields: Number of fields per row
             data_size: "small", "medium", or "large" - affects field sizes
         """
-        field_size_map = {
-            "small": 10,
-            "medium": 50,
-            "large": 200
-        }
-        field_size = field_size_map.get(data_size, 10)
-        
-        data = []
-        for i in range(num_rows):
-            row = {
-                "id": i,
-                "name": ''.join(random.choices(string.ascii_letters, k=20)),
-                "email": f"user{i}@example.com",
-                "age": random.randint(18, 80),
-                "score": random.randint(0, 100)
-            }
-            for j in range(num_fields - 5):
-                row[f"field_{j}"] = ''.join(random.choices(string.ascii_letters + string.digits, k=field_size))
-            data.append(row)
-        return data
+        dataset = dataset_cache.get(num_rows, num_fields, data_size, self.data_seed)
+        self.dataset_lookups["hits" if dataset.cache_hit else "misses"] += 1
+        return dataset
+    
+    def _encode_payloads(self, rows: Iterable[Dict[str, Any]]) -> EncodedPayloads:
+        """Encode rows with the experiment's payload_encoding; call before the timed region starts"""
+        return encode_payloads(rows, self.payload_encoding)
     
     async def _run_concurrent_operations(
         self,
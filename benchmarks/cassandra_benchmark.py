@@ -1,11 +1,16 @@
 from benchmarks.base import BaseBenchmark
 from app.db.cassandra import get_cassandra_connection
 from cassandra.query import SimpleStatement, ConsistencyLevel
-from typing import Dict, Any
+from cassandra.concurrent import execute_concurrent_with_args
+from contextlib import contextmanager
+from typing import Dict, Any, List
 import time
 import asyncio
 
 class CassandraBenchmark(BaseBenchmark):
+    default_operations = ["insert", "select"]
+    load_operations = ("insert",)
+    
     def __init__(self):
         super().__init__()
         self.table_name = "benchmark_test"
@@ -30,27 +35,32 @@ class CassandraBenchmark(BaseBenchmark):
     
     async def run(self, config: Dict[str, Any]) -> Dict[str, Any]:
         num_rows = config.get("rows", 1000)
-        operations = config.get("operations", ["insert", "select"])
+        operations = config.get("operations", self.default_operations)
         
         results = {}
         
         if "insert" in operations:
+            self._begin_operation("insert")
             insert_result = await self._run_insert_benchmark(num_rows)
             results["insert"] = insert_result
             
         if "select" in operations:
+            self._begin_operation("select")
             select_result = await self._run_select_benchmark(num_rows)
             results["select"] = select_result
             
         if "update" in operations:
+            self._begin_operation("update")
             update_result = await self._run_update_benchmark(num_rows)
             results["update"] = update_result
             
         if "consistency" in operations:
+            self._begin_operation("consistency")
             consistency_result = await self._run_consistency_benchmark(num_rows)
             results["consistency"] = consistency_result
             
         if "timeseries" in operations:
+            self._begin_operation("timeseries")
             timeseries_result = await self._run_timeseries_benchmark(num_rows)
             results["timeseries"] = timeseries_result
         
@@ -58,7 +68,10 @@ class CassandraBenchmark(BaseBenchmark):
     
     async def _run_insert_benchmark(self, num_rows: int) -> Dict[str, Any]:
         def _insert():
-            data = self.generate_test_data(num_rows)
+            rows = [
+                (row["id"], row["name"], row["email"], row["age"], row["score"])
+                for row in self.generate_test_data(num_rows)
+            ]
             with get_cassandra_connection() as session:
                 insert_stmt = session.prepare(f"""
                     INSERT INTO {self.table_name} (id, name, email, age, score, created_at)
@@ -66,14 +79,8 @@ class CassandraBenchmark(BaseBenchmark):
                 """)
                 
                 start = time.perf_counter()
-                for row in data:
-                    session.execute(insert_stmt, (
-                        row["id"],
-                        row["name"],
-                        row["email"],
-                        row["age"],
-                        row["score"]
-                    ))
+                for row in rows:
+                    session.execute(insert_stmt, row)
                 elapsed = time.perf_counter() - start
                 self._record_query_time(elapsed)
                 return {
@@ -91,9 +98,9 @@ class CassandraBenchmark(BaseBenchmark):
                 select_stmt = session.prepare(f"""
                     SELECT * FROM {self.table_name} WHERE id = ?
                 """)
-                for i in range(samples):
+                for i in self._samples(samples):
                     start = time.perf_counter()
-                    session.execute(select_stmt, (i,))
+                    session.execute(select_stmt, (i % num_rows,))
                     elapsed = time.perf_counter() - start
                     query_times.append(elapsed)
                     self._record_query_time(elapsed)
@@ -115,14 +122,14 @@ class CassandraBenchmark(BaseBenchmark):
                     SET score = score + 1
                     WHERE id = ?
                 """)
-                for i in range(updates):
+                for i in self._samples(updates):
                     start = time.perf_counter()
-                    session.execute(update_stmt, (i,))
+                    session.execute(update_stmt, (i % num_rows,))
                     elapsed = time.perf_counter() - start
                     query_times.append(elapsed)
                     self._record_query_time(elapsed)
             return {
-                "rows_updated": updates,
+                "rows_updated": len(query_times),
                 "avg_time_seconds": round(sum(query_times) / len(query_times), 4) if query_times else 0
             }
         return await asyncio.to_thread(_update)
@@ -137,9 +144,9 @@ class CassandraBenchmark(BaseBenchmark):
                 """)
                 for consistency in consistency_levels:
                     select_stmt.consistency_level = consistency
-                    for i in range(min(20, num_rows // 50)):
+                    for i in self._samples(min(20, num_rows // 50), f"consistency:{ConsistencyLevel.value_to_name[consistency]}"):
                         start = time.perf_counter()
-                        session.execute(select_stmt, (i,))
+                        session.execute(select_stmt, (i % num_rows,))
                         elapsed = time.perf_counter() - start
                         query_times.append(elapsed)
                         self._record_query_time(elapsed)
@@ -180,7 +187,8 @@ class CassandraBenchmark(BaseBenchmark):
                     WHERE sensor_id = ? AND timestamp > ?
                     LIMIT 100
                 """)
-                for sensor_id in range(5):
+                for i in self._samples(5, "timeseries:query"):
+                    sensor_id = i % 10
                     start = time.perf_counter()
                     from datetime import datetime, timedelta
                     from cassandra.util import datetime_from_timestamp
@@ -204,3 +212,82 @@ class CassandraBenchmark(BaseBenchmark):
                 session.execute(f"DROP TABLE IF EXISTS {self.table_name}")
                 session.execute(f"DROP TABLE IF EXISTS {self.table_name}_timeseries")
         await asyncio.to_thread(_teardown)
+    
+    # Declarative workload adapter. Records are partitioned by key, so range reads
+    # are multi-partition IN queries over consecutive keys rather than clustering scans.
+    wl_blocking = True
+    wl_table = "workload_records"
+    wl_column_types = {"int": "bigint", "float": "double", "str": "text"}
+    
+    async def wl_setup(self, spec) -> None:
+        self._wl_key = spec.schema.key_field
+        self._wl_fields = spec.schema.field_names
+        columns = [f"{self._wl_key} bigint PRIMARY KEY"]
+        columns += [f"{f.name} {self.wl_column_types[f.type]}" for f in spec.schema.fields]
+        def _setup():
+            with get_cassandra_connection() as session:
+                session.execute(f"DROP TABLE IF EXISTS {self.wl_table}")
+                session.execute(f"CREATE TABLE {self.wl_table} ({', '.join(columns)})")
+        await asyncio.to_thread(_setup)
+    
+    async def wl_teardown(self, spec) -> None:
+        def _teardown():
+            with get_cassandra_connection() as session:
+                session.execute(f"DROP TABLE IF EXISTS {self.wl_table}")
+        await asyncio.to_thread(_teardown)
+    
+    @contextmanager
+    def wl_connect(self):
+        with get_cassandra_connection() as session:
+            names = [self._wl_key] + self._wl_fields
+            statements = {
+                "insert": session.prepare(
+                    f"INSERT INTO {self.wl_table} ({', '.join(names)}) VALUES ({', '.join('?' for _ in names)})"
+                ),
+                "point_read": session.prepare(f"SELECT * FROM {self.wl_table} WHERE {self._wl_key} = ?"),
+                "range_read": session.prepare(f"SELECT * FROM {self.wl_table} WHERE {self._wl_key} IN ?"),
+                "scan": session.prepare(f"SELECT * FROM {self.wl_table} LIMIT ?")
+            }
+            for name in self._wl_fields:
+                statements[f"update:{name}"] = session.prepare(
+                    f"UPDATE {self.wl_table} SET {name} = ? WHERE {self._wl_key} = ?"
+                )
+            yield session, statements, names
+    
+    def wl_load(self, handle, records: List[Dict[str, Any]]) -> None:
+        session, statements, names = handle
+        execute_concurrent_with_args(
+            session, statements["insert"], [tuple(r[n] for n in names) for r in records], concurrency=50
+        )
+    
+    def wl_point_read(self, handle, key: int) -> None:
+        session, statements, _ = handle
+        list(session.execute(statements["point_read"], (key,)))
+    
+    def wl_range_read(self, handle, key: int, count: int) -> None:
+        session, statements, _ = handle
+        list(session.execute(statements["range_read"], (list(range(key, key + count)),)))
+    
+    def wl_scan(self, handle, count: int) -> None:
+        session, statements, _ = handle
+        list(session.execute(statements["scan"], (count,)))
+    
+    def wl_insert(self, handle, record: Dict[str, Any]) -> None:
+        session, statements, names = handle
+        session.execute(statements["insert"], tuple(record[n] for n in names))
+    
+    def wl_update(self, handle, key: int, values: Dict[str, Any]) -> None:
+        session, statements, _ = handle
+        (name, value), = values.items()
+        session.execute(statements[f"update:{name}"], (value, key))
+    
+    # Trace replay: logged CQL runs unprepared on a plain session (wl_connect prepares workload statements)
+    replay_command = "cql"
+    
+    @contextmanager
+    def replay_connect(self):
+        with get_cassandra_connection() as session:
+            yield session
+    
+    def replay_execute(self, session, command: Dict[str, Any]) -> None:
+        session.execute(command["cql"])
@@ -1,10 +1,18 @@
 from benchmarks.base import BaseBenchmark
 from app.db.elasticsearch import get_elasticsearch_connection
-from typing import Dict, Any
+from contextlib import contextmanager
+from typing import Dict, Any, List
 import time
 import asyncio
 
+# Documents per bulk request, as elasticsearch.helpers.bulk chunks them
+BULK_CHUNK_SIZE = 500
+
 class ElasticsearchBenchmark(BaseBenchmark):
+    default_operations = ["index", "search"]
+    load_operations = ("index",)
+    payload_encodings = ("json", "orjson")
+    
     def __init__(self):
         super().__init__()
         self.index_name = "benchmark_test"
@@ -33,23 +41,27 @@ class ElasticsearchBenchmark(BaseBenchmark):
     
     async def run(self, config: Dict[str, Any]) -> Dict[str, Any]:
         num_rows = config.get("rows", 1000)
-        operations = config.get("operations", ["index", "search"])
+        operations = config.get("operations", self.default_operations)
         
         results = {}
         
         if "index" in operations:
+            self._begin_operation("index")
             index_result = await self._run_index_benchmark(num_rows)
             results["index"] = index_result
             
         if "search" in operations:
+            self._begin_operation("search")
             search_result = await self._run_search_benchmark(num_rows)
             results["search"] = search_result
             
         if "aggregate" in operations:
+            self._begin_operation("aggregate")
             aggregate_result = await self._run_aggregate_benchmark()
             results["aggregate"] = aggregate_result
             
         if "fulltext" in operations:
+            self._begin_operation("fulltext")
             fulltext_result = await self._run_fulltext_search_benchmark()
             results["fulltext"] = fulltext_result
         
@@ -57,33 +69,44 @@ class ElasticsearchBenchmark(BaseBenchmark):
     
     async def _run_index_benchmark(self, num_rows: int) -> Dict[str, Any]:
         def _index():
+            from elasticsearch.helpers import BulkIndexError
             data = self.generate_test_data(num_rows)
+            sources = [
+                {
+                    "id": row["id"],
+                    "name": row["name"],
+                    "email": row["email"],
+                    "age": row["age"],
+                    "score": row["score"],
+                    "description": f"This is a test description for {row['name']} with various keywords"
+                }
+                for row in data
+            ]
+            payloads = self._encode_payloads(sources)
+            # NDJSON bulk bodies, in the chunks elasticsearch.helpers.bulk would send, built before timing
+            bodies = []
+            for offset in range(0, len(sources), BULK_CHUNK_SIZE):
+                lines = []
+                for index in range(offset, min(offset + BULK_CHUNK_SIZE, len(sources))):
+                    lines.append(f'{{"index":{{"_index":"{self.index_name}","_id":{sources[index]["id"]}}}}}\n'.encode())
+                    lines.append(payloads[index])
+                    lines.append(b"\n")
+                bodies.append(b"".join(lines))
             with get_elasticsearch_connection() as client:
                 start = time.perf_counter()
-                actions = []
-                for row in data:
-                    action = {
-                        "_index": self.index_name,
-                        "_id": row["id"],
-                        "_source": {
-                            "id": row["id"],
-                            "name": row["name"],
-                            "email": row["email"],
-                            "age": row["age"],
-                            "score": row["score"],
-                            "description": f"This is a test description for {row['name']} with various keywords"
-                        }
-                    }
-                    actions.append(action)
-                from elasticsearch.helpers import bulk
-                bulk(client, actions)
+                for body in bodies:
+                    response = client.bulk(operations=body)
+                    if response["errors"]:
+                        errors = [item for item in response["items"] if "error" in item["index"]]
+                        raise BulkIndexError(f"{len(errors)} document(s) failed to index.", errors)
                 client.indices.refresh(index=self.index_name)
                 elapsed = time.perf_counter() - start
                 self._record_query_time(elapsed)
                 return {
                     "documents_indexed": num_rows,
                     "time_seconds": round(elapsed, 3),
-                    "docs_per_second": round(num_rows / elapsed, 2) if elapsed > 0 else 0
+                    "docs_per_second": round(num_rows / elapsed, 2) if elapsed > 0 else 0,
+                    **payloads.summary()
                 }
         return await asyncio.to_thread(_index)
     
@@ -102,12 +125,13 @@ class ElasticsearchBenchmark(BaseBenchmark):
                 }}
             ]
             with get_elasticsearch_connection() as client:
-                for query in queries:
-                    start = time.perf_counter()
-                    result = client.search(index=self.index_name, body={"query": query}, size=50)
-                    elapsed = time.perf_counter() - start
-                    query_times.append(elapsed)
-                    self._record_query_time(elapsed)
+                for index, query in enumerate(queries):
+                    for _ in self._samples(1, f"search:{index}"):
+                        start = time.perf_counter()
+                        result = client.search(index=self.index_name, body={"query": query}, size=50)
+                        elapsed = time.perf_counter() - start
+                        query_times.append(elapsed)
+                        self._record_query_time(elapsed)
             return {
                 "queries_executed": len(query_times),
                 "avg_time_seconds": round(sum(query_times) / len(query_times), 4) if query_times else 0,
@@ -155,16 +179,17 @@ class ElasticsearchBenchmark(BaseBenchmark):
                 {"match_phrase": {"description": "test description"}}
             ]
             with get_elasticsearch_connection() as client:
-                for query in queries:
-                    start = time.perf_counter()
-                    result = client.search(
-                        index=self.index_name,
-                        body={"query": query, "highlight": {"fields": {"description": {}}}},
-                        size=20
-                    )
-                    elapsed = time.perf_counter() - start
-                    query_times.append(elapsed)
-                    self._record_query_time(elapsed)
+                for index, query in enumerate(queries):
+                    for _ in self._samples(1, f"fulltext:{index}"):
+                        start = time.perf_counter()
+                        result = client.search(
+                            index=self.index_name,
+                            body={"query": query, "highlight": {"fields": {"description": {}}}},
+                            size=20
+                        )
+                        elapsed = time.perf_counter() - start
+                        query_times.append(elapsed)
+                        self._record_query_time(elapsed)
             return {
                 "queries_executed": len(query_times),
                 "avg_time_seconds": round(sum(query_times) / len(query_times), 4) if query_times else 0
@@ -177,3 +202,68 @@ class ElasticsearchBenchmark(BaseBenchmark):
                 if client.indices.exists(index=self.index_name):
                     client.indices.delete(index=self.index_name)
         await asyncio.to_thread(_teardown)
+    
+    # Declarative workload adapter: one document per record, _id = key, key also indexed for ranges
+    wl_blocking = True
+    wl_index = "workload_records"
+    wl_field_types = {"int": "long", "float": "double", "str": "keyword"}
+    
+    async def wl_setup(self, spec) -> None:
+        self._wl_key = spec.schema.key_field
+        properties = {self._wl_key: {"type": "long"}}
+        properties.update({f.name: {"type": self.wl_field_types[f.type]} for f in spec.schema.fields})
+        def _setup():
+            with get_elasticsearch_connection() as client:
+                if client.indices.exists(index=self.wl_index):
+                    client.indices.delete(index=self.wl_index)
+                client.indices.create(index=self.wl_index, mappings={"properties": properties})
+        await asyncio.to_thread(_setup)
+    
+    async def wl_teardown(self, spec) -> None:
+        def _teardown():
+            with get_elasticsearch_connection() as client:
+                if client.indices.exists(index=self.wl_index):
+                    client.indices.delete(index=self.wl_index)
+        await asyncio.to_thread(_teardown)
+    
+    @contextmanager
+    def wl_connect(self):
+        with get_elasticsearch_connection() as client:
+            yield client
+    
+    def wl_load(self, client, records: List[Dict[str, Any]]) -> None:
+        from elasticsearch.helpers import bulk
+        # Refresh per batch so the run phase reads a fully visible dataset
+        bulk(client, [{"_index": self.wl_index, "_id": r[self._wl_key], "_source": r} for r in records], refresh=True)
+    
+    def wl_point_read(self, client, key: int) -> None:
+        client.get(index=self.wl_index, id=key)
+    
+    def wl_range_read(self, client, key: int, count: int) -> None:
+        client.search(
+            index=self.wl_index,
+            query={"range": {self._wl_key: {"gte": key}}},
+            sort=[{self._wl_key: "asc"}],
+            size=count
+        )
+    
+    def wl_scan(self, client, count: int) -> None:
+        client.search(index=self.wl_index, query={"match_all": {}}, size=count)
+    
+    def wl_insert(self, client, record: Dict[str, Any]) -> None:
+        client.index(index=self.wl_index, id=record[self._wl_key], document=record)
+    
+    def wl_update(self, client, key: int, values: Dict[str, Any]) -> None:
+        client.update(index=self.wl_index, id=key, doc=values)
+    
+    # Trace replay: {"http": {"method", "path", "body"}} requests sent through the client's transport
+    replay_command = "http"
+    
+    def replay_execute(self, client, command: Dict[str, Any]) -> None:
+        http = command["http"]
+        client.perform_request(
+            http["method"].upper(),
+            http["path"],
+            headers={"accept": "application/json", "content-type": "application/json"},
+            body=http.get("body")
+        )
@@ -0,0 +1,109 @@
+import json
+import time
+from collections.abc import Sequence
+from itertools import accumulate
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Tuple
+from app.core.exceptions import ConfigurationError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import bson
+except ImportError:
+    bson = None
+
+def _raw(row: Dict[str, Any]) -> bytes:
+    # Values only, unit-separator delimited: the cheapest encoding a client could send
+    return "\x1f".join(str(value) for value in row.values()).encode()
+
+ENCODERS: Dict[str, Callable[[Dict[str, Any]], bytes]] = {
+    "json": lambda row: json.dumps(row).encode(),
+    "orjson": lambda row: orjson.dumps(row),
+    "msgpack": lambda row: msgpack.packb(row),
+    "bson": lambda row: bson.encode(row),
+    "raw": _raw
+}
+# Encoders backed by an optional package: (module, package to install)
+OPTIONAL_ENCODERS = {
+    "orjson": (orjson, "orjson"),
+    "msgpack": (msgpack, "msgpack"),
+    "bson": (bson, "pymongo")
+}
+
+def payload_encoding(config: Dict[str, Any], supported: Tuple[str, ...], database_type: str) -> str:
+    """
+    The experiment's "payload_encoding", defaulting to the backend's first
+    supported encoding. Only backends that store opaque or serialized
+    documents (a non-empty `supported`) accept one.
+    """
+    encoding = config.get("payload_encoding")
+    if encoding is None:
+        return supported[0] if supported else ""
+    if not supported:
+        raise ConfigurationError(f"{database_type} does not encode payloads; remove payload_encoding")
+    if encoding not in supported:
+        raise ConfigurationError(
+            f"payload_encoding for {database_type} must be one of: {', '.join(supported)}"
+        )
+    if encoding in OPTIONAL_ENCODERS and OPTIONAL_ENCODERS[encoding][0] is None:
+        raise ConfigurationError(f"payload_encoding {encoding} requires the {OPTIONAL_ENCODERS[encoding][1]} package")
+    return encoding
+
+class EncodedPayloads(Sequence):
+    """
+    Pre-encoded payloads in one contiguous buffer.
+
+    Items are zero-copy memoryviews into the buffer, which drivers that accept
+    bytes-like values (redis-py) send as is. `encode_seconds` is the time the
+    encoding took, spent before the operation's timed region starts.
+    """
+
+    def __init__(self, buffer: bytes, offsets: List[int], encoding: str, encode_seconds: float):
+        self.buffer = buffer
+        self.offsets = offsets
+        self.encoding = encoding
+        self.encode_seconds = encode_seconds
+        self._view = memoryview(buffer)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> memoryview:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("payload index out of range")
+        return self._view[self.offsets[index]:self.offsets[index + 1]]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        view = self._view
+        for start, stop in zip(self.offsets, self.offsets[1:]):
+            yield view[start:stop]
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.buffer)
+
+    def summary(self) -> Dict[str, Any]:
+        """The encode side of an operation's result, reported next to its database time"""
+        return {
+            "encoding": self.encoding,
+            "encode_time_seconds": round(self.encode_seconds, 4),
+            "payload_bytes": self.nbytes
+        }
+
+def encode_payloads(rows: Iterable[Dict[str, Any]], encoding: str) -> EncodedPayloads:
+    encode = ENCODERS[encoding]
+    start = time.perf_counter()
+    parts = [encode(row) for row in rows]
+    buffer = b"".join(parts)
+    offsets = [0, *accumulate(len(part) for part in parts)]
+    return EncodedPayloads(buffer, offsets, encoding, time.perf_counter() - start)
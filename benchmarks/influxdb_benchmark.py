@@ -1,16 +1,25 @@
 from benchmarks.base import BaseBenchmark
 from app.db.influxdb import get_influxdb_connection
 from influxdb_client import Point, WritePrecision
-from typing import Dict, Any
+from influxdb_client.client.write_api import SYNCHRONOUS
+from influxdb_client.service.metrics_service import MetricsService
+from typing import Dict, Any, Iterator, List, Optional
+from contextlib import contextmanager
 import time
+import psutil
 from datetime import datetime, timedelta
 import asyncio
 
 class InfluxDBBenchmark(BaseBenchmark):
+    default_operations = ["write", "query"]
+    load_operations = ("write",)
+    
     def __init__(self):
         super().__init__()
         self.bucket = "optistack"
         self.measurement = "benchmark_test"
+        self.cardinality_measurement = "benchmark_cardinality"
+        self.query_consumption = "stream"
         
     async def setup(self, config: Dict[str, Any]) -> None:
         def _setup():
@@ -28,28 +37,58 @@ class InfluxDBBenchmark(BaseBenchmark):
     
     async def run(self, config: Dict[str, Any]) -> Dict[str, Any]:
         num_rows = config.get("rows", 1000)
-        operations = config.get("operations", ["write", "query"])
+        operations = config.get("operations", self.default_operations)
+        self.query_consumption = config.get("query_consumption", "stream")
         
         results = {}
         
         if "write" in operations:
+            self._begin_operation("write")
             write_result = await self._run_write_benchmark(num_rows)
             results["write"] = write_result
             
         if "query" in operations:
+            self._begin_operation("query")
             query_result = await self._run_query_benchmark(num_rows)
             results["query"] = query_result
             
         if "aggregate" in operations:
+            self._begin_operation("aggregate")
             aggregate_result = await self._run_aggregate_benchmark()
             results["aggregate"] = aggregate_result
+            
+        if "cardinality" in operations:
+            self._begin_operation("cardinality")
+            cardinality_result = await self._run_cardinality_benchmark(
+                levels=config.get("cardinality_levels", [10, 1000, 100000, 1000000]),
+                points_per_series=config.get("points_per_series", 1),
+                batch_size=config.get("write_batch_size", 5000)
+            )
+            results["cardinality"] = cardinality_result
         
         return results
     
+    def _consume_query(self, query_api, query: str) -> int:
+        """
+        Consume a Flux query result without materialising it.
+        
+        "stream" parses records lazily via query_stream, "csv" iterates the raw
+        annotated CSV rows. Either way only one record is held at a time.
+        """
+        rows = 0
+        if self.query_consumption == "csv":
+            for row in query_api.query_csv(query):
+                if row and not row[0].startswith("#"):
+                    rows += 1
+        else:
+            for _ in query_api.query_stream(query):
+                rows += 1
+        return rows
+    
     async def _run_write_benchmark(self, num_rows: int) -> Dict[str, Any]:
         def _write():
             with get_influxdb_connection() as client:
-                write_api = client.write_api(write_options=WritePrecision.NS)
+                write_api = client.write_api(write_options=SYNCHRONOUS)
                 start = time.perf_counter()
                 points = []
                 for i in range(num_rows):
@@ -81,15 +120,18 @@ class InfluxDBBenchmark(BaseBenchmark):
                     f'from(bucket:"{self.bucket}") |> range(start: -1h) |> filter(fn: (r) => r.sensor_id == "sensor_1") |> limit(n: 50)',
                     f'from(bucket:"{self.bucket}") |> range(start: -1h) |> filter(fn: (r) => r._field == "temperature" and r._value > 30) |> limit(n: 50)'
                 ]
-                for query in queries:
-                    start = time.perf_counter()
-                    result = query_api.query(query)
-                    list(result)
-                    elapsed = time.perf_counter() - start
-                    query_times.append(elapsed)
-                    self._record_query_time(elapsed)
+                rows_returned = 0
+                for index, query in enumerate(queries):
+                    for _ in self._samples(1, f"query:{index}"):
+                        start = time.perf_counter()
+                        rows_returned += self._consume_query(query_api, query)
+                        elapsed = time.perf_counter() - start
+                        query_times.append(elapsed)
+                        self._record_query_time(elapsed)
                 return {
                     "queries_executed": len(query_times),
+                    "rows_returned": rows_returned,
+                    "consumption": self.query_consumption,
                     "avg_time_seconds": round(sum(query_times) / len(query_times), 4) if query_times else 0,
                     "min_time_seconds": round(min(query_times), 4) if query_times else 0,
                     "max_time_seconds": round(max(query_times), 4) if query_times else 0
@@ -110,23 +152,218 @@ class InfluxDBBenchmark(BaseBenchmark):
                   |> limit(n: 100)
                 '''
                 start = time.perf_counter()
-                result = query_api.query(query)
-                list(result)
+                rows_returned = self._consume_query(query_api, query)
                 elapsed = time.perf_counter() - start
                 self._record_query_time(elapsed)
                 return {
-                    "time_seconds": round(elapsed, 3)
+                    "time_seconds": round(elapsed, 3),
+                    "rows_returned": rows_returned
                 }
         return await asyncio.to_thread(_aggregate)
-    
+
+    def _cardinality_lines(self, num_series: int, num_points: int) -> Iterator[str]:
+        end_ns = time.time_ns()
+        for i in range(num_points):
+            yield (
+                f"{self.cardinality_measurement},sensor_id=sensor_{i % num_series} "
+                f"temperature={20.0 + (i % 50)},humidity={50.0 + (i % 30)} "
+                f"{end_ns - (num_points - i) * 1000}"
+            )
+
+    def _server_memory(self, client) -> Dict[str, Optional[float]]:
+        """Read heap and RSS from the server's Prometheus /metrics endpoint"""
+        wanted = {
+            "go_memstats_heap_inuse_bytes": "heap_inuse_mb",
+            "process_resident_memory_bytes": "rss_mb"
+        }
+        memory = {name: None for name in wanted.values()}
+        try:
+            text = MetricsService(client.api_client).get_metrics()
+        except Exception:
+            return memory
+        for line in text.splitlines():
+            parts = line.split()
+            if len(parts) == 2 and parts[0] in wanted:
+                memory[wanted[parts[0]]] = round(float(parts[1]) / 1024 / 1024, 2)
+        return memory
+
+    async def _run_cardinality_benchmark(
+        self,
+        levels: List[int],
+        points_per_series: int = 1,
+        batch_size: int = 5000
+    ) -> Dict[str, Any]:
+        """
+        Sweep series cardinality and measure how writes, reads and server memory scale
+
+        Args:
+            levels: Number of distinct sensor_id tag values to write at each step
+            points_per_series: Points written per series at each step
+            batch_size: Line protocol records per write request
+        """
+        def _cardinality():
+            process = psutil.Process()
+            level_results = []
+            with get_influxdb_connection() as client:
+                write_api = client.write_api(write_options=SYNCHRONOUS)
+                query_api = client.query_api()
+                base_filter = (
+                    f'from(bucket:"{self.bucket}") |> range(start: -1h) '
+                    f'|> filter(fn: (r) => r._measurement == "{self.cardinality_measurement}")'
+                )
+                queries = {
+                    "single_series": f'{base_filter} |> filter(fn: (r) => r.sensor_id == "sensor_0")',
+                    "last_per_series": f'{base_filter} |> filter(fn: (r) => r._field == "temperature") |> last()',
+                    "global_count": f'{base_filter} |> filter(fn: (r) => r._field == "temperature") |> group() |> count()'
+                }
+                try:
+                    for num_series in levels:
+                        num_points = num_series * points_per_series
+                        memory_before = self._server_memory(client)
+
+                        batch = []
+                        start = time.perf_counter()
+                        for line in self._cardinality_lines(num_series, num_points):
+                            batch.append(line)
+                            if len(batch) >= batch_size:
+                                write_api.write(bucket=self.bucket, record=batch, write_precision=WritePrecision.NS)
+                                batch = []
+                        if batch:
+                            write_api.write(bucket=self.bucket, record=batch, write_precision=WritePrecision.NS)
+                        write_elapsed = time.perf_counter() - start
+                        self._record_query_time(write_elapsed)
+
+                        query_results = {}
+                        for name, query in queries.items():
+                            start = time.perf_counter()
+                            rows = self._consume_query(query_api, query)
+                            elapsed = time.perf_counter() - start
+                            self._record_query_time(elapsed)
+                            query_results[name] = {
+                                "time_seconds": round(elapsed, 4),
+                                "rows_returned": rows
+                            }
+
+                        level_results.append({
+                            "series": num_series,
+                            "points_written": num_points,
+                            "write_time_seconds": round(write_elapsed, 3),
+                            "points_per_second": round(num_points / write_elapsed, 2) if write_elapsed > 0 else 0,
+                            "queries": query_results,
+                            "server_memory_before": memory_before,
+                            "server_memory_after": self._server_memory(client),
+                            "client_rss_mb": round(process.memory_info().rss / 1024 / 1024, 2)
+                        })
+                        self._delete_measurement(client, self.cardinality_measurement)
+                finally:
+                    write_api.close()
+            return {
+                "levels": level_results,
+                "consumption": self.query_consumption
+            }
+        return await asyncio.to_thread(_cardinality)
+
+    def _delete_measurement(
+        self,
+        client,
+        measurement: str,
+        start: Optional[datetime] = None,
+        stop: Optional[datetime] = None
+    ) -> None:
+        delete_api = client.delete_api()
+        start = start or datetime.utcnow() - timedelta(days=1)
+        stop = stop or datetime.utcnow() + timedelta(minutes=1)
+        try:
+            delete_api.delete(start, stop, f'_measurement="{measurement}"', bucket=self.bucket)
+        except Exception:
+            pass
+
     async def teardown(self) -> None:
         def _teardown():
             with get_influxdb_connection() as client:
-                delete_api = client.delete_api()
-                start = datetime.utcnow() - timedelta(days=1)
-                stop = datetime.utcnow()
-                try:
-                    delete_api.delete(start, stop, f'_measurement="{self.measurement}"', bucket=self.bucket)
-                except Exception:
-                    pass
+                self._delete_measurement(client, self.measurement)
+                self._delete_measurement(client, self.cardinality_measurement)
+        await asyncio.to_thread(_teardown)
+    
+    # Declarative workload adapter. Record key k is stored at WORKLOAD_EPOCH + k seconds,
+    # so point and range reads are time-range queries and updates overwrite fields in place.
+    wl_blocking = True
+    wl_measurement = "workload_records"
+    WORKLOAD_EPOCH = datetime(2020, 1, 1)
+    
+    def _wl_time(self, key: int) -> str:
+        return (self.WORKLOAD_EPOCH + timedelta(seconds=key)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    
+    def _wl_range_query(self, key: int, count: int) -> str:
+        return (
+            f'from(bucket: "{self.bucket}") |> range(start: {self._wl_time(key)}, stop: {self._wl_time(key + count)}) '
+            f'|> filter(fn: (r) => r._measurement == "{self.wl_measurement}")'
+        )
+    
+    def _wl_point(self, key: int, values: Dict[str, Any]) -> Point:
+        point = Point(self.wl_measurement).time(self.WORKLOAD_EPOCH + timedelta(seconds=key), WritePrecision.S)
+        for name, value in values.items():
+            point = point.field(name, value)
+        return point
+    
+    def _wl_fields(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        return {name: value for name, value in record.items() if name != self._wl_key}
+    
+    async def wl_setup(self, spec) -> None:
+        self._wl_key = spec.schema.key_field
+        await self.setup({})
+        await self.wl_teardown(spec)
+    
+    async def wl_teardown(self, spec) -> None:
+        def _teardown():
+            with get_influxdb_connection() as client:
+                self._delete_measurement(
+                    client, self.wl_measurement,
+                    start=self.WORKLOAD_EPOCH,
+                    stop=self.WORKLOAD_EPOCH + timedelta(seconds=spec.record_count + spec.operation_count + 1)
+                )
         await asyncio.to_thread(_teardown)
+    
+    @contextmanager
+    def wl_connect(self):
+        with get_influxdb_connection() as client:
+            write_api = client.write_api(write_options=SYNCHRONOUS)
+            try:
+                yield client.query_api(), write_api
+            finally:
+                write_api.close()
+    
+    def wl_load(self, handle, records: List[Dict[str, Any]]) -> None:
+        _, write_api = handle
+        write_api.write(bucket=self.bucket, record=[self._wl_point(r[self._wl_key], self._wl_fields(r)) for r in records])
+    
+    def wl_point_read(self, handle, key: int) -> None:
+        query_api, _ = handle
+        self._consume_query(query_api, self._wl_range_query(key, 1))
+    
+    def wl_range_read(self, handle, key: int, count: int) -> None:
+        query_api, _ = handle
+        self._consume_query(query_api, self._wl_range_query(key, count))
+    
+    def wl_scan(self, handle, count: int) -> None:
+        query_api, _ = handle
+        self._consume_query(
+            query_api,
+            f'from(bucket: "{self.bucket}") |> range(start: 0) '
+            f'|> filter(fn: (r) => r._measurement == "{self.wl_measurement}") |> limit(n: {count})'
+        )
+    
+    def wl_insert(self, handle, record: Dict[str, Any]) -> None:
+        _, write_api = handle
+        write_api.write(bucket=self.bucket, record=self._wl_point(record[self._wl_key], self._wl_fields(record)))
+    
+    def wl_update(self, handle, key: int, values: Dict[str, Any]) -> None:
+        _, write_api = handle
+        write_api.write(bucket=self.bucket, record=self._wl_point(key, values))
+    
+    # Trace replay: Flux queries, consumed like the native query operations
+    replay_command = "flux"
+    
+    def replay_execute(self, handle, command: Dict[str, Any]) -> None:
+        query_api, _ = handle
+        self._consume_query(query_api, command["flux"])
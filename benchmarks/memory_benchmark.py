@@ -0,0 +1,82 @@
+from benchmarks.base import BaseBenchmark
+from typing import Dict, Any, List
+import asyncio
+import time
+
+class MemoryBenchmark(BaseBenchmark):
+    """
+    In-process dict store with a configurable injected delay.
+    
+    injected_delay_ms stands in for a server's service time, so a run with a
+    known delay shows exactly how much the harness adds on top of it (and how
+    concurrency and the event loop behave against a backend of known speed).
+    """
+    default_operations = ["insert", "select", "update"]
+    load_operations = ("insert",)
+    
+    def __init__(self):
+        super().__init__()
+        self.store: Dict[int, Dict[str, Any]] = {}
+        self.delay = 0.0
+    
+    async def setup(self, config: Dict[str, Any]) -> None:
+        self.store = {}
+        self.delay = config.get("injected_delay_ms", 0) / 1000
+    
+    async def _call(self) -> None:
+        await asyncio.sleep(self.delay)
+    
+    async def run(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        num_rows = config.get("rows", 1000)
+        concurrent_users = config.get("concurrent_users", 1)
+        operations = config.get("operations", self.default_operations)
+        self.delay = config.get("injected_delay_ms", self.delay * 1000) / 1000
+        
+        results = {}
+        if "insert" in operations:
+            self._begin_operation("insert")
+            # Decoded up front; only the store writes are timed
+            rows = iter(list(self.generate_test_data(num_rows)))
+            
+            async def insert():
+                await self._call()
+                row = next(rows)
+                self.store[row["id"]] = row
+            
+            results["insert"] = self._summarize(await self._run_concurrent_operations(insert, num_rows, concurrent_users))
+        
+        if "select" in operations:
+            self._begin_operation("select")
+            keys = iter(range(num_rows))
+            
+            async def select():
+                await self._call()
+                self.store.get(next(keys) % max(num_rows, 1))
+            
+            results["select"] = self._summarize(await self._run_concurrent_operations(select, num_rows, concurrent_users))
+        
+        if "update" in operations:
+            self._begin_operation("update")
+            keys = iter(range(num_rows))
+            
+            async def update():
+                await self._call()
+                row = self.store.get(next(keys) % max(num_rows, 1))
+                if row:
+                    row["score"] += 1
+            
+            results["update"] = self._summarize(await self._run_concurrent_operations(update, num_rows, concurrent_users))
+        
+        return results
+    
+    def _summarize(self, durations: List[float]) -> Dict[str, Any]:
+        return {
+            "operations": len(durations),
+            "injected_delay_ms": self.delay * 1000,
+            "avg_time_seconds": round(sum(durations) / len(durations), 6) if durations else 0,
+            "max_time_seconds": round(max(durations), 6) if durations else 0
+        }
+    
+    async def teardown(self) -> None:
+        self.store = {}
+
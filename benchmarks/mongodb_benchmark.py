@@ -1,9 +1,14 @@
 from benchmarks.base import BaseBenchmark
 from app.db.mongodb import get_mongodb_connection
-from typing import Dict, Any
+from bson.raw_bson import RawBSONDocument
+from typing import Dict, Any, List
 import time
 
 class MongoDBBenchmark(BaseBenchmark):
+    default_operations = ["insert", "select"]
+    load_operations = ("insert",)
+    payload_encodings = ("bson",)
+    
     def __init__(self):
         super().__init__()
         self.collection_name = "benchmark_test"
@@ -18,7 +23,7 @@ class MongoDBBenchmark(BaseBenchmark):
     
     async def run(self, config: Dict[str, Any]) -> Dict[str, Any]:
         num_rows = config.get("rows", 1000)
-        operations = config.get("operations", ["insert", "select"])
+        operations = config.get("operations", self.default_operations)
         
         results = {}
         
@@ -26,26 +31,32 @@ class MongoDBBenchmark(BaseBenchmark):
             collection = db[self.collection_name]
             
             if "insert" in operations:
+                self._begin_operation("insert")
                 insert_result = await self._run_insert_benchmark(collection, num_rows)
                 results["insert"] = insert_result
                 
             if "select" in operations:
+                self._begin_operation("select")
                 select_result = await self._run_select_benchmark(collection, num_rows)
                 results["select"] = select_result
                 
             if "update" in operations:
+                self._begin_operation("update")
                 update_result = await self._run_update_benchmark(collection, num_rows)
                 results["update"] = update_result
                 
             if "aggregate" in operations:
+                self._begin_operation("aggregate")
                 aggregate_result = await self._run_aggregate_benchmark(collection)
                 results["aggregate"] = aggregate_result
                 
             if "lookup" in operations:
+                self._begin_operation("lookup")
                 lookup_result = await self._run_lookup_benchmark(db)
                 results["lookup"] = lookup_result
                 
             if "textsearch" in operations:
+                self._begin_operation("textsearch")
                 textsearch_result = await self._run_text_search_benchmark(collection, num_rows)
                 results["textsearch"] = textsearch_result
         
@@ -63,29 +74,33 @@ class MongoDBBenchmark(BaseBenchmark):
             }
             for row in data
         ]
+        # Raw BSON is sent as is, so the driver does no encoding inside the timed region
+        payloads = self._encode_payloads(documents)
+        raw_documents = [RawBSONDocument(bytes(payload)) for payload in payloads]
         
         start = time.perf_counter()
-        await collection.insert_many(documents, ordered=False)
+        await collection.insert_many(raw_documents, ordered=False)
         elapsed = time.perf_counter() - start
         self._record_query_time(elapsed)
         
         return {
             "documents_inserted": num_rows,
             "time_seconds": round(elapsed, 3),
-            "docs_per_second": round(num_rows / elapsed, 2) if elapsed > 0 else 0
+            "docs_per_second": round(num_rows / elapsed, 2) if elapsed > 0 else 0,
+            **payloads.summary()
         }
     
     async def _run_select_benchmark(self, collection, num_rows: int) -> Dict[str, Any]:
         query_times = []
         
-        for i in range(min(100, num_rows // 10)):
+        for i in self._samples(min(100, num_rows // 10), "select:point"):
             start = time.perf_counter()
-            await collection.find_one({"id": i})
+            await collection.find_one({"id": i % num_rows})
             elapsed = time.perf_counter() - start
             query_times.append(elapsed)
             self._record_query_time(elapsed)
         
-        for i in range(min(50, num_rows // 20)):
+        for i in self._samples(min(50, num_rows // 20), "select:range"):
             start = time.perf_counter()
             await collection.find({"score": {"$gt": 50}}).limit(10).to_list(length=10)
             elapsed = time.perf_counter() - start
@@ -103,10 +118,10 @@ class MongoDBBenchmark(BaseBenchmark):
         updates = min(100, num_rows // 10)
         query_times = []
         
-        for i in range(updates):
+        for i in self._samples(updates):
             start = time.perf_counter()
             await collection.update_one(
-                {"id": i},
+                {"id": i % num_rows},
                 {"$inc": {"score": 1}}
             )
             elapsed = time.perf_counter() - start
@@ -114,7 +129,7 @@ class MongoDBBenchmark(BaseBenchmark):
             self._record_query_time(elapsed)
         
         return {
-            "documents_updated": updates,
+            "documents_updated": len(query_times),
             "avg_time_seconds": round(sum(query_times) / len(query_times), 4) if query_times else 0
         }
     
@@ -205,3 +220,47 @@ class MongoDBBenchmark(BaseBenchmark):
             orders_collection = db.get_collection("benchmark_orders")
             if orders_collection:
                 await orders_collection.drop()
+    
+    # Trace replay: profiler commands run as database commands
+    replay_command = "db_command"
+    
+    async def replay_execute(self, db, command: Dict[str, Any]) -> None:
+        await db.command(command["db_command"])
+    
+    # Declarative workload adapter: one document per record, keyed by _id
+    wl_collection = "workload_records"
+    
+    def wl_connect(self):
+        return get_mongodb_connection()
+    
+    async def wl_setup(self, spec) -> None:
+        self._wl_key = spec.schema.key_field
+        async with get_mongodb_connection() as db:
+            await db[self.wl_collection].drop()
+    
+    async def wl_teardown(self, spec) -> None:
+        async with get_mongodb_connection() as db:
+            await db[self.wl_collection].drop()
+    
+    def _wl_document(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        document = {k: v for k, v in record.items() if k != self._wl_key}
+        document["_id"] = record[self._wl_key]
+        return document
+    
+    async def wl_load(self, db, records: List[Dict[str, Any]]) -> None:
+        await db[self.wl_collection].insert_many([self._wl_document(r) for r in records], ordered=False)
+    
+    async def wl_point_read(self, db, key: int) -> None:
+        await db[self.wl_collection].find_one({"_id": key})
+    
+    async def wl_range_read(self, db, key: int, count: int) -> None:
+        await db[self.wl_collection].find({"_id": {"$gte": key}}).sort("_id", 1).limit(count).to_list(count)
+    
+    async def wl_scan(self, db, count: int) -> None:
+        await db[self.wl_collection].find().limit(count).to_list(count)
+    
+    async def wl_insert(self, db, record: Dict[str, Any]) -> None:
+        await db[self.wl_collection].insert_one(self._wl_document(record))
+    
+    async def wl_update(self, db, key: int, values: Dict[str, Any]) -> None:
+        await db[self.wl_collection].update_one({"_id": key}, {"$set": values})
@@ -1,10 +1,18 @@
 from benchmarks.base import BaseBenchmark
-from app.db.mysql import get_mysql_connection
+from benchmarks.workload import SQLWorkloadAdapter
+from benchmarks.replay import SQLReplayAdapter
+from app.db.mysql import get_mysql_connection, create_mysql_async_engine
 from sqlalchemy import text
 from typing import Dict, Any
 import time
 
-class MySQLBenchmark(BaseBenchmark):
+class MySQLBenchmark(SQLWorkloadAdapter, SQLReplayAdapter, BaseBenchmark):
+    default_operations = ["insert", "select"]
+    load_operations = ("insert",)
+    latency_breakdown_supported = True
+    engine_factory = staticmethod(create_mysql_async_engine)
+    wl_column_types = {"int": "BIGINT", "float": "DOUBLE", "str": "VARCHAR({size})"}
+    
     def __init__(self):
         super().__init__()
         self.table_name = "benchmark_test"
@@ -34,33 +42,35 @@ class MySQLBenchmark(BaseBenchmark):
     
     async def run(self, config: Dict[str, Any]) -> Dict[str, Any]:
         num_rows = config.get("rows", 1000)
-        operations = config.get("operations", ["insert", "select"])
+        operations = config.get("operations", self.default_operations)
+        batch_size = config.get("batch_size", 1000)
         
         results = {}
         
         async with get_mysql_connection() as session:
             if "insert" in operations:
-                insert_result = await self._run_insert_benchmark(session, num_rows)
+                self._begin_operation("insert")
+                insert_result = await self._run_insert_benchmark(session, num_rows, batch_size)
                 results["insert"] = insert_result
                 
             if "select" in operations:
+                self._begin_operation("select")
                 select_result = await self._run_select_benchmark(session, num_rows)
                 results["select"] = select_result
                 
             if "update" in operations:
+                self._begin_operation("update")
                 update_result = await self._run_update_benchmark(session, num_rows)
                 results["update"] = update_result
         
         return results
     
-    async def _run_insert_benchmark(self, session, num_rows: int) -> Dict[str, Any]:
-        data = self.generate_test_data(num_rows)
+    async def _run_insert_benchmark(self, session, num_rows: int, batch_size: int = 1000) -> Dict[str, Any]:
+        batches = self.generate_test_data(num_rows).batches(batch_size)
         
         start = time.perf_counter()
         
-        batch_size = 1000
-        for i in range(0, len(data), batch_size):
-            batch = data[i:i+batch_size]
+        for batch in batches:
             values_str = ", ".join([
                 f"({row['id']}, '{row['name']}', '{row['email']}', {row['age']}, {row['score']})"
                 for row in batch
@@ -78,7 +88,8 @@ class MySQLBenchmark(BaseBenchmark):
         return {
             "rows_inserted": num_rows,
             "time_seconds": round(elapsed, 3),
-            "rows_per_second": round(num_rows / elapsed, 2) if elapsed > 0 else 0
+            "rows_per_second": round(num_rows / elapsed, 2) if elapsed > 0 else 0,
+            "batch_size": batch_size
         }
     
     async def _run_select_benchmark(self, session, num_rows: int) -> Dict[str, Any]:
@@ -92,12 +103,12 @@ class MySQLBenchmark(BaseBenchmark):
         
         query_times = []
         
-        for query_template in queries:
-            for i in range(min(100, num_rows // 10)):
+        for index, query_template in enumerate(queries):
+            for i in self._samples(min(100, num_rows // 10), f"select:{index}"):
                 if "id = :id" in query_template:
-                    params = {"id": i}
+                    params = {"id": i % num_rows}
                 elif "name = :name" in query_template:
-                    params = {"name": f"user{i}@example.com"}
+                    params = {"name": f"user{i % num_rows}@example.com"}
                 elif "score > :score" in query_template:
                     params = {"score": 50}
                 else:
@@ -120,20 +131,20 @@ class MySQLBenchmark(BaseBenchmark):
         updates = min(100, num_rows // 10)
         query_times = []
         
-        for i in range(updates):
+        for i in self._samples(updates):
             start = time.perf_counter()
             await session.execute(text(f"""
                 UPDATE {self.table_name}
                 SET score = score + 1
                 WHERE id = :id
-            """), {"id": i})
+            """), {"id": i % num_rows})
             await session.commit()
             elapsed = time.perf_counter() - start
             query_times.append(elapsed)
             self._record_query_time(elapsed)
         
         return {
-            "rows_updated": updates,
+            "rows_updated": len(query_times),
             "avg_time_seconds": round(sum(query_times) / len(query_times), 4) if query_times else 0
         }
     
@@ -141,3 +152,6 @@ class MySQLBenchmark(BaseBenchmark):
         async with get_mysql_connection() as session:
             await session.execute(text(f"DROP TABLE IF EXISTS {self.table_name}"))
             await session.commit()
+    
+    def wl_connect(self):
+        return get_mysql_connection()
@@ -0,0 +1,45 @@
+from benchmarks.base import BaseBenchmark
+from typing import Dict, Any
+import asyncio
+import time
+
+class NoopBenchmark(BaseBenchmark):
+    """
+    Zero-I/O backend for measuring the harness itself.
+    
+    Every operation goes through the same path as a real benchmark (timers,
+    _record_query_time, monitor, metrics and tracing, one await that yields to
+    the event loop, result dict building) but talks to nothing, so its
+    latency is the floor OptiStack adds to every reported number.
+    """
+    default_operations = ["insert", "select", "update"]
+    load_operations = ("insert",)
+    
+    async def setup(self, config: Dict[str, Any]) -> None:
+        pass
+    
+    async def _noop(self) -> None:
+        # Stands in for a driver call that completes immediately but still yields like real I/O would
+        await asyncio.sleep(0)
+    
+    async def run(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        num_ops = config.get("rows", 1000)
+        concurrent_users = config.get("concurrent_users", 1)
+        operations = config.get("operations", self.default_operations)
+        
+        results = {}
+        for operation in operations:
+            self._begin_operation(operation)
+            start = time.perf_counter()
+            durations = await self._run_concurrent_operations(self._noop, num_ops, concurrent_users)
+            elapsed = time.perf_counter() - start
+            results[operation] = {
+                "operations": len(durations),
+                "time_seconds": round(elapsed, 6),
+                "ops_per_second": round(len(durations) / elapsed, 2) if elapsed > 0 else 0,
+                "avg_time_seconds": round(sum(durations) / len(durations), 9) if durations else 0
+            }
+        return results
+    
+    async def teardown(self) -> None:
+        pass
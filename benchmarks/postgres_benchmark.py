@@ -1,13 +1,20 @@
 from benchmarks.base import BaseBenchmark
-from app.db.postgres import get_postgres_connection
+from benchmarks.workload import SQLWorkloadAdapter
+from benchmarks.replay import SQLReplayAdapter
+from app.db.postgres import get_postgres_connection, create_postgres_async_engine
 from sqlalchemy import text
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import time
 import io
 import csv
 import asyncio
 
-class PostgresBenchmark(BaseBenchmark):
+class PostgresBenchmark(SQLWorkloadAdapter, SQLReplayAdapter, BaseBenchmark):
+    default_operations = ["insert", "select"]
+    load_operations = ("insert",)
+    latency_breakdown_supported = True
+    engine_factory = staticmethod(create_postgres_async_engine)
+    
     def __init__(self):
         super().__init__()
         self.table_name = "benchmark_test"
@@ -37,32 +44,26 @@ class PostgresBenchmark(BaseBenchmark):
     
     async def run(self, config: Dict[str, Any]) -> Dict[str, Any]:
         num_rows = self._get_config_value(config, "rows", 1000)
-        operations = self._get_config_value(config, "operations", ["insert", "select"])
+        operations = self._get_config_value(config, "operations", self.default_operations)
         concurrent_users = self._get_config_value(config, "concurrent_users", 1)
-        warmup_rows = self._get_config_value(config, "warmup_rows", 0)
-        warmup_operations = self._get_config_value(config, "warmup_operations", [])
-        steady_state_duration = self._get_config_value(config, "steady_state_duration", 0)
         data_size = self._get_config_value(config, "data_size", "small")
+        batch_size = self._get_config_value(config, "batch_size", None)
         
         results = {}
         
-        # Warm-up phase
-        if warmup_rows > 0 and warmup_operations:
-            async with get_postgres_connection() as session:
-                if "insert" in warmup_operations:
-                    await self._run_insert_benchmark(session, warmup_rows, data_size=data_size, warmup=True)
-        
-        # Main benchmark phase
         async with get_postgres_connection() as session:
             if "insert" in operations:
+                self._begin_operation("insert")
                 insert_result = await self._run_insert_benchmark(
                     session, num_rows, 
                     concurrent_users=concurrent_users,
-                    data_size=data_size
+                    data_size=data_size,
+                    batch_size=batch_size
                 )
                 results["insert"] = insert_result
                 
             if "select" in operations:
+                self._begin_operation("select")
                 select_result = await self._run_select_benchmark(
                     session, num_rows,
                     concurrent_users=concurrent_users
@@ -70,6 +71,7 @@ class PostgresBenchmark(BaseBenchmark):
                 results["select"] = select_result
                 
             if "update" in operations:
+                self._begin_operation("update")
                 update_result = await self._run_update_benchmark(
                     session, num_rows,
                     concurrent_users=concurrent_users
@@ -77,28 +79,25 @@ class PostgresBenchmark(BaseBenchmark):
                 results["update"] = update_result
                 
             if "join" in operations:
+                self._begin_operation("join")
                 join_result = await self._run_join_benchmark(session)
                 results["join"] = join_result
                 
             if "window" in operations:
+                self._begin_operation("window")
                 window_result = await self._run_window_function_benchmark(session)
                 results["window"] = window_result
                 
             if "json" in operations:
+                self._begin_operation("json")
                 json_result = await self._run_json_benchmark(session, num_rows)
                 results["json"] = json_result
                 
             if "fulltext" in operations:
+                self._begin_operation("fulltext")
                 fulltext_result = await self._run_fulltext_search_benchmark(session, num_rows)
                 results["fulltext"] = fulltext_result
         
-        # Steady state testing (sustained load)
-        if steady_state_duration > 0 and "select" in operations:
-            steady_state_result = await self._run_steady_state_benchmark(
-                steady_state_duration, concurrent_users
-            )
-            results["steady_state"] = steady_state_result
-        
         return results
     
     async def _run_insert_benchmark(
@@ -107,7 +106,7 @@ class PostgresBenchmark(BaseBenchmark):
         num_rows: int, 
         concurrent_users: int = 1,
         data_size: str = "small",
-        warmup: bool = False
+        batch_size: Optional[int] = None
     ) -> Dict[str, Any]:
         data = self.generate_test_data(num_rows, data_size=data_size)
         
@@ -121,35 +120,37 @@ class PostgresBenchmark(BaseBenchmark):
                 VALUES {values_str}
             """))
         
+        if concurrent_users > 1:
+            batch_size = batch_size or max(100, num_rows // (concurrent_users * 10))
+        else:
+            batch_size = batch_size or 1000
+        # Rows are decoded before timing so the timed region holds only the inserts
+        batches = data.batches(batch_size)
+        
         start = time.perf_counter()
         
         if concurrent_users > 1:
             # Concurrent batch inserts
-            batch_size = max(100, num_rows // (concurrent_users * 10))
-            batches = [data[i:i+batch_size] for i in range(0, len(data), batch_size)]
-            
             async def insert_worker(batch):
                 await insert_batch(batch)
             
             await asyncio.gather(*[insert_worker(batch) for batch in batches])
         else:
             # Sequential batch inserts
-            batch_size = 1000
-            for i in range(0, len(data), batch_size):
-                batch = data[i:i+batch_size]
+            for batch in batches:
                 await insert_batch(batch)
         
         await session.commit()
         
         elapsed = time.perf_counter() - start
-        if not warmup:
-            self._record_query_time(elapsed)
+        self._record_query_time(elapsed)
         
         return {
             "rows_inserted": num_rows,
             "time_seconds": round(elapsed, 3),
             "rows_per_second": round(num_rows / elapsed, 2) if elapsed > 0 else 0,
-            "concurrent_users": concurrent_users if not warmup else 0
+            "concurrent_users": concurrent_users,
+            "batch_size": batch_size
         }
     
     async def _run_select_benchmark(
@@ -184,40 +185,24 @@ class PostgresBenchmark(BaseBenchmark):
             self._record_query_time(elapsed)
             return elapsed
         
+        # Sample i runs query template i % 5; workers share one index stream
+        indices = self._samples(len(queries) * num_queries)
+        
+        async def query_worker():
+            worker_times = []
+            for index in indices:
+                query_template = queries[index % len(queries)]
+                elapsed = await execute_query(query_template, index // len(queries))
+                worker_times.append(elapsed)
+            return worker_times
+        
         if concurrent_users > 1:
             # Concurrent execution
-            all_queries = []
-            for query_template in queries:
-                for i in range(num_queries):
-                    all_queries.append((query_template, i))
-            
-            # Distribute queries across concurrent users
-            queries_per_user = len(all_queries) // concurrent_users
-            tasks = []
-            
-            async def query_worker(worker_id):
-                worker_times = []
-                start_idx = worker_id * queries_per_user
-                end_idx = start_idx + queries_per_user if worker_id < concurrent_users - 1 else len(all_queries)
-                
-                for idx in range(start_idx, end_idx):
-                    query_template, query_id = all_queries[idx]
-                    elapsed = await execute_query(query_template, query_id)
-                    worker_times.append(elapsed)
-                return worker_times
-            
-            for user_id in range(concurrent_users):
-                tasks.append(query_worker(user_id))
-            
-            results = await asyncio.gather(*tasks)
+            results = await asyncio.gather(*[query_worker() for _ in range(concurrent_users)])
             query_times = [t for worker_times in results for t in worker_times]
         else:
             # Sequential execution
-            query_times = []
-            for query_template in queries:
-                for i in range(num_queries):
-                    elapsed = await execute_query(query_template, i)
-                    query_times.append(elapsed)
+            query_times = await query_worker()
         
         return {
             "queries_executed": len(query_times),
@@ -247,35 +232,21 @@ class PostgresBenchmark(BaseBenchmark):
             self._record_query_time(elapsed)
             return elapsed
         
+        indices = self._samples(updates)
+        
+        async def update_worker():
+            return [await execute_update(i) for i in indices]
+        
         if concurrent_users > 1:
             # Concurrent execution
-            updates_per_user = updates // concurrent_users
-            tasks = []
-            
-            async def update_worker(worker_id):
-                worker_times = []
-                start_idx = worker_id * updates_per_user
-                end_idx = start_idx + updates_per_user if worker_id < concurrent_users - 1 else updates
-                
-                for i in range(start_idx, end_idx):
-                    elapsed = await execute_update(i)
-                    worker_times.append(elapsed)
-                return worker_times
-            
-            for user_id in range(concurrent_users):
-                tasks.append(update_worker(user_id))
-            
-            results = await asyncio.gather(*tasks)
+            results = await asyncio.gather(*[update_worker() for _ in range(concurrent_users)])
             query_times = [t for worker_times in results for t in worker_times]
         else:
             # Sequential execution
-            query_times = []
-            for i in range(updates):
-                elapsed = await execute_update(i)
-                query_times.append(elapsed)
+            query_times = await update_worker()
         
         return {
-            "rows_updated": updates,
+            "rows_updated": len(query_times),
             "avg_time_seconds": round(sum(query_times) / len(query_times), 4) if query_times else 0,
             "concurrent_users": concurrent_users
         }
@@ -314,44 +285,6 @@ class PostgresBenchmark(BaseBenchmark):
             "time_seconds": round(elapsed, 3)
         }
     
-    async def _run_steady_state_benchmark(
-        self,
-        duration_seconds: int,
-        concurrent_users: int = 1
-    ) -> Dict[str, Any]:
-        """
-        Run sustained load test for specified duration
-        """
-        end_time = time.perf_counter() + duration_seconds
-        query_count = 0
-        
-        async def steady_state_query():
-            nonlocal query_count
-            async with get_postgres_connection() as session:
-                while time.perf_counter() < end_time:
-                    start = time.perf_counter()
-                    await session.execute(text(f"""
-                        SELECT * FROM {self.table_name} 
-                        WHERE id = :id
-                    """), {"id": query_count % 1000})
-                    elapsed = time.perf_counter() - start
-                    self._record_query_time(elapsed)
-                    query_count += 1
-                    await asyncio.sleep(0.001)  # Small delay to prevent overwhelming
-        
-        if concurrent_users > 1:
-            tasks = [steady_state_query() for _ in range(concurrent_users)]
-            await asyncio.gather(*tasks)
-        else:
-            await steady_state_query()
-        
-        return {
-            "duration_seconds": duration_seconds,
-            "queries_executed": query_count,
-            "queries_per_second": round(query_count / duration_seconds, 2) if duration_seconds > 0 else 0,
-            "concurrent_users": concurrent_users
-        }
-    
     async def _run_window_function_benchmark(self, session) -> Dict[str, Any]:
         query_times = []
         
@@ -378,12 +311,13 @@ class PostgresBenchmark(BaseBenchmark):
             """
         ]
         
-        for query in queries:
-            start = time.perf_counter()
-            await session.execute(text(query))
-            elapsed = time.perf_counter() - start
-            query_times.append(elapsed)
-            self._record_query_time(elapsed)
+        for index, query in enumerate(queries):
+            for _ in self._samples(1, f"window:{index}"):
+                start = time.perf_counter()
+                await session.execute(text(query))
+                elapsed = time.perf_counter() - start
+                query_times.append(elapsed)
+                self._record_query_time(elapsed)
         
         return {
             "queries_executed": len(query_times),
@@ -412,12 +346,13 @@ class PostgresBenchmark(BaseBenchmark):
             f"SELECT id, metadata->'settings'->>'enabled' as enabled FROM {self.table_name} LIMIT 50"
         ]
         
-        for query in queries:
-            start = time.perf_counter()
-            await session.execute(text(query))
-            elapsed = time.perf_counter() - start
-            query_times.append(elapsed)
-            self._record_query_time(elapsed)
+        for index, query in enumerate(queries):
+            for _ in self._samples(1, f"json:{index}"):
+                start = time.perf_counter()
+                await session.execute(text(query))
+                elapsed = time.perf_counter() - start
+                query_times.append(elapsed)
+                self._record_query_time(elapsed)
         
         return {
             "queries_executed": len(query_times),
@@ -461,12 +396,13 @@ class PostgresBenchmark(BaseBenchmark):
             """
         ]
         
-        for query in queries:
-            start = time.perf_counter()
-            await session.execute(text(query))
-            elapsed = time.perf_counter() - start
-            query_times.append(elapsed)
-            self._record_query_time(elapsed)
+        for index, query in enumerate(queries):
+            for _ in self._samples(1, f"fulltext:{index}"):
+                start = time.perf_counter()
+                await session.execute(text(query))
+                elapsed = time.perf_counter() - start
+                query_times.append(elapsed)
+                self._record_query_time(elapsed)
         
         return {
             "queries_executed": len(query_times),
@@ -478,3 +414,6 @@ class PostgresBenchmark(BaseBenchmark):
             await session.execute(text(f"DROP TABLE IF EXISTS {self.table_name}"))
             await session.execute(text(f"DROP TABLE IF EXISTS {self.table_name}_join"))
             await session.commit()
+    
+    def wl_connect(self):
+        return get_postgres_connection()
@@ -1,10 +1,16 @@
 from benchmarks.base import BaseBenchmark
-from app.db.redis import get_redis_connection
-from typing import Dict, Any
+from app.db.redis import get_redis_connection, create_redis_client, prewarm_redis_pool, close_redis_client
+from app.db.registry import engine_registry
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List
 import time
-import json
 
 class RedisBenchmark(BaseBenchmark):
+    default_operations = ["set", "get"]
+    load_operations = ("set",)
+    payload_encodings = ("json", "orjson", "msgpack", "raw")
+    pool_tuning_supported = True
+    
     def __init__(self):
         super().__init__()
         self.key_prefix = "benchmark:"
@@ -17,28 +23,33 @@ class RedisBenchmark(BaseBenchmark):
     
     async def run(self, config: Dict[str, Any]) -> Dict[str, Any]:
         num_rows = config.get("rows", 1000)
-        operations = config.get("operations", ["set", "get"])
+        operations = config.get("operations", self.default_operations)
         
         results = {}
         
         async with get_redis_connection() as client:
             if "set" in operations:
+                self._begin_operation("set")
                 set_result = await self._run_set_benchmark(client, num_rows)
                 results["set"] = set_result
                 
             if "get" in operations:
+                self._begin_operation("get")
                 get_result = await self._run_get_benchmark(client, num_rows)
                 results["get"] = get_result
                 
             if "pipeline" in operations:
+                self._begin_operation("pipeline")
                 pipeline_result = await self._run_pipeline_benchmark(client, num_rows)
                 results["pipeline"] = pipeline_result
                 
             if "hash" in operations:
+                self._begin_operation("hash")
                 hash_result = await self._run_hash_benchmark(client, num_rows)
                 results["hash"] = hash_result
                 
             if "sortedset" in operations:
+                self._begin_operation("sortedset")
                 sortedset_result = await self._run_sorted_set_benchmark(client, num_rows)
                 results["sortedset"] = sortedset_result
         
@@ -46,12 +57,12 @@ class RedisBenchmark(BaseBenchmark):
     
     async def _run_set_benchmark(self, client, num_rows: int) -> Dict[str, Any]:
         data = self.generate_test_data(num_rows)
+        keys = [f"{self.key_prefix}string:{row['id']}" for row in data]
+        payloads = self._encode_payloads(data)
         
         start = time.perf_counter()
         
-        for row in data:
-            key = f"{self.key_prefix}string:{row['id']}"
-            value = json.dumps(row)
+        for key, value in zip(keys, payloads):
             await client.set(key, value)
         
         elapsed = time.perf_counter() - start
@@ -60,15 +71,16 @@ class RedisBenchmark(BaseBenchmark):
         return {
             "keys_set": num_rows,
             "time_seconds": round(elapsed, 3),
-            "ops_per_second": round(num_rows / elapsed, 2) if elapsed > 0 else 0
+            "ops_per_second": round(num_rows / elapsed, 2) if elapsed > 0 else 0,
+            **payloads.summary()
         }
     
     async def _run_get_benchmark(self, client, num_rows: int) -> Dict[str, Any]:
         query_times = []
         samples = min(100, num_rows // 10)
         
-        for i in range(samples):
-            key = f"{self.key_prefix}string:{i}"
+        for i in self._samples(samples):
+            key = f"{self.key_prefix}string:{i % num_rows}"
             start = time.perf_counter()
             await client.get(key)
             elapsed = time.perf_counter() - start
@@ -84,13 +96,13 @@ class RedisBenchmark(BaseBenchmark):
     
     async def _run_pipeline_benchmark(self, client, num_rows: int) -> Dict[str, Any]:
         data = self.generate_test_data(num_rows)
+        keys = [f"{self.key_prefix}pipeline:{row['id']}" for row in data]
+        payloads = self._encode_payloads(data)
         
         start = time.perf_counter()
         
         pipe = client.pipeline()
-        for row in data:
-            key = f"{self.key_prefix}pipeline:{row['id']}"
-            value = json.dumps(row)
+        for key, value in zip(keys, payloads):
             pipe.set(key, value)
         results = await pipe.execute()
         
@@ -100,22 +112,27 @@ class RedisBenchmark(BaseBenchmark):
         return {
             "keys_set": num_rows,
             "time_seconds": round(elapsed, 3),
-            "ops_per_second": round(num_rows / elapsed, 2) if elapsed > 0 else 0
+            "ops_per_second": round(num_rows / elapsed, 2) if elapsed > 0 else 0,
+            **payloads.summary()
         }
     
     async def _run_hash_benchmark(self, client, num_rows: int) -> Dict[str, Any]:
         data = self.generate_test_data(num_rows)
-        
-        start = time.perf_counter()
-        
-        for row in data:
-            key = f"{self.key_prefix}hash:{row['id']}"
-            await client.hset(key, mapping={
+        # Keys and field mappings are built before timing, like the encoded string payloads
+        mappings = [
+            (f"{self.key_prefix}hash:{row['id']}", {
                 "name": row["name"],
                 "email": row["email"],
                 "age": str(row["age"]),
                 "score": str(row["score"])
             })
+            for row in data
+        ]
+        
+        start = time.perf_counter()
+        
+        for key, mapping in mappings:
+            await client.hset(key, mapping=mapping)
         
         elapsed = time.perf_counter() - start
         self._record_query_time(elapsed)
@@ -127,13 +144,13 @@ class RedisBenchmark(BaseBenchmark):
         }
     
     async def _run_sorted_set_benchmark(self, client, num_rows: int) -> Dict[str, Any]:
-        data = self.generate_test_data(num_rows)
+        members = [{str(row["id"]): row["score"]} for row in self.generate_test_data(num_rows)]
         
         start = time.perf_counter()
         
         key = f"{self.key_prefix}sortedset:leaderboard"
-        for row in data:
-            await client.zadd(key, {str(row["id"]): row["score"]})
+        for member in members:
+            await client.zadd(key, member)
         
         elapsed = time.perf_counter() - start
         self._record_query_time(elapsed)
@@ -163,3 +180,104 @@ class RedisBenchmark(BaseBenchmark):
             keys = await client.keys(f"{self.key_prefix}*")
             if keys:
                 await client.delete(*keys)
+    
+    # Trace replay: MONITOR arguments are sent back verbatim
+    replay_command = "args"
+    
+    async def replay_execute(self, client, command: Dict[str, Any]) -> None:
+        await client.execute_command(*command["args"])
+    
+    # Declarative workload adapter: a hash per record plus a sorted-set index for key ranges
+    def _wl_record_key(self, key: int) -> str:
+        return f"{self.key_prefix}wl:rec:{key}"
+    
+    @property
+    def _wl_index(self) -> str:
+        return f"{self.key_prefix}wl:index"
+    
+    def wl_connect(self):
+        return get_redis_connection()
+    
+    @asynccontextmanager
+    async def wl_pool(self, pool_size: int, stats):
+        # Commands check a connection out per call, so the client itself is the per-operation handle
+        client = create_redis_client(**{**engine_registry.options("redis"), "max_connections": pool_size, "blocking": True})
+        pool = client.connection_pool
+        get_connection = pool.get_connection
+        ensure_connection = pool.ensure_connection
+        
+        async def timed_get_connection(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await get_connection(*args, **kwargs)
+            finally:
+                stats.add_wait(time.perf_counter() - start)
+        
+        async def timed_ensure_connection(connection):
+            if connection.is_connected:
+                return await ensure_connection(connection)
+            start = time.perf_counter()
+            try:
+                return await ensure_connection(connection)
+            finally:
+                stats.add_connect(time.perf_counter() - start)
+        
+        @asynccontextmanager
+        async def connect():
+            yield client
+        
+        pool.get_connection = timed_get_connection
+        pool.ensure_connection = timed_ensure_connection
+        try:
+            await prewarm_redis_pool(client, pool_size)
+            yield connect
+        finally:
+            await close_redis_client(client)
+    
+    async def _wl_clear(self) -> None:
+        async with get_redis_connection() as client:
+            keys = [key async for key in client.scan_iter(match=f"{self.key_prefix}wl:*", count=1000)]
+            for offset in range(0, len(keys), 1000):
+                await client.delete(*keys[offset:offset + 1000])
+    
+    async def wl_setup(self, spec) -> None:
+        self._wl_key = spec.schema.key_field
+        await self._wl_clear()
+    
+    async def wl_teardown(self, spec) -> None:
+        await self._wl_clear()
+    
+    async def wl_load(self, client, records: List[Dict[str, Any]]) -> None:
+        pipe = client.pipeline(transaction=False)
+        for record in records:
+            key = record[self._wl_key]
+            pipe.hset(self._wl_record_key(key), mapping=record)
+            pipe.zadd(self._wl_index, {str(key): key})
+        await pipe.execute()
+    
+    async def wl_point_read(self, client, key: int) -> None:
+        await client.hgetall(self._wl_record_key(key))
+    
+    async def wl_range_read(self, client, key: int, count: int) -> None:
+        members = await client.zrangebyscore(self._wl_index, key, "+inf", start=0, num=count)
+        pipe = client.pipeline(transaction=False)
+        for member in members:
+            pipe.hgetall(self._wl_record_key(int(member)))
+        await pipe.execute()
+    
+    async def wl_scan(self, client, count: int) -> None:
+        _, keys = await client.scan(0, match=f"{self.key_prefix}wl:rec:*", count=count)
+        pipe = client.pipeline(transaction=False)
+        for key in keys[:count]:
+            pipe.hgetall(key)
+        await pipe.execute()
+    
+    async def wl_insert(self, client, record: Dict[str, Any]) -> None:
+        key = record[self._wl_key]
+        pipe = client.pipeline(transaction=False)
+        pipe.hset(self._wl_record_key(key), mapping=record)
+        pipe.zadd(self._wl_index, {str(key): key})
+        await pipe.execute()
+    
+    async def wl_update(self, client, key: int, values: Dict[str, Any]) -> None:
+        await client.hset(self._wl_record_key(key), mapping=values)
@@ -0,0 +1,367 @@
+"""
+Replay of captured production traffic.
+
+A query log is converted once into a binary trace (app/utils/query_trace.py)
+and streamed back against a backend through its replay_* adapter methods,
+either on the original schedule (optionally sped up) or as fast as possible.
+Latency is reported per query fingerprint.
+"""
+from typing import Dict, Any, List, Optional, Tuple
+from app.core.exceptions import ConfigurationError
+from app.utils.query_trace import LOG_PARSERS, TraceReader, ingest_log, resolve_trace_path
+from benchmarks.base import BaseBenchmark
+import asyncio
+import math
+import os
+import queue
+import threading
+import time
+
+# Events buffered ahead of the workers per worker; bounds memory while keeping workers fed
+QUEUE_DEPTH = 64
+# How often a blocked dispatcher checks that a worker is still alive to drain the queue
+WORKER_CHECK_SECONDS = 0.1
+SQL_TRANSACTION_CONTROL = ("begin", "start", "commit", "rollback", "end", "abort")
+
+def replay_settings(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Validated replay options from an experiment config's "replay" object"""
+    raw = config.get("replay")
+    if not isinstance(raw, dict) or ("trace" in raw) == ("log" in raw):
+        raise ConfigurationError("replay must be an object with either a 'trace' or a 'log' path")
+    if "log" in raw and raw.get("format") not in LOG_PARSERS:
+        raise ConfigurationError(f"replay.format must be one of {', '.join(LOG_PARSERS)}")
+    speed = raw.get("speed", 1.0)
+    if speed != "max" and (not isinstance(speed, (int, float)) or speed <= 0):
+        raise ConfigurationError("replay.speed must be a positive multiplier or 'max'")
+    source = resolve_trace_path(raw.get("trace") or raw["log"])
+    if not os.path.isfile(source):
+        raise ConfigurationError(f"Replay source {raw.get('trace') or raw['log']} does not exist")
+    concurrency = int(raw.get("concurrency", config.get("concurrent_users", 8)))
+    if concurrency < 1:
+        raise ConfigurationError("replay.concurrency must be at least 1")
+    return {
+        "source": source,
+        "format": raw.get("format"),
+        "speed": None if speed == "max" else float(speed),
+        "concurrency": concurrency,
+        "limit": raw.get("limit"),
+        "top_fingerprints": int(raw.get("top_fingerprints", 50))
+    }
+
+class LatencyHistogram:
+    """
+    Log-bucketed latencies, about 1% relative error per bucket.
+
+    Memory is proportional to the number of distinct buckets hit, not the
+    number of samples, so per-fingerprint percentiles stay cheap on
+    traces with hundreds of millions of events.
+    """
+    FLOOR = 1e-6
+    GROWTH = 1.02
+
+    _inverse_log_growth = 1.0 / math.log(GROWTH)
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        bucket = int(math.log(max(seconds, self.FLOOR) / self.FLOOR) * self._inverse_log_growth)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        if q >= 100:
+            return self.max
+        rank = q / 100 * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                # Geometric midpoint of the bucket, capped by the largest value actually seen
+                return min(self.FLOOR * self.GROWTH ** (bucket + 0.5), self.max)
+        return self.max
+
+class FingerprintStats:
+    def __init__(self):
+        self.service = LatencyHistogram()
+        self.response = LatencyHistogram()
+        self.errors = 0
+
+    def merge(self, other: "FingerprintStats") -> None:
+        self.service.merge(other.service)
+        self.response.merge(other.response)
+        self.errors += other.errors
+
+class TraceReplayer:
+    """
+    Streams a trace to a pool of workers.
+
+    A dispatcher reads events one at a time and releases each at its scheduled
+    time (trace offset / speed) into a bounded queue; with speed None events
+    are released as soon as a worker can take them. Response time is measured
+    from the scheduled time, so a backend that falls behind the original pace
+    is charged for the backlog; service time is measured from the actual call.
+    Each worker keeps its own statistics, merged after the run.
+    """
+
+    def __init__(self, adapter: BaseBenchmark, trace_path: str, speed: Optional[float], concurrency: int, limit: Optional[int] = None):
+        self.adapter = adapter
+        self.trace_path = trace_path
+        self.speed = speed
+        self.concurrency = concurrency
+        self.limit = limit
+        self.reader = TraceReader(trace_path)
+
+    def _events(self):
+        command_key = self.adapter.replay_command
+        for index, (offset, fingerprint_id, command) in enumerate(self.reader):
+            if self.limit and index >= self.limit:
+                return
+            if command_key not in command:
+                raise ConfigurationError(
+                    f"Trace event {index} is not a '{command_key}' command and cannot be replayed on {self.adapter.backend}"
+                )
+            yield offset, fingerprint_id, command
+
+    def _record(self, stats: Dict[int, FingerprintStats], fingerprint_id: int, intended: float, call_start: float, end: float, error: bool) -> None:
+        entry = stats.get(fingerprint_id)
+        if entry is None:
+            entry = stats[fingerprint_id] = FingerprintStats()
+        entry.service.record(end - call_start)
+        entry.response.record(end - intended)
+        if error:
+            entry.errors += 1
+        self.adapter._record_query_time(end - call_start, error=error)
+
+    async def run(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        if self.adapter.wl_blocking:
+            worker_stats = await asyncio.to_thread(self._run_blocking, started)
+        else:
+            worker_stats = await self._run_async(started)
+        duration = time.perf_counter() - started
+        return self._summarize(worker_stats, duration)
+
+    async def _run_async(self, started: float) -> List[Dict[int, FingerprintStats]]:
+        pending: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * QUEUE_DEPTH)
+        worker_stats = [{} for _ in range(self.concurrency)]
+        execute = self.adapter.replay_execute
+        cancelled = self.adapter.cancelled
+
+        async def dispatch():
+            for offset, fingerprint_id, command in self._events():
+                if cancelled.is_set():
+                    break
+                intended = started + offset / self.speed if self.speed else time.perf_counter()
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await pending.put((fingerprint_id, command, intended))
+            for _ in range(self.concurrency):
+                await pending.put(None)
+
+        async def worker(stats: Dict[int, FingerprintStats]):
+            async with self.adapter.replay_connect() as handle:
+                while (item := await pending.get()) is not None:
+                    fingerprint_id, command, intended = item
+                    call_start = time.perf_counter()
+                    error = False
+                    try:
+                        await execute(handle, command)
+                    except Exception:
+                        error = True
+                    self._record(stats, fingerprint_id, intended, call_start, time.perf_counter(), error)
+
+        tasks = [asyncio.ensure_future(dispatch()), *[asyncio.ensure_future(worker(stats)) for stats in worker_stats]]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # If any task fails the rest are cancelled, so a worker that failed to connect
+            # does not leave the dispatcher waiting on a full queue (or workers on an empty one)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return worker_stats
+
+    def _run_blocking(self, started: float) -> List[Dict[int, FingerprintStats]]:
+        pending: queue.Queue = queue.Queue(maxsize=self.concurrency * QUEUE_DEPTH)
+        worker_stats = [{} for _ in range(self.concurrency)]
+        execute = self.adapter.replay_execute
+        cancelled = self.adapter.cancelled
+        # Errors that ended a worker (failed connects); events that fail only count as errors
+        failures: List[BaseException] = []
+
+        def worker(stats: Dict[int, FingerprintStats]):
+            try:
+                with self.adapter.replay_connect() as handle:
+                    while (item := pending.get()) is not None:
+                        fingerprint_id, command, intended = item
+                        call_start = time.perf_counter()
+                        error = False
+                        try:
+                            execute(handle, command)
+                        except Exception:
+                            error = True
+                        self._record(stats, fingerprint_id, intended, call_start, time.perf_counter(), error)
+            except BaseException as e:
+                failures.append(e)
+
+        threads = [threading.Thread(target=worker, args=(stats,), daemon=True) for stats in worker_stats]
+
+        def put(item) -> bool:
+            """Queue item for the workers; False once none is left to take it"""
+            while True:
+                try:
+                    pending.put(item, timeout=WORKER_CHECK_SECONDS)
+                    return True
+                except queue.Full:
+                    if not any(thread.is_alive() for thread in threads):
+                        return False
+
+        for thread in threads:
+            thread.start()
+        try:
+            for offset, fingerprint_id, command in self._events():
+                if cancelled.is_set():
+                    break
+                intended = started + offset / self.speed if self.speed else time.perf_counter()
+                delay = intended - time.perf_counter()
+                if delay > 0 and cancelled.wait(delay):
+                    break
+                if not put((fingerprint_id, command, intended)):
+                    break
+        finally:
+            for _ in threads:
+                if not put(None):
+                    break
+            for thread in threads:
+                thread.join()
+        if failures:
+            raise failures[0]
+        return worker_stats
+
+    def _summarize(self, worker_stats: List[Dict[int, FingerprintStats]], duration: float) -> Dict[str, Any]:
+        merged: Dict[int, FingerprintStats] = {}
+        for stats in worker_stats:
+            for fingerprint_id, entry in stats.items():
+                merged.setdefault(fingerprint_id, FingerprintStats()).merge(entry)
+        events = sum(entry.service.count for entry in merged.values())
+        busy = sum(entry.service.total for entry in merged.values())
+
+        def ms(seconds: float) -> float:
+            return round(seconds * 1000, 3)
+
+        fingerprints = []
+        for fingerprint_id, entry in merged.items():
+            summary = {
+                "fingerprint": self.reader.fingerprints.get(fingerprint_id, str(fingerprint_id)),
+                "count": entry.service.count,
+                "errors": entry.errors,
+                "total_ms": ms(entry.service.total),
+                "share_of_time": round(entry.service.total / busy, 4) if busy > 0 else 0.0,
+                "latency_ms": {
+                    "avg": ms(entry.service.total / entry.service.count),
+                    "p50": ms(entry.service.percentile(50)),
+                    "p95": ms(entry.service.percentile(95)),
+                    "p99": ms(entry.service.percentile(99)),
+                    "max": ms(entry.service.max)
+                }
+            }
+            if self.speed:
+                summary["response_ms"] = {"p50": ms(entry.response.percentile(50)), "p99": ms(entry.response.percentile(99))}
+            fingerprints.append(summary)
+        fingerprints.sort(key=lambda f: f["total_ms"], reverse=True)
+        return {
+            "events": events,
+            "errors": sum(entry.errors for entry in merged.values()),
+            "duration_seconds": round(duration, 3),
+            "ops_per_second": round(events / duration, 2) if duration > 0 else 0.0,
+            "speed": self.speed or "max",
+            "concurrency": self.concurrency,
+            "fingerprint_count": len(fingerprints),
+            "fingerprints": fingerprints
+        }
+
+class ReplayBenchmark(BaseBenchmark):
+    """
+    Replays a trace through another benchmark's replay_* adapter methods.
+
+    The target must already hold the schema and data the captured traffic
+    expects; setup only converts a raw log into a trace (cached next to the
+    log until the log changes), outside the timed region.
+    """
+    default_operations = ["replay"]
+    load_operations: Tuple[str, ...] = ()
+
+    def __init__(self, adapter: BaseBenchmark):
+        super().__init__()
+        self.adapter = adapter
+        self.backend = adapter.backend
+        # The replayer runs the adapter's methods, so cancelling this benchmark must stop it
+        adapter.cancelled = self.cancelled
+        self.ingest: Optional[Dict[str, Any]] = None
+
+    def set_monitor(self, monitor):
+        super().set_monitor(monitor)
+        self.adapter.set_monitor(monitor)
+
+    async def setup(self, config: Dict[str, Any]) -> None:
+        options = replay_settings(config)
+        if options["format"]:
+            trace_path = f"{options['source']}.trace"
+            if not os.path.exists(trace_path) or os.path.getmtime(trace_path) < os.path.getmtime(options["source"]):
+                self.ingest = await asyncio.to_thread(ingest_log, options["source"], options["format"], trace_path)
+
+    async def run(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        options = replay_settings(config)
+        trace_path = f"{options['source']}.trace" if options["format"] else options["source"]
+        replayer = TraceReplayer(self.adapter, trace_path, options["speed"], options["concurrency"], options["limit"])
+        self.adapter._begin_operation("replay")
+        result = await replayer.run()
+        result["fingerprints"] = result["fingerprints"][:options["top_fingerprints"]]
+        if self.ingest:
+            result["ingest"] = self.ingest
+        return {"replay": result}
+
+    async def teardown(self) -> None:
+        pass
+
+class SQLReplayAdapter:
+    """
+    replay_* implementation for the SQLAlchemy-backed benchmarks.
+
+    Statements run as logged, each committed on its own; transaction-control
+    statements from the log are skipped since every statement autocommits.
+    """
+    replay_command = "sql"
+
+    async def replay_execute(self, session, command: Dict[str, Any]) -> None:
+        words = command["sql"].split(None, 1)
+        if not words or words[0].rstrip(";").lower() in SQL_TRANSACTION_CONTROL:
+            return
+        try:
+            # Logged SQL goes to the driver untouched: no bind-parameter parsing of ":" casts
+            # and, with no_parameters, no "%" interpolation by pyformat drivers
+            connection = await session.connection()
+            result = await connection.exec_driver_sql(command["sql"], execution_options={"no_parameters": True})
+            if result.returns_rows:
+                result.fetchall()
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
@@ -0,0 +1,141 @@
+import math
+import threading
+import time
+from statistics import NormalDist
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from app.core.exceptions import ConfigurationError
+
+DEFAULT_SAMPLING = {
+    "percentile": 99,
+    "relative_ci_width": 0.05,
+    "confidence": 0.95,
+    "min_samples": 50,
+    "max_samples": 100000,
+    "phase_budget_seconds": 30
+}
+# Convergence is re-checked once the sample count has grown by this factor, so
+# the sorts cost O(n log n) amortised over the whole phase
+CHECK_GROWTH = 1.1
+
+def sampling_settings(config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Options from an experiment config's "adaptive_sampling" (true, or an
+    object overriding DEFAULT_SAMPLING); None when sampling counts are fixed.
+    """
+    raw = config.get("adaptive_sampling")
+    if not raw:
+        return None
+    if not isinstance(raw, (bool, dict)):
+        raise ConfigurationError("adaptive_sampling must be true or an object")
+    options = {**DEFAULT_SAMPLING, **(raw if isinstance(raw, dict) else {})}
+    if set(options) - set(DEFAULT_SAMPLING):
+        raise ConfigurationError(f"Unknown adaptive_sampling keys: {', '.join(sorted(set(options) - set(DEFAULT_SAMPLING)))}")
+    if not isinstance(options["percentile"], (int, float)) or not 0 < options["percentile"] < 100:
+        raise ConfigurationError("adaptive_sampling.percentile must be between 0 and 100")
+    if not isinstance(options["relative_ci_width"], (int, float)) or options["relative_ci_width"] <= 0:
+        raise ConfigurationError("adaptive_sampling.relative_ci_width must be positive")
+    if not isinstance(options["confidence"], (int, float)) or not 0 < options["confidence"] < 1:
+        raise ConfigurationError("adaptive_sampling.confidence must be between 0 and 1")
+    if not all(isinstance(options[key], int) and options[key] > 0 for key in ("min_samples", "max_samples")):
+        raise ConfigurationError("adaptive_sampling.min_samples and max_samples must be positive integers")
+    if options["min_samples"] > options["max_samples"]:
+        raise ConfigurationError("adaptive_sampling.min_samples cannot exceed max_samples")
+    if not isinstance(options["phase_budget_seconds"], (int, float)) or options["phase_budget_seconds"] <= 0:
+        raise ConfigurationError("adaptive_sampling.phase_budget_seconds must be positive")
+    return options
+
+def percentile_interval(sorted_values: List[float], q: float, confidence: float) -> Tuple[float, float, float]:
+    """
+    Distribution-free (low, estimate, high) for the q-quantile of sorted samples.
+
+    The rank of the true quantile among n samples is Binomial(n, q); its
+    normal approximation gives the order statistics bounding the interval.
+    """
+    n = len(sorted_values)
+    z = NormalDist().inv_cdf(1 - (1 - confidence) / 2)
+    center = q * n
+    spread = z * math.sqrt(n * q * (1 - q))
+    low = max(0, math.floor(center - spread))
+    high = min(n - 1, math.ceil(center + spread))
+    return sorted_values[low], sorted_values[min(int(center), n - 1)], sorted_values[high]
+
+class PhaseSampler:
+    """
+    Sample indices for one timed phase.
+
+    With no settings it yields exactly `default` indices. Otherwise it keeps
+    yielding until the confidence interval of the target percentile, over the
+    latencies recorded into `latencies`, is narrower than relative_ci_width
+    of the estimate, or the phase hits max_samples or its time budget. Every
+    phase also stops early once `cancelled` is set, so loops running in
+    worker threads wind down when an experiment is cancelled.
+    """
+
+    def __init__(self, settings: Optional[Dict[str, Any]], default: int, cancelled: Optional[threading.Event] = None):
+        self.settings = settings
+        self.default = default
+        self.cancelled = cancelled
+        self.latencies: List[float] = []
+        self.issued = 0
+        self.stopped_by: Optional[str] = None
+        self.interval: Optional[Tuple[float, float, float]] = None
+        self.elapsed = 0.0
+
+    def _converged(self) -> bool:
+        settings = self.settings
+        self.interval = percentile_interval(sorted(self.latencies), settings["percentile"] / 100, settings["confidence"])
+        low, estimate, high = self.interval
+        return estimate > 0 and (high - low) / estimate <= settings["relative_ci_width"]
+
+    def __iter__(self) -> Iterator[int]:
+        started = time.perf_counter()
+        settings = self.settings
+        next_check = settings["min_samples"] if settings else 0
+        try:
+            while True:
+                if self.cancelled is not None and self.cancelled.is_set():
+                    self.stopped_by = "cancelled"
+                    return
+                if settings is None:
+                    if self.issued >= self.default:
+                        self.stopped_by = "fixed"
+                        return
+                else:
+                    if self.issued >= settings["max_samples"]:
+                        self.stopped_by = "max_samples"
+                        return
+                    if time.perf_counter() - started >= settings["phase_budget_seconds"]:
+                        self.stopped_by = "budget"
+                        return
+                    # Checked on recorded samples: concurrent workers may have more in flight
+                    if len(self.latencies) >= next_check:
+                        if self._converged():
+                            self.stopped_by = "converged"
+                            return
+                        next_check = max(next_check + 1, int(len(self.latencies) * CHECK_GROWTH))
+                yield self.issued
+                self.issued += 1
+        finally:
+            # A loop that stops pulling (an error, or a closed generator) leaves no reason set
+            self.stopped_by = self.stopped_by or "interrupted"
+            self.elapsed = time.perf_counter() - started
+
+    def report(self) -> Dict[str, Any]:
+        report: Dict[str, Any] = {
+            "samples": len(self.latencies),
+            "stopped_by": self.stopped_by,
+            "elapsed_seconds": round(self.elapsed, 3)
+        }
+        if self.settings:
+            if self.latencies and (self.interval is None or self.stopped_by != "converged"):
+                self._converged()
+            if self.interval:
+                low, estimate, high = self.interval
+                report.update({
+                    "percentile": self.settings["percentile"],
+                    "estimate_ms": round(estimate * 1000, 3),
+                    "ci_low_ms": round(low * 1000, 3),
+                    "ci_high_ms": round(high * 1000, 3),
+                    "relative_ci_width": round((high - low) / estimate, 4) if estimate > 0 else None
+                })
+        return report
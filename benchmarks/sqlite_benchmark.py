@@ -0,0 +1,420 @@
+from benchmarks.base import BaseBenchmark
+from benchmarks.replay import SQL_TRANSACTION_CONTROL
+from app.db.sqlite import get_sqlite_connection, sqlite_pragmas, durability_label, DEFAULT_PRAGMAS
+from app.core.config import settings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Any, List, Callable, Iterable, Tuple
+import threading
+import time
+import os
+import asyncio
+
+_DONE = object()
+
+class SQLiteBenchmark(BaseBenchmark):
+    """
+    Embedded SQLite on a local file, with the PostgreSQL operation set.
+
+    sqlite3 calls block, so every operation runs on a thread pool with one
+    connection per concurrent user and is timed inside its thread. The
+    journal_mode, synchronous, page_size and mmap_size config keys set the
+    storage pragmas and each setup starts from a fresh file, so a sweep over
+    them shows what each durability level costs in throughput.
+    """
+    default_operations = ["insert", "select"]
+    load_operations = ("insert",)
+    # Settings the load is written under; sweep points differing in these each get their own load
+    dataset_parameters = ("journal_mode", "synchronous", "page_size")
+
+    def __init__(self):
+        super().__init__()
+        self.table_name = "benchmark_test"
+        self.path = settings.SQLITE_PATH
+        self.pragmas: Dict[str, Any] = dict(DEFAULT_PRAGMAS)
+
+    def _remove_files(self) -> None:
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+    async def setup(self, config: Dict[str, Any]) -> None:
+        self.pragmas = sqlite_pragmas(config)
+
+        def create():
+            self._remove_files()
+            with get_sqlite_connection(self.path, self.pragmas) as connection:
+                connection.execute(f"""
+                    CREATE TABLE {self.table_name} (
+                        id INTEGER PRIMARY KEY,
+                        name VARCHAR(100),
+                        email VARCHAR(100),
+                        age INTEGER,
+                        score INTEGER,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                connection.execute(f"CREATE INDEX idx_name ON {self.table_name}(name)")
+                connection.execute(f"CREATE INDEX idx_score ON {self.table_name}(score)")
+                connection.commit()
+
+        await asyncio.to_thread(create)
+
+    async def run(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        num_rows = self._get_config_value(config, "rows", 1000)
+        operations = self._get_config_value(config, "operations", self.default_operations)
+        concurrent_users = self._get_config_value(config, "concurrent_users", 1)
+        data_size = self._get_config_value(config, "data_size", "small")
+        batch_size = self._get_config_value(config, "batch_size", None) or 1000
+        # Connection-level pragmas (synchronous, mmap_size) may differ between runs on one load
+        self.pragmas = sqlite_pragmas(config)
+
+        results = {}
+
+        if "insert" in operations:
+            self._begin_operation("insert")
+            results["insert"] = await self._run_insert_benchmark(num_rows, concurrent_users, data_size, batch_size)
+
+        if "select" in operations:
+            self._begin_operation("select")
+            results["select"] = await self._run_select_benchmark(num_rows, concurrent_users)
+
+        if "update" in operations:
+            self._begin_operation("update")
+            results["update"] = await self._run_update_benchmark(num_rows, concurrent_users)
+
+        if "join" in operations:
+            self._begin_operation("join")
+            results["join"] = await asyncio.to_thread(self._run_join_benchmark)
+
+        if "window" in operations:
+            self._begin_operation("window")
+            results["window"] = await asyncio.to_thread(self._run_window_function_benchmark)
+
+        if "json" in operations:
+            self._begin_operation("json")
+            results["json"] = await asyncio.to_thread(self._run_json_benchmark, num_rows)
+
+        results["storage"] = {
+            **self.pragmas,
+            "durability": durability_label(self.pragmas),
+            "file_size_bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        }
+        return results
+
+    async def _run_in_threads(
+        self,
+        statement: Callable,
+        items: Iterable[Any],
+        concurrent_users: int
+    ) -> Tuple[List[float], float]:
+        """
+        Run statement(connection, item) for every item across concurrent_users
+        threads, each holding its own connection and pulling the next item
+        from a shared iterator. Returns the per-call times and the wall-clock
+        time for the whole set.
+        """
+        workers = max(1, concurrent_users)
+        pragmas = self.pragmas
+        iterator = iter(items)
+        lock = threading.Lock()
+
+        def next_item():
+            with lock:
+                return next(iterator, _DONE)
+
+        def worker():
+            times = []
+            with get_sqlite_connection(self.path, pragmas) as connection:
+                for item in iter(next_item, _DONE):
+                    start = time.perf_counter()
+                    statement(connection, item)
+                    elapsed = time.perf_counter() - start
+                    self._record_query_time(elapsed)
+                    times.append(elapsed)
+            return times
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = await asyncio.gather(*[
+                loop.run_in_executor(executor, worker) for _ in range(workers)
+            ])
+        wall = time.perf_counter() - start
+        return [t for worker_times in results for t in worker_times], wall
+
+    async def _run_insert_benchmark(
+        self,
+        num_rows: int,
+        concurrent_users: int = 1,
+        data_size: str = "small",
+        batch_size: int = 1000
+    ) -> Dict[str, Any]:
+        data = self.generate_test_data(num_rows, data_size=data_size)
+        batches = [
+            [(row["id"], row["name"], row["email"], row["age"], row["score"]) for row in data[i:i+batch_size]]
+            for i in range(0, len(data), batch_size)
+        ]
+
+        def insert_batch(connection, batch):
+            connection.executemany(
+                f"INSERT INTO {self.table_name} (id, name, email, age, score) VALUES (?, ?, ?, ?, ?)",
+                batch
+            )
+            connection.commit()
+
+        _, elapsed = await self._run_in_threads(insert_batch, batches, concurrent_users)
+
+        return {
+            "rows_inserted": num_rows,
+            "time_seconds": round(elapsed, 3),
+            "rows_per_second": round(num_rows / elapsed, 2) if elapsed > 0 else 0,
+            "concurrent_users": concurrent_users,
+            "batch_size": batch_size
+        }
+
+    async def _run_select_benchmark(self, num_rows: int, concurrent_users: int = 1) -> Dict[str, Any]:
+        queries = [
+            (f"SELECT * FROM {self.table_name} WHERE id = ?", lambda i: (i % num_rows,)),
+            (f"SELECT * FROM {self.table_name} WHERE name = ?", lambda i: (f"user{i % num_rows}@example.com",)),
+            (f"SELECT * FROM {self.table_name} WHERE score > ?", lambda i: (50,)),
+            (f"SELECT COUNT(*) FROM {self.table_name}", lambda i: ()),
+            (f"SELECT AVG(score) FROM {self.table_name}", lambda i: ())
+        ]
+        num_queries = min(100, num_rows // 10)
+
+        # Sample i runs query template i % 5; worker threads share one index stream
+        def execute_query(connection, index):
+            query, params = queries[index % len(queries)]
+            connection.execute(query, params(index // len(queries))).fetchall()
+
+        query_times, elapsed = await self._run_in_threads(
+            execute_query, self._samples(len(queries) * num_queries), concurrent_users
+        )
+
+        return {
+            "queries_executed": len(query_times),
+            "avg_time_seconds": round(sum(query_times) / len(query_times), 4) if query_times else 0,
+            "min_time_seconds": round(min(query_times), 4) if query_times else 0,
+            "max_time_seconds": round(max(query_times), 4) if query_times else 0,
+            "queries_per_second": round(len(query_times) / elapsed, 2) if elapsed > 0 else 0,
+            "concurrent_users": concurrent_users
+        }
+
+    async def _run_update_benchmark(self, num_rows: int, concurrent_users: int = 1) -> Dict[str, Any]:
+        updates = min(100, num_rows // 10)
+
+        # One commit per update, so each pays the journal's sync cost
+        def execute_update(connection, update_id):
+            connection.execute(
+                f"UPDATE {self.table_name} SET score = score + 1 WHERE id = ?",
+                (update_id % num_rows,)
+            )
+            connection.commit()
+
+        query_times, elapsed = await self._run_in_threads(execute_update, self._samples(updates), concurrent_users)
+
+        return {
+            "rows_updated": len(query_times),
+            "avg_time_seconds": round(sum(query_times) / len(query_times), 4) if query_times else 0,
+            "updates_per_second": round(len(query_times) / elapsed, 2) if elapsed > 0 else 0,
+            "concurrent_users": concurrent_users
+        }
+
+    def _timed_queries(self, connection, queries: List[str], phase: str) -> List[float]:
+        query_times = []
+        for index, query in enumerate(queries):
+            for _ in self._samples(1, f"{phase}:{index}"):
+                start = time.perf_counter()
+                connection.execute(query).fetchall()
+                elapsed = time.perf_counter() - start
+                query_times.append(elapsed)
+                self._record_query_time(elapsed)
+        return query_times
+
+    def _run_join_benchmark(self) -> Dict[str, Any]:
+        with get_sqlite_connection(self.path, self.pragmas) as connection:
+            connection.execute(f"""
+                CREATE TABLE IF NOT EXISTS {self.table_name}_join (
+                    id INTEGER PRIMARY KEY,
+                    user_id INTEGER,
+                    action VARCHAR(50),
+                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            connection.executemany(
+                f"INSERT OR REPLACE INTO {self.table_name}_join (id, user_id, action) VALUES (?, ?, ?)",
+                [(i, i % 50, "test") for i in range(100)]
+            )
+            connection.commit()
+
+            start = time.perf_counter()
+            rows = connection.execute(f"""
+                SELECT t.id, t.name, t.score, j.action, j.timestamp
+                FROM {self.table_name} t
+                JOIN {self.table_name}_join j ON t.id = j.user_id
+                WHERE t.score > 50
+                LIMIT 100
+            """).fetchall()
+            elapsed = time.perf_counter() - start
+            self._record_query_time(elapsed)
+
+        return {
+            "rows_returned": len(rows),
+            "time_seconds": round(elapsed, 3)
+        }
+
+    def _run_window_function_benchmark(self) -> Dict[str, Any]:
+        queries = [
+            f"""
+            SELECT id, name, score,
+                   ROW_NUMBER() OVER (ORDER BY score DESC) as rank,
+                   AVG(score) OVER (PARTITION BY age) as avg_by_age
+            FROM {self.table_name}
+            LIMIT 100
+            """,
+            f"""
+            SELECT id, name, score,
+                   LAG(score) OVER (ORDER BY id) as prev_score,
+                   LEAD(score) OVER (ORDER BY id) as next_score
+            FROM {self.table_name}
+            LIMIT 100
+            """,
+            f"""
+            SELECT id, name, score,
+                   SUM(score) OVER (ORDER BY id ROWS BETWEEN 2 PRECEDING AND CURRENT ROW) as running_sum
+            FROM {self.table_name}
+            LIMIT 100
+            """
+        ]
+        with get_sqlite_connection(self.path, self.pragmas) as connection:
+            query_times = self._timed_queries(connection, queries, "window")
+
+        return {
+            "queries_executed": len(query_times),
+            "avg_time_seconds": round(sum(query_times) / len(query_times), 4) if query_times else 0
+        }
+
+    def _run_json_benchmark(self, num_rows: int) -> Dict[str, Any]:
+        queries = [
+            f"SELECT * FROM {self.table_name} WHERE json_extract(metadata, '$.tags') LIKE '%tag1%'",
+            f"SELECT * FROM {self.table_name} WHERE json_extract(metadata, '$.settings.enabled') = 1",
+            f"SELECT id, json_extract(metadata, '$.settings.enabled') as enabled FROM {self.table_name} LIMIT 50"
+        ]
+        with get_sqlite_connection(self.path, self.pragmas) as connection:
+            # SQLite has no ADD COLUMN IF NOT EXISTS; JSON is stored as TEXT and read with json_extract
+            columns = [row[1] for row in connection.execute(f"PRAGMA table_info({self.table_name})")]
+            if "metadata" not in columns:
+                connection.execute(f"ALTER TABLE {self.table_name} ADD COLUMN metadata TEXT")
+            connection.executemany(
+                f"UPDATE {self.table_name} SET metadata = ? WHERE id = ?",
+                [('{"tags": ["tag1", "tag2"], "settings": {"enabled": true}}', i) for i in range(min(100, num_rows // 10))]
+            )
+            connection.commit()
+            query_times = self._timed_queries(connection, queries, "json")
+
+        return {
+            "queries_executed": len(query_times),
+            "avg_time_seconds": round(sum(query_times) / len(query_times), 4) if query_times else 0
+        }
+
+    async def teardown(self) -> None:
+        await asyncio.to_thread(self._remove_files)
+
+    # Workload adapter: blocking, one connection per worker thread, default pragmas
+    # (declarative workloads do not pass the experiment config to wl_setup)
+    wl_blocking = True
+    wl_table = "workload_records"
+    wl_column_types = {"int": "INTEGER", "float": "REAL", "str": "TEXT"}
+
+    async def wl_setup(self, spec) -> None:
+        self._wl_key = spec.schema.key_field
+        self._wl_fields = spec.schema.field_names
+        columns = [f"{self._wl_key} INTEGER PRIMARY KEY"]
+        columns += [f"{f.name} {self.wl_column_types[f.type]}" for f in spec.schema.fields]
+
+        def create():
+            with get_sqlite_connection(self.path, self.pragmas) as connection:
+                connection.execute(f"DROP TABLE IF EXISTS {self.wl_table}")
+                connection.execute(f"CREATE TABLE {self.wl_table} ({', '.join(columns)})")
+                connection.commit()
+
+        await asyncio.to_thread(create)
+
+    async def wl_teardown(self, spec) -> None:
+        def drop():
+            with get_sqlite_connection(self.path, self.pragmas) as connection:
+                connection.execute(f"DROP TABLE IF EXISTS {self.wl_table}")
+                connection.commit()
+
+        await asyncio.to_thread(drop)
+
+    @contextmanager
+    def wl_connect(self):
+        with get_sqlite_connection(self.path, self.pragmas) as connection:
+            names = [self._wl_key] + self._wl_fields
+            statements = {
+                "insert": f"INSERT INTO {self.wl_table} ({', '.join(names)}) VALUES ({', '.join('?' for _ in names)})",
+                "point_read": f"SELECT * FROM {self.wl_table} WHERE {self._wl_key} = ?",
+                "range_read": f"SELECT * FROM {self.wl_table} WHERE {self._wl_key} >= ? ORDER BY {self._wl_key} LIMIT ?",
+                "scan": f"SELECT * FROM {self.wl_table} LIMIT ?"
+            }
+            for name in self._wl_fields:
+                statements[f"update:{name}"] = f"UPDATE {self.wl_table} SET {name} = ? WHERE {self._wl_key} = ?"
+            yield connection, statements, names
+
+    def _wl_write(self, connection, statement: str, parameters, many: bool = False) -> None:
+        # A failed write leaves the implicit transaction open; roll back so the connection stays usable
+        try:
+            if many:
+                connection.executemany(statement, parameters)
+            else:
+                connection.execute(statement, parameters)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+
+    def wl_load(self, handle, records: List[Dict[str, Any]]) -> None:
+        connection, statements, names = handle
+        self._wl_write(connection, statements["insert"], [tuple(r[n] for n in names) for r in records], many=True)
+
+    def wl_point_read(self, handle, key: int) -> None:
+        connection, statements, _ = handle
+        connection.execute(statements["point_read"], (key,)).fetchall()
+
+    def wl_range_read(self, handle, key: int, count: int) -> None:
+        connection, statements, _ = handle
+        connection.execute(statements["range_read"], (key, count)).fetchall()
+
+    def wl_scan(self, handle, count: int) -> None:
+        connection, statements, _ = handle
+        connection.execute(statements["scan"], (count,)).fetchall()
+
+    def wl_insert(self, handle, record: Dict[str, Any]) -> None:
+        connection, statements, names = handle
+        self._wl_write(connection, statements["insert"], tuple(record[n] for n in names))
+
+    def wl_update(self, handle, key: int, values: Dict[str, Any]) -> None:
+        connection, statements, _ = handle
+        (name, value), = values.items()
+        self._wl_write(connection, statements[f"update:{name}"], (value, key))
+
+    # Trace replay: logged SQL runs as-is on a plain connection, each statement committed on its own
+    replay_command = "sql"
+
+    @contextmanager
+    def replay_connect(self):
+        with get_sqlite_connection(self.path, self.pragmas) as connection:
+            yield connection
+
+    def replay_execute(self, connection, command: Dict[str, Any]) -> None:
+        words = command["sql"].split(None, 1)
+        if not words or words[0].rstrip(";").lower() in SQL_TRANSACTION_CONTROL:
+            return
+        try:
+            connection.execute(command["sql"]).fetchall()
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
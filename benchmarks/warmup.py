@@ -0,0 +1,93 @@
+import threading
+import time
+from statistics import mean, pstdev
+from typing import Dict, Any, List, Optional
+from app.core.exceptions import ConfigurationError
+
+DEFAULT_WARMUP = {
+    "operations": None,
+    "window_seconds": 1.0,
+    "stable_windows": 5,
+    "tolerance": 0.05,
+    "max_seconds": 60
+}
+
+def warmup_settings(config: Dict[str, Any], load_operations=()) -> Optional[Dict[str, Any]]:
+    """
+    Options from an experiment config's "warmup" (true, or an object
+    overriding DEFAULT_WARMUP); None when the run starts cold.
+    """
+    if "warmup_rows" in config or "warmup_operations" in config:
+        raise ConfigurationError("warmup_rows and warmup_operations were replaced by warmup (see README)")
+    raw = config.get("warmup")
+    if not raw:
+        return None
+    if not isinstance(raw, (bool, dict)):
+        raise ConfigurationError("warmup must be true or an object")
+    options = {**DEFAULT_WARMUP, **(raw if isinstance(raw, dict) else {})}
+    if set(options) - set(DEFAULT_WARMUP):
+        raise ConfigurationError(f"Unknown warmup keys: {', '.join(sorted(set(options) - set(DEFAULT_WARMUP)))}")
+    operations = options["operations"]
+    if operations is not None:
+        if not isinstance(operations, list) or not operations or not all(isinstance(op, str) for op in operations):
+            raise ConfigurationError("warmup.operations must be a non-empty list of operation names")
+        if set(operations) & set(load_operations):
+            # Re-running a load would collide with (or duplicate) the data the measured run loads
+            raise ConfigurationError(
+                f"warmup.operations cannot include load operations: {', '.join(sorted(set(operations) & set(load_operations)))}"
+            )
+    for key in ("window_seconds", "tolerance", "max_seconds"):
+        if not isinstance(options[key], (int, float)) or isinstance(options[key], bool) or options[key] <= 0:
+            raise ConfigurationError(f"warmup.{key} must be positive")
+    if not isinstance(options["stable_windows"], int) or options["stable_windows"] < 2:
+        raise ConfigurationError("warmup.stable_windows must be an integer of at least 2")
+    return options
+
+class SteadyStateDetector:
+    """
+    Windowed-throughput steady-state test for a warm-up phase.
+
+    Completed queries are counted into fixed windows of window_seconds. The
+    workload is steady once the coefficient of variation of the last
+    stable_windows window throughputs is at most tolerance. Thread-safe, as
+    blocking backends record from worker threads.
+    """
+
+    def __init__(self, window_seconds: float, stable_windows: int, tolerance: float):
+        self.window_seconds = window_seconds
+        self.stable_windows = stable_windows
+        self.tolerance = tolerance
+        self.windows: List[float] = []
+        self.queries = 0
+        self._window_queries = 0
+        self._window_start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _close_windows(self, now: float) -> None:
+        # A gap longer than one window (e.g. between passes) closes the empty windows too
+        while now - self._window_start >= self.window_seconds:
+            self.windows.append(self._window_queries / self.window_seconds)
+            self._window_queries = 0
+            self._window_start += self.window_seconds
+
+    def record(self) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            self._close_windows(now)
+            self._window_queries += 1
+            self.queries += 1
+
+    def variation(self) -> Optional[float]:
+        """Coefficient of variation over the last stable_windows windows; None until there are enough"""
+        with self._lock:
+            self._close_windows(time.perf_counter())
+            recent = self.windows[-self.stable_windows:]
+        if len(recent) < self.stable_windows:
+            return None
+        average = mean(recent)
+        return pstdev(recent) / average if average > 0 else None
+
+    @property
+    def steady(self) -> bool:
+        variation = self.variation()
+        return variation is not None and variation <= self.tolerance
@@ -0,0 +1,704 @@
+"""
+Declarative, backend-agnostic workloads.
+
+A WorkloadSpec describes records, key popularity, an operation mix and a
+concurrency/rate target. The spec is expanded into a deterministic operation
+stream (same seed, same stream on every store) and executed through the
+backend's wl_* adapter methods, so results are comparable across stores.
+"""
+from dataclasses import dataclass, field
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional, Callable
+from app.core.exceptions import ConfigurationError
+from benchmarks.base import BaseBenchmark
+import asyncio
+import threading
+import time
+import numpy as np
+
+OPERATION_TYPES = ("point_read", "range_read", "insert", "update", "scan", "read_modify_write")
+FIELD_TYPES = ("int", "float", "str")
+
+DEFAULT_FIELDS = [
+    {"name": "name", "type": "str", "size": 20},
+    {"name": "email", "type": "str", "size": 30},
+    {"name": "age", "type": "int"},
+    {"name": "score", "type": "float"},
+    {"name": "payload", "type": "str", "size": 100}
+]
+
+# YCSB core workloads A-F. "read" maps to point_read and YCSB's scan (a short
+# range starting at a chosen key) to range_read with lengths uniform in [1, range_length].
+YCSB_WORKLOADS = {
+    "a": {"mix": {"point_read": 0.5, "update": 0.5}, "key_distribution": {"type": "zipfian"}},
+    "b": {"mix": {"point_read": 0.95, "update": 0.05}, "key_distribution": {"type": "zipfian"}},
+    "c": {"mix": {"point_read": 1.0}, "key_distribution": {"type": "zipfian"}},
+    "d": {"mix": {"point_read": 0.95, "insert": 0.05}, "key_distribution": {"type": "latest"}},
+    "e": {
+        "mix": {"range_read": 0.95, "insert": 0.05},
+        "key_distribution": {"type": "zipfian"},
+        "range_length": 100,
+        "range_length_distribution": "uniform"
+    },
+    "f": {"mix": {"point_read": 0.5, "read_modify_write": 0.5}, "key_distribution": {"type": "zipfian"}}
+}
+
+@dataclass
+class FieldSpec:
+    name: str
+    type: str = "str"
+    size: int = 20
+
+@dataclass
+class RecordSchema:
+    fields: List[FieldSpec]
+    key_field: str = "id"
+
+    @property
+    def field_names(self) -> List[str]:
+        return [f.name for f in self.fields]
+
+@dataclass
+class KeyDistribution:
+    type: str = "uniform"
+    params: Dict[str, Any] = field(default_factory=dict)
+
+@dataclass
+class WorkloadSpec:
+    schema: RecordSchema
+    mix: Dict[str, float]
+    record_count: int = 10000
+    operation_count: int = 10000
+    key_distribution: KeyDistribution = field(default_factory=KeyDistribution)
+    concurrency: int = 1
+    target_rate: Optional[float] = None
+    range_length: int = 10
+    range_length_distribution: str = "constant"
+    scan_length: int = 100
+    load_batch_size: int = 1000
+    seed: int = 42
+    preset: Optional[str] = None
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "WorkloadSpec":
+        """
+        Build a spec from an experiment config's "workload" object.
+
+        A "preset" (YCSB core workload "a" to "f") supplies defaults that the
+        object's own keys override. Top-level "rows" and "concurrent_users"
+        override record_count and concurrency, so workload experiments can be
+        swept like any other.
+        """
+        raw = config.get("workload")
+        if not isinstance(raw, dict):
+            raise ConfigurationError("workload must be an object")
+        preset = raw.get("preset")
+        if preset is not None:
+            if str(preset).lower() not in YCSB_WORKLOADS:
+                raise ConfigurationError(f"Unknown workload preset {preset}; choose one of a-f")
+            preset = str(preset).lower()
+            raw = {**YCSB_WORKLOADS[preset], **raw}
+        raw = dict(raw)
+        if "rows" in config:
+            raw["record_count"] = config["rows"]
+        if "concurrent_users" in config:
+            raw["concurrency"] = config["concurrent_users"]
+
+        fields = []
+        for entry in raw.get("schema", {}).get("fields", DEFAULT_FIELDS):
+            try:
+                spec = FieldSpec(**entry)
+            except TypeError as e:
+                raise ConfigurationError(f"Invalid workload field {entry}: {e}")
+            if spec.type not in FIELD_TYPES:
+                raise ConfigurationError(f"Field {spec.name} has unsupported type {spec.type}")
+            fields.append(spec)
+        schema = RecordSchema(fields=fields, key_field=raw.get("schema", {}).get("key_field", "id"))
+
+        mix = {op: float(weight) for op, weight in raw.get("mix", {"point_read": 0.5, "update": 0.5}).items()}
+        unknown = set(mix) - set(OPERATION_TYPES)
+        if unknown or not mix or sum(mix.values()) <= 0 or min(mix.values()) < 0:
+            raise ConfigurationError(f"workload.mix must weight operations from {OPERATION_TYPES}")
+
+        distribution = dict(raw.get("key_distribution", {"type": "uniform"}))
+        key_distribution = KeyDistribution(type=distribution.pop("type", "uniform"), params=distribution)
+        if key_distribution.type not in KEY_CHOOSERS:
+            raise ConfigurationError(f"Unknown key distribution {key_distribution.type}")
+
+        spec = cls(
+            schema=schema,
+            mix=mix,
+            record_count=int(raw.get("record_count", 10000)),
+            operation_count=int(raw.get("operation_count", 10000)),
+            key_distribution=key_distribution,
+            concurrency=int(raw.get("concurrency", 1)),
+            target_rate=raw.get("target_rate"),
+            range_length=int(raw.get("range_length", 10)),
+            range_length_distribution=raw.get("range_length_distribution", "constant"),
+            scan_length=int(raw.get("scan_length", 100)),
+            load_batch_size=int(raw.get("load_batch_size", 1000)),
+            seed=int(raw.get("seed", 42)),
+            preset=preset
+        )
+        if spec.record_count < 1 or spec.operation_count < 0 or spec.concurrency < 1:
+            raise ConfigurationError("workload needs record_count >= 1, operation_count >= 0 and concurrency >= 1")
+        if spec.range_length_distribution not in ("constant", "uniform"):
+            raise ConfigurationError("workload.range_length_distribution must be 'constant' or 'uniform'")
+        return spec
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "preset": self.preset,
+            "record_count": self.record_count,
+            "operation_count": self.operation_count,
+            "fields": [f.__dict__ for f in self.schema.fields],
+            "key_distribution": {"type": self.key_distribution.type, **self.key_distribution.params},
+            "mix": self.mix,
+            "concurrency": self.concurrency,
+            "target_rate": self.target_rate,
+            "range_length": self.range_length,
+            "range_length_distribution": self.range_length_distribution,
+            "scan_length": self.scan_length,
+            "seed": self.seed
+        }
+
+# Key choosers: (rng, count, key_space, params, inserted_before) -> int64 keys in [0, key_space).
+# inserted_before[i] is how many inserts precede operation i, for choosers that track the newest key.
+
+FNV_OFFSET_BASIS_64 = np.uint64(0xCBF29CE484222325)
+FNV_PRIME_64 = np.uint64(0x100000001B3)
+
+def _fnv_hash64(values: np.ndarray) -> np.ndarray:
+    """Vectorised FNV-1a over each value's eight little-endian bytes (YCSB's key scrambling hash)"""
+    values = values.astype(np.uint64)
+    hashed = np.full(values.shape, FNV_OFFSET_BASIS_64, dtype=np.uint64)
+    for shift in range(0, 64, 8):
+        hashed ^= (values >> np.uint64(shift)) & np.uint64(0xFF)
+        hashed *= FNV_PRIME_64
+    return hashed
+
+def _zipfian_ranks(rng: np.random.Generator, count: int, items: int, theta: float) -> np.ndarray:
+    """
+    Ranks in [0, items) with P(rank i) proportional to 1 / (i + 1) ** theta.
+
+    Gray et al.'s closed-form inversion as used by YCSB: zeta(n) is summed
+    once, then each draw is O(1) with no per-item CDF table.
+    """
+    if items == 1:
+        return np.zeros(count, dtype=np.int64)
+    zetan = float(np.sum(1.0 / np.power(np.arange(1, items + 1, dtype=np.float64), theta)))
+    zeta2 = 1.0 + 0.5 ** theta
+    alpha = 1.0 / (1.0 - theta)
+    eta = (1.0 - (2.0 / items) ** (1.0 - theta)) / (1.0 - zeta2 / zetan)
+    u = rng.random(count)
+    uz = u * zetan
+    ranks = (items * np.power(eta * u - eta + 1.0, alpha)).astype(np.int64)
+    ranks = np.where(uz < zeta2, 1, ranks)
+    ranks = np.where(uz < 1.0, 0, ranks)
+    return np.clip(ranks, 0, items - 1)
+
+def _uniform_keys(rng, count, key_space, params, inserted_before) -> np.ndarray:
+    return rng.integers(0, key_space, size=count, dtype=np.int64)
+
+def _sequential_keys(rng, count, key_space, params, inserted_before) -> np.ndarray:
+    return np.arange(count, dtype=np.int64) % key_space
+
+def _zipfian_keys(rng, count, key_space, params, inserted_before) -> np.ndarray:
+    """Key 0 is the hottest, key 1 the next, and so on"""
+    return _zipfian_ranks(rng, count, key_space, float(params.get("theta", 0.99)))
+
+def _scrambled_zipfian_keys(rng, count, key_space, params, inserted_before) -> np.ndarray:
+    """Zipfian popularity with the hot keys hashed across the key space instead of clustered at 0"""
+    ranks = _zipfian_ranks(rng, count, key_space, float(params.get("theta", 0.99)))
+    return (_fnv_hash64(ranks) % np.uint64(key_space)).astype(np.int64)
+
+def _latest_keys(rng, count, key_space, params, inserted_before) -> np.ndarray:
+    """Zipfian over recency: the most recently inserted key is the hottest"""
+    ranks = _zipfian_ranks(rng, count, key_space, float(params.get("theta", 0.99)))
+    return np.maximum(key_space - 1 + inserted_before - ranks, 0)
+
+def _hotspot_keys(rng, count, key_space, params, inserted_before) -> np.ndarray:
+    """hot_operation_fraction of operations go uniformly to the first hot_data_fraction of keys"""
+    hot_keys = max(1, int(key_space * float(params.get("hot_data_fraction", 0.2))))
+    hot = rng.random(count) < float(params.get("hot_operation_fraction", 0.8))
+    keys = rng.integers(hot_keys, max(key_space, hot_keys + 1), size=count, dtype=np.int64)
+    keys[hot] = rng.integers(0, hot_keys, size=int(hot.sum()), dtype=np.int64)
+    return np.minimum(keys, key_space - 1)
+
+KEY_CHOOSERS = {
+    "uniform": _uniform_keys,
+    "sequential": _sequential_keys,
+    "zipfian": _zipfian_keys,
+    "scrambled_zipfian": _scrambled_zipfian_keys,
+    "latest": _latest_keys,
+    "hotspot": _hotspot_keys
+}
+
+class RecordFactory:
+    """Deterministic record values derived from (key, version), cheap enough to build per operation"""
+
+    def __init__(self, schema: RecordSchema, seed: int, pool_size: int = 1024):
+        rng = np.random.default_rng(seed)
+        alphabet = np.frombuffer(b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789", dtype=np.uint8)
+        self.schema = schema
+        self.pool_size = pool_size
+        self._pools = {}
+        for spec in schema.fields:
+            if spec.type == "str":
+                chars = alphabet[rng.integers(0, len(alphabet), size=(pool_size, spec.size))]
+                self._pools[spec.name] = [row.tobytes().decode() for row in chars]
+
+    def _value(self, spec: FieldSpec, slot: int, key: int, version: int):
+        if spec.type == "str":
+            return self._pools[spec.name][(key * 2654435761 + version * 40503 + slot) % self.pool_size]
+        if spec.type == "int":
+            return (key * 7919 + version * 104729 + slot) % 100000
+        return ((key * 7919 + version * 104729 + slot) % 1000000) / 100.0
+
+    def record(self, key: int, version: int = 0) -> Dict[str, Any]:
+        values = {self.schema.key_field: int(key)}
+        for slot, spec in enumerate(self.schema.fields):
+            values[spec.name] = self._value(spec, slot, key, version)
+        return values
+
+    def update_values(self, key: int, version: int) -> Dict[str, Any]:
+        """One field per update, rotating through the schema like YCSB's single-field writes"""
+        slot = version % len(self.schema.fields)
+        spec = self.schema.fields[slot]
+        return {spec.name: self._value(spec, slot, key, version)}
+
+class OperationStream:
+    """
+    The pre-generated operation sequence: an op code and a key per operation.
+
+    Built with numpy before the timed region from the spec's seed. Inserts
+    take fresh keys above the loaded range in order, starting after the
+    `inserted` keys earlier runs on the same data already took; other
+    operations draw from the key chooser over the loaded records (for
+    "latest", over the records inserted so far).
+    """
+
+    def __init__(self, spec: WorkloadSpec, inserted: int = 0):
+        rng = np.random.default_rng(spec.seed)
+        names = [op for op in OPERATION_TYPES if spec.mix.get(op, 0) > 0]
+        weights = np.array([spec.mix[op] for op in names], dtype=np.float64)
+        self.operation_names = names
+        self.codes = rng.choice(len(names), size=spec.operation_count, p=weights / weights.sum()).astype(np.int8)
+        inserts = self.codes == names.index("insert") if "insert" in names else np.zeros(len(self.codes), dtype=np.bool_)
+        self.insert_count = int(inserts.sum())
+        inserted_before = inserted + np.cumsum(inserts) - inserts
+        chooser = KEY_CHOOSERS[spec.key_distribution.type]
+        self.keys = chooser(rng, spec.operation_count, spec.record_count, spec.key_distribution.params, inserted_before)
+        self.keys[inserts] = spec.record_count + inserted + np.arange(self.insert_count, dtype=np.int64)
+        self.lengths: Optional[np.ndarray] = None
+        if "range_read" in names:
+            ranges = self.codes == names.index("range_read")
+            if spec.range_length_distribution == "uniform":
+                self.lengths = rng.integers(1, spec.range_length + 1, size=spec.operation_count, dtype=np.int64)
+            self.keys[ranges] = np.minimum(self.keys[ranges], max(spec.record_count - spec.range_length, 0))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+class WorkloadRunner:
+    """
+    Executes an OperationStream against a backend adapter.
+
+    Workers pull the next operation index from a shared cursor. With a
+    target_rate, operation i is scheduled at start + i / rate and its
+    response time is measured from that intended start, so a backend that
+    falls behind is charged for the queueing (no coordinated omission);
+    service time is measured from the actual call. Blocking adapters run
+    each worker in its own thread and time the native call directly, so the
+    thread hand-off is not part of the latency.
+    """
+
+    def __init__(self, adapter: BaseBenchmark, spec: WorkloadSpec, inserted: int = 0):
+        self.adapter = adapter
+        self.spec = spec
+        self.records = RecordFactory(spec.schema, spec.seed)
+        # Keys above the loaded range already taken by earlier runs; advanced by every run
+        self.inserted = inserted
+
+    async def load(self) -> Dict[str, Any]:
+        spec = self.spec
+        started = time.perf_counter()
+        loaded = 0
+        async with self._connection() as handle:
+            for offset in range(0, spec.record_count, spec.load_batch_size):
+                if self.adapter.cancelled.is_set():
+                    break
+                batch = [self.records.record(k) for k in range(offset, min(offset + spec.load_batch_size, spec.record_count))]
+                batch_started = time.perf_counter()
+                await self._call(self.adapter.wl_load, handle, batch)
+                self.adapter._record_query_time(time.perf_counter() - batch_started)
+                loaded += len(batch)
+        elapsed = time.perf_counter() - started
+        return {
+            "records_loaded": loaded,
+            "time_seconds": round(elapsed, 3),
+            "records_per_second": round(loaded / elapsed, 2) if elapsed > 0 else 0
+        }
+
+    @asynccontextmanager
+    async def _connection(self):
+        if self.adapter.wl_blocking:
+            context = self.adapter.wl_connect()
+            handle = await asyncio.to_thread(context.__enter__)
+            try:
+                yield handle
+            finally:
+                await asyncio.to_thread(context.__exit__, None, None, None)
+        else:
+            async with self.adapter.wl_connect() as handle:
+                yield handle
+
+    async def _call(self, method, *args):
+        if self.adapter.wl_blocking:
+            return await asyncio.to_thread(method, *args)
+        return await method(*args)
+
+    def _method(self, name: str):
+        """The adapter call for an operation; read-modify-write is a point read then an update on one handle"""
+        if name != "read_modify_write":
+            return getattr(self.adapter, f"wl_{name}")
+        adapter = self.adapter
+        if adapter.wl_blocking:
+            def read_modify_write(handle, key, values):
+                adapter.wl_point_read(handle, key)
+                adapter.wl_update(handle, key, values)
+        else:
+            async def read_modify_write(handle, key, values):
+                await adapter.wl_point_read(handle, key)
+                await adapter.wl_update(handle, key, values)
+        return read_modify_write
+
+    def _arguments(self, name: str, key: int, index: int, lengths: Optional[List[int]]):
+        if name == "insert":
+            return (self.records.record(key),)
+        if name in ("update", "read_modify_write"):
+            return (key, self.records.update_values(key, index + 1))
+        if name == "range_read":
+            return (key, lengths[index] if lengths else self.spec.range_length)
+        if name == "scan":
+            return (self.spec.scan_length,)
+        return (key,)
+
+    async def run(self) -> Dict[str, Any]:
+        stream = OperationStream(self.spec, self.inserted)
+        self.inserted += stream.insert_count
+        methods = [self._method(name) for name in stream.operation_names]
+        total = len(stream)
+        service = np.zeros(total, dtype=np.float64)
+        response = np.zeros(total, dtype=np.float64)
+        errors = np.zeros(total, dtype=np.bool_)
+        # Operations that completed; a cancelled run stops short of total
+        executed = np.zeros(total, dtype=np.bool_)
+        cancelled = self.adapter.cancelled
+        cursor = [0]
+        cursor_lock = threading.Lock()
+        interval = 1.0 / self.spec.target_rate if self.spec.target_rate else 0.0
+        codes = stream.codes.tolist()
+        keys = stream.keys.tolist()
+        lengths = stream.lengths.tolist() if stream.lengths is not None else None
+        names = stream.operation_names
+
+        def next_index() -> int:
+            with cursor_lock:
+                index = cursor[0]
+                cursor[0] += 1
+            return index
+
+        started = time.perf_counter()
+
+        def blocking_worker():
+            with self.adapter.wl_connect() as handle:
+                while not cancelled.is_set():
+                    index = next_index()
+                    if index >= total:
+                        return
+                    code = codes[index]
+                    args = self._arguments(names[code], keys[index], index, lengths)
+                    intended = started + index * interval
+                    delay = intended - time.perf_counter()
+                    if delay > 0 and cancelled.wait(delay):
+                        return
+                    call_start = time.perf_counter()
+                    try:
+                        methods[code](handle, *args)
+                    except Exception:
+                        errors[index] = True
+                    end = time.perf_counter()
+                    service[index] = end - call_start
+                    response[index] = end - (intended if interval else call_start)
+                    executed[index] = True
+                    self.adapter._record_query_time(service[index], error=bool(errors[index]))
+
+        async def async_worker():
+            async with self.adapter.wl_connect() as handle:
+                while not cancelled.is_set():
+                    index = next_index()
+                    if index >= total:
+                        return
+                    code = codes[index]
+                    args = self._arguments(names[code], keys[index], index, lengths)
+                    intended = started + index * interval
+                    delay = intended - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    call_start = time.perf_counter()
+                    try:
+                        await methods[code](handle, *args)
+                    except Exception:
+                        errors[index] = True
+                    end = time.perf_counter()
+                    service[index] = end - call_start
+                    response[index] = end - (intended if interval else call_start)
+                    executed[index] = True
+                    self.adapter._record_query_time(service[index], error=bool(errors[index]))
+
+        if self.adapter.wl_blocking:
+            await asyncio.gather(*[asyncio.to_thread(blocking_worker) for _ in range(self.spec.concurrency)])
+        else:
+            await asyncio.gather(*[async_worker() for _ in range(self.spec.concurrency)])
+        duration = time.perf_counter() - started
+
+        operations = {}
+        for code, name in enumerate(names):
+            mask = (stream.codes == code) & executed
+            operations[name] = _latency_summary(service[mask], response[mask], errors[mask], duration, bool(interval))
+        completed = int(executed.sum())
+        return {
+            "duration_seconds": round(duration, 3),
+            "operations_executed": completed,
+            "ops_per_second": round(completed / duration, 2) if duration > 0 else 0.0,
+            "target_rate": self.spec.target_rate,
+            "errors": int(errors.sum()),
+            "operations": operations
+        }
+
+    async def run_checkouts(self, connect, concurrency: int) -> Dict[str, Any]:
+        """
+        Run the stream from `concurrency` async workers that check a handle out
+        of `connect` for each operation and return it afterwards, the way a
+        request handler borrows a pooled connection. Service time includes the
+        checkout; target_rate is not applied.
+        """
+        stream = OperationStream(self.spec, self.inserted)
+        self.inserted += stream.insert_count
+        methods = [self._method(name) for name in stream.operation_names]
+        total = len(stream)
+        service = np.zeros(total, dtype=np.float64)
+        errors = np.zeros(total, dtype=np.bool_)
+        codes = stream.codes.tolist()
+        keys = stream.keys.tolist()
+        lengths = stream.lengths.tolist() if stream.lengths is not None else None
+        names = stream.operation_names
+        # Shared by the workers; they all run on the event loop thread
+        indexes = iter(range(total))
+
+        async def worker():
+            for index in indexes:
+                if self.adapter.cancelled.is_set():
+                    return
+                code = codes[index]
+                args = self._arguments(names[code], keys[index], index, lengths)
+                call_start = time.perf_counter()
+                try:
+                    async with connect() as handle:
+                        await methods[code](handle, *args)
+                except Exception:
+                    errors[index] = True
+                service[index] = time.perf_counter() - call_start
+                self.adapter._record_query_time(service[index], error=bool(errors[index]))
+
+        started = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        duration = time.perf_counter() - started
+        summary = _latency_summary(service, service, errors, duration, False)
+        return {"concurrency": concurrency, "duration_seconds": round(duration, 3), **summary}
+
+def _latency_summary(
+    service: np.ndarray,
+    response: np.ndarray,
+    errors: np.ndarray,
+    duration: float,
+    rate_limited: bool
+) -> Dict[str, Any]:
+    if len(service) == 0:
+        return {"count": 0}
+    p50, p95, p99 = np.percentile(service, [50, 95, 99]) * 1000
+    summary = {
+        "count": int(len(service)),
+        "errors": int(errors.sum()),
+        "ops_per_second": round(len(service) / duration, 2) if duration > 0 else 0.0,
+        "latency_ms": {
+            "avg": round(float(service.mean()) * 1000, 3),
+            "p50": round(float(p50), 3),
+            "p95": round(float(p95), 3),
+            "p99": round(float(p99), 3),
+            "max": round(float(service.max()) * 1000, 3)
+        }
+    }
+    if rate_limited:
+        r50, r99 = np.percentile(response, [50, 99]) * 1000
+        summary["response_ms"] = {"p50": round(float(r50), 3), "p99": round(float(r99), 3)}
+    return summary
+
+class WorkloadBenchmark(BaseBenchmark):
+    """
+    Runs a WorkloadSpec through another benchmark's wl_* adapter methods.
+
+    Exposes "load" and "run" as operations so trials and sweeps can reuse a
+    loaded dataset exactly as they do for native benchmarks.
+    """
+    default_operations = ["load", "run"]
+    load_operations = ("load",)
+
+    def __init__(self, adapter: BaseBenchmark):
+        super().__init__()
+        self.adapter = adapter
+        self.backend = adapter.backend
+        self.spec: Optional[WorkloadSpec] = None
+        # The workers run the adapter's methods, so cancelling this benchmark must stop them
+        adapter.cancelled = self.cancelled
+        # Inserted keys are never reused, so repeated runs on one load do not collide
+        self.inserted = 0
+
+    def set_monitor(self, monitor):
+        super().set_monitor(monitor)
+        self.adapter.set_monitor(monitor)
+
+    async def setup(self, config: Dict[str, Any]) -> None:
+        self.spec = WorkloadSpec.from_config(config)
+        await self.adapter.wl_setup(self.spec)
+        self.inserted = 0
+
+    async def run(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        spec = WorkloadSpec.from_config(config)
+        self.spec = self.spec or spec
+        operations = config.get("operations", self.default_operations)
+        runner = WorkloadRunner(self.adapter, spec, 0 if "load" in operations else self.inserted)
+        results: Dict[str, Any] = {"spec": spec.describe()}
+        if "load" in operations:
+            self.adapter._begin_operation("workload_load")
+            results["load"] = await runner.load()
+        if "run" in operations:
+            self.adapter._begin_operation("workload_run")
+            try:
+                results["run"] = await runner.run()
+            finally:
+                self.inserted = runner.inserted
+        return results
+
+    async def teardown(self) -> None:
+        if self.spec:
+            await self.adapter.wl_teardown(self.spec)
+
+class SQLWorkloadAdapter:
+    """
+    wl_* implementation shared by the SQLAlchemy-backed benchmarks.
+
+    Subclasses provide wl_connect() (an async context manager yielding a
+    session) and engine_factory (the db module's engine constructor, used by
+    wl_pool), and may override the column type map for their dialect.
+    """
+    wl_table = "workload_records"
+    wl_column_types = {"int": "BIGINT", "float": "DOUBLE PRECISION", "str": "VARCHAR({size})"}
+    pool_tuning_supported = True
+    engine_factory: Optional[Callable[..., Any]] = None
+
+    def _wl_ddl(self, spec: WorkloadSpec) -> str:
+        columns = [f"{spec.schema.key_field} BIGINT PRIMARY KEY"]
+        for f in spec.schema.fields:
+            columns.append(f"{f.name} {self.wl_column_types[f.type].format(size=f.size)}")
+        return f"CREATE TABLE {self.wl_table} ({', '.join(columns)})"
+
+    def _wl_statements(self, spec: WorkloadSpec):
+        from sqlalchemy import text
+        key = spec.schema.key_field
+        names = [key] + spec.schema.field_names
+        self._wl_sql = {
+            "insert": text(f"INSERT INTO {self.wl_table} ({', '.join(names)}) VALUES ({', '.join(':' + n for n in names)})"),
+            "point_read": text(f"SELECT * FROM {self.wl_table} WHERE {key} = :key"),
+            "range_read": text(f"SELECT * FROM {self.wl_table} WHERE {key} >= :key ORDER BY {key} LIMIT :count"),
+            "scan": text(f"SELECT * FROM {self.wl_table} LIMIT :count")
+        }
+        for name in spec.schema.field_names:
+            self._wl_sql[f"update:{name}"] = text(f"UPDATE {self.wl_table} SET {name} = :{name} WHERE {key} = :key")
+
+    async def wl_setup(self, spec: WorkloadSpec) -> None:
+        from sqlalchemy import text
+        async with self.wl_connect() as session:
+            await session.execute(text(f"DROP TABLE IF EXISTS {self.wl_table}"))
+            await session.execute(text(self._wl_ddl(spec)))
+            await session.commit()
+        self._wl_statements(spec)
+
+    async def wl_teardown(self, spec: WorkloadSpec) -> None:
+        from sqlalchemy import text
+        async with self.wl_connect() as session:
+            await session.execute(text(f"DROP TABLE IF EXISTS {self.wl_table}"))
+            await session.commit()
+
+    @asynccontextmanager
+    async def wl_pool(self, pool_size: int, stats):
+        from app.db.registry import engine_registry, sqlalchemy_sessions, prewarm_sqlalchemy_pool
+        # The experiment's engine options, with a strict pool of the size under test
+        engine = self.engine_factory(**{**engine_registry.options(self.backend), "pool_size": pool_size, "max_overflow": 0})
+        pool = engine.sync_engine.pool
+        do_get = pool._do_get
+        create_connection = pool._create_connection
+
+        def timed_do_get():
+            start = time.perf_counter()
+            try:
+                return do_get()
+            finally:
+                stats.add_wait(time.perf_counter() - start)
+
+        def timed_create_connection():
+            start = time.perf_counter()
+            try:
+                return create_connection()
+            finally:
+                stats.add_connect(time.perf_counter() - start)
+
+        pool._do_get = timed_do_get
+        pool._create_connection = timed_create_connection
+        try:
+            await prewarm_sqlalchemy_pool(engine, pool_size)
+            yield sqlalchemy_sessions(engine)
+        finally:
+            await engine.dispose()
+
+    async def _wl_execute(self, session, statement, parameters, fetch: bool = False, commit: bool = False):
+        # A failed statement aborts the transaction; roll back so the worker's session stays usable
+        try:
+            result = await session.execute(statement, parameters)
+            if fetch:
+                result.fetchall()
+            if commit:
+                await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+    async def wl_load(self, session, records: List[Dict[str, Any]]) -> None:
+        await self._wl_execute(session, self._wl_sql["insert"], records, commit=True)
+
+    async def wl_point_read(self, session, key: int) -> None:
+        await self._wl_execute(session, self._wl_sql["point_read"], {"key": key}, fetch=True)
+
+    async def wl_range_read(self, session, key: int, count: int) -> None:
+        await self._wl_execute(session, self._wl_sql["range_read"], {"key": key, "count": count}, fetch=True)
+
+    async def wl_scan(self, session, count: int) -> None:
+        await self._wl_execute(session, self._wl_sql["scan"], {"count": count}, fetch=True)
+
+    async def wl_insert(self, session, record: Dict[str, Any]) -> None:
+        await self._wl_execute(session, self._wl_sql["insert"], record, commit=True)
+
+    async def wl_update(self, session, key: int, values: Dict[str, Any]) -> None:
+        (name, value), = values.items()
+        await self._wl_execute(session, self._wl_sql[f"update:{name}"], {name: value, "key": key}, commit=True)
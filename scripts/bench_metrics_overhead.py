@@ -0,0 +1,48 @@
+"""
+Measure the per-operation cost of metrics recording.
+
+Run with: python -m scripts.bench_metrics_overhead
+"""
+from benchmarks.base import BaseBenchmark
+from telemetry.metrics import Counter, Histogram
+import timeit
+
+ITERATIONS = 1_000_000
+
+class _NullBenchmark(BaseBenchmark):
+    async def setup(self, config):
+        pass
+
+    async def run(self, config):
+        return {}
+
+    async def teardown(self):
+        pass
+
+def _per_op_ns(stmt, number: int = ITERATIONS) -> float:
+    best = min(timeit.repeat(stmt, number=number, repeat=5))
+    return best / number * 1e9
+
+def main():
+    counter = Counter("bench_total", "bench", ("backend",)).labels("bench")
+    histogram = Histogram("bench_seconds", "bench", ("backend",)).labels("bench")
+
+    instrumented = _NullBenchmark()
+    instrumented._begin_operation("bench")
+    bare = _NullBenchmark()
+
+    results = {
+        "counter.inc": _per_op_ns(counter.inc),
+        "histogram.observe": _per_op_ns(lambda: histogram.observe(0.0042)),
+        "_record_query_time (metrics on)": _per_op_ns(lambda: instrumented._record_query_time(0.0042)),
+        "_record_query_time (metrics off)": _per_op_ns(lambda: bare._record_query_time(0.0042)),
+    }
+    for name, ns in results.items():
+        print(f"{name:36s} {ns:8.1f} ns/op")
+    overhead = results["_record_query_time (metrics on)"] - results["_record_query_time (metrics off)"]
+    print(f"{'recording overhead':36s} {overhead:8.1f} ns/op")
+    if overhead >= 1000:
+        raise SystemExit("Metrics recording overhead is above 1us per operation")
+
+if __name__ == "__main__":
+    main()
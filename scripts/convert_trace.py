@@ -0,0 +1,25 @@
+"""
+Convert a captured query log into a binary replay trace.
+
+Run with: python -m scripts.convert_trace <format> <log> <trace> [--limit N]
+Formats: postgres_csv, mongodb_profile, redis_monitor, ndjson
+"""
+from app.utils.query_trace import LOG_PARSERS, ingest_log
+import argparse
+import time
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a query log into a replay trace")
+    parser.add_argument("format", choices=sorted(LOG_PARSERS))
+    parser.add_argument("log")
+    parser.add_argument("trace")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many events")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    stats = ingest_log(args.log, args.format, args.trace, args.limit)
+    elapsed = time.perf_counter() - started
+    print(f"{stats['events']} events, {stats['fingerprints']} fingerprints written to {args.trace} in {elapsed:.1f}s")
+
+if __name__ == "__main__":
+    main()
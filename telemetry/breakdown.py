@@ -0,0 +1,190 @@
+from contextvars import ContextVar
+from statistics import median
+from typing import Dict, Any, List, Optional, Tuple
+from app.core.exceptions import ConfigurationError
+import asyncio
+import threading
+import time
+
+# Per-operation latency decomposition for the SQLAlchemy-backed benchmarks.
+#
+# Pool and cursor events on every instrumented engine report into the
+# LatencyBreakdown active in the current context (benchmarks activate theirs
+# in _begin_operation). Events wait as pending, per task or worker thread,
+# until that task records a timed query, which commits the ones that started
+# inside its timed region to the current operation; events from untimed
+# statements (setup DDL, warm-up, teardown) are dropped. Keeping pending
+# events per task stops concurrent workers from committing or discarding
+# each other's.
+
+_active: ContextVar[Optional["LatencyBreakdown"]] = ContextVar("optistack_latency_breakdown", default=None)
+# (breakdown, owner, events): tasks inherit their parent's value, so the owner
+# tells a task's own list apart from one it inherited
+_pending: ContextVar[Optional[Tuple["LatencyBreakdown", Any, List[Tuple[float, str, float]]]]] = ContextVar(
+    "optistack_breakdown_pending", default=None
+)
+
+def breakdown_enabled(config: Dict[str, Any], supported: bool, database_type: str) -> bool:
+    """
+    Whether the experiment asked for "latency_breakdown", which needs the
+    backend's own SQLAlchemy-backed operations (not a workload or replay).
+    """
+    enabled = config.get("latency_breakdown", False)
+    if not isinstance(enabled, bool):
+        raise ConfigurationError("latency_breakdown must be true or false")
+    if enabled and not supported:
+        raise ConfigurationError(f"latency_breakdown is not available for {database_type}")
+    if enabled and ("workload" in config or "replay" in config):
+        raise ConfigurationError("latency_breakdown is not available for workloads or replays")
+    return enabled
+
+def activate(breakdown: Optional["LatencyBreakdown"]) -> None:
+    _active.set(breakdown)
+
+def _owner() -> Any:
+    """The running task, or the thread when called outside the event loop"""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return task if task is not None else threading.get_ident()
+
+class LatencyBreakdown:
+    """
+    Splits recorded query time per operation into pool acquire, statement
+    execution (send, server work, receive and driver decode) and client time
+    (SQLAlchemy result processing and row materialisation). With a measured
+    round trip, execution is further split into network and server time.
+    """
+
+    def __init__(self, keep_statements: bool = False):
+        self.operation: Optional[str] = None
+        self.round_trip: Optional[float] = None
+        self.statement_times: Optional[List[float]] = [] if keep_statements else None
+        self._operations: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def begin(self, operation: str) -> None:
+        with self._lock:
+            self.operation = operation
+        _pending.set(None)
+
+    def _events(self) -> List[Tuple[float, str, float]]:
+        """The calling task's pending (start, component, seconds) events"""
+        owner = _owner()
+        entry = _pending.get()
+        if entry is None or entry[0] is not self or entry[1] != owner:
+            entry = (self, owner, [])
+            _pending.set(entry)
+        return entry[2]
+
+    def add(self, component: str, start: float, seconds: float) -> None:
+        self._events().append((start, component, seconds))
+        if component == "execute" and self.statement_times is not None:
+            with self._lock:
+                self.statement_times.append(seconds)
+
+    def add_query(self, seconds: float) -> None:
+        """Commit the calling task's events that started inside this timed query to the current operation"""
+        started = time.perf_counter() - seconds
+        events = self._events()
+        with self._lock:
+            totals = self._operations.setdefault(
+                self.operation, {"queries": 0, "total": 0.0, "acquire": 0.0, "execute": 0.0, "statements": 0}
+            )
+            totals["queries"] += 1
+            totals["total"] += seconds
+            for start, component, elapsed in events:
+                if start >= started:
+                    totals[component] += elapsed
+                    totals["statements"] += component == "execute"
+        events.clear()
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            operations = {name: dict(totals) for name, totals in self._operations.items()}
+        report: Dict[str, Any] = {
+            "round_trip_ms": round(self.round_trip * 1000, 3) if self.round_trip is not None else None,
+            "operations": {}
+        }
+        for name, totals in operations.items():
+            total = totals["total"]
+            execute = totals["execute"]
+            entry = {
+                "queries": totals["queries"],
+                "statements": totals["statements"],
+                "total_seconds": round(total, 6),
+                "acquire_seconds": round(totals["acquire"], 6),
+                "execute_seconds": round(execute, 6),
+                # Clamped: timer resolution can put components a hair above the total
+                "client_seconds": round(max(0.0, total - totals["acquire"] - execute), 6)
+            }
+            if self.round_trip is not None:
+                network = min(execute, totals["statements"] * self.round_trip)
+                entry["network_seconds"] = round(network, 6)
+                entry["server_seconds"] = round(execute - network, 6)
+            if total > 0:
+                parts = ("acquire", "network", "server", "client") if self.round_trip is not None else ("acquire", "execute", "client")
+                entry["share"] = {part: round(entry[f"{part}_seconds"] / total, 3) for part in parts}
+            report["operations"][name] = entry
+        return report
+
+def instrument_breakdown(engine):
+    """
+    Report pool acquire waits and cursor execution times on a SQLAlchemy
+    engine to the active LatencyBreakdown. Costs one context lookup per
+    statement when no breakdown is active.
+    """
+    from sqlalchemy import event
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        if _active.get() is not None:
+            context._breakdown_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        breakdown = _active.get()
+        start = getattr(context, "_breakdown_start", None)
+        if breakdown is not None and start is not None:
+            breakdown.add("execute", start, time.perf_counter() - start)
+
+    pool = sync_engine.pool
+    do_get = pool._do_get
+
+    def _timed_do_get():
+        breakdown = _active.get()
+        if breakdown is None:
+            return do_get()
+        start = time.perf_counter()
+        try:
+            return do_get()
+        finally:
+            breakdown.add("acquire", start, time.perf_counter() - start)
+
+    pool._do_get = _timed_do_get
+    return engine
+
+async def measure_round_trip(connect, samples: int = 20) -> Optional[float]:
+    """
+    Median execution time of a trivial statement over one warm connection,
+    taken as the network round trip every statement pays. `connect` is the
+    benchmark's async session context manager factory.
+    """
+    from sqlalchemy import text
+
+    probe = LatencyBreakdown(keep_statements=True)
+    previous = _active.get()
+    activate(probe)
+    try:
+        async with connect() as session:
+            # The first statement opens the connection; only the rest are kept
+            await session.execute(text("SELECT 1"))
+            probe.statement_times.clear()
+            for _ in range(samples):
+                await session.execute(text("SELECT 1"))
+    finally:
+        activate(previous)
+    return median(probe.statement_times) if probe.statement_times else None
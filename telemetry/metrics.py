@@ -1,11 +1,306 @@
 from app.core.config import settings
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+import threading
+import time
 
-def setup_metrics():
-    if not settings.OPENTELEMETRY_ENABLED:
-        return
-    
-    pass
+# In-process metrics with Prometheus text exposition.
+#
+# Hot paths should resolve a labelled child once (metric.labels(...)) and keep
+# it; inc()/observe() on a child is a thread-local lookup plus an add, well
+# under a microsecond. See scripts/bench_metrics_overhead.py.
+
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _ShardedChild:
+    """
+    Per-thread shards make recording lock-free: each thread only ever writes
+    its own list, and collection sums the shards. A scrape can observe a
+    histogram count and sum from slightly different instants, which is the
+    usual trade-off for lock-free exposition.
+    """
+    __slots__ = ("_local", "_shards", "_lock")
+    _width = 1
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[list] = []
+        self._lock = threading.Lock()
+
+    def _new_shard(self) -> list:
+        shard = [0] * self._width
+        with self._lock:
+            self._shards.append(shard)
+        self._local.shard = shard
+        return shard
+
+    def _totals(self) -> list:
+        totals = [0] * self._width
+        for shard in list(self._shards):
+            for i, value in enumerate(shard):
+                totals[i] += value
+        return totals
+
+class _CounterChild(_ShardedChild):
+    __slots__ = ()
+
+    def inc(self, amount: float = 1.0):
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._totals()[0]
+
+class _GaugeChild:
+    # Gauges are set from control paths (experiment start/stop, pool events), not per query
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+class _HistogramChild(_ShardedChild):
+    # Shard layout: one slot per bucket (the last is +Inf), then the running sum
+    __slots__ = ("upper_bounds", "_width")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        super().__init__()
+        self.upper_bounds = upper_bounds
+        self._width = len(upper_bounds) + 2
+
+    def observe(self, value: float):
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard[bisect_left(self.upper_bounds, value)] += 1
+        shard[-1] += value
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        totals = self._totals()
+        return totals[:-1], totals[-1]
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in list(self._children.items()):
+            lines.extend(self._render_child(key, child))
+        return lines
+
+    def _render_child(self, key, child) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._default.dec(amount)
+
+    def set(self, value: float):
+        self._default.set(value)
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.upper_bounds = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.upper_bounds)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def _render_child(self, key, child) -> List[str]:
+        counts, total = child.snapshot()
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.upper_bounds + (float("inf"),), counts):
+            cumulative += count
+            labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+REGISTRY = MetricsRegistry()
+
+# The latency histogram's _count is the per-backend operation counter; only errors get their own
+OPERATION_LATENCY = REGISTRY.register(Histogram(
+    "optistack_operation_latency_seconds", "Benchmark operation latency", ("backend", "operation")
+))
+OPERATION_ERRORS = REGISTRY.register(Counter(
+    "optistack_operation_errors_total", "Benchmark operations that failed", ("backend", "operation")
+))
+ACTIVE_EXPERIMENTS = REGISTRY.register(Gauge(
+    "optistack_active_experiments", "Experiments currently running"
+))
+POOL_CHECKOUTS = REGISTRY.register(Counter(
+    "optistack_pool_checkouts_total", "Connection pool checkouts", ("backend",)
+))
+POOL_CHECKED_OUT = REGISTRY.register(Gauge(
+    "optistack_pool_checked_out", "Connections currently checked out", ("backend",)
+))
+POOL_WAIT = REGISTRY.register(Histogram(
+    "optistack_pool_wait_seconds", "Time spent waiting for a pooled connection", ("backend",)
+))
+DATASET_CACHE_LOOKUPS = REGISTRY.register(Counter(
+    "optistack_dataset_cache_lookups_total", "Generated-dataset cache lookups", ("result",)
+))
+HTTP_REQUEST_LATENCY = REGISTRY.register(Histogram(
+    "optistack_http_request_duration_seconds", "API request latency", ("method", "route", "status")
+))
+
+def setup_metrics() -> bool:
+    """Metrics are registered at import time; this only reports whether recording is on"""
+    return settings.METRICS_ENABLED
+
+def metrics_enabled() -> bool:
+    return settings.METRICS_ENABLED
 
 def record_metric(name: str, value: float, tags: dict = None):
-    pass
+    """Generic entry point: increments counters/gauges or observes histograms by metric name"""
+    if not settings.METRICS_ENABLED:
+        return
+    metric = REGISTRY.get(name)
+    if metric is None:
+        return
+    child = metric.labels(*[(tags or {}).get(label, "") for label in metric.labelnames])
+    if isinstance(metric, Histogram):
+        child.observe(value)
+    else:
+        child.inc(value)
+
+def operation_recorders(backend: str, operation: str):
+    """Pre-resolved (latency histogram, error counter) children for one operation"""
+    return OPERATION_LATENCY.labels(backend, operation), OPERATION_ERRORS.labels(backend, operation)
+
+def render_metrics() -> str:
+    return REGISTRY.render()
+
+def instrument_engine(engine, backend: str):
+    """
+    Count pool checkouts and time waits for a pooled connection on a SQLAlchemy engine.
+
+    Checkout/checkin use pool events; the wait is measured by wrapping the
+    pool's _do_get, which is where QueuePool blocks when it is exhausted.
+    """
+    if not settings.METRICS_ENABLED:
+        return engine
+    from sqlalchemy import event
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+    checkouts = POOL_CHECKOUTS.labels(backend)
+    checked_out = POOL_CHECKED_OUT.labels(backend)
+    wait = POOL_WAIT.labels(backend)
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checkouts.inc()
+        checked_out.inc()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        checked_out.dec()
+
+    pool = sync_engine.pool
+    do_get = pool._do_get
+
+    def _timed_do_get():
+        start = time.perf_counter()
+        try:
+            return do_get()
+        finally:
+            wait.observe(time.perf_counter() - start)
 
+    pool._do_get = _timed_do_get
+    return engine
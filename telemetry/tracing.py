@@ -1,11 +1,189 @@
 from app.core.config import settings
+from app.core.logging import logger
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+import json
+import os
+import threading
+import time
+
+try:
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    from opentelemetry.trace import Status, StatusCode
+    OTEL_AVAILABLE = True
+except ImportError:
+    SpanExporter = object
+    OTEL_AVAILABLE = False
+
+_provider = None
+_memory_exporter = None
+
+class OTLPFileSpanExporter(SpanExporter):
+    """
+    Appends each exported batch as one OTLP/JSON ExportTraceServiceRequest line
+    (the OTLP file exporter layout), so traces can be replayed into a collector.
+    """
+
+    def __init__(self, path: str):
+        from opentelemetry.exporter.otlp.proto.common.trace_encoder import encode_spans
+        from google.protobuf.json_format import MessageToDict
+
+        self._encode = encode_spans
+        self._to_dict = MessageToDict
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, spans) -> "SpanExportResult":
+        line = json.dumps(self._to_dict(self._encode(spans)), separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        with self._lock:
+            self._file.close()
+
+def _build_exporter(kind: str):
+    global _memory_exporter
+    if kind == "memory":
+        _memory_exporter = InMemorySpanExporter()
+        return _memory_exporter
+    if kind == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter(endpoint=settings.OPENTELEMETRY_ENDPOINT) if settings.OPENTELEMETRY_ENDPOINT else OTLPSpanExporter()
+    return OTLPFileSpanExporter(settings.OPENTELEMETRY_FILE_PATH)
 
 def setup_tracing():
-    if not settings.OPENTELEMETRY_ENABLED:
+    global _provider
+    if not settings.OPENTELEMETRY_ENABLED or _provider is not None:
+        return
+    if not OTEL_AVAILABLE:
+        logger.warning("OPENTELEMETRY_ENABLED is set but opentelemetry-sdk is not installed; tracing disabled")
+        return
+
+    try:
+        exporter = _build_exporter(settings.OPENTELEMETRY_EXPORTER)
+    except ImportError as e:
+        logger.warning(f"Trace exporter {settings.OPENTELEMETRY_EXPORTER} unavailable ({e}); tracing disabled")
         return
-    
-    pass
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.PROJECT_NAME.lower(), "service.version": settings.VERSION}),
+        sampler=ParentBased(TraceIdRatioBased(settings.OPENTELEMETRY_SAMPLE_RATIO))
+    )
+    provider.add_span_processor(BatchSpanProcessor(
+        exporter,
+        max_queue_size=settings.OPENTELEMETRY_MAX_QUEUE_SIZE,
+        max_export_batch_size=settings.OPENTELEMETRY_BATCH_SIZE,
+        schedule_delay_millis=settings.OPENTELEMETRY_EXPORT_INTERVAL_MS
+    ))
+    _provider = provider
+    logger.info(f"Tracing enabled with {settings.OPENTELEMETRY_EXPORTER} exporter")
+
+def shutdown_tracing():
+    global _provider
+    if _provider is not None:
+        _provider.shutdown()
+        _provider = None
+
+def force_flush():
+    if _provider is not None:
+        _provider.force_flush()
+
+def get_memory_exporter():
+    return _memory_exporter
+
+def tracing_enabled() -> bool:
+    return _provider is not None
 
 def get_tracer(name: str):
-    return None
+    if _provider is None:
+        return None
+    return _provider.get_tracer(name)
+
+@contextmanager
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None, tracer_name: str = "optistack"):
+    """Span around a block, or a no-op yielding None when tracing is off"""
+    tracer = get_tracer(tracer_name)
+    if tracer is None:
+        yield None
+        return
+    with tracer.start_as_current_span(name, attributes=attributes or {}) as span:
+        yield span
+
+class OperationTracer:
+    """
+    Emits spans for a systematic sample of benchmark operations.
+
+    Operation latencies are only known after the fact, so sampled spans are
+    created retroactively from (end - duration, end) under the current span
+    (the benchmark's run phase). Every sample_interval-th operation is traced;
+    the rest cost a counter decrement. Time spent creating spans is measured
+    and the skip path is calibrated once, so report() can state the overhead.
+    """
+
+    _skip_cost_ns: Optional[float] = None
+
+    def __init__(self, backend: str, sample_ratio: float):
+        self.backend = backend
+        self.sample_interval = max(1, round(1 / sample_ratio))
+        self._tracer = get_tracer("optistack.benchmarks")
+        self._countdown = self.sample_interval
+        self.operations = 0
+        self.sampled = 0
+        self.span_overhead_ns = 0
+
+    @classmethod
+    def _calibrate_skip_cost(cls) -> float:
+        if cls._skip_cost_ns is None:
+            probe = cls.__new__(cls)
+            probe.sample_interval = 1 << 62
+            probe._countdown = probe.sample_interval
+            probe.operations = 0
+            iterations = 100000
+            start = time.perf_counter_ns()
+            for _ in range(iterations):
+                probe.record("calibration", 0.0)
+            cls._skip_cost_ns = (time.perf_counter_ns() - start) / iterations
+        return cls._skip_cost_ns
+
+    def record(self, operation: str, duration: float, error: bool = False):
+        self.operations += 1
+        self._countdown -= 1
+        if self._countdown:
+            return
+        self._countdown = self.sample_interval
+        start = time.perf_counter_ns()
+        span = self._tracer.start_span(
+            f"db.{operation or 'operation'}",
+            start_time=time.time_ns() - int(duration * 1e9),
+            attributes={"db.system": self.backend, "db.operation": operation or ""}
+        )
+        if error:
+            span.set_status(Status(StatusCode.ERROR))
+        span.end()
+        self.sampled += 1
+        self.span_overhead_ns += time.perf_counter_ns() - start
+
+    def report(self, run_seconds: float) -> Dict[str, Any]:
+        skipped = self.operations - self.sampled
+        overhead_ns = self.span_overhead_ns + skipped * self._calibrate_skip_cost()
+        return {
+            "operations": self.operations,
+            "sampled_operations": self.sampled,
+            "sample_interval": self.sample_interval,
+            "overhead_ms": round(overhead_ns / 1e6, 3),
+            "overhead_per_operation_ns": round(overhead_ns / self.operations, 1) if self.operations else 0.0,
+            "overhead_percent": round(overhead_ns / 1e9 / run_seconds * 100, 4) if run_seconds > 0 else 0.0
+        }
 
+def operation_tracer(backend: str) -> Optional[OperationTracer]:
+    if _provider is None or settings.OPENTELEMETRY_OPERATION_SAMPLE_RATIO <= 0:
+        return None
+    return OperationTracer(backend, settings.OPENTELEMETRY_OPERATION_SAMPLE_RATIO)
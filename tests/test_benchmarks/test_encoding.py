@@ -0,0 +1,29 @@
+import json
+import pytest
+import bson
+from app.core.exceptions import ConfigurationError
+from benchmarks.encoding import encode_payloads, payload_encoding
+from benchmarks.redis_benchmark import RedisBenchmark
+
+ROWS = [{"id": i, "name": f"user{i}", "score": i * 10} for i in range(5)]
+
+def test_payloads_share_one_buffer():
+    payloads = encode_payloads(ROWS, "json")
+    assert len(payloads) == 5
+    assert [json.loads(bytes(payload)) for payload in payloads] == ROWS
+    assert payloads[-1].obj is payloads.buffer
+    assert payloads.nbytes == sum(len(json.dumps(row)) for row in ROWS)
+    assert payloads.summary()["encoding"] == "json"
+
+def test_bson_and_raw_round_trip():
+    assert bson.decode(bytes(encode_payloads(ROWS, "bson")[2])) == ROWS[2]
+    assert bytes(encode_payloads(ROWS, "raw")[1]) == b"1\x1fuser1\x1f10"
+
+def test_encoding_validation():
+    supported = RedisBenchmark.payload_encodings
+    assert payload_encoding({}, supported, "redis") == "json"
+    assert payload_encoding({"payload_encoding": "raw"}, supported, "redis") == "raw"
+    with pytest.raises(ConfigurationError):
+        payload_encoding({"payload_encoding": "bson"}, supported, "redis")
+    with pytest.raises(ConfigurationError):
+        payload_encoding({"payload_encoding": "json"}, (), "postgres")
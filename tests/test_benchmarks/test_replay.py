@@ -0,0 +1,111 @@
+import json
+import time
+import pytest
+from contextlib import asynccontextmanager, contextmanager
+from app.core.config import settings
+from app.utils.performance_monitor import PerformanceMonitor
+from benchmarks.base import BaseBenchmark
+from benchmarks.replay import LatencyHistogram, ReplayBenchmark
+
+class RecordingAdapter(BaseBenchmark):
+    replay_command = "sql"
+
+    def __init__(self):
+        super().__init__()
+        self.executed = []
+
+    async def setup(self, config):
+        pass
+
+    async def run(self, config):
+        return {}
+
+    async def teardown(self):
+        pass
+
+    @asynccontextmanager
+    async def replay_connect(self):
+        yield None
+
+    async def replay_execute(self, handle, command):
+        self.executed.append((time.perf_counter(), command["sql"]))
+        if "missing" in command["sql"]:
+            raise RuntimeError("relation does not exist")
+
+class BlockingRecordingAdapter(RecordingAdapter):
+    wl_blocking = True
+
+    @contextmanager
+    def replay_connect(self):
+        yield None
+
+    def replay_execute(self, handle, command):
+        self.executed.append((time.perf_counter(), command["sql"]))
+
+class UnreachableAdapter(RecordingAdapter):
+    @asynccontextmanager
+    async def replay_connect(self):
+        raise ConnectionRefusedError("connection refused")
+        yield
+
+class BlockingUnreachableAdapter(BlockingRecordingAdapter):
+    @contextmanager
+    def replay_connect(self):
+        raise ConnectionRefusedError("connection refused")
+        yield
+
+def _write_log(tmp_path, events):
+    lines = [json.dumps({"ts": 1700000000 + offset, "command": {"sql": sql}}) for offset, sql in events]
+    (tmp_path / "traffic.ndjson").write_text("\n".join(lines) + "\n")
+
+async def _replay(adapter, config):
+    benchmark = ReplayBenchmark(adapter)
+    benchmark.set_monitor(PerformanceMonitor())
+    await benchmark.setup(config)
+    return (await benchmark.run(config))["replay"]
+
+async def test_replay_as_fast_as_possible_reports_per_fingerprint(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "TRACE_DIR", str(tmp_path))
+    _write_log(tmp_path, [(i * 10, f"SELECT * FROM t WHERE id = {i}") for i in range(20)] + [(300, "SELECT * FROM missing")])
+    config = {"replay": {"log": "traffic.ndjson", "format": "ndjson", "speed": "max", "concurrency": 4}}
+
+    adapter = RecordingAdapter()
+    result = await _replay(adapter, config)
+
+    assert result["events"] == 21
+    assert result["errors"] == 1
+    assert result["ingest"] == {"events": 21, "fingerprints": 2}
+    assert (tmp_path / "traffic.ndjson.trace").exists()
+    top = result["fingerprints"][0]
+    assert top["fingerprint"] == "select * from t where id = ?"
+    assert top["count"] == 20
+    assert "response_ms" not in top
+
+async def test_replay_honours_original_timing_with_speed_up(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "TRACE_DIR", str(tmp_path))
+    _write_log(tmp_path, [(0, "SELECT 1"), (0.2, "SELECT 2"), (0.4, "SELECT 3")])
+    config = {"replay": {"log": "traffic.ndjson", "format": "ndjson", "speed": 2.0, "concurrency": 2}}
+
+    for adapter in (RecordingAdapter(), BlockingRecordingAdapter()):
+        result = await _replay(adapter, config)
+        times = sorted(t for t, _ in adapter.executed)
+        assert 0.18 <= times[-1] - times[0] < 0.35
+        assert "response_ms" in result["fingerprints"][0]
+
+async def test_replay_fails_instead_of_waiting_when_workers_cannot_connect(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "TRACE_DIR", str(tmp_path))
+    # More events than the queue holds, so the dispatcher would block on a full queue
+    _write_log(tmp_path, [(i, f"SELECT {i}") for i in range(500)])
+    config = {"replay": {"log": "traffic.ndjson", "format": "ndjson", "speed": "max", "concurrency": 2}}
+
+    for adapter in (UnreachableAdapter(), BlockingUnreachableAdapter()):
+        with pytest.raises(ConnectionRefusedError):
+            await _replay(adapter, config)
+
+def test_latency_histogram_percentiles_are_within_bucket_error():
+    histogram = LatencyHistogram()
+    for i in range(1, 1001):
+        histogram.record(i / 1000)
+    assert abs(histogram.percentile(50) - 0.5) / 0.5 < 0.02
+    assert abs(histogram.percentile(99) - 0.99) / 0.99 < 0.02
+    assert histogram.percentile(100) == 1.0
@@ -0,0 +1,90 @@
+import asyncio
+import random
+import pytest
+from app.core.exceptions import ConfigurationError, ExperimentTimeoutError
+from app.services.execution_timeout import experiment_timeout, run_with_timeout
+from benchmarks.base import BaseBenchmark
+from benchmarks.sampling import percentile_interval, sampling_settings
+
+class SyntheticBenchmark(BaseBenchmark):
+    """Records a latency drawn from `draw` for every sample index"""
+
+    def __init__(self, draw):
+        super().__init__()
+        self.draw = draw
+        self.torn_down = False
+
+    async def setup(self, config):
+        pass
+
+    async def run(self, config):
+        self._begin_operation("select")
+        for _ in self._samples(config.get("default", 100)):
+            self._record_query_time(self.draw())
+            await asyncio.sleep(config.get("sleep", 0))
+        return {}
+
+    async def teardown(self):
+        self.torn_down = True
+
+def test_settings_validation():
+    assert sampling_settings({}) is None
+    assert sampling_settings({"adaptive_sampling": True})["percentile"] == 99
+    with pytest.raises(ConfigurationError):
+        sampling_settings({"adaptive_sampling": {"percentile": 100}})
+    with pytest.raises(ConfigurationError):
+        sampling_settings({"adaptive_sampling": {"min_samples": 10, "max_samples": 5}})
+    with pytest.raises(ConfigurationError):
+        sampling_settings({"adaptive_sampling": {"target": 99}})
+
+def test_percentile_interval_brackets_the_estimate():
+    values = sorted(range(1, 1001))
+    low, estimate, high = percentile_interval(values, 0.5, 0.95)
+    assert low < estimate < high
+    assert 460 < low and high < 540
+
+async def test_fixed_counts_without_adaptive_sampling():
+    benchmark = SyntheticBenchmark(lambda: 0.001)
+    await benchmark.run({"default": 37})
+    assert benchmark.phase_samples["select"] == {"samples": 37, "stopped_by": "fixed", "elapsed_seconds": pytest.approx(0, abs=0.5)}
+
+async def test_stable_latencies_converge_at_min_samples():
+    benchmark = SyntheticBenchmark(lambda: 0.001)
+    benchmark.configure_sampling(sampling_settings({"adaptive_sampling": {"min_samples": 40}}))
+    await benchmark.run({"default": 5})
+    report = benchmark.phase_samples["select"]
+    assert report["stopped_by"] == "converged"
+    assert report["samples"] == 40
+    assert report["relative_ci_width"] == 0
+
+async def test_noisy_latencies_stop_at_the_budget():
+    rng = random.Random(1)
+    benchmark = SyntheticBenchmark(lambda: rng.lognormvariate(0, 2))
+    benchmark.configure_sampling(sampling_settings({
+        "adaptive_sampling": {"relative_ci_width": 1e-6, "phase_budget_seconds": 0.05}
+    }))
+    await benchmark.run({"sleep": 0.001})
+    report = benchmark.phase_samples["select"]
+    assert report["stopped_by"] == "budget"
+    assert report["ci_low_ms"] < report["estimate_ms"] <= report["ci_high_ms"]
+
+async def test_timeout_cancels_the_run_and_still_tears_down():
+    benchmark = SyntheticBenchmark(lambda: 0.001)
+
+    async def work():
+        await benchmark.setup({})
+        try:
+            return await benchmark.run({"default": 10 ** 9, "sleep": 0.001})
+        finally:
+            await benchmark.teardown()
+
+    with pytest.raises(ExperimentTimeoutError):
+        await run_with_timeout(benchmark, work(), 0.05)
+    assert benchmark.torn_down
+    assert benchmark.phase_samples["select"]["stopped_by"] in ("cancelled", "interrupted")
+
+def test_timeout_defaults_to_the_config_file():
+    assert experiment_timeout({}) == 300
+    assert experiment_timeout({"timeout_seconds": 5}) == 5
+    with pytest.raises(ConfigurationError):
+        experiment_timeout({"timeout_seconds": 0})
@@ -0,0 +1,75 @@
+import sqlite3
+import pytest
+from app.core.exceptions import ConfigurationError
+from app.db.sqlite import durability_label, sqlite_pragmas
+from app.services.sweep import init_sweep_progress, run_sweep
+from app.utils.performance_monitor import PerformanceMonitor
+from benchmarks.sampling import sampling_settings
+from benchmarks.sqlite_benchmark import SQLiteBenchmark
+
+@pytest.fixture
+def benchmark(tmp_path):
+    benchmark = SQLiteBenchmark()
+    benchmark.path = str(tmp_path / "bench.db")
+    benchmark.set_monitor(PerformanceMonitor())
+    return benchmark
+
+async def test_runs_the_postgres_operation_set(benchmark):
+    config = {
+        "rows": 200,
+        "concurrent_users": 4,
+        "batch_size": 50,
+        "operations": ["insert", "select", "update", "join", "window", "json"]
+    }
+    await benchmark.setup(config)
+    results = await benchmark.run(config)
+    assert results["insert"]["rows_inserted"] == 200
+    assert results["select"]["queries_executed"] == 100
+    assert results["update"]["rows_updated"] == 20
+    assert results["window"]["queries_executed"] == 3
+    assert results["json"]["queries_executed"] == 3
+    assert results["storage"]["journal_mode"] == "WAL"
+    # 4 insert batches, 100 selects, 20 updates, 1 join, 3 window and 3 json queries
+    assert benchmark.monitor.query_count() == 131
+    await benchmark.teardown()
+
+async def test_setup_applies_pragmas_to_a_fresh_file(benchmark):
+    config = {"rows": 20, "journal_mode": "delete", "synchronous": "full", "page_size": 8192}
+    await benchmark.setup(config)
+    await benchmark.run(config)
+    connection = sqlite3.connect(benchmark.path)
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    assert connection.execute("PRAGMA page_size").fetchone()[0] == 8192
+    connection.close()
+    await benchmark.teardown()
+
+def test_pragmas_reject_unknown_values():
+    with pytest.raises(ConfigurationError):
+        sqlite_pragmas({"journal_mode": "WAL; DROP TABLE x"})
+    with pytest.raises(ConfigurationError):
+        sqlite_pragmas({"page_size": 3000})
+
+def test_durability_labels():
+    assert durability_label(sqlite_pragmas({"synchronous": "FULL"})) == "durable on commit"
+    assert "roll back" in durability_label(sqlite_pragmas({}))
+    assert "corrupt" in durability_label(sqlite_pragmas({"synchronous": "OFF"}))
+
+async def test_sweep_loads_once_per_journal_setting(benchmark):
+    config = {
+        "rows": 50,
+        "operations": ["insert", "update"],
+        "sweep": {"grid": {"mmap_size": [0, 1048576], "synchronous": ["OFF", "FULL"]}}
+    }
+    progress = init_sweep_progress(config, dataset_parameters=benchmark.dataset_parameters)
+    assert [p["overrides"]["synchronous"] for p in progress["points"]] == ["OFF", "OFF", "FULL", "FULL"]
+    await run_sweep(benchmark, config, benchmark.monitor, progress)
+    assert [p["load_reused"] for p in progress["points"]] == [False, True, False, True]
+
+async def test_adaptive_sampling_runs_across_worker_threads(benchmark):
+    config = {"rows": 100, "concurrent_users": 3, "operations": ["insert", "select", "update"]}
+    benchmark.configure_sampling(sampling_settings({"adaptive_sampling": {"min_samples": 60, "phase_budget_seconds": 0.5}}))
+    await benchmark.setup(config)
+    results = await benchmark.run(config)
+    assert results["select"]["queries_executed"] == benchmark.phase_samples["select"]["samples"] >= 60
+    assert benchmark.phase_samples["update"]["stopped_by"] in ("converged", "budget")
+    await benchmark.teardown()
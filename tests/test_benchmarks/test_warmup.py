@@ -0,0 +1,52 @@
+import pytest
+from app.core.exceptions import ConfigurationError
+from app.utils.performance_monitor import PerformanceMonitor
+from benchmarks.memory_benchmark import MemoryBenchmark
+from benchmarks.warmup import SteadyStateDetector, warmup_settings
+
+@pytest.fixture
+def benchmark():
+    benchmark = MemoryBenchmark()
+    benchmark.set_monitor(PerformanceMonitor())
+    return benchmark
+
+def test_settings_validation():
+    assert warmup_settings({}) is None
+    assert warmup_settings({"warmup": True})["stable_windows"] == 5
+    with pytest.raises(ConfigurationError):
+        warmup_settings({"warmup": {"operations": ["insert"]}}, ("insert",))
+    with pytest.raises(ConfigurationError):
+        warmup_settings({"warmup": {"stable_windows": 1}})
+    with pytest.raises(ConfigurationError):
+        warmup_settings({"warmup_rows": 1000, "warmup_operations": ["insert"]})
+
+def test_steady_once_recent_windows_agree():
+    detector = SteadyStateDetector(window_seconds=60, stable_windows=3, tolerance=0.05)
+    detector.windows = [10.0, 400.0, 1000.0, 1010.0]
+    assert not detector.steady
+    detector.windows.append(990.0)
+    assert detector.steady
+
+async def test_warm_up_queries_are_not_reported(benchmark):
+    config = {"rows": 50, "operations": ["insert", "select", "update"]}
+    benchmark.configure_warmup(warmup_settings(
+        {"warmup": {"window_seconds": 0.01, "stable_windows": 3, "tolerance": 0.5, "max_seconds": 1}}
+    ))
+    benchmark.monitor.start_experiment()
+    await benchmark.setup(config)
+    results = await benchmark.run_phases(config)
+    benchmark.monitor.stop_experiment()
+    report = benchmark.warmup_report
+    assert report["operations"] == ["select", "update"]
+    assert report["passes"] >= 1 and report["queries"] >= 100
+    assert report["stopped_by"] in ("steady", "max_seconds")
+    assert results["select"]["operations"] == 50
+    assert benchmark.monitor.query_count() == 150
+    assert benchmark.monitor.get_results()["duration_seconds"] < report["seconds"] + 0.5
+
+async def test_steady_state_phase_for_any_backend(benchmark):
+    config = {"rows": 20, "operations": ["insert", "select"], "steady_state_duration": 0.05}
+    await benchmark.setup(config)
+    results = await benchmark.run_phases(config)
+    assert results["steady_state"]["passes"] >= 1
+    assert results["steady_state"]["queries_executed"] == 20 * results["steady_state"]["passes"]
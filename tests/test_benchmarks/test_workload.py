@@ -0,0 +1,222 @@
+import asyncio
+import time
+import pytest
+from contextlib import asynccontextmanager, contextmanager
+from benchmarks.base import BaseBenchmark
+from benchmarks.workload import OperationStream, WorkloadBenchmark, WorkloadSpec
+from app.core.exceptions import ConfigurationError, ExperimentTimeoutError
+from app.services.execution_timeout import run_with_timeout
+from app.utils.performance_monitor import PerformanceMonitor
+
+class MemoryAdapter(BaseBenchmark):
+    """In-memory wl_* adapter standing in for a store"""
+
+    async def setup(self, config):
+        pass
+
+    async def run(self, config):
+        return {}
+
+    async def teardown(self):
+        pass
+
+    async def wl_setup(self, spec):
+        self.key_field = spec.schema.key_field
+        self.records = {}
+
+    async def wl_teardown(self, spec):
+        self.records = {}
+
+    @asynccontextmanager
+    async def wl_connect(self):
+        yield self.records
+
+    async def wl_load(self, records, batch):
+        for record in batch:
+            records[record[self.key_field]] = record
+
+    async def wl_point_read(self, records, key):
+        return records[key]
+
+    async def wl_range_read(self, records, key, count):
+        return [records[k] for k in range(key, key + count) if k in records]
+
+    async def wl_scan(self, records, count):
+        return list(records.values())[:count]
+
+    async def wl_insert(self, records, record):
+        records[record[self.key_field]] = record
+
+    async def wl_update(self, records, key, values):
+        records[key].update(values)
+
+class BlockingMemoryAdapter(MemoryAdapter):
+    wl_blocking = True
+
+    @contextmanager
+    def wl_connect(self):
+        yield self.records
+
+    def wl_load(self, records, batch):
+        for record in batch:
+            records[record[self.key_field]] = record
+
+    def wl_point_read(self, records, key):
+        return records[key]
+
+    def wl_update(self, records, key, values):
+        records[key].update(values)
+
+CONFIG = {
+    "workload": {
+        "record_count": 200,
+        "operation_count": 500,
+        "mix": {"point_read": 0.5, "range_read": 0.1, "scan": 0.05, "insert": 0.1, "update": 0.25},
+        "key_distribution": {"type": "zipfian", "theta": 0.99},
+        "concurrency": 4,
+        "load_batch_size": 64
+    }
+}
+
+def test_spec_applies_top_level_overrides_and_validates():
+    spec = WorkloadSpec.from_config({**CONFIG, "rows": 50, "concurrent_users": 2})
+    assert spec.record_count == 50
+    assert spec.concurrency == 2
+    assert spec.schema.key_field == "id"
+    with pytest.raises(ConfigurationError):
+        WorkloadSpec.from_config({"workload": {"mix": {"delete": 1}}})
+    with pytest.raises(ConfigurationError):
+        WorkloadSpec.from_config({"workload": {"key_distribution": {"type": "gaussian"}}})
+
+def test_operation_stream_is_deterministic_and_skewed():
+    spec = WorkloadSpec.from_config(CONFIG)
+    first, second = OperationStream(spec), OperationStream(spec)
+    assert (first.codes == second.codes).all()
+    assert (first.keys == second.keys).all()
+
+    names = first.operation_names
+    inserts = first.keys[first.codes == names.index("insert")]
+    assert list(inserts) == list(range(spec.record_count, spec.record_count + len(inserts)))
+    reads = first.keys[first.codes == names.index("point_read")]
+    assert (reads < spec.record_count).all()
+    assert (reads == 0).sum() > (reads == spec.record_count - 1).sum()
+
+async def test_workload_benchmark_loads_and_runs_every_operation():
+    adapter = MemoryAdapter()
+    benchmark = WorkloadBenchmark(adapter)
+    benchmark.set_monitor(PerformanceMonitor())
+
+    await benchmark.setup(CONFIG)
+    results = await benchmark.run(CONFIG)
+
+    assert results["load"]["records_loaded"] == 200
+    run = results["run"]
+    assert run["operations_executed"] == 500
+    assert run["errors"] == 0
+    assert set(run["operations"]) == {"point_read", "range_read", "scan", "insert", "update"}
+    assert sum(op["count"] for op in run["operations"].values()) == 500
+    assert len(adapter.records) == 200 + run["operations"]["insert"]["count"]
+    await benchmark.teardown()
+    assert adapter.records == {}
+
+class UniqueKeyAdapter(MemoryAdapter):
+    async def wl_insert(self, records, record):
+        if record[self.key_field] in records:
+            raise KeyError(f"duplicate key {record[self.key_field]}")
+        records[record[self.key_field]] = record
+
+async def test_repeated_runs_on_one_load_insert_fresh_keys():
+    config = {"workload": {"preset": "d", "record_count": 50, "operation_count": 300}}
+    adapter = UniqueKeyAdapter()
+    benchmark = WorkloadBenchmark(adapter)
+    benchmark.set_monitor(PerformanceMonitor())
+
+    await benchmark.setup(config)
+    first = (await benchmark.run(config))["run"]
+    second = (await benchmark.run({**config, "operations": ["run"]}))["run"]
+
+    assert first["errors"] == 0 and second["errors"] == 0
+    inserts = first["operations"]["insert"]["count"] + second["operations"]["insert"]["count"]
+    assert len(adapter.records) == 50 + inserts
+
+async def test_blocking_adapter_runs_in_threads_with_target_rate():
+    config = {"workload": {"record_count": 20, "operation_count": 40, "concurrency": 2, "target_rate": 2000}}
+    adapter = BlockingMemoryAdapter()
+    benchmark = WorkloadBenchmark(adapter)
+    benchmark.set_monitor(PerformanceMonitor())
+
+    await benchmark.setup(config)
+    run = (await benchmark.run(config))["run"]
+
+    assert run["errors"] == 0
+    assert run["operations_executed"] == 40
+    assert "response_ms" in run["operations"]["point_read"]
+
+class SlowBlockingAdapter(BlockingMemoryAdapter):
+    def wl_point_read(self, records, key):
+        time.sleep(0.002)
+        return records[key]
+
+async def test_timeout_stops_blocking_workload_workers():
+    config = {"workload": {"preset": "c", "record_count": 20, "operation_count": 10 ** 6, "concurrency": 4}}
+    adapter = SlowBlockingAdapter()
+    benchmark = WorkloadBenchmark(adapter)
+    benchmark.set_monitor(PerformanceMonitor())
+    await benchmark.setup(config)
+
+    with pytest.raises(ExperimentTimeoutError):
+        await run_with_timeout(benchmark, benchmark.run(config), 0.1)
+    assert adapter.cancelled.is_set()
+    # Worker threads finish their current call and then stop issuing operations
+    await asyncio.sleep(0.05)
+    stopped = benchmark.monitor.query_count()
+    await asyncio.sleep(0.05)
+    assert benchmark.monitor.query_count() == stopped < 10 ** 6
+
+def _stream(distribution, **workload):
+    return OperationStream(WorkloadSpec.from_config({"workload": {
+        "record_count": 1000,
+        "operation_count": 20000,
+        "key_distribution": distribution,
+        **workload
+    }}))
+
+def test_ycsb_presets_set_defaults_that_explicit_keys_override():
+    spec = WorkloadSpec.from_config({"workload": {"preset": "E", "range_length": 20}})
+    assert spec.preset == "e"
+    assert spec.mix == {"range_read": 0.95, "insert": 0.05}
+    assert spec.range_length == 20
+    assert spec.range_length_distribution == "uniform"
+    assert WorkloadSpec.from_config({"workload": {"preset": "d"}}).key_distribution.type == "latest"
+    with pytest.raises(ConfigurationError):
+        WorkloadSpec.from_config({"workload": {"preset": "g"}})
+
+def test_scrambled_zipfian_keeps_skew_but_spreads_hot_keys():
+    zipfian = _stream({"type": "zipfian"}).keys
+    scrambled = _stream({"type": "scrambled_zipfian"}).keys
+    assert (zipfian < 10).mean() > 0.3
+    assert (scrambled < 10).mean() < 0.1
+    counts = sorted(((scrambled == k).sum() for k in set(scrambled.tolist())), reverse=True)
+    assert sum(counts[:10]) / len(scrambled) > 0.3
+
+def test_latest_follows_inserts_and_hotspot_concentrates():
+    stream = _stream({"type": "latest"}, mix={"point_read": 0.9, "insert": 0.1})
+    reads = stream.codes == stream.operation_names.index("point_read")
+    newest = 1000 + (stream.codes == stream.operation_names.index("insert")).cumsum() - 1
+    assert (stream.keys[reads] <= newest[reads]).all()
+    assert ((newest[reads] - stream.keys[reads]) < 10).mean() > 0.3
+
+    hotspot = _stream({"type": "hotspot", "hot_data_fraction": 0.1, "hot_operation_fraction": 0.9}).keys
+    assert 0.88 < (hotspot < 100).mean() < 0.92
+
+async def test_workload_f_reads_then_updates():
+    config = {"workload": {"preset": "f", "record_count": 50, "operation_count": 200}}
+    adapter = MemoryAdapter()
+    benchmark = WorkloadBenchmark(adapter)
+    benchmark.set_monitor(PerformanceMonitor())
+
+    await benchmark.setup(config)
+    run = (await benchmark.run(config))["run"]
+
+    assert run["errors"] == 0
+    assert set(run["operations"]) == {"point_read", "read_modify_write"}
@@ -0,0 +1,63 @@
+import pytest
+from app.core.config import load_config_file
+from app.core.exceptions import ConfigurationError
+from app.db.registry import EngineRegistry, engine_registry, engine_settings
+import app.db.postgres  # registers the postgres engine factory
+
+class FakeEngine:
+    def __init__(self, options):
+        self.options = options
+        self.disposed = False
+        self.prewarmed = 0
+
+    async def dispose(self):
+        self.disposed = True
+
+def create_fake_engine(pool_size: int = 10, pool_timeout: float = 30.0, pool_pre_ping: bool = True, driver_options=None):
+    return FakeEngine({"pool_size": pool_size, "pool_timeout": pool_timeout, "pool_pre_ping": pool_pre_ping})
+
+async def prewarm_fake_engine(engine, size):
+    engine.prewarmed = size
+
+@pytest.fixture
+def registry():
+    registry = EngineRegistry(max_idle=1)
+    registry.register("fake", create_fake_engine, prewarm=prewarm_fake_engine)
+    return registry
+
+async def test_lease_routes_lookups_to_the_override_engine(registry):
+    default = registry.get("fake")
+    assert registry.get("fake") is default
+    async with registry.lease("fake", {"pool_size": 2}) as entry:
+        assert registry.get("fake") is entry.engine and entry.engine is not default
+        assert entry.engine.options["pool_size"] == 2
+        async with registry.lease("fake", {"pool_size": 2}) as shared:
+            assert shared is entry
+        assert (await registry.prewarm("fake"))["connections"] == 2
+        assert entry.engine.prewarmed == 2
+    assert registry.get("fake") is default
+
+async def test_idle_override_engines_are_evicted_least_recently_used_first(registry):
+    default = registry.get("fake")
+    async with registry.lease("fake", {"pool_size": 1}) as first:
+        pass
+    async with registry.lease("fake", {"pool_size": 2}) as second:
+        assert not first.engine.disposed
+    assert first.engine.disposed and not second.engine.disposed
+    async with registry.lease("fake", {"pool_size": 2}) as again:
+        assert again is second
+    assert not default.disposed
+
+def test_overrides_are_validated():
+    # Options layer the factory defaults, conf/config.yaml, then the experiment's overrides
+    assert load_config_file() is load_config_file()
+    assert engine_registry.options("postgres")["max_overflow"] == 20
+    assert engine_settings({"engine": {"pool_size": 4, "pool_pre_ping": False}}, "postgres") == (
+        {"pool_size": 4, "pool_pre_ping": False}, True
+    )
+    for engine in ({"pool_size": 0}, {"pool_pre_ping": 1}, {"statement_cache": 10}, {"driver_options": []}):
+        with pytest.raises(ConfigurationError):
+            engine_settings({"engine": engine}, "postgres")
+    with pytest.raises(ConfigurationError):
+        engine_settings({"engine": {"pool_size": 4}}, "sqlite")
+    assert engine_settings({"prewarm": False}, "sqlite") == ({}, False)
@@ -0,0 +1,7 @@
+from app.services.baseline_service import workload_fingerprint
+
+def test_fingerprint_ignores_defaults_order_and_observation_keys():
+    a = workload_fingerprint("Postgres", {"operations": ["select", "insert"]})
+    b = workload_fingerprint("postgres", {"rows": 1000, "operations": ["insert", "select"], "archive_samples": True})
+    assert a == b
+    assert a != workload_fingerprint("postgres", {"rows": 5000, "operations": ["insert", "select"]})
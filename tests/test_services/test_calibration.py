@@ -0,0 +1,38 @@
+import pytest
+from app.core.exceptions import ConfigurationError
+from app.services.calibration import calibration_report, calibration_settings, run_calibration
+from app.utils.performance_monitor import PerformanceMonitor
+from benchmarks.memory_benchmark import MemoryBenchmark
+from benchmarks.noop_benchmark import NoopBenchmark
+
+async def test_noop_backend_records_through_the_monitor():
+    benchmark = NoopBenchmark()
+    monitor = PerformanceMonitor()
+    benchmark.set_monitor(monitor)
+    results = await benchmark.run({"rows": 200, "concurrent_users": 4})
+    assert set(results) == {"insert", "select", "update"}
+    assert monitor.query_count() == 600
+
+async def test_memory_backend_honours_injected_delay():
+    benchmark = MemoryBenchmark()
+    benchmark.set_monitor(PerformanceMonitor())
+    config = {"rows": 20, "injected_delay_ms": 2}
+    await benchmark.setup(config)
+    results = await benchmark.run(config)
+    assert len(benchmark.store) == 20
+    assert results["select"]["avg_time_seconds"] >= 0.002
+    assert results["update"]["operations"] == 20
+
+async def test_calibration_reports_overhead_share():
+    calibration = await run_calibration({"calibrate": {"operations": 500}, "concurrent_users": 2})
+    assert calibration["operations"] == 500
+    assert calibration["harness_latency_ms"]["p50"] < 1.0
+
+    report = calibration_report(calibration, {"latency_ms": {"avg": 10.0, "p50": 0.0, "p99": 20.0}})
+    assert report["share_of_measured_latency"]["avg"] == round(calibration["harness_latency_ms"]["avg"] / 10.0, 4)
+    assert report["share_of_measured_latency"]["p50"] is None
+
+def test_calibration_settings_validate():
+    assert calibration_settings({"calibrate": True})["operations"] == 10000
+    with pytest.raises(ConfigurationError):
+        calibration_settings({"calibrate": {"operations": 0}})
@@ -0,0 +1,29 @@
+import numpy as np
+from app.services.comparison import compare_operation_samples
+
+def _run(rng, scale, count=20000):
+    timestamps = np.sort(rng.uniform(0, 10, count))
+    latencies = rng.lognormal(mean=np.log(0.002 * scale), sigma=0.3, size=count)
+    return timestamps, latencies
+
+def test_detects_latency_regression():
+    rng = np.random.default_rng(1)
+    result = compare_operation_samples(_run(rng, 1.0), _run(rng, 1.2), iterations=200, seed=1)
+    assert result["metrics"]["latency_p50_ms"]["verdict"] == "regression"
+    assert result["mann_whitney_p"] < 0.001
+
+def test_identical_distributions_are_noise():
+    rng = np.random.default_rng(2)
+    result = compare_operation_samples(_run(rng, 1.0), _run(rng, 1.0), iterations=200, seed=2)
+    assert result["metrics"]["latency_p50_ms"]["verdict"] == "noise"
+    assert result["metrics"]["ops_per_second"]["verdict"] == "noise"
+
+def test_throughput_of_sub_second_runs():
+    rng = np.random.default_rng(3)
+    latencies = rng.lognormal(mean=np.log(0.002), sigma=0.3, size=500)
+    slow = (np.sort(rng.uniform(0, 0.5, 500)), latencies)
+    fast = (np.sort(rng.uniform(0, 0.25, 500)), latencies)
+    result = compare_operation_samples(slow, fast, iterations=200, seed=3)
+    throughput = result["metrics"]["ops_per_second"]
+    assert throughput["verdict"] == "improvement"
+    assert 0.8 < throughput["relative_change"] < 1.2
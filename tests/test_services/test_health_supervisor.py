@@ -0,0 +1,41 @@
+import pytest
+from app.services.health_supervisor import HealthSupervisor, CIRCUIT_OPEN, CIRCUIT_CLOSED
+from app.core.exceptions import DatabaseConnectionError
+
+def _supervisor(probe_result):
+    supervisor = HealthSupervisor()
+    supervisor.failure_threshold = 2
+
+    async def probe():
+        return probe_result["healthy"]
+
+    supervisor.probes = {"postgres": (lambda: True, probe)}
+    supervisor.statuses = {"postgres": supervisor.statuses["postgres"]}
+    return supervisor
+
+@pytest.mark.asyncio
+async def test_circuit_opens_after_threshold_and_closes_on_recovery():
+    probe_result = {"healthy": False}
+    supervisor = _supervisor(probe_result)
+
+    await supervisor.probe("postgres")
+    assert supervisor.statuses["postgres"].circuit == CIRCUIT_CLOSED
+    await supervisor.probe("postgres")
+    assert supervisor.statuses["postgres"].circuit == CIRCUIT_OPEN
+    with pytest.raises(DatabaseConnectionError):
+        supervisor.check_circuit("postgres")
+
+    probe_result["healthy"] = True
+    await supervisor.probe("postgres")
+    assert supervisor.statuses["postgres"].circuit == CIRCUIT_CLOSED
+    await supervisor.ensure_available("postgres")
+
+@pytest.mark.asyncio
+async def test_ensure_available_uses_cache_within_ttl():
+    probe_result = {"healthy": True}
+    supervisor = _supervisor(probe_result)
+    await supervisor.ensure_available("postgres")
+
+    probe_result["healthy"] = False
+    await supervisor.ensure_available("postgres")
+    assert supervisor.snapshot()["status"] == "healthy"
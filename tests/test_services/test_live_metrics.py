@@ -0,0 +1,26 @@
+import asyncio
+import pytest
+from app.services.live_metrics import LiveMetricsHub
+from app.utils.performance_monitor import PerformanceMonitor
+
+@pytest.mark.asyncio
+async def test_subscribers_receive_snapshots_and_end_marker():
+    hub = LiveMetricsHub(interval=0.05, buffer_size=2)
+    monitor = PerformanceMonitor()
+    monitor.start_experiment()
+    hub.register("exp-1", monitor)
+    fast = hub.subscribe("exp-1")
+    slow = hub.subscribe("exp-1")
+
+    for _ in range(10):
+        monitor.record_query_time(0.002)
+    snapshot = await asyncio.wait_for(fast.get(), timeout=2)
+    assert snapshot["total_queries"] == 10
+    assert snapshot["latency_ms"]["p50"] == 2.0
+
+    await asyncio.sleep(0.3)
+    monitor.stop_experiment()
+    await hub.unregister("exp-1")
+    assert slow.qsize() == 2
+    items = [slow.get_nowait() for _ in range(2)]
+    assert items[-1] is None
@@ -0,0 +1,109 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+import pytest
+from app.core.exceptions import ConfigurationError
+from app.services.pool_tuning import pool_tuning_settings, recommend_pool_size, run_pool_tuning
+from app.utils.performance_monitor import PerformanceMonitor
+from benchmarks.base import BaseBenchmark
+
+class PooledBackend(BaseBenchmark):
+    """Point reads against a server that executes at most four at a time"""
+    pool_tuning_supported = True
+
+    def __init__(self):
+        super().__init__()
+        self.server = asyncio.Semaphore(4)
+        self.loaded = 0
+
+    async def setup(self, config):
+        pass
+
+    async def run(self, config):
+        return {}
+
+    async def teardown(self):
+        pass
+
+    @asynccontextmanager
+    async def wl_connect(self):
+        yield None
+
+    async def wl_setup(self, spec):
+        self.loaded = 0
+
+    async def wl_teardown(self, spec):
+        pass
+
+    async def wl_load(self, handle, records):
+        self.loaded += len(records)
+
+    async def wl_point_read(self, handle, key):
+        async with self.server:
+            await asyncio.sleep(0.003)
+
+    @asynccontextmanager
+    async def wl_pool(self, pool_size, stats):
+        connections = asyncio.Queue()
+        for _ in range(pool_size):
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            stats.add_connect(time.perf_counter() - start)
+            connections.put_nowait(object())
+
+        @asynccontextmanager
+        async def connect():
+            start = time.perf_counter()
+            connection = await connections.get()
+            stats.add_wait(time.perf_counter() - start)
+            try:
+                yield connection
+            finally:
+                connections.put_nowait(connection)
+
+        yield connect
+
+def test_settings_validation():
+    assert pool_tuning_settings({}, True, "postgres") is None
+    assert pool_tuning_settings({"pool_tuning": True}, True, "postgres")["pool_sizes"] == [1, 2, 4, 8, 16, 32]
+    assert pool_tuning_settings({"pool_tuning": {"pool_sizes": [8, 2, 2]}}, True, "redis")["pool_sizes"] == [2, 8]
+    with pytest.raises(ConfigurationError):
+        pool_tuning_settings({"pool_tuning": True}, False, "sqlite")
+    with pytest.raises(ConfigurationError):
+        pool_tuning_settings({"pool_tuning": {"workload": {"preset": "d"}}}, True, "postgres")
+    with pytest.raises(ConfigurationError):
+        pool_tuning_settings({"pool_tuning": True, "sweep": {"grid": {"rows": [1]}}}, True, "postgres")
+    with pytest.raises(ConfigurationError):
+        pool_tuning_settings({"pool_tuning": {"pool_sizes": [0]}}, True, "postgres")
+
+def test_smallest_pool_within_tolerance_is_recommended():
+    sizes = [
+        {"pool_size": 2, "peak_ops_per_second": 500.0, "peak_concurrency": 2},
+        {"pool_size": 4, "peak_ops_per_second": 970.0, "peak_concurrency": 8},
+        {"pool_size": 8, "peak_ops_per_second": 1000.0, "peak_concurrency": 16}
+    ]
+    recommendation = recommend_pool_size(sizes, 0.05)
+    assert recommendation["pool_size"] == 4 and recommendation["concurrency"] == 8
+    assert recommendation["peak_pool_size"] == 8
+    assert recommend_pool_size(sizes, 0.0)["pool_size"] == 8
+
+async def test_tuning_finds_the_server_limit():
+    benchmark = PooledBackend()
+    benchmark.set_monitor(PerformanceMonitor())
+    settings = pool_tuning_settings({"pool_tuning": {
+        "pool_sizes": [1, 2, 4, 8],
+        "concurrency": [1, 8],
+        "operations": 40,
+        "tolerance": 0.25,
+        "workload": {"preset": "c", "record_count": 100}
+    }}, True, "pooled")
+    results = await run_pool_tuning(benchmark, settings)
+    assert benchmark.loaded == 100
+    sizes = results["benchmark_results"]["pool_sizes"]
+    assert list(sizes) == ["1", "2", "4", "8"]
+    assert sizes["4"]["connect_ms"]["count"] == 4 and sizes["4"]["reconnects"] == 0
+    assert [level["concurrency"] for level in sizes["1"]["levels"]] == [1, 8]
+    # Eight workers on one connection queue for it; on eight connections they never wait
+    assert sizes["1"]["levels"][1]["pool_wait_ms"]["avg"] > sizes["8"]["levels"][1]["pool_wait_ms"]["avg"]
+    assert results["pool_tuning"]["recommendation"]["pool_size"] == 4
+    assert benchmark.monitor.query_count() == 1 + 4 * 2 * 40
@@ -0,0 +1,85 @@
+import pytest
+from benchmarks.base import BaseBenchmark
+from app.core.exceptions import ConfigurationError
+from app.services.sweep import expand_sweep, init_sweep_progress, run_sweep, table_to_csv
+from app.utils.performance_monitor import PerformanceMonitor
+
+class LoadTrackingBenchmark(BaseBenchmark):
+    default_operations = ["insert", "select"]
+    load_operations = ("insert",)
+
+    def __init__(self):
+        super().__init__()
+        self.setups = 0
+        self.loads = []
+
+    async def setup(self, config):
+        self.setups += 1
+
+    async def run(self, config):
+        results = {}
+        for operation in config["operations"]:
+            self._begin_operation(operation)
+            self._record_query_time(0.001)
+            if operation == "insert":
+                self.loads.append(config["rows"])
+            results[operation] = {"rows": config["rows"], "users": config.get("concurrent_users", 1)}
+        return results
+
+    async def teardown(self):
+        pass
+
+GRID_CONFIG = {"sweep": {"grid": {"concurrent_users": [1, 4], "rows": [100, 1000]}}}
+
+def test_grid_puts_load_parameters_in_the_outer_loop():
+    points = expand_sweep(GRID_CONFIG)
+    assert points == [
+        {"rows": 100, "concurrent_users": 1},
+        {"rows": 100, "concurrent_users": 4},
+        {"rows": 1000, "concurrent_users": 1},
+        {"rows": 1000, "concurrent_users": 4}
+    ]
+
+def test_sweep_rejects_trials():
+    with pytest.raises(ConfigurationError):
+        expand_sweep({**GRID_CONFIG, "trials": 3})
+
+async def test_sweep_reuses_loads_and_builds_a_table():
+    benchmark = LoadTrackingBenchmark()
+    monitor = PerformanceMonitor()
+    benchmark.set_monitor(monitor)
+    progress = init_sweep_progress(GRID_CONFIG)
+    checkpoints = []
+
+    async def checkpoint():
+        checkpoints.append(progress["completed"])
+
+    result = await run_sweep(benchmark, GRID_CONFIG, monitor, progress, checkpoint)
+
+    assert benchmark.setups == 2
+    assert benchmark.loads == [100, 1000]
+    assert checkpoints == [1, 2, 3, 4]
+    table = result["table"]
+    assert table["columns"][:4] == ["rows", "concurrent_users", "operation", "load_reused"]
+    select_rows = [row for row in table["rows"] if row[2] == "select"]
+    assert [(row[0], row[1], row[3]) for row in select_rows] == [
+        (100, 1, False), (100, 4, True), (1000, 1, False), (1000, 4, True)
+    ]
+    assert table_to_csv(table).splitlines()[0].startswith("rows,concurrent_users,operation")
+
+async def test_sweep_resumes_from_completed_points():
+    first = init_sweep_progress(GRID_CONFIG)
+    benchmark = LoadTrackingBenchmark()
+    monitor = PerformanceMonitor()
+    benchmark.set_monitor(monitor)
+    await run_sweep(benchmark, GRID_CONFIG, monitor, first)
+    for point in first["points"][2:]:
+        point["status"] = "pending"
+
+    resumed = init_sweep_progress(GRID_CONFIG, first)
+    assert resumed["completed"] == 2 and resumed["resumed"]
+    benchmark = LoadTrackingBenchmark()
+    benchmark.set_monitor(monitor)
+    await run_sweep(benchmark, GRID_CONFIG, monitor, resumed)
+    assert benchmark.loads == [1000]
+    assert resumed["completed"] == 4
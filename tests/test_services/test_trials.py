@@ -0,0 +1,61 @@
+from benchmarks.base import BaseBenchmark
+from app.services.trials import run_trials, trial_schedule
+from app.utils.performance_monitor import PerformanceMonitor
+
+class RecordingBenchmark(BaseBenchmark):
+    default_operations = ["insert", "select", "update"]
+    load_operations = ("insert",)
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    async def setup(self, config):
+        self.calls.append("setup")
+
+    async def run(self, config):
+        results = {}
+        for operation in config["operations"]:
+            self.calls.append(operation)
+            self._begin_operation(operation)
+            self._record_query_time(0.001)
+            results[operation] = {"operations": 1, "avg_time_ms": 1.0 + len(self.calls)}
+        return results
+
+    async def teardown(self):
+        self.calls.append("teardown")
+
+def test_schedule_keeps_loads_first_and_rotates_the_rest():
+    schedule = trial_schedule(["select", "insert", "update", "scan"], ("insert",), 4)
+    assert schedule == [
+        ["insert", "select", "update", "scan"],
+        ["insert", "update", "scan", "select"],
+        ["insert", "scan", "select", "update"],
+        ["insert", "select", "update", "scan"]
+    ]
+
+async def test_run_trials_discards_warmup_and_summarizes():
+    benchmark = RecordingBenchmark()
+    monitor = PerformanceMonitor()
+    benchmark.set_monitor(monitor)
+    monitor.start_experiment()
+    result = await run_trials(benchmark, {"trials": 3, "warmup_trials": 1}, monitor)
+    monitor.stop_experiment()
+
+    trials = result["trials"]
+    assert [t["warmup"] for t in trials["per_trial"]] == [True, False, False, False]
+    assert benchmark.calls.count("setup") == 4
+    select_stats = trials["summary"]["benchmark_results"]["select"]["avg_time_ms"]
+    assert select_stats["n"] == 3
+    assert select_stats["ci95_low"] <= select_stats["mean"] <= select_stats["ci95_high"]
+    assert result["benchmark_results"]["select"]["avg_time_ms"] == select_stats["mean"]
+    assert trials["summary"]["performance_metrics"]["total_queries"]["mean"] == 3
+
+async def test_reuse_setup_loads_once():
+    benchmark = RecordingBenchmark()
+    monitor = PerformanceMonitor()
+    benchmark.set_monitor(monitor)
+    await run_trials(benchmark, {"trials": 2, "reuse_setup": True}, monitor)
+    assert benchmark.calls.count("setup") == 1
+    assert benchmark.calls.count("insert") == 1
+    assert benchmark.calls[-1] == "teardown"
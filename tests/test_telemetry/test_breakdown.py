@@ -0,0 +1,95 @@
+import asyncio
+import time
+import pytest
+from sqlalchemy import create_engine, text
+from app.core.exceptions import ConfigurationError
+from benchmarks.base import BaseBenchmark
+from telemetry.breakdown import LatencyBreakdown, breakdown_enabled, instrument_breakdown
+
+class SQLiteEngineBenchmark(BaseBenchmark):
+    """Runs its timed queries through an instrumented SQLAlchemy engine"""
+
+    def __init__(self, engine):
+        super().__init__()
+        self.engine = engine
+
+    async def setup(self, config):
+        pass
+
+    async def run(self, config):
+        self._begin_operation("select")
+        with self.engine.connect() as connection:
+            # Untimed: its execution must not be charged to the operation
+            connection.execute(text("SELECT 1"))
+        for _ in range(config["queries"]):
+            start = time.perf_counter()
+            with self.engine.connect() as connection:
+                connection.execute(text("WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 2000) SELECT sum(i) FROM n"))
+                connection.execute(text("SELECT 1"))
+            self._record_query_time(time.perf_counter() - start)
+        self._begin_operation("update")
+        return {}
+
+    async def teardown(self):
+        pass
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'breakdown.db'}")
+    instrument_breakdown(engine)
+    yield engine
+    engine.dispose()
+
+async def test_timed_queries_are_decomposed(engine):
+    benchmark = SQLiteEngineBenchmark(engine)
+    benchmark.configure_breakdown(True)
+    await benchmark.run({"queries": 5})
+    report = benchmark.breakdown.report()["operations"]
+    assert list(report) == ["select"]
+    select = report["select"]
+    assert select["queries"] == 5 and select["statements"] == 10
+    assert 0 < select["execute_seconds"] <= select["total_seconds"]
+    assert select["acquire_seconds"] > 0
+    assert sum(select["share"].values()) == pytest.approx(1, abs=0.01)
+
+def test_round_trip_splits_execution():
+    breakdown = LatencyBreakdown()
+    breakdown.round_trip = 0.001
+    breakdown.begin("select")
+    for _ in range(4):
+        breakdown.add("execute", time.perf_counter(), 0.003)
+    breakdown.add_query(0.015)
+    select = breakdown.report()["operations"]["select"]
+    assert select["network_seconds"] == 0.004
+    assert select["server_seconds"] == 0.008
+    assert select["client_seconds"] == 0.003
+
+async def test_concurrent_workers_commit_only_their_own_events():
+    breakdown = LatencyBreakdown()
+    breakdown.begin("select")
+
+    async def worker(delay, execute, hold):
+        await asyncio.sleep(delay)
+        start = time.perf_counter()
+        await asyncio.sleep(0.002)
+        breakdown.add("execute", time.perf_counter(), execute)
+        await asyncio.sleep(hold)
+        breakdown.add_query(time.perf_counter() - start)
+
+    # The short worker starts and commits while the long one's event is still pending
+    await asyncio.gather(worker(0, 0.002, 0.03), worker(0.01, 0.001, 0.002))
+    select = breakdown.report()["operations"]["select"]
+    assert select["queries"] == 2 and select["statements"] == 2
+    assert select["execute_seconds"] == pytest.approx(0.003)
+
+async def test_uninstrumented_runs_record_nothing(engine):
+    benchmark = SQLiteEngineBenchmark(engine)
+    await benchmark.run({"queries": 1})
+    assert benchmark.breakdown is None
+
+def test_enabled_only_for_sqlalchemy_backends():
+    assert breakdown_enabled({"latency_breakdown": True}, True, "postgres")
+    with pytest.raises(ConfigurationError):
+        breakdown_enabled({"latency_breakdown": True}, False, "redis")
+    with pytest.raises(ConfigurationError):
+        breakdown_enabled({"latency_breakdown": True, "workload": {}}, True, "postgres")
@@ -0,0 +1,55 @@
+import threading
+from fastapi.testclient import TestClient
+from telemetry.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+def test_histogram_exposition_is_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.register(Histogram("op_seconds", "Op latency", ("backend",), buckets=(0.01, 0.1)))
+    child = latency.labels("redis")
+    for value in (0.005, 0.05, 0.05, 2.0):
+        child.observe(value)
+
+    text = registry.render()
+    assert "# TYPE op_seconds histogram" in text
+    assert 'op_seconds_bucket{backend="redis",le="0.01"} 1' in text
+    assert 'op_seconds_bucket{backend="redis",le="0.1"} 3' in text
+    assert 'op_seconds_bucket{backend="redis",le="+Inf"} 4' in text
+    assert 'op_seconds_count{backend="redis"} 4' in text
+    assert 'op_seconds_sum{backend="redis"} 2.105' in text
+
+def test_counter_shards_sum_across_threads():
+    counter = Counter("ops_total", "Ops", ("backend",))
+    child = counter.labels("mongodb")
+
+    def work():
+        for _ in range(1000):
+            child.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert child.value == 4000
+    assert counter.labels("mongodb") is child
+
+def test_unlabelled_gauge_and_label_escaping():
+    registry = MetricsRegistry()
+    gauge = registry.register(Gauge("active", "Active"))
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+    errors = registry.register(Counter("errors_total", "Errors", ("route",)))
+    errors.labels('/a"b').inc()
+
+    text = registry.render()
+    assert "active 1" in text
+    assert 'errors_total{route="/a\\"b"} 1' in text
+
+def test_metrics_endpoint_reports_request_latency(client: TestClient):
+    client.get("/")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'optistack_http_request_duration_seconds_count{method="GET",route="/",status="200"}' in response.text
+    assert "# TYPE optistack_operation_latency_seconds histogram" in response.text
@@ -0,0 +1,58 @@
+import json
+import pytest
+from app.core.config import settings
+from telemetry import tracing
+
+pytest.importorskip("opentelemetry.sdk")
+
+@pytest.fixture
+def enabled_tracing(monkeypatch):
+    monkeypatch.setattr(settings, "OPENTELEMETRY_ENABLED", True)
+    monkeypatch.setattr(settings, "OPENTELEMETRY_EXPORTER", "memory")
+    monkeypatch.setattr(settings, "OPENTELEMETRY_OPERATION_SAMPLE_RATIO", 0.1)
+    tracing.setup_tracing()
+    yield tracing.get_memory_exporter()
+    tracing.shutdown_tracing()
+
+def test_disabled_tracing_is_a_no_op():
+    assert tracing.get_tracer("optistack") is None
+    assert tracing.operation_tracer("redis") is None
+    with tracing.start_span("noop") as span:
+        assert span is None
+
+def test_operation_spans_are_sampled_under_the_run_phase(enabled_tracing):
+    tracer = tracing.operation_tracer("redis")
+    with tracing.start_span("experiment.run"):
+        for _ in range(100):
+            tracer.record("get", 0.002)
+    tracing.force_flush()
+
+    spans = enabled_tracing.get_finished_spans()
+    run_span = next(s for s in spans if s.name == "experiment.run")
+    op_spans = [s for s in spans if s.name == "db.get"]
+    assert len(op_spans) == 10
+    assert all(s.parent.span_id == run_span.context.span_id for s in op_spans)
+    assert all(s.attributes["db.system"] == "redis" for s in op_spans)
+    assert abs((op_spans[0].end_time - op_spans[0].start_time) / 1e9 - 0.002) < 0.001
+
+    report = tracer.report(run_seconds=1.0)
+    assert report["operations"] == 100
+    assert report["sampled_operations"] == 10
+    assert report["overhead_ms"] > 0
+    assert report["overhead_percent"] < 100
+
+def test_file_exporter_writes_otlp_json_lines(tmp_path):
+    pytest.importorskip("opentelemetry.exporter.otlp.proto.common")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+
+    path = tmp_path / "spans.jsonl"
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(tracing.OTLPFileSpanExporter(str(path))))
+    with provider.get_tracer("test").start_as_current_span("experiment.setup"):
+        pass
+    provider.shutdown()
+
+    payload = json.loads(path.read_text().splitlines()[0])
+    span = payload["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert span["name"] == "experiment.setup"
@@ -0,0 +1,45 @@
+import os
+import numpy as np
+import pytest
+from app.core.exceptions import ConfigurationError
+from app.utils.dataset_cache import DatasetCache, data_seed
+
+def test_second_lookup_hits_and_memory_maps(tmp_path):
+    cache = DatasetCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+    first = cache.get(100, num_fields=7, data_size="medium")
+    second = cache.get(100, num_fields=7, data_size="medium")
+    assert (first.cache_hit, second.cache_hit) == (False, True)
+    assert isinstance(second.columns["name"], np.memmap)
+    assert second[:] == first[:]
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0}
+
+def test_rows_are_plain_values_and_depend_on_the_seed(tmp_path):
+    cache = DatasetCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+    rows = cache.get(10, num_fields=6, data_size="small", seed=1)
+    row = rows[3]
+    assert set(row) == {"id", "name", "email", "age", "score", "field_0"}
+    assert row["id"] == 3 and row["email"] == "user3@example.com"
+    assert isinstance(row["name"], str) and len(row["name"]) == 20
+    assert len(row["field_0"]) == 10 and 18 <= row["age"] <= 80
+    assert rows[-1]["id"] == 9 and len(list(rows)) == 10
+    assert [len(batch) for batch in rows.batches(4)] == [4, 4, 2]
+    assert [row for batch in rows.batches(4) for row in batch] == rows[:]
+    assert cache.get(10, num_fields=6, seed=2)[3]["name"] != row["name"]
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = DatasetCache(str(tmp_path), max_bytes=2 * 1024 * 1024)
+    cache.get(1000, num_fields=20, data_size="large", seed=1)
+    cache.get(1000, num_fields=20, data_size="large", seed=2)
+    assert cache.evictions == 1
+    assert len(os.listdir(tmp_path)) == 1
+    assert cache.get(1000, num_fields=20, data_size="large", seed=2).cache_hit
+
+def test_disabled_cache_generates_without_writing(tmp_path):
+    cache = DatasetCache(str(tmp_path / "off"), max_bytes=0)
+    assert len(cache.get(5)) == 5
+    assert not os.path.exists(tmp_path / "off")
+
+def test_data_seed_validation():
+    assert data_seed({}) == 0
+    with pytest.raises(ConfigurationError):
+        data_seed({"data_seed": "1"})
@@ -0,0 +1,13 @@
+import pytest
+from datetime import datetime
+from app.utils.helpers import encode_cursor, decode_cursor
+from app.core.exceptions import InvalidCursorError
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 1, 1, 12, 30, 45, 123456)
+    cursor = encode_cursor(created_at, "abc-123")
+    assert decode_cursor(cursor) == (created_at, "abc-123")
+
+def test_invalid_cursor():
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor")
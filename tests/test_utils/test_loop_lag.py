@@ -0,0 +1,38 @@
+import asyncio
+import time
+from app.utils.loop_lag import LoopLagProbe, client_bound_report
+
+async def test_probe_measures_a_blocked_loop():
+    probe = LoopLagProbe(interval=0.005)
+    assert probe.start()
+    await asyncio.sleep(0.05)
+    for _ in range(3):
+        time.sleep(0.04)  # Blocks the loop the way synchronous work inside a benchmark would
+        await asyncio.sleep(0.01)
+    probe.stop()
+
+    summary = probe.summary()
+    assert summary["probe_samples"] > 5
+    assert summary["loop_lag_ms"]["max"] >= 30
+    assert summary["loop_thread_cpu_percent"] is not None
+
+def test_probe_outside_a_loop_reports_nothing():
+    probe = LoopLagProbe()
+    assert not probe.start()
+    assert probe.summary()["probe_samples"] == 0
+
+def test_client_bound_flag():
+    summary = {
+        "probe_interval_ms": 10.0,
+        "probe_samples": 100,
+        "loop_lag_ms": {"mean": 0.4, "p50": 0.3, "p95": 1.0, "p99": 2.0, "max": 3.0},
+        "loop_thread_cpu_percent": 35.0
+    }
+    assert not client_bound_report(summary, 20.0, 40.0, 0.1, 90.0)["client_bound"]
+
+    report = client_bound_report(summary, 2.0, 40.0, 0.1, 90.0)
+    assert report["client_bound"]
+    assert report["lag_share_of_latency"] == 0.2
+
+    saturated = client_bound_report({**summary, "loop_thread_cpu_percent": 97.0}, 20.0, 99.0, 0.1, 90.0)
+    assert saturated["reasons"] == ["event-loop thread at 97.0% CPU"]
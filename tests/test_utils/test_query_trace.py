@@ -0,0 +1,64 @@
+import pytest
+from app.core.config import settings
+from app.core.exceptions import ConfigurationError
+from app.utils.query_trace import TraceReader, fingerprint_command, ingest_log, resolve_trace_path
+
+POSTGRES_CSV = (
+    '2024-05-01 12:00:00.000 UTC,"app","shop",101,"10.0.0.1:5000",6630a1.65,1,"SELECT",'
+    '2024-05-01 11:59:00 UTC,3/10,0,LOG,00000,"duration: 0.210 ms  statement: SELECT * FROM orders WHERE id = 42",'
+    ',,,,,,,,"psql","client backend",,0\n'
+    '2024-05-01 12:00:00.500 UTC,"app","shop",101,"10.0.0.1:5000",6630a1.65,2,"SELECT",'
+    '2024-05-01 11:59:00 UTC,3/11,0,LOG,00000,"execute <unnamed>: SELECT * FROM orders WHERE id = $1 AND note = $2",'
+    '"parameters: $1 = \'7\', $2 = \'it\'\'s\'",,,,,,,,"psql","client backend",,0\n'
+    '2024-05-01 12:00:01.000 UTC,"app","shop",101,"10.0.0.1:5000",6630a1.65,3,"idle",'
+    '2024-05-01 11:59:00 UTC,,0,LOG,00000,"connection authorized: user=app",,,,,,,,,"psql","client backend",,0\n'
+)
+
+def test_fingerprints_ignore_literals():
+    assert fingerprint_command({"sql": "SELECT * FROM t WHERE id = 1 AND name = 'a'"}) == \
+        fingerprint_command({"sql": "select *  from t where id = 99 and name = 'b''c'"})
+    assert fingerprint_command({"sql": "SELECT * FROM t WHERE id IN (1, 2, 3)"}) == "select * from t where id in (?+)"
+    assert fingerprint_command({"args": ["get", "user:17"]}) == "GET user:?"
+    assert fingerprint_command({"db_command": {"find": "orders", "filter": {"id": 1}}}) == \
+        fingerprint_command({"db_command": {"find": "orders", "filter": {"id": 2}}})
+
+def test_postgres_log_round_trips_through_a_trace(tmp_path):
+    log = tmp_path / "postgres.csv"
+    log.write_text(POSTGRES_CSV)
+    stats = ingest_log(str(log), "postgres_csv", str(tmp_path / "postgres.trace"))
+    assert stats == {"events": 2, "fingerprints": 2}
+
+    reader = TraceReader(str(tmp_path / "postgres.trace"))
+    events = list(reader)
+    assert [offset for offset, _, _ in events] == [0.0, 0.5]
+    assert events[1][2] == {"sql": "SELECT * FROM orders WHERE id = '7' AND note = 'it''s'"}
+    assert reader.fingerprints[events[0][1]] == "select * from orders where id = ?"
+
+def test_redis_monitor_and_mongodb_profile(tmp_path):
+    monitor = tmp_path / "monitor.txt"
+    monitor.write_text(
+        'OK\n'
+        '1700000000.000000 [0 127.0.0.1:6379] "SET" "user:1" "a \\"quoted\\" value"\n'
+        '1700000000.250000 [0 127.0.0.1:6379] "GET" "user:2"\n'
+    )
+    ingest_log(str(monitor), "redis_monitor", str(tmp_path / "monitor.trace"))
+    events = list(TraceReader(str(tmp_path / "monitor.trace")))
+    assert events[0][2] == {"args": ["SET", "user:1", 'a "quoted" value']}
+    assert events[1][0] == 0.25
+
+    profile = tmp_path / "profile.json"
+    profile.write_text(
+        '{"op": "query", "ts": {"$date": "2024-05-01T12:00:00Z"}, '
+        '"command": {"find": "orders", "filter": {"_id": {"$oid": "65f000000000000000000001"}}, "lsid": {}, "$db": "shop"}}\n'
+        '{"op": "getmore", "ts": {"$date": "2024-05-01T12:00:01Z"}, "command": {"getMore": 1, "collection": "orders"}}\n'
+    )
+    ingest_log(str(profile), "mongodb_profile", str(tmp_path / "profile.trace"))
+    (event,) = list(TraceReader(str(tmp_path / "profile.trace")))
+    assert set(event[2]["db_command"]) == {"find", "filter"}
+    assert str(event[2]["db_command"]["filter"]["_id"]) == "65f000000000000000000001"
+
+def test_trace_paths_stay_inside_the_trace_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "TRACE_DIR", str(tmp_path))
+    assert resolve_trace_path("logs/a.csv") == str(tmp_path / "logs" / "a.csv")
+    with pytest.raises(ConfigurationError):
+        resolve_trace_path("../etc/passwd")
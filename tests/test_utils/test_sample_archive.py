@@ -0,0 +1,27 @@
+from array import array
+from app.core.config import settings
+from app.utils.sample_archive import write_sample_archive, read_samples, downsample_samples
+
+def _samples(count: int):
+    return {
+        "timestamp": array('d', [i * 0.01 for i in range(count)]),
+        "operation": array('B', [i % 2 for i in range(count)]),
+        "latency": array('d', [0.001 * (1 + i % 10) for i in range(count)]),
+        "error": array('B', [1 if i % 100 == 0 else 0 for i in range(count)]),
+        "operations": {0: "select", 1: "update"}
+    }
+
+def test_archive_range_read_and_downsample(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SAMPLE_ARCHIVE_DIR", str(tmp_path))
+    info = write_sample_archive("exp-1", _samples(1000), chunk_rows=128)
+    assert info["samples"] == 1000
+    assert info["chunks"] == 8
+
+    window = read_samples("exp-1", start=2.0, end=3.0, operation="select")
+    assert len(window["samples"]) == 50
+    assert all(s["operation"] == "select" for s in window["samples"])
+
+    series = downsample_samples("exp-1", bucket_seconds=1.0)
+    assert [b["count"] for b in series["buckets"]] == [100] * 10
+    assert series["buckets"][0]["errors"] == 1
+    assert series["buckets"][0]["latency_ms"]["max"] == 10.0
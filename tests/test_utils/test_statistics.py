@@ -0,0 +1,22 @@
+from app.utils.statistics import detect_shift, summarize_trials
+
+HISTORY = [1000.0, 1010.0, 990.0, 1005.0, 995.0, 1002.0, 998.0]
+
+def test_detect_shift_flags_throughput_drop():
+    result = detect_shift(HISTORY, 800.0, higher_is_better=True)
+    assert result["verdict"] == "regression"
+
+def test_detect_shift_within_noise():
+    assert detect_shift(HISTORY, 1003.0, higher_is_better=True)["verdict"] == "ok"
+
+def test_detect_shift_needs_history():
+    assert detect_shift(HISTORY[:2], 500.0, higher_is_better=True)["verdict"] == "insufficient_history"
+
+def test_summarize_trials_t_interval():
+    summary = summarize_trials([10.0, 12.0, 14.0])
+    assert summary["mean"] == 12.0
+    assert summary["median"] == 12.0
+    assert summary["stdev"] == 2.0
+    # t(0.975, df=2) = 4.303, half width = 4.303 * 2 / sqrt(3)
+    assert summary["ci95_low"] == round(12.0 - 4.303 * 2 / 3 ** 0.5, 4)
+    assert summarize_trials([5.0])["ci95_high"] == 5.0
@@ -0,0 +1,40 @@
+import os
+import time
+import pytest
+from app.core.exceptions import ConfigurationError
+from app.utils.performance_monitor import PerformanceMonitor
+from app.utils.system_sampler import SystemSampler, resource_sampling_settings
+
+def test_settings_default_to_the_backend_server_process():
+    assert resource_sampling_settings({}, "postgres")["process_names"] == ["postgres"]
+    assert resource_sampling_settings({"resource_sampling": {"pids": [1], "process_names": []}}, "redis") == \
+        {"interval": 0.5, "pids": [1], "process_names": []}
+    with pytest.raises(ConfigurationError):
+        resource_sampling_settings({"resource_sampling": {"interval_seconds": 0}}, "postgres")
+
+def test_tick_records_rates_and_watched_processes():
+    sampler = SystemSampler(pids=[os.getpid()])
+    sampler.start()
+    sum(i * i for i in range(200000))
+    sample = sampler.tick(1.0, {"queries": 10, "p50_ms": 1.0, "p99_ms": 2.0})
+
+    assert len(sample["cpu_percent_per_core"]) == os.cpu_count()
+    assert sample["ctx_switches_per_second"] >= 0
+    assert sample["processes"][str(os.getpid())]["rss_mb"] > 0
+    assert sample["load"]["ops_per_second"] == pytest.approx(10 / sample["interval_seconds"], rel=0.05)
+    assert sampler.summary()["samples"] == 1
+
+def test_monitor_aligns_load_with_resource_windows():
+    monitor = PerformanceMonitor()
+    monitor.configure_resource_sampling(0.05, [], [])
+    monitor.start_experiment()
+    for _ in range(5):
+        monitor.record_query_time(0.001)
+        time.sleep(0.06)
+    monitor.stop_experiment()
+
+    samples = list(monitor.system_sampler.samples)
+    assert len(samples) >= 3
+    assert sum(s["load"]["queries"] for s in samples) <= 5
+    assert all(b["t"] > a["t"] for a, b in zip(samples, samples[1:]))
+    assert monitor.get_results()["system"]["samples"] == len(samples)